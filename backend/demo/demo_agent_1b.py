@@ -13,6 +13,7 @@ from rich.table import Table
 
 from src.agent_1b.agent import Agent1B, _extract_keywords_from_profile, _extract_regulations_from_profile, _extract_countries_from_profile
 from src.agent_1b.display import process_and_display_analysis
+from src.agent_1b.sinks import get_sink
 from src.storage.database import get_session
 from src.storage.models import Document
 
@@ -139,7 +140,7 @@ def main():
                         critical_count += 1
                     
                     # Afficher et sauvegarder
-                    analysis_id = process_and_display_analysis(analysis, save_to_db=True)
+                    analysis_id = process_and_display_analysis(analysis, save_to_db=True, sink=get_sink("rich"))
                     
                     if analysis_id:
                         analyses_created.append(analysis_id)
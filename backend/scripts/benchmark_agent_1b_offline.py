@@ -0,0 +1,114 @@
+"""
+Benchmark reproductible de l'Agent 1B avec le modèle LLM hors ligne
+
+Analyse un lot de documents synthétiques (ou les fichiers fournis) avec
+OfflineChatModel : aucune clé API, réponses déterministes, latence et taux
+d'erreur paramétrables. Deux exécutions avec les mêmes options donnent les
+mêmes scores, appels et tokens.
+
+Usage:
+    python scripts/benchmark_agent_1b_offline.py
+    python scripts/benchmark_agent_1b_offline.py --documents 50 --latency-ms 800 --spread 0.5 --error-rate 0.02
+    python scripts/benchmark_agent_1b_offline.py data/documents/doc.txt --no-tiering
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import settings
+
+DEFAULT_PROFILE = {
+    "company_id": "benchmark",
+    "company_name": "HUTCHINSON",
+    "industry": "Advanced materials & engineered components",
+    "keywords": ["caoutchouc", "rubber", "elastomer", "aluminium", "steel"],
+    "nc_codes": ["4001.21", "4002.19", "4016.93", "7601.10"],
+    "regulations": ["CBAM", "EUDR", "CSRD"],
+    "countries": "FR, DE, PL, US",
+}
+
+SENTENCES = [
+    "Importers of goods listed in Annex I shall submit a declaration.",
+    "Natural rubber of CN code 4001.21 and articles of CN code 4016.93 are covered.",
+    "Unwrought aluminium of CN code 7601.10 falls within the scope of this Regulation.",
+    "Operators shall perform due diligence on relevant commodities placed on the market.",
+    "The Commission shall adopt implementing acts laying down reporting obligations.",
+    "This Regulation shall enter into force on the twentieth day following its publication.",
+]
+
+
+def synthetic_documents(count: int, seed: int) -> list:
+    """Documents synthétiques déterministes (articles tirés de SENTENCES)"""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        articles = [
+            f"Article {n}\n" + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 12)))
+            for n in range(1, rng.randint(3, 15))
+        ]
+        documents.append((f"doc-{i:04d}", "\n\n".join(articles), f"Document synthétique {i}", rng.choice(["CBAM", "EUDR"])))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Agent 1B hors ligne")
+    parser.add_argument("files", nargs="*", help="Fichiers texte à analyser (défaut: documents synthétiques)")
+    parser.add_argument("--documents", type=int, default=20, help="Nombre de documents synthétiques")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latence par appel (médiane si lognormal)")
+    parser.add_argument("--distribution", default="lognormal", choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--spread", type=float, default=0.0, help="Demi-largeur (uniform) ou sigma (lognormal)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--mode", default="single", choices=["single", "map_reduce"])
+    parser.add_argument("--no-tiering", action="store_true", help="Désactiver la cascade triage/premium")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings.llm_backend = "offline"
+    settings.offline_llm_seed = args.seed
+    settings.offline_llm_latency_ms = args.latency_ms
+    settings.offline_llm_latency_distribution = args.distribution
+    settings.offline_llm_latency_spread = args.spread
+    settings.offline_llm_error_rate = args.error_rate
+    settings.semantic_analysis_mode = args.mode
+    settings.semantic_tiering_enabled = not args.no_tiering
+    settings.semantic_chunk_cache_enabled = False
+
+    from src.agent_1b.agent import Agent1B
+
+    if args.files:
+        documents = [
+            (Path(f).stem, Path(f).read_text(encoding="utf-8", errors="ignore"), Path(f).stem, "CBAM")
+            for f in args.files
+        ]
+    else:
+        documents = synthetic_documents(args.documents, args.seed)
+
+    agent = Agent1B(DEFAULT_PROFILE)
+    criticality = {}
+
+    start = time.perf_counter()
+    for document_id, content, title, regulation_type in documents:
+        analysis = agent.analyze_document(document_id, content, title, regulation_type)
+        level = analysis.relevance_score.criticality.value
+        criticality[level] = criticality.get(level, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    stats = agent.get_semantic_stats()
+    print(f"\n{len(documents)} documents en {elapsed:.2f}s ({len(documents) / elapsed:.1f} doc/s)")
+    print(f"Criticité: {criticality}")
+    print(f"Escalades vers le premium: {stats['escalations']}")
+    for tier, tier_stats in stats["tiers"].items():
+        print(
+            f"  {tier:<8} appels={tier_stats['llm_calls']:<4} erreurs={tier_stats['errors']:<3} "
+            f"tokens={tier_stats['input_tokens']}/{tier_stats['output_tokens']} "
+            f"latence={tier_stats['latency_s']:.2f}s coût=${tier_stats['cost_usd']:.4f}"
+        )
+    print(f"Coût total estimé: ${stats['total_cost_usd']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de la préparation du contenu envoyé au LLM (Agent 1B)
+
+Compare l'ancienne troncature début/fin (70% / 30% de 32000 caractères) à la
+sélection de passages BM25 : tokens envoyés et couverture des termes du profil
+(mots-clés et codes NC présents dans l'extrait).
+
+Usage:
+    python scripts/benchmark_chunk_selection.py
+    python scripts/benchmark_chunk_selection.py data/documents/doc.pdf --budget 4000 --budget 8000
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent_1b.tools.chunk_retriever import (
+    build_query_terms,
+    select_relevant_content,
+    tokenize,
+)
+from src.utils.tokens import estimate_tokens
+
+DEFAULT_PROFILE = "data/company_profiles/Hutchinson_SA.json"
+DEFAULT_KEYWORDS = [
+    "caoutchouc", "rubber", "elastomer", "aluminium", "steel",
+    "CBAM", "EUDR", "carbon", "deforestation", "import"
+]
+
+
+def head_tail_excerpt(content: str, max_chars: int = 32000) -> str:
+    """Reproduit l'ancienne stratégie de troncature 70/30"""
+    if len(content) <= max_chars:
+        return content
+    first_part = content[:int(max_chars * 0.7)]
+    last_part = content[-int(max_chars * 0.3):]
+    return first_part + "\n\n[...CONTENU TRONQUÉ...]\n\n" + last_part
+
+
+def term_coverage(text: str, query_terms: list) -> int:
+    """Nombre de termes de la requête présents dans le texte"""
+    present = set(tokenize(text))
+    return sum(1 for term in query_terms if term in present)
+
+
+def load_text(path: Path) -> str:
+    """Charge le texte d'un document (.pdf via l'extracteur de l'Agent 1A, sinon texte brut)"""
+    if path.suffix.lower() == ".pdf":
+        from src.agent_1a.tools.pdf_extractor import extract_pdf_content_sync
+        result = extract_pdf_content_sync(str(path), extract_tables=False, extract_nc_codes=False)
+        return result.text if result.status == "success" else ""
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+
+def load_profile(path: Path) -> dict:
+    """Charge un profil JSON et complète les mots-clés si absents"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "nc_codes": data.get("nc_codes", []),
+        "keywords": data.get("keywords") or DEFAULT_KEYWORDS,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tokens envoyés au LLM (troncature vs BM25)")
+    parser.add_argument("documents", nargs="*", help="Fichiers .pdf ou .txt (défaut: data/documents/*.pdf)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Profil entreprise JSON")
+    parser.add_argument("--regulation", default="CBAM", help="Type de réglementation")
+    parser.add_argument("--budget", type=int, action="append", help="Budget(s) de tokens BM25 (défaut: 8000)")
+    args = parser.parse_args()
+
+    budgets = args.budget or [8000]
+    documents = [Path(p) for p in args.documents] or sorted(Path("data/documents").glob("*.pdf"))
+    profile = load_profile(Path(args.profile))
+    query_terms = build_query_terms(profile, args.regulation)
+
+    print(f"Requête: {len(query_terms)} termes ({args.regulation})\n")
+    header = f"{'Document':<32} {'Original':>9} {'Début/fin':>16}"
+    for budget in budgets:
+        header += f" {'BM25@' + str(budget):>16}"
+    print(header)
+    print("-" * len(header))
+
+    totals = {"head_tail": [0, 0], **{b: [0, 0] for b in budgets}}
+    for path in documents:
+        content = load_text(path)
+        if not content:
+            print(f"{path.name:<32} (extraction impossible)")
+            continue
+
+        excerpt = head_tail_excerpt(content)
+        row = [estimate_tokens(excerpt), term_coverage(excerpt, query_terms)]
+        totals["head_tail"][0] += row[0]
+        totals["head_tail"][1] += row[1]
+        line = f"{path.name[:32]:<32} {estimate_tokens(content):>9} {row[0]:>8} tok/{row[1]:>3}t"
+
+        for budget in budgets:
+            selection = select_relevant_content(content, query_terms, budget)
+            coverage = term_coverage(selection.text, query_terms)
+            totals[budget][0] += selection.selected_tokens
+            totals[budget][1] += coverage
+            line += f" {selection.selected_tokens:>8} tok/{coverage:>3}t"
+        print(line)
+
+    print("-" * len(header))
+    line = f"{'TOTAL':<32} {'':>9} {totals['head_tail'][0]:>8} tok/{totals['head_tail'][1]:>3}t"
+    for budget in budgets:
+        line += f" {totals[budget][0]:>8} tok/{totals[budget][1]:>3}t"
+    print(line)
+    print("\ntok = tokens estimés envoyés, t = termes de la requête couverts par l'extrait")
+
+
+if __name__ == "__main__":
+    main()
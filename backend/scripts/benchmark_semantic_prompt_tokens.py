@@ -0,0 +1,126 @@
+"""
+Benchmark des tokens du prompt d'analyse sémantique (Agent 1B)
+
+Compare, sur un jeu fixe de documents, les tokens d'entrée par appel :
+- legacy : format_instructions de PydanticOutputParser recopiées dans le prompt
+- function_calling : consigne courte + définition d'outil (+ prompt système tool use)
+- json_schema : consigne courte, schéma transmis en décodage contraint
+
+Sans clé API, les tokens sont estimés localement (~4 caractères/token) et le
+surcoût du prompt système tool use d'Anthropic est ajouté forfaitairement.
+Avec --count-api et ANTHROPIC_API_KEY, l'API count_tokens donne les valeurs exactes.
+
+Usage:
+    python scripts/benchmark_semantic_prompt_tokens.py
+    python scripts/benchmark_semantic_prompt_tokens.py data/documents/doc.pdf --count-api
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_anthropic.chat_models import convert_to_anthropic_tool
+
+from src.agent_1b.models import SemanticAnalysisResult
+from src.agent_1b.tools.semantic_analyzer import SEMANTIC_ANALYSIS_PROMPT, SemanticAnalyzer
+from src.agent_1b.tools.structured_output import (
+    JSON_SCHEMA_FORMAT_INSTRUCTIONS,
+    NATIVE_FORMAT_INSTRUCTIONS,
+)
+from src.config import settings
+from src.utils.tokens import estimate_tokens
+
+DEFAULT_PROFILE = {
+    "company_name": "HUTCHINSON",
+    "industry": "Advanced materials & engineered components",
+    "keywords": ["caoutchouc", "rubber", "elastomer", "aluminium", "steel"],
+    "nc_codes": ["4001.21", "4002.19", "4016.93", "7601.10"],
+    "regulations": ["CBAM", "EUDR", "CSRD"],
+    "countries": "FR, DE, PL, US",
+}
+
+# Prompt système ajouté par Anthropic quand tool_choice force un outil (Claude 4.x)
+TOOL_USE_SYSTEM_TOKENS = 313
+
+
+def load_text(path: Path) -> str:
+    """Charge le texte d'un document (.pdf via l'extracteur de l'Agent 1A, sinon texte brut)"""
+    if path.suffix.lower() == ".pdf":
+        from src.agent_1a.tools.pdf_extractor import extract_pdf_content_sync
+        result = extract_pdf_content_sync(str(path), extract_tables=False, extract_nc_codes=False)
+        return result.text if result.status == "success" else ""
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tokens du prompt sémantique")
+    parser.add_argument("documents", nargs="*", help="Fichiers .pdf ou .txt (défaut: data/documents/*.pdf)")
+    parser.add_argument("--count-api", action="store_true", help="Compter via l'API Anthropic (clé requise)")
+    args = parser.parse_args()
+
+    documents = [Path(p) for p in args.documents] or sorted(Path("data/documents").glob("*.pdf"))
+    analyzer = SemanticAnalyzer(mode="single")
+    tool = convert_to_anthropic_tool(SemanticAnalysisResult)
+
+    variants = {
+        "legacy": (PydanticOutputParser(pydantic_object=SemanticAnalysisResult).get_format_instructions(), None),
+        "function_calling": (NATIVE_FORMAT_INSTRUCTIONS.format(tool_name="SemanticAnalysisResult"), tool),
+        "json_schema": (JSON_SCHEMA_FORMAT_INSTRUCTIONS, None),
+    }
+
+    counter = None
+    if args.count_api:
+        if not settings.anthropic_api_key:
+            sys.exit("ANTHROPIC_API_KEY requis pour --count-api")
+        counter = analyzer.llm
+
+    def count(prompt: str, tool_def) -> int:
+        if counter is not None:
+            from langchain_core.messages import HumanMessage
+            tools = [tool_def] if tool_def else None
+            return counter.get_num_tokens_from_messages([HumanMessage(prompt)], tools=tools)
+        tokens = estimate_tokens(prompt)
+        if tool_def:
+            tokens += estimate_tokens(json.dumps(tool_def)) + TOOL_USE_SYSTEM_TOKENS
+        return tokens
+
+    print(f"Comptage: {'API Anthropic' if counter else 'estimation locale'}\n")
+    header = f"{'Document':<32}" + "".join(f"{name:>18}" for name in variants)
+    print(header)
+    print("-" * len(header))
+
+    totals = {name: 0 for name in variants}
+    for path in documents:
+        content = load_text(path)
+        if not content:
+            print(f"{path.name:<32} (extraction impossible)")
+            continue
+
+        excerpt = analyzer._prepare_content(content, company_profile=DEFAULT_PROFILE, regulation_type="CBAM")
+        inputs = {
+            **analyzer._profile_fields(DEFAULT_PROFILE),
+            "document_title": path.stem,
+            "regulation_type": "CBAM",
+            "document_content": excerpt,
+        }
+
+        line = f"{path.name[:32]:<32}"
+        for name, (instructions, tool_def) in variants.items():
+            tokens = count(SEMANTIC_ANALYSIS_PROMPT.format(**inputs, format_instructions=instructions), tool_def)
+            totals[name] += tokens
+            line += f"{tokens:>18}"
+        print(line)
+
+    print("-" * len(header))
+    print(f"{'TOTAL':<32}" + "".join(f"{totals[name]:>18}" for name in variants))
+    legacy = totals["legacy"] or 1
+    print(f"{'vs legacy':<32}" + "".join(
+        f"{(totals[name] - legacy) / legacy:>+17.1%} " for name in variants
+    ))
+
+
+if __name__ == "__main__":
+    main()
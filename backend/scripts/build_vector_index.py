@@ -0,0 +1,59 @@
+"""
+Script pour (re)construire l'index vectoriel TF-IDF des documents
+
+L'index est reconstruit automatiquement après chaque collecte (pipeline,
+worker, scheduler) ; ce script permet de le préparer à l'avance (première
+mise en service de /similar) et d'en mesurer le coût.
+
+Usage:
+    python scripts/build_vector_index.py
+    python scripts/build_vector_index.py --force
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.agent_1b.tools.vector_index import VectorIndex, rebuild_document_index
+from src.storage.database import get_session
+
+
+def build_vector_index(force: bool = False):
+    """Construit l'index et mesure une requête de similarité sur tout le corpus"""
+    session = get_session()
+    try:
+        start = time.perf_counter()
+        index = rebuild_document_index(session, force=force)
+        build_s = time.perf_counter() - start
+    finally:
+        session.close()
+
+    if index is None:
+        print("Index déjà à jour (--force pour le reconstruire).")
+        index = VectorIndex.load()
+
+    print(f"📦 Index: {len(index.document_ids)} documents, {index.chunk_matrix.shape[0]} passages, "
+          f"dim={index.idf.shape[0]} ({build_s:.2f}s)")
+
+    if not index.document_ids:
+        print("Aucun document avec contenu en base.")
+        return
+
+    reloaded = VectorIndex.load()
+    start = time.perf_counter()
+    for doc_id in reloaded.document_ids[:50]:
+        reloaded.most_similar(doc_id, limit=5)
+    per_query_ms = (time.perf_counter() - start) * 1000 / min(50, len(reloaded.document_ids))
+    print(f"⚡ most_similar: {per_query_ms:.2f} ms/requête (mémoire mappée: "
+          f"{isinstance(reloaded.chunk_matrix, np.memmap)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construction de l'index vectoriel des documents")
+    parser.add_argument("--force", action="store_true", help="Reconstruire même si le corpus est inchangé")
+    args = parser.parse_args()
+    build_vector_index(force=args.force)
@@ -0,0 +1,44 @@
+"""
+Script pour recalculer les compteurs des dashboards (table stats_counters)
+
+Les compteurs sont tenus à jour à chaque écriture des analyses et impact
+assessments ; à relancer après des modifications SQL directes. Par défaut,
+dry-run : affiche les écarts. --apply remplace les compteurs.
+
+Usage:
+    python scripts/rebuild_stats.py
+    python scripts/rebuild_stats.py --apply
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage.database import get_session
+from src.storage.stats import rebuild_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcul des compteurs des dashboards")
+    parser.add_argument("--apply", action="store_true", help="Écrire les compteurs recalculés (sinon dry-run)")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        drift = rebuild_stats(session)
+        if args.apply:
+            session.commit()
+        else:
+            session.rollback()
+    finally:
+        session.close()
+
+    mode = "appliqué" if args.apply else "dry-run"
+    print(f"\n📊 Compteurs des dashboards ({mode}) : {len(drift)} écart(s)")
+    for (metric, bucket), (current, expected) in sorted(drift.items()):
+        print(f"   {metric:<24} {bucket:<20} {current:>8} -> {expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Script pour recalculer les scores des analyses après un changement de poids ou de seuils
+
+Par défaut, dry-run : affiche le nombre d'analyses dont la criticité ou la
+pertinence changerait. --apply écrit les nouvelles valeurs.
+
+Usage:
+    python scripts/rescore_analyses.py
+    python scripts/rescore_analyses.py --config config/scoring_rules_v2.json
+    python scripts/rescore_analyses.py --config config/scoring_rules_v2.json --apply
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent_1b.rescoring import rescore_analyses
+from src.agent_1b.tools.scoring_config import load_scoring_config
+from src.storage.database import get_session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-scoring des analyses historiques")
+    parser.add_argument("--config", type=Path, help="Fichier de scoring (défaut: config/scoring_rules.json)")
+    parser.add_argument("--apply", action="store_true", help="Écrire les nouveaux scores (sinon dry-run)")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        report = rescore_analyses(session, load_scoring_config(args.config), apply=args.apply)
+    finally:
+        session.close()
+
+    mode = "appliqué" if report.applied else "dry-run"
+    print(f"\n📊 Re-scoring ({mode}) : {report.rescored}/{report.total} analyses en {report.seconds:.3f}s")
+    if report.skipped:
+        print(f"   {report.skipped} analyses sans scores par niveau ignorées (à ré-analyser)")
+    print(f"   Score final modifié : {report.score_changed}")
+    print(f"   Criticité modifiée  : {report.criticality_changed}")
+    print(f"   Pertinence modifiée : {report.relevance_changed}")
+    for transition, count in sorted(report.transitions.items(), key=lambda item: -item[1]):
+        print(f"     {transition:<24} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,8 @@ import os
 # Ajouter le dossier parent au PYTHONPATH
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.storage.database import engine, Base
+from src.storage.database import engine, drop_all_tables
+from src.storage.migrations_runner import upgrade_database
 from src.storage.models import (
     Document, Analysis, ImpactAssessment, Alert, 
     ExecutionLog, CompanyProfile
@@ -32,12 +33,12 @@ def reset_database():
     
     try:
         # Supprimer toutes les tables
-        Base.metadata.drop_all(bind=engine)
+        drop_all_tables()
         print("✅ Tables supprimées")
         
         # Recréer toutes les tables
         print("\n🔨 Recréation des tables...")
-        Base.metadata.create_all(bind=engine)
+        upgrade_database(engine)
         print("✅ Tables créées")
         
         print("\n" + "=" * 60)
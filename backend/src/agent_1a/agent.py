@@ -1,393 +1,583 @@
-"""
-Agent 1A - Pipeline Combiné EUR-Lex + CBAM Guidance
-
-Collecte les documents depuis deux sources :
-1. EUR-Lex : Lois et règlements (CBAM, EUDR, CSRD)
-2. CBAM Guidance : Documents officiels CBAM (Guidance, FAQs, Templates)
-"""
-
-import asyncio
-import structlog
-from typing import Dict, List
-from datetime import datetime
-import hashlib
-
-from .tools.scraper import search_eurlex
-from .tools.cbam_guidance_scraper import search_cbam_guidance
-from .tools.document_fetcher import fetch_document
-from .tools.pdf_extractor import extract_pdf_content
-
-logger = structlog.get_logger()
-
-# ========================================
-# PIPELINE COMBINÉ
-# ========================================
-
-async def run_agent_1a_combined(
-    keyword: str = "CBAM",
-    max_eurlex_documents: int = 10,
-    cbam_categories: str = "all",
-    max_cbam_documents: int = 50
-) -> Dict:
-    """
-    Pipeline combiné Agent 1A : EUR-Lex + CBAM Guidance
-    
-    Collecte et traite les documents depuis deux sources en parallèle :
-    1. EUR-Lex : Lois et règlements
-    2. CBAM Guidance : Documents officiels
-    
-    Args:
-        keyword: Mot-clé pour EUR-Lex (CBAM, EUDR, CSRD)
-        max_eurlex_documents: Nombre max de documents EUR-Lex
-        cbam_categories: Catégories CBAM (all, guidance, faq, template, default_values, tool)
-        max_cbam_documents: Nombre max de documents CBAM
-        
-    Returns:
-        dict: Résultat avec statistiques et documents traités
-    """
-    logger.info(
-        "agent_1a_combined_started",
-        keyword=keyword,
-        max_eurlex=max_eurlex_documents,
-        cbam_categories=cbam_categories,
-        max_cbam=max_cbam_documents
-    )
-    
-    try:
-        from src.storage.database import get_session
-        from src.storage.repositories import DocumentRepository
-        
-        # ====================================================================
-        # ÉTAPE 1 : SCRAPING PARALLÈLE (EUR-Lex + CBAM)
-        # ====================================================================
-        logger.info("step_1_parallel_scraping")
-        
-        # Lancer les deux scrapers en parallèle
-        eurlex_task = search_eurlex(keyword, max_results=max_eurlex_documents)
-        cbam_task = search_cbam_guidance(categories=cbam_categories, max_results=max_cbam_documents)
-        
-        eurlex_results, cbam_results = await asyncio.gather(eurlex_task, cbam_task)
-        
-        # Vérifier les résultats
-        if eurlex_results.status != "success":
-            logger.error("eurlex_search_failed", error=eurlex_results.error)
-        
-        if cbam_results.status != "success":
-            logger.error("cbam_search_failed", error=cbam_results.error)
-        
-        total_found = len(eurlex_results.documents) + len(cbam_results.documents)
-        
-        logger.info(
-            "step_1_completed",
-            eurlex_count=len(eurlex_results.documents),
-            cbam_count=len(cbam_results.documents),
-            total=total_found
-        )
-        
-        # ====================================================================
-        # ÉTAPE 2 : VÉRIFIER LES DOCUMENTS EXISTANTS EN BDD
-        # ====================================================================
-        logger.info("step_2_checking_existing_documents")
-        
-        session = get_session()
-        repo = DocumentRepository(session)
-        
-        documents_to_process = []
-        documents_unchanged = []
-        
-        try:
-            # Vérifier EUR-Lex documents
-            for doc in eurlex_results.documents:
-                # Utiliser pdf_url pour télécharger le PDF au lieu du HTML
-                url = str(doc.pdf_url) if doc.pdf_url else str(doc.url)
-                existing_doc = repo.find_by_url(url)
-                
-                if existing_doc:
-                    if existing_doc.hash_sha256 == doc.metadata.get("remote_hash"):
-                        documents_unchanged.append(doc)
-                        logger.info("document_unchanged", celex=doc.celex_number)
-                        continue
-                
-                documents_to_process.append({
-                    'source': 'eurlex',
-                    'doc': doc,
-                    'url': url
-                })
-            
-            # Vérifier CBAM documents
-            for doc in cbam_results.documents:
-                url = str(doc.url)
-                existing_doc = repo.find_by_url(url)
-                
-                if existing_doc:
-                    # Pour CBAM, on vérifie juste l'existence (pas de hash remote)
-                    documents_unchanged.append(doc)
-                    logger.info("document_unchanged", title=doc.title)
-                    continue
-                
-                documents_to_process.append({
-                    'source': 'cbam',
-                    'doc': doc,
-                    'url': url
-                })
-            
-            logger.info(
-                "step_2_completed",
-                to_process=len(documents_to_process),
-                unchanged=len(documents_unchanged)
-            )
-            
-        finally:
-            session.close()
-        
-        # ====================================================================
-        # ÉTAPE 3 : TÉLÉCHARGEMENT DES DOCUMENTS
-        # ====================================================================
-        logger.info("step_3_downloading", count=len(documents_to_process))
-        
-        downloaded_files = []
-        download_errors = []
-        
-        for item in documents_to_process:
-            try:
-                doc = item['doc']
-                url = item['url']
-                source = item['source']
-                
-                # Identifier le document
-                if source == 'eurlex':
-                    doc_id = doc.celex_number
-                else:
-                    doc_id = doc.title[:50]
-                
-                logger.info("downloading_document", source=source, id=doc_id)
-                
-                # Vérifier si le document existe déjà en BDD pour éviter téléchargement inutile
-                session_check = get_session()
-                repo_check = DocumentRepository(session_check)
-                existing_doc_check = repo_check.find_by_url(url)
-                session_check.close()
-                
-                # Utiliser skip_if_exists et existing_hash pour optimiser
-                fetch_result = await fetch_document(
-                    url, 
-                    output_dir="data/documents",
-                    skip_if_exists=True,
-                    existing_hash=existing_doc_check.hash_sha256 if existing_doc_check else None
-                )
-                
-                if not fetch_result.success:
-                    raise Exception(fetch_result.error or "Download failed")
-                
-                # Si le document est inchangé, on skip le téléchargement
-                if fetch_result.document.status == "skipped":
-                    logger.info("document_skipped", source=source, id=doc_id, reason="unchanged")
-                    continue
-                
-                file_path = fetch_result.document.file_path
-                
-                downloaded_files.append({
-                    'source': source,
-                    'doc': doc,
-                    'file_path': file_path,
-                    'url': url
-                })
-                
-                logger.info("document_downloaded", source=source, id=doc_id, path=file_path)
-                
-            except Exception as e:
-                logger.error("download_failed", source=source, id=doc_id, error=str(e))
-                download_errors.append({
-                    'source': source,
-                    'doc': doc,
-                    'error': str(e)
-                })
-        
-        logger.info(
-            "step_3_completed",
-            downloaded=len(downloaded_files),
-            errors=len(download_errors)
-        )
-        
-        # ====================================================================
-        # ÉTAPE 4 : EXTRACTION DU CONTENU (PDFs uniquement)
-        # ====================================================================
-        logger.info("step_4_extracting", count=len(downloaded_files))
-        
-        extracted_documents = []
-        extraction_errors = []
-        
-        for item in downloaded_files:
-            try:
-                doc = item['doc']
-                file_path = item['file_path']
-                source = item['source']
-                
-                # Identifier le document
-                if source == 'eurlex':
-                    doc_id = doc.celex_number
-                else:
-                    doc_id = doc.title[:50]
-                
-                # Extraire seulement les PDFs
-                if not file_path.endswith('.pdf'):
-                    doc_format = doc.format if hasattr(doc, 'format') else 'UNKNOWN'
-                    logger.info("skipping_non_pdf", source=source, id=doc_id, format=doc_format)
-                    continue
-                
-                logger.info("extracting_content", source=source, id=doc_id)
-                
-                content = await extract_pdf_content(file_path)
-                
-                extracted_documents.append({
-                    'source': source,
-                    'doc': doc,
-                    'file_path': file_path,
-                    'content': content,
-                    'url': item['url']
-                })
-                
-                logger.info(
-                    "content_extracted",
-                    source=source,
-                    id=doc_id,
-                    pages=content.page_count,
-                    nc_codes=len(content.nc_codes)
-                )
-                
-            except Exception as e:
-                logger.error("extraction_failed", source=source, id=doc_id, error=str(e))
-                extraction_errors.append({
-                    'source': source,
-                    'doc': doc,
-                    'error': str(e)
-                })
-        
-        logger.info(
-            "step_4_completed",
-            extracted=len(extracted_documents),
-            errors=len(extraction_errors)
-        )
-        
-        # ====================================================================
-        # ÉTAPE 5 : SAUVEGARDE EN BASE DE DONNÉES
-        # ====================================================================
-        logger.info("step_5_saving_to_database", count=len(extracted_documents))
-        
-        session = get_session()
-        repo = DocumentRepository(session)
-        
-        saved_count = 0
-        save_errors = []
-        
-        try:
-            for item in extracted_documents:
-                try:
-                    doc = item['doc']
-                    content = item['content']
-                    file_path = item['file_path']
-                    url = item['url']
-                    source = item['source']
-                    
-                    # Calculer le hash du fichier
-                    with open(file_path, 'rb') as f:
-                        file_hash = hashlib.sha256(f.read()).hexdigest()
-                    
-                    # Préparer les métadonnées selon la source
-                    # Note: content est un objet ExtractedContent (Pydantic), pas un dict
-                    if source == 'eurlex':
-                        metadata = {
-                            'source': 'eurlex',
-                            'celex_number': doc.celex_number,
-                            'document_type': doc.document_type,
-                            'pages': content.page_count,
-                            'tables': len(content.tables),
-                            'file_path': file_path
-                        }
-                        regulation_type = 'CBAM'  # EUR-Lex documents are CBAM-related
-                        nc_codes = [nc.code for nc in content.nc_codes]  # Extraire les codes NC
-                        pub_date = doc.publication_date  # EurlexDocument utilise publication_date, pas date
-                    else:  # cbam
-                        metadata = {
-                            'source': 'cbam_guidance',
-                            'format': doc.format,
-                            'size': doc.size,
-                            'category': doc.category,
-                            'pages': content.page_count,
-                            'file_path': file_path
-                        }
-                        regulation_type = 'CBAM'
-                        nc_codes = [nc.code for nc in content.nc_codes]  # Extraire les codes NC
-                        pub_date = getattr(doc, 'date', None)
-                    
-                    # Sauvegarder avec upsert_document
-                    saved_doc, status = repo.upsert_document(
-                        source_url=url,
-                        hash_sha256=file_hash,
-                        title=doc.title,
-                        content=content.text,  # Attribut text, pas .get('text')
-                        nc_codes=nc_codes,
-                        regulation_type=regulation_type,
-                        publication_date=pub_date,
-                        document_metadata=metadata
-                    )
-                    saved_count += 1
-                    
-                    logger.info("document_saved", source=source, title=doc.title[:50], status=status, doc_id=saved_doc.id)
-                    
-                except Exception as e:
-                    logger.error("save_failed", source=source, title=doc.title[:50], error=str(e))
-                    save_errors.append({
-                        'source': source,
-                        'doc': doc,
-                        'error': str(e)
-                    })
-            
-            session.commit()
-            
-        except Exception as e:
-            session.rollback()
-            logger.error("database_transaction_failed", error=str(e))
-            raise
-        finally:
-            session.close()
-        
-        logger.info("step_5_completed", saved=saved_count, errors=len(save_errors))
-        
-        # ====================================================================
-        # RÉSULTAT FINAL
-        # ====================================================================
-        
-        result = {
-            "status": "success",
-            "keyword": keyword,
-            "cbam_categories": cbam_categories,
-            "sources": {
-                "eurlex": {
-                    "found": len(eurlex_results.documents),
-                    "processed": len([x for x in extracted_documents if x['source'] == 'eurlex'])
-                },
-                "cbam_guidance": {
-                    "found": len(cbam_results.documents),
-                    "processed": len([x for x in extracted_documents if x['source'] == 'cbam'])
-                }
-            },
-            "total_found": total_found,
-            "documents_processed": saved_count,
-            "documents_unchanged": len(documents_unchanged),
-            "download_errors": len(download_errors),
-            "extraction_errors": len(extraction_errors),
-            "save_errors": len(save_errors)
-        }
-        
-        logger.info("agent_1a_combined_completed", result=result)
-        
-        return result
-        
-    except Exception as e:
-        logger.error("agent_1a_combined_failed", error=str(e))
-        return {
-            "status": "error",
-            "keyword": keyword,
-            "error": str(e)
-        }
+"""
+Agent 1A - Pipeline Combiné EUR-Lex + CBAM Guidance
+
+Collecte les documents depuis deux sources :
+1. EUR-Lex : Lois et règlements (CBAM, EUDR, CSRD)
+2. CBAM Guidance : Documents officiels CBAM (Guidance, FAQs, Templates)
+"""
+
+import asyncio
+import structlog
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+
+from .tools.scraper import search_eurlex
+from .tools.cbam_guidance_scraper import search_cbam_guidance
+from .tools.document_fetcher import fetch_document
+from .tools.pdf_extractor import extract_pdf_content
+from .tools.text_normalizer import normalize_extracted_text
+from .incremental import WATERMARK_AGENT_TYPE, IncrementalPlanner, load_watermarks
+from src.utils.metrics import current_metrics, span, with_metrics
+
+logger = structlog.get_logger()
+
+# ========================================
+# PIPELINE COMBINÉ
+# ========================================
+
+@with_metrics
+async def run_agent_1a_combined(
+    keyword: str = "CBAM",
+    max_eurlex_documents: int = 10,
+    cbam_categories: str = "all",
+    max_cbam_documents: int = 50,
+    incremental: Optional[bool] = None
+) -> Dict:
+    """
+    Pipeline combiné Agent 1A : EUR-Lex + CBAM Guidance
+    
+    Collecte et traite les documents depuis deux sources en parallèle :
+    1. EUR-Lex : Lois et règlements
+    2. CBAM Guidance : Documents officiels
+    
+    Chaque exécution est journalisée (execution_logs) avec un point de reprise
+    par source ; en mode incrémental, seuls les nouveaux documents sont
+    téléchargés et les documents EUR-Lex connus sont revérifiés à une cadence
+    plus lente (voir src/agent_1a/incremental.py). Les mesures par étape (temps,
+    CPU, mémoire, octets) sont jointes au résultat et au journal.
+    
+    Args:
+        keyword: Mot-clé pour EUR-Lex (CBAM, EUDR, CSRD)
+        max_eurlex_documents: Nombre max de documents EUR-Lex
+        cbam_categories: Catégories CBAM (all, guidance, faq, template, default_values, tool)
+        max_cbam_documents: Nombre max de documents CBAM
+        incremental: Collecte depuis la dernière exécution réussie
+            (défaut: settings.incremental_collection)
+        
+    Returns:
+        dict: Résultat avec statistiques et documents traités
+    """
+    logger.info(
+        "agent_1a_combined_started",
+        keyword=keyword,
+        max_eurlex=max_eurlex_documents,
+        cbam_categories=cbam_categories,
+        max_cbam=max_cbam_documents
+    )
+    
+    log_id = None
+    try:
+        from src.config import settings
+        from src.storage.database import get_session
+        from src.storage.models import ExecutionLog
+        from src.storage.repositories import DocumentRepository, ExecutionLogRepository
+        
+        if incremental is None:
+            incremental = settings.incremental_collection
+        mode = "incremental" if incremental else "full"
+        
+        # Journal d'exécution + points de reprise de la dernière collecte réussie
+        session = get_session()
+        try:
+            previous_watermarks = load_watermarks(session)
+            log_id = ExecutionLogRepository(session).save(ExecutionLog(
+                agent_type=WATERMARK_AGENT_TYPE,
+                status="running",
+                log_metadata={"mode": mode, "keyword": keyword}
+            )).id
+            session.commit()
+        finally:
+            session.close()
+        
+        # ====================================================================
+        # ÉTAPE 1 : SCRAPING PARALLÈLE (EUR-Lex + CBAM)
+        # ====================================================================
+        logger.info("step_1_parallel_scraping")
+        stage = span("scrape")
+        
+        # Lancer les deux scrapers en parallèle
+        eurlex_task = search_eurlex(keyword, max_results=max_eurlex_documents)
+        cbam_task = search_cbam_guidance(categories=cbam_categories, max_results=max_cbam_documents)
+        
+        eurlex_results, cbam_results = await asyncio.gather(eurlex_task, cbam_task)
+        
+        # Vérifier les résultats
+        if eurlex_results.status != "success":
+            logger.error("eurlex_search_failed", error=eurlex_results.error)
+        
+        if cbam_results.status != "success":
+            logger.error("cbam_search_failed", error=cbam_results.error)
+        
+        total_found = len(eurlex_results.documents) + len(cbam_results.documents)
+        stage.finish(items=total_found)
+        
+        logger.info(
+            "step_1_completed",
+            eurlex_count=len(eurlex_results.documents),
+            cbam_count=len(cbam_results.documents),
+            total=total_found
+        )
+        
+        # ====================================================================
+        # ÉTAPE 2 : VÉRIFIER LES DOCUMENTS EXISTANTS EN BDD
+        # ====================================================================
+        logger.info("step_2_checking_existing_documents", mode=mode)
+        stage = span("check_existing", items=total_found)
+        
+        # Nouveaux points de reprise (ceux d'une source en erreur sont conservés)
+        planner = IncrementalPlanner(previous_watermarks)
+        watermarks = dict(previous_watermarks)
+        if eurlex_results.status == "success":
+            watermarks["eurlex"] = planner.observe_listing("eurlex", eurlex_results.documents)
+        if cbam_results.status == "success":
+            watermarks["cbam"] = planner.observe_listing("cbam", cbam_results.documents)
+        
+        session = get_session()
+        repo = DocumentRepository(session)
+        
+        documents_to_process = []
+        documents_unchanged = []
+        
+        try:
+            # Vérifier EUR-Lex documents
+            for doc in eurlex_results.documents:
+                # Utiliser pdf_url pour télécharger le PDF au lieu du HTML
+                url = str(doc.pdf_url) if doc.pdf_url else str(doc.url)
+                existing_doc = repo.find_by_url(url)
+                
+                if incremental and not planner.should_process('eurlex', doc, existing_doc):
+                    documents_unchanged.append(doc)
+                    logger.info("document_unchanged", celex=doc.celex_number, reason="recently_checked")
+                    continue
+                
+                if existing_doc:
+                    if existing_doc.hash_sha256 == doc.metadata.get("remote_hash"):
+                        documents_unchanged.append(doc)
+                        logger.info("document_unchanged", celex=doc.celex_number)
+                        continue
+                
+                documents_to_process.append({
+                    'source': 'eurlex',
+                    'doc': doc,
+                    'url': url
+                })
+            
+            # Vérifier CBAM documents
+            for doc in cbam_results.documents:
+                url = str(doc.url)
+                existing_doc = repo.find_by_url(url)
+                
+                if incremental:
+                    # Documents connus revérifiés seulement si leur entrée de la page a changé
+                    if not planner.should_process('cbam', doc, existing_doc):
+                        documents_unchanged.append(doc)
+                        logger.info("document_unchanged", title=doc.title, reason="recently_checked")
+                        continue
+                elif existing_doc:
+                    # Pour CBAM, on vérifie juste l'existence (pas de hash remote)
+                    documents_unchanged.append(doc)
+                    logger.info("document_unchanged", title=doc.title)
+                    continue
+                
+                documents_to_process.append({
+                    'source': 'cbam',
+                    'doc': doc,
+                    'url': url
+                })
+            
+            logger.info(
+                "step_2_completed",
+                to_process=len(documents_to_process),
+                unchanged=len(documents_unchanged)
+            )
+            
+        finally:
+            session.close()
+            stage.finish()
+        
+        # ====================================================================
+        # ÉTAPE 3 : TÉLÉCHARGEMENT DES DOCUMENTS
+        # ====================================================================
+        logger.info("step_3_downloading", count=len(documents_to_process))
+        stage = span("download")
+        
+        downloaded_files = []
+        download_errors = []
+        
+        for item in documents_to_process:
+            try:
+                doc = item['doc']
+                url = item['url']
+                source = item['source']
+                
+                # Identifier le document
+                if source == 'eurlex':
+                    doc_id = doc.celex_number
+                else:
+                    doc_id = doc.title[:50]
+                
+                logger.info("downloading_document", source=source, id=doc_id)
+                
+                # Vérifier si le document existe déjà en BDD pour éviter téléchargement inutile
+                session_check = get_session()
+                repo_check = DocumentRepository(session_check)
+                existing_doc_check = repo_check.find_by_url(url)
+                session_check.close()
+                
+                # Utiliser skip_if_exists et existing_hash pour optimiser
+                fetch_result = await fetch_document(
+                    url, 
+                    output_dir="data/documents",
+                    skip_if_exists=True,
+                    existing_hash=existing_doc_check.hash_sha256 if existing_doc_check else None
+                )
+                
+                if not fetch_result.success:
+                    raise Exception(fetch_result.error or "Download failed")
+                
+                # Si le document est inchangé, on skip le téléchargement
+                if fetch_result.document.status == "skipped":
+                    logger.info("document_skipped", source=source, id=doc_id, reason="unchanged")
+                    # Prochaine revérification dans incremental_revalidate_days
+                    session_check = get_session()
+                    try:
+                        DocumentRepository(session_check).mark_checked(url)
+                        session_check.commit()
+                    finally:
+                        session_check.close()
+                    continue
+                
+                file_path = fetch_result.document.file_path
+                
+                downloaded_files.append({
+                    'source': source,
+                    'doc': doc,
+                    'file_path': file_path,
+                    'url': url
+                })
+                
+                logger.info("document_downloaded", source=source, id=doc_id, path=file_path)
+                
+            except Exception as e:
+                logger.error("download_failed", source=source, id=doc_id, error=str(e))
+                download_errors.append({
+                    'source': source,
+                    'doc': doc,
+                    'error': str(e)
+                })
+        
+        stage.finish(items=len(documents_to_process))
+        logger.info(
+            "step_3_completed",
+            downloaded=len(downloaded_files),
+            errors=len(download_errors)
+        )
+        
+        # ====================================================================
+        # ÉTAPE 4 : EXTRACTION DU CONTENU (PDFs uniquement)
+        # ====================================================================
+        logger.info("step_4_extracting", count=len(downloaded_files))
+        stage = span("extract")
+        
+        extracted_documents = []
+        extraction_errors = []
+        
+        for item in downloaded_files:
+            try:
+                doc = item['doc']
+                file_path = item['file_path']
+                source = item['source']
+                
+                # Identifier le document
+                if source == 'eurlex':
+                    doc_id = doc.celex_number
+                else:
+                    doc_id = doc.title[:50]
+                
+                # Extraire seulement les PDFs
+                if not file_path.endswith('.pdf'):
+                    doc_format = doc.format if hasattr(doc, 'format') else 'UNKNOWN'
+                    logger.info("skipping_non_pdf", source=source, id=doc_id, format=doc_format)
+                    continue
+                
+                logger.info("extracting_content", source=source, id=doc_id)
+                
+                content, normalization = await extract_normalized_content(file_path, source, doc_id)
+                
+                extracted_documents.append({
+                    'source': source,
+                    'doc': doc,
+                    'file_path': file_path,
+                    'content': content,
+                    'normalization': normalization,
+                    'url': item['url']
+                })
+                
+                logger.info(
+                    "content_extracted",
+                    source=source,
+                    id=doc_id,
+                    pages=content.page_count,
+                    nc_codes=len(content.nc_codes)
+                )
+                
+            except Exception as e:
+                logger.error("extraction_failed", source=source, id=doc_id, error=str(e))
+                extraction_errors.append({
+                    'source': source,
+                    'doc': doc,
+                    'error': str(e)
+                })
+        
+        stage.finish(items=len(extracted_documents))
+        logger.info(
+            "step_4_completed",
+            extracted=len(extracted_documents),
+            errors=len(extraction_errors)
+        )
+        
+        # ====================================================================
+        # ÉTAPE 5 : SAUVEGARDE EN BASE DE DONNÉES
+        # ====================================================================
+        logger.info("step_5_saving_to_database", count=len(extracted_documents))
+        stage = span("save")
+        
+        saved_count = 0
+        try:
+            # Écritures synchrones (SQLAlchemy) hors de la boucle d'événements
+            saved_count, saved_by_status, save_errors = await asyncio.to_thread(
+                _save_documents, extracted_documents
+            )
+        finally:
+            stage.finish(items=saved_count)
+        
+        logger.info("step_5_completed", saved=saved_count, errors=len(save_errors))
+        
+        # ====================================================================
+        # RÉSULTAT FINAL
+        # ====================================================================
+        
+        result = {
+            "status": "success",
+            "mode": mode,
+            "keyword": keyword,
+            "cbam_categories": cbam_categories,
+            "sources": {
+                "eurlex": {
+                    "found": len(eurlex_results.documents),
+                    "processed": len([x for x in extracted_documents if x['source'] == 'eurlex'])
+                },
+                "cbam_guidance": {
+                    "found": len(cbam_results.documents),
+                    "processed": len([x for x in extracted_documents if x['source'] == 'cbam'])
+                }
+            },
+            "total_found": total_found,
+            "documents_processed": saved_count,
+            "documents_unchanged": len(documents_unchanged),
+            "download_errors": len(download_errors),
+            "extraction_errors": len(extraction_errors),
+            "save_errors": len(save_errors),
+            "normalization": {
+                "chars_saved": sum(x['normalization'].chars_saved for x in extracted_documents if x.get('normalization')),
+                "tokens_saved": sum(x['normalization'].tokens_saved for x in extracted_documents if x.get('normalization'))
+            },
+            "incremental": planner.summary(),
+            "metrics": current_metrics().snapshot()
+        }
+        
+        _complete_execution_log(
+            log_id,
+            "success",
+            documents_processed=saved_count,
+            documents_new=saved_by_status["new"],
+            documents_modified=saved_by_status["modified"],
+            errors=[str(x['error']) for x in download_errors + extraction_errors + save_errors],
+            log_metadata={
+                "mode": mode,
+                "keyword": keyword,
+                "watermarks": {source: wm.model_dump(mode="json") for source, wm in watermarks.items()},
+                "incremental": planner.summary(),
+                "metrics": result["metrics"]
+            }
+        )
+        
+        logger.info("agent_1a_combined_completed", result=result)
+        
+        return result
+        
+    except Exception as e:
+        logger.error("agent_1a_combined_failed", error=str(e))
+        if log_id:
+            _complete_execution_log(log_id, "error", errors=[str(e)],
+                                    log_metadata={"mode": mode, "metrics": current_metrics().snapshot()})
+        return {
+            "status": "error",
+            "keyword": keyword,
+            "error": str(e)
+        }
+
+
+def _save_documents(extracted_documents: List[Dict]) -> Tuple[int, Dict[str, int], List[Dict]]:
+    """
+    Sauvegarde les documents extraits en une transaction
+    
+    Args:
+        extracted_documents: Documents extraits (voir save_extracted_document)
+        
+    Returns:
+        Tuple (nombre sauvegardé, nombre par statut new/modified/unchanged, erreurs)
+    """
+    from src.storage.database import get_session
+    from src.storage.repositories import DocumentRepository
+    
+    session = get_session()
+    repo = DocumentRepository(session)
+    
+    saved_count = 0
+    saved_by_status = {"new": 0, "modified": 0, "unchanged": 0}
+    save_errors = []
+    
+    try:
+        for item in extracted_documents:
+            try:
+                doc = item['doc']
+                source = item['source']
+                
+                saved_doc, status = save_extracted_document(repo, item)
+                saved_count += 1
+                saved_by_status[status] = saved_by_status.get(status, 0) + 1
+                
+                logger.info("document_saved", source=source, title=doc.title[:50], status=status, doc_id=saved_doc.id)
+                
+            except Exception as e:
+                logger.error("save_failed", source=source, title=doc.title[:50], error=str(e))
+                save_errors.append({
+                    'source': source,
+                    'doc': doc,
+                    'error': str(e)
+                })
+        
+        session.commit()
+        
+    except Exception as e:
+        session.rollback()
+        logger.error("database_transaction_failed", error=str(e))
+        raise
+    finally:
+        session.close()
+    
+    return saved_count, saved_by_status, save_errors
+
+
+def _complete_execution_log(log_id: str, status: str, **kwargs) -> None:
+    """Finalise le journal d'exécution (un échec d'écriture n'interrompt pas la collecte)"""
+    from src.storage.database import get_session
+    from src.storage.repositories import ExecutionLogRepository
+    
+    session = get_session()
+    try:
+        ExecutionLogRepository(session).complete_execution(log_id, status=status, **kwargs)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error("execution_log_failed", log_id=log_id, error=str(e))
+    finally:
+        session.close()
+
+
+# ========================================
+# ÉTAPES PARTAGÉES (pipeline combiné et pipeline en flux)
+# ========================================
+
+def document_label(source: str, doc) -> str:
+    """Identifiant lisible d'un document (CELEX pour EUR-Lex, titre pour CBAM)"""
+    return doc.celex_number if source == 'eurlex' else doc.title[:50]
+
+
+async def extract_normalized_content(file_path: str, source: str, doc_id: str) -> Tuple:
+    """
+    Extrait le contenu d'un PDF et normalise le texte
+    
+    Args:
+        file_path: Chemin du PDF téléchargé
+        source: Source du document (eurlex, cbam)
+        doc_id: Identifiant lisible (logs)
+        
+    Returns:
+        Tuple (ExtractedContent, NormalizationResult ou None)
+    """
+    from src.config import settings
+    
+    content = await extract_pdf_content(file_path)
+    
+    # Normaliser le texte (en-têtes/pieds répétés, pagination, césures)
+    normalization = None
+    if settings.text_normalization_enabled and content.text:
+        normalization = await asyncio.to_thread(normalize_extracted_text, content.text)
+        content.text = normalization.text
+        logger.info("content_normalized", source=source, id=doc_id, **normalization.stats())
+    
+    return content, normalization
+
+
+def save_extracted_document(repo, item: Dict) -> Tuple:
+    """
+    Sauvegarde un document extrait (upsert par URL, sans commit)
+    
+    Args:
+        repo: DocumentRepository
+        item: Dictionnaire source, doc, file_path, content, normalization, url
+        
+    Returns:
+        Tuple (Document, status) où status est "new", "modified" ou "unchanged"
+    """
+    doc = item['doc']
+    content = item['content']
+    file_path = item['file_path']
+    source = item['source']
+    
+    # Calculer le hash du fichier
+    with open(file_path, 'rb') as f:
+        file_hash = hashlib.sha256(f.read()).hexdigest()
+    
+    # Préparer les métadonnées selon la source
+    # Note: content est un objet ExtractedContent (Pydantic), pas un dict
+    if source == 'eurlex':
+        metadata = {
+            'source': 'eurlex',
+            'celex_number': doc.celex_number,
+            'document_type': doc.document_type,
+            'pages': content.page_count,
+            'tables': len(content.tables),
+            'file_path': file_path
+        }
+        pub_date = doc.publication_date  # EurlexDocument utilise publication_date, pas date
+    else:  # cbam
+        metadata = {
+            'source': 'cbam_guidance',
+            'format': doc.format,
+            'size': doc.size,
+            'category': doc.category,
+            'pages': content.page_count,
+            'file_path': file_path
+        }
+        pub_date = getattr(doc, 'date', None)
+    
+    # Provenance des pages et gain de la normalisation
+    normalization = item.get('normalization')
+    if normalization:
+        metadata['page_offsets'] = normalization.page_offsets
+        metadata['normalization'] = normalization.stats()
+    
+    return repo.upsert_document(
+        source_url=item['url'],
+        hash_sha256=file_hash,
+        title=doc.title,
+        content=content.text,  # Attribut text, pas .get('text')
+        nc_codes=[nc.code for nc in content.nc_codes],  # Extraire les codes NC
+        regulation_type='CBAM',  # EUR-Lex et CBAM Guidance : documents CBAM
+        publication_date=pub_date,
+        document_metadata=metadata
+    )
@@ -0,0 +1,230 @@
+"""
+Collecte incrémentale Agent 1A ("depuis la dernière exécution réussie")
+
+Chaque exécution enregistre, par source, un point de reprise (high-water
+mark) dans ExecutionLog.log_metadata :
+- dernière date de publication vue
+- plus grand numéro CELEX vu (EUR-Lex)
+- empreinte de la page de résultats (URL + taille/CELEX de chaque entrée)
+
+L'exécution suivante ne traite que les nouveautés. Un document déjà connu
+est revérifié (HEAD/GET + hash) aussitôt si son entrée de la page de
+résultats a changé ; sinon, pour EUR-Lex seulement, à une cadence plus lente
+(settings.incremental_revalidate_days, selon Document.last_checked). Les
+documents CBAM connus ne sont pas revérifiés périodiquement : le mode complet
+ne vérifie que leur existence, le mode incrémental ne fait pas plus de
+requêtes que lui.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import structlog
+from pydantic import BaseModel
+
+from src.config import settings
+
+logger = structlog.get_logger()
+
+WATERMARK_AGENT_TYPE = "agent_1a"
+
+# Sources dont les documents connus sont revérifiés à la cadence incrémentale
+# (le mode complet compare aussi leur hash distant)
+REVALIDATED_SOURCES = ("eurlex",)
+
+
+class SourceWatermark(BaseModel):
+    """Point de reprise d'une source (eurlex, cbam)"""
+    source: str
+    last_publication_date: Optional[datetime] = None
+    last_celex: Optional[str] = None
+    listing_fingerprint: Optional[str] = None
+    entries: Dict[str, str] = {}  # URL → signature de l'entrée (taille, CELEX...)
+    items_seen: int = 0
+    recorded_at: Optional[datetime] = None
+
+
+def entry_signature(source: str, doc) -> str:
+    """Signature d'une entrée de la page de résultats (change si le document est republié)"""
+    if source == "eurlex":
+        return f"{doc.celex_number or ''}|{doc.publication_date or ''}|{doc.title}"
+    return f"{getattr(doc, 'size', None) or ''}|{getattr(doc, 'date', None) or ''}|{doc.title}"
+
+
+def document_url(source: str, doc) -> str:
+    """URL de téléchargement (clé des documents en base, voir run_agent_1a_combined)"""
+    if source == "eurlex":
+        return str(doc.pdf_url) if doc.pdf_url else str(doc.url)
+    return str(doc.url)
+
+
+def build_watermark(source: str, documents: Iterable, now: Optional[datetime] = None) -> SourceWatermark:
+    """
+    Calcule le point de reprise d'une source à partir de sa page de résultats
+
+    Args:
+        source: eurlex ou cbam
+        documents: Documents retournés par le scraper
+        now: Date d'enregistrement (défaut: maintenant)
+
+    Returns:
+        SourceWatermark
+    """
+    entries = {document_url(source, doc): entry_signature(source, doc) for doc in documents}
+    dates = [d for d in (_publication_date(source, doc) for doc in documents) if d]
+    celex = [doc.celex_number for doc in documents if source == "eurlex" and doc.celex_number]
+    fingerprint = hashlib.sha256(
+        "\n".join(f"{url} {signature}" for url, signature in sorted(entries.items())).encode()
+    ).hexdigest()
+    return SourceWatermark(
+        source=source,
+        last_publication_date=max(dates) if dates else None,
+        last_celex=max(celex) if celex else None,
+        listing_fingerprint=fingerprint,
+        entries=entries,
+        items_seen=len(entries),
+        recorded_at=now or datetime.utcnow()
+    )
+
+
+def merge_watermark(current: SourceWatermark, previous: Optional[SourceWatermark]) -> SourceWatermark:
+    """Le point de reprise ne recule jamais (résultats partiels, source en erreur)"""
+    if previous is None:
+        return current
+    dates = [d for d in (current.last_publication_date, previous.last_publication_date) if d]
+    celex = [c for c in (current.last_celex, previous.last_celex) if c]
+    return current.model_copy(update={
+        "last_publication_date": max(dates) if dates else None,
+        "last_celex": max(celex) if celex else None,
+        "entries": {**previous.entries, **current.entries},
+    })
+
+
+def load_watermarks(session) -> Dict[str, SourceWatermark]:
+    """
+    Points de reprise de la dernière collecte réussie
+
+    Returns:
+        {source: SourceWatermark} (vide si aucune exécution réussie)
+    """
+    from src.storage.repositories import ExecutionLogRepository
+
+    last = ExecutionLogRepository(session).get_last_successful_execution(WATERMARK_AGENT_TYPE)
+    if last is None or not last.log_metadata:
+        return {}
+    return {
+        source: SourceWatermark(**data)
+        for source, data in (last.log_metadata.get("watermarks") or {}).items()
+    }
+
+
+class IncrementalPlanner:
+    """
+    Décide, document par document, s'il faut le (re)traiter
+
+    Usage:
+        planner = IncrementalPlanner(load_watermarks(session))
+        planner.observe_listing("eurlex", eurlex_results.documents)
+        if planner.should_process("eurlex", doc, existing_doc):
+            ...
+    """
+
+    def __init__(
+        self,
+        previous: Dict[str, SourceWatermark],
+        revalidate_days: Optional[float] = None,
+        now: Optional[datetime] = None
+    ):
+        """
+        Args:
+            previous: Points de reprise de la dernière exécution réussie
+            revalidate_days: Cadence de revérification des documents connus
+                (défaut: settings.incremental_revalidate_days)
+            now: Date de référence (défaut: maintenant)
+        """
+        self.previous = previous
+        self.now = now or datetime.utcnow()
+        days = settings.incremental_revalidate_days if revalidate_days is None else revalidate_days
+        self.revalidate_before = self.now - timedelta(days=days)
+        self.listing_unchanged: Dict[str, bool] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def observe_listing(self, source: str, documents: List) -> SourceWatermark:
+        """
+        Compare la page de résultats au point de reprise précédent
+
+        Returns:
+            Nouveau point de reprise de la source
+        """
+        current = build_watermark(source, documents, self.now)
+        previous = self.previous.get(source)
+        self.listing_unchanged[source] = bool(
+            previous and previous.listing_fingerprint == current.listing_fingerprint
+        )
+        self.stats[source] = {"new": 0, "newer_than_watermark": 0, "revalidated": 0, "skipped": 0}
+        logger.info(
+            "incremental_listing_checked",
+            source=source,
+            unchanged=self.listing_unchanged[source],
+            items=current.items_seen,
+            previous_celex=previous.last_celex if previous else None
+        )
+        return merge_watermark(current, previous)
+
+    def is_newer(self, source: str, doc) -> bool:
+        """Document publié après le point de reprise (date ou CELEX)"""
+        previous = self.previous.get(source)
+        if previous is None:
+            return True
+        pub_date = _publication_date(source, doc)
+        if pub_date and previous.last_publication_date and pub_date > previous.last_publication_date:
+            return True
+        celex = getattr(doc, "celex_number", None) if source == "eurlex" else None
+        return bool(celex and previous.last_celex and celex > previous.last_celex)
+
+    def should_process(self, source: str, doc, existing) -> bool:
+        """
+        Args:
+            source: eurlex ou cbam
+            doc: Document du scraper
+            existing: Document en base pour cette URL (ou None)
+
+        Returns:
+            True si le document doit être téléchargé / revérifié
+        """
+        stats = self.stats.setdefault(source, {"new": 0, "newer_than_watermark": 0, "revalidated": 0, "skipped": 0})
+        if self.is_newer(source, doc):
+            stats["newer_than_watermark"] += 1
+        if existing is None:
+            stats["new"] += 1
+            return True
+
+        previous = self.previous.get(source)
+        url = document_url(source, doc)
+        entry_changed = previous is not None and previous.entries.get(url) not in (None, entry_signature(source, doc))
+        stale = source in REVALIDATED_SOURCES and (
+            existing.last_checked is None or existing.last_checked < self.revalidate_before
+        )
+        if entry_changed or stale:
+            stats["revalidated"] += 1
+            return True
+        stats["skipped"] += 1
+        return False
+
+    def summary(self) -> Dict:
+        return {
+            "revalidate_before": self.revalidate_before.isoformat(),
+            "listing_unchanged": dict(self.listing_unchanged),
+            "sources": {source: dict(stats) for source, stats in self.stats.items()},
+        }
+
+
+def _publication_date(source: str, doc) -> Optional[datetime]:
+    value = doc.publication_date if source == "eurlex" else getattr(doc, "date", None)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
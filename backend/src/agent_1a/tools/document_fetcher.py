@@ -15,6 +15,8 @@ import httpx
 import structlog
 from pydantic import BaseModel, HttpUrl
 
+from src.utils.metrics import record
+
 logger = structlog.get_logger()
 
 
@@ -78,6 +80,7 @@ async def get_remote_file_hash(
             logger.info("get_remote_hash_fallback", method="download_and_hash")
             response = await client.get(url)
             response.raise_for_status()
+            record(bytes=len(response.content))
             
             hash_sha256 = hashlib.sha256(response.content).hexdigest()
             logger.info("get_remote_hash_completed", method="download", hash=hash_sha256[:16] + "...")
@@ -186,6 +189,7 @@ async def fetch_document(
             
             content = response.content
             content_type = response.headers.get("content-type", "")
+            record(bytes=len(content))
             
         # Générer le nom du fichier si non fourni
         if not filename:
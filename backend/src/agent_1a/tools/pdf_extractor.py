@@ -18,6 +18,7 @@ PDF Extractor - Extraction de contenu et codes NC depuis PDFs
 Responsable: Dev 1 (ou Dev 2)
 """
 from langchain.tools import tool
+import asyncio
 import json
 import re
 from pathlib import Path
@@ -66,6 +67,16 @@ async def extract_pdf_content(
     Returns:
         ExtractedContent: Contenu extrait avec métadonnées
     """
+    # pdfplumber est bloquant et coûteux en CPU : exécuté hors de la boucle
+    # d'événements (l'API reste réactive pendant une collecte)
+    return await asyncio.to_thread(_extract_pdf_content_sync, file_path, extract_tables, extract_nc_codes)
+
+
+def _extract_pdf_content_sync(
+    file_path: str,
+    extract_tables: bool,
+    extract_nc_codes: bool
+) -> ExtractedContent:
     logger.info("pdf_extraction_started", file_path=file_path)
     
     try:
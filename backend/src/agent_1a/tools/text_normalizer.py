@@ -0,0 +1,201 @@
+"""
+Normalisation du texte extrait des PDFs
+
+Supprime le bruit de mise en page avant le stockage en base :
+- marqueurs "--- Page N ---" ajoutés par l'extracteur, remplacés par un saut
+  de page (\\f) que le découpage de l'Agent 1B utilise comme frontière
+- en-têtes et pieds de page répétés (ex: en-tête du Journal officiel)
+- numéros de page isolés
+- mots coupés en fin de ligne ("obliga-\\ntions" -> "obligations")
+- espaces multiples et lignes vides superflues
+
+La position de début de chaque page dans le texte normalisé est conservée
+(page_offsets) pour pouvoir retrouver la page d'origine d'un passage.
+"""
+
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from src.utils.tokens import estimate_tokens
+
+
+PAGE_MARKER_PATTERN = re.compile(r"\n?--- Page (\d+) ---\n")
+
+# Séparateur de pages du texte normalisé (saut de page entre deux paragraphes)
+PAGE_BREAK = "\n\f\n"
+
+# Numéros de page isolés : "3", "- 3 -", "Page 3", "3/25", "Page 3 of 25", "3 sur 25"
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^[\s\-–]*(?:page\s*)?\d{1,4}(?:\s*(?:/|of|sur)\s*\d{1,4})?[\s\-–]*$",
+    re.IGNORECASE,
+)
+
+# Titres de structure jamais traités comme en-têtes (leur numéro varie d'une page à l'autre)
+HEADING_PATTERN = re.compile(r"^\s*(?:article|annex|annexe|chapter|chapitre|section|title|titre)\b", re.IGNORECASE)
+
+HYPHENATION_PATTERN = re.compile(r"([a-zà-öø-ÿ])-\n([a-zà-öø-ÿ])")
+SPACES_PATTERN = re.compile(r"[ \t ]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+# Nombre de lignes en début/fin de page examinées pour les en-têtes/pieds
+EDGE_LINES = 3
+
+
+class NormalizedText(BaseModel):
+    """Texte normalisé et statistiques de réduction"""
+    text: str
+    page_offsets: List[Tuple[int, int]] = Field(
+        default_factory=list,
+        description="(numéro de page, position de début dans le texte normalisé)"
+    )
+    original_chars: int
+    normalized_chars: int
+    original_tokens: int
+    repeated_lines_removed: int = 0
+
+    @property
+    def chars_saved(self) -> int:
+        return self.original_chars - self.normalized_chars
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - estimate_tokens(self.text)
+
+    def stats(self) -> dict:
+        """Statistiques sérialisables (métadonnées document / logs)"""
+        return {
+            "original_chars": self.original_chars,
+            "normalized_chars": self.normalized_chars,
+            "chars_saved": self.chars_saved,
+            "tokens_saved": self.tokens_saved,
+            "repeated_lines_removed": self.repeated_lines_removed,
+        }
+
+
+def normalize_extracted_text(text: str, min_repeat_ratio: float = 0.5) -> NormalizedText:
+    """
+    Normalise le texte produit par l'extracteur PDF
+
+    Args:
+        text: Texte brut (avec marqueurs "--- Page N ---")
+        min_repeat_ratio: Part minimale des pages où une ligne de bord doit
+            apparaître pour être considérée comme en-tête/pied répété
+
+    Returns:
+        NormalizedText (texte, page_offsets, statistiques)
+    """
+    pages = _split_pages(text)
+
+    repeated = _find_repeated_edge_lines(pages, min_repeat_ratio)
+    removed = 0
+
+    parts = []
+    page_offsets = []
+    offset = 0
+    for page_num, page_text in pages:
+        lines = page_text.split("\n")
+        edges = _edge_indices(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            if i in edges and (_line_key(line) in repeated or PAGE_NUMBER_PATTERN.match(line)):
+                removed += 1
+                continue
+            kept.append(line)
+
+        page_clean = _clean_whitespace("\n".join(kept))
+        if not page_clean:
+            continue
+
+        if parts:
+            parts.append(PAGE_BREAK)
+            offset += len(PAGE_BREAK)
+        page_offsets.append((page_num, offset))
+        parts.append(page_clean)
+        offset += len(page_clean)
+
+    normalized = "".join(parts)
+
+    return NormalizedText(
+        text=normalized,
+        page_offsets=page_offsets,
+        original_chars=len(text),
+        normalized_chars=len(normalized),
+        original_tokens=estimate_tokens(text),
+        repeated_lines_removed=removed,
+    )
+
+
+def page_for_offset(page_offsets: List[Tuple[int, int]], offset: int) -> Optional[int]:
+    """
+    Retrouve la page d'origine d'une position du texte normalisé
+
+    Args:
+        page_offsets: Table (page, début) produite par normalize_extracted_text
+        offset: Position dans le texte normalisé
+
+    Returns:
+        Numéro de page, ou None si la table est vide
+    """
+    if not page_offsets:
+        return None
+    starts = [start for _, start in page_offsets]
+    index = max(bisect_right(starts, offset) - 1, 0)
+    return page_offsets[index][0]
+
+
+def _split_pages(text: str) -> List[Tuple[int, str]]:
+    """Découpe le texte sur les marqueurs de page (une seule page si absents)"""
+    markers = list(PAGE_MARKER_PATTERN.finditer(text))
+    if not markers:
+        return [(1, text)]
+
+    pages = []
+    preamble = text[:markers[0].start()]
+    if preamble.strip():
+        pages.append((1, preamble))
+    for marker, next_marker in zip(markers, markers[1:] + [None]):
+        end = next_marker.start() if next_marker else len(text)
+        pages.append((int(marker.group(1)), text[marker.end():end]))
+    return pages
+
+
+def _line_key(line: str) -> str:
+    """Clé de comparaison d'une ligne (chiffres masqués : pagination, dates d'édition)"""
+    return re.sub(r"\d+", "#", SPACES_PATTERN.sub(" ", line).strip().lower())
+
+
+def _edge_indices(lines: List[str]) -> set:
+    """Indices des premières/dernières lignes non vides de la page"""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    return set(non_empty[:EDGE_LINES] + non_empty[-EDGE_LINES:])
+
+
+def _find_repeated_edge_lines(pages: List[Tuple[int, str]], min_repeat_ratio: float) -> set:
+    """Lignes de bord présentes sur une part significative des pages"""
+    if len(pages) < 3:
+        return set()
+
+    counts = Counter()
+    for _, page_text in pages:
+        non_empty = [line for line in page_text.split("\n") if line.strip()]
+        edges = non_empty[:EDGE_LINES] + non_empty[-EDGE_LINES:]
+        counts.update({_line_key(line) for line in edges})
+
+    threshold = max(3, int(len(pages) * min_repeat_ratio))
+    return {
+        key for key, count in counts.items()
+        if count >= threshold and key and not HEADING_PATTERN.match(key)
+    }
+
+
+def _clean_whitespace(text: str) -> str:
+    """Recolle les mots coupés et compacte les espaces"""
+    text = HYPHENATION_PATTERN.sub(r"\1\2", text)
+    text = SPACES_PATTERN.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    text = BLANK_LINES_PATTERN.sub("\n\n", text)
+    return text.strip()
@@ -20,6 +20,7 @@ from .models import (
     KeywordAnalysisResult,
     NCCodeAnalysisResult,
     SemanticAnalysisResult,
+    ChunkExtraction,
     RelevanceScore
 )
 
@@ -33,5 +34,6 @@ __all__ = [
     "KeywordAnalysisResult",
     "NCCodeAnalysisResult",
     "SemanticAnalysisResult",
+    "ChunkExtraction",
     "RelevanceScore"
 ]
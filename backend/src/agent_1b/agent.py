@@ -7,28 +7,24 @@ Analyse la pertinence des documents collectés par l'Agent 1A avec une approche
 - 40% Analyse sémantique LLM
 
 Utilise Pydantic pour garantir la fiabilité des données.
-Sauvegarde les résultats en BDD + affichage Rich.
+Sauvegarde les résultats en BDD + sortie Rich/JSON lines (voir sinks.py).
 """
 
 import structlog
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
-
 from src.agent_1b.models import (
     DocumentAnalysis,
     AnalysisAlert,
-    Criticality
+    Criticality,
+    KeywordAnalysisResult,
+    NCCodeAnalysisResult
 )
-from src.agent_1b.tools.keyword_filter import analyze_keywords
-from src.agent_1b.tools.nc_code_filter import analyze_nc_codes
-from src.agent_1b.tools.semantic_analyzer import analyze_semantically
+from src.agent_1b.tools.compiled_profile import get_compiled_profile
+from src.agent_1b.tools.document_preprocessor import PreparedDocument, prepare_document
+from src.agent_1b.tools.semantic_tiering import TieredSemanticAnalyzer
 from src.agent_1b.tools.relevance_scorer import (
     RelevanceScorer,
     create_document_analysis,
@@ -52,14 +48,25 @@ class Agent1B:
     3. Quels départements sont impactés ?
     """
     
-    def __init__(self, company_profile: Dict):
+    def __init__(
+        self,
+        company_profile: Dict,
+        semantic_analyzer: Optional[TieredSemanticAnalyzer] = None
+    ):
         """
         Args:
             company_profile: Profil entreprise (dict depuis JSON)
+            semantic_analyzer: Cascade triage/premium du Niveau 3 (créée si absente)
         """
         self.company_profile = company_profile
         self.company_name = company_profile.get("company_name", "Unknown")
-        self.scorer = RelevanceScorer()
+        self.scorer = RelevanceScorer.from_config()
+        
+        # Filtres Niveaux 1 et 2 compilés une fois par version du profil
+        self.compiled_profile = get_compiled_profile(company_profile)
+        self.keyword_filter = self.compiled_profile.keyword_filter
+        self.nc_code_filter = self.compiled_profile.nc_code_filter
+        self.semantic_analyzer = semantic_analyzer or TieredSemanticAnalyzer(self.scorer)
         
         logger.info("agent_1b_initialized", company=self.company_name)
     
@@ -82,20 +89,30 @@ class Agent1B:
         Returns:
             DocumentAnalysis avec scores, criticité et recommandations
         """
-        logger.info(
-            "agent_1b_analysis_started",
-            document_id=document_id[:8],
-            title=document_title[:60],
-            regulation_type=regulation_type
-        )
+        prepared = prepare_document(document_id, document_content, document_title, regulation_type)
+        return self.analyze_prepared(prepared)
+    
+    def filter_document(
+        self,
+        prepared: PreparedDocument
+    ) -> Tuple[KeywordAnalysisResult, NCCodeAnalysisResult]:
+        """
+        Filtres Niveaux 1 et 2 (mots-clés et codes NC), sans appel LLM
         
+        Args:
+            prepared: Document prétraité (voir prepare_document)
+            
+        Returns:
+            Tuple (résultat mots-clés, résultat codes NC)
+        """
         # ====================================================================
         # NIVEAU 1 : ANALYSE MOTS-CLÉS (30%)
         # ====================================================================
         logger.info("level_1_keyword_analysis")
         
-        company_keywords = self.company_profile.get("keywords", [])
-        keyword_result = analyze_keywords(document_content, company_keywords)
+        keyword_result = self.keyword_filter.analyze(
+            prepared.content, document_lower=prepared.content_lower
+        )
         
         logger.info(
             "level_1_completed",
@@ -108,11 +125,8 @@ class Agent1B:
         # ====================================================================
         logger.info("level_2_nc_code_analysis")
         
-        company_nc_codes = self._extract_nc_codes_from_profile()
-        nc_code_result = analyze_nc_codes(
-            document_content,
-            company_nc_codes,
-            critical_codes=self._get_critical_nc_codes()
+        nc_code_result = self.nc_code_filter.analyze(
+            prepared.content, document_codes=prepared.nc_codes
         )
         
         logger.info(
@@ -122,16 +136,44 @@ class Agent1B:
             critical_codes=len(nc_code_result.critical_codes)
         )
         
+        return keyword_result, nc_code_result
+    
+    def analyze_prepared(
+        self,
+        prepared: PreparedDocument,
+        filter_results: Optional[Tuple[KeywordAnalysisResult, NCCodeAnalysisResult]] = None
+    ) -> DocumentAnalysis:
+        """
+        Analyse complète d'un document déjà prétraité
+        
+        Args:
+            prepared: Document prétraité (partagé entre profils)
+            filter_results: Résultats des Niveaux 1 et 2 s'ils ont déjà été calculés
+            
+        Returns:
+            DocumentAnalysis avec scores, criticité et recommandations
+        """
+        logger.info(
+            "agent_1b_analysis_started",
+            document_id=prepared.document_id[:8],
+            title=prepared.title[:60],
+            regulation_type=prepared.regulation_type
+        )
+        
+        keyword_result, nc_code_result = filter_results or self.filter_document(prepared)
+        
         # ====================================================================
         # NIVEAU 3 : ANALYSE SÉMANTIQUE LLM (40%)
         # ====================================================================
         logger.info("level_3_semantic_analysis")
         
-        semantic_result = analyze_semantically(
-            document_content,
-            document_title,
-            regulation_type,
-            self.company_profile
+        semantic_result = self.semantic_analyzer.analyze(
+            prepared.content,
+            prepared.title,
+            prepared.regulation_type,
+            self.company_profile,
+            keyword_result=keyword_result,
+            nc_code_result=nc_code_result
         )
         
         logger.info(
@@ -147,10 +189,10 @@ class Agent1B:
         logger.info("aggregating_scores")
         
         analysis = create_document_analysis(
-            document_id=document_id,
+            document_id=prepared.document_id,
             company_profile_id=self.company_profile.get("company_id", "unknown"),
-            document_title=document_title,
-            regulation_type=regulation_type,
+            document_title=prepared.title,
+            regulation_type=prepared.regulation_type,
             keyword_result=keyword_result,
             nc_code_result=nc_code_result,
             semantic_result=semantic_result,
@@ -159,7 +201,7 @@ class Agent1B:
         
         logger.info(
             "agent_1b_analysis_completed",
-            document_id=document_id[:8],
+            document_id=prepared.document_id[:8],
             final_score=analysis.relevance_score.final_score,
             criticality=analysis.relevance_score.criticality.value,
             is_relevant=analysis.is_relevant
@@ -167,40 +209,18 @@ class Agent1B:
         
         return analysis
     
+    def get_semantic_stats(self) -> Dict:
+        """Appels, tokens, latence et coût par niveau de la cascade sémantique"""
+        return self.semantic_analyzer.get_stats()
+    
     def _extract_nc_codes_from_profile(self) -> List[str]:
         """Extrait tous les codes NC du profil entreprise"""
-        nc_codes = []
-        
-        # Format simple : liste directe
-        if isinstance(self.company_profile.get("nc_codes"), list):
-            nc_codes = self.company_profile["nc_codes"]
-        
-        # Format structuré : imports + exports
-        elif isinstance(self.company_profile.get("nc_codes"), dict):
-            nc_dict = self.company_profile["nc_codes"]
-            
-            for imp in nc_dict.get("imports", []):
-                if isinstance(imp, dict):
-                    nc_codes.append(imp.get("code", ""))
-                else:
-                    nc_codes.append(str(imp))
-            
-            for exp in nc_dict.get("exports", []):
-                if isinstance(exp, dict):
-                    nc_codes.append(exp.get("code", ""))
-                else:
-                    nc_codes.append(str(exp))
-        
-        # Nettoyer et dédupliquer
-        nc_codes = list(set(filter(None, nc_codes)))
-        
-        return nc_codes
+        return self.compiled_profile.nc_codes
     
     def _get_critical_nc_codes(self) -> List[str]:
         """Identifie les codes NC critiques pour l'entreprise"""
-        # Pour l'instant, retourne une liste vide
-        # À améliorer avec une logique métier
-        return []
+        # config.critical_nc_codes du profil (vide par défaut)
+        return sorted(self.compiled_profile.critical_codes)
 
 
 def run_agent_1b_on_document(
@@ -0,0 +1,118 @@
+"""
+Analyse multi-profils de l'Agent 1B
+
+Chaque document est prétraité une seule fois (minuscules, codes NC,
+passages), puis les filtres Niveaux 1 et 2 de tous les profils actifs sont
+exécutés en une passe. Les appels LLM sont ensuite regroupés par document :
+chaque couple document/profil n'est analysé qu'une fois, par une cascade
+sémantique partagée entre les profils.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.agent_1b.agent import Agent1B
+from src.agent_1b.models import DocumentAnalysis
+from src.agent_1b.tools.document_preprocessor import PreparedDocument, prepare_document
+from src.agent_1b.tools.relevance_scorer import RelevanceScorer
+from src.agent_1b.tools.semantic_tiering import TieredSemanticAnalyzer
+
+logger = structlog.get_logger()
+
+
+class BatchAnalysisResult(BaseModel):
+    """Résultat d'une analyse multi-profils"""
+    analyses: List[DocumentAnalysis] = Field(default_factory=list)
+    errors: List[Dict] = Field(default_factory=list)
+    documents: int = 0
+    profiles: int = 0
+    prepare_seconds: float = 0.0
+    filter_seconds: float = 0.0
+    semantic_seconds: float = 0.0
+
+
+class MultiProfileAnalyzer:
+    """Analyse un lot de documents pour plusieurs profils entreprise"""
+
+    def __init__(
+        self,
+        company_profiles: List[Dict],
+        semantic_analyzer: Optional[TieredSemanticAnalyzer] = None
+    ):
+        """
+        Args:
+            company_profiles: Profils entreprise (voir load_active_company_profiles)
+            semantic_analyzer: Cascade sémantique partagée (créée si absente)
+        """
+        self.semantic_analyzer = semantic_analyzer or TieredSemanticAnalyzer(RelevanceScorer.from_config())
+        self.agents = {
+            profile.get("company_id", profile.get("company_name", "unknown")): Agent1B(
+                profile, semantic_analyzer=self.semantic_analyzer
+            )
+            for profile in company_profiles
+        }
+
+    def analyze(self, documents: List[Tuple[str, str, str, str]]) -> BatchAnalysisResult:
+        """
+        Analyse chaque couple document/profil une seule fois
+
+        Args:
+            documents: Tuples (document_id, contenu, titre, type de réglementation)
+
+        Returns:
+            BatchAnalysisResult (analyses dans l'ordre document puis profil)
+        """
+        result = BatchAnalysisResult(documents=len(documents), profiles=len(self.agents))
+
+        # Prétraitement commun à tous les profils
+        start = time.perf_counter()
+        prepared: Dict[str, PreparedDocument] = {}
+        for document_id, content, title, regulation_type in documents:
+            if document_id not in prepared:
+                prepared[document_id] = prepare_document(document_id, content, title, regulation_type)
+        result.prepare_seconds = round(time.perf_counter() - start, 3)
+
+        # Niveaux 1 et 2 pour tous les profils en une passe (sans LLM)
+        start = time.perf_counter()
+        filter_results = {}
+        for document_id, document in prepared.items():
+            for profile_id, agent in self.agents.items():
+                try:
+                    filter_results[(document_id, profile_id)] = agent.filter_document(document)
+                except Exception as e:
+                    logger.error("batch_filter_failed", document_id=document_id, profile_id=profile_id, error=str(e))
+                    result.errors.append({"document_id": document_id, "profile_id": profile_id, "error": str(e)})
+        result.filter_seconds = round(time.perf_counter() - start, 3)
+
+        # Niveau 3 groupé par document : un appel par couple document/profil
+        start = time.perf_counter()
+        for (document_id, profile_id), filters in filter_results.items():
+            try:
+                analysis = self.agents[profile_id].analyze_prepared(
+                    prepared[document_id], filter_results=filters
+                )
+                result.analyses.append(analysis)
+            except Exception as e:
+                logger.error("batch_analysis_failed", document_id=document_id, profile_id=profile_id, error=str(e))
+                result.errors.append({"document_id": document_id, "profile_id": profile_id, "error": str(e)})
+        result.semantic_seconds = round(time.perf_counter() - start, 3)
+
+        logger.info(
+            "batch_analysis_completed",
+            documents=result.documents,
+            profiles=result.profiles,
+            analyses=len(result.analyses),
+            errors=len(result.errors),
+            prepare_seconds=result.prepare_seconds,
+            filter_seconds=result.filter_seconds,
+            semantic_seconds=result.semantic_seconds
+        )
+
+        return result
+
+    def get_semantic_stats(self) -> Dict:
+        """Consommation de la cascade sémantique partagée"""
+        return self.semantic_analyzer.get_stats()
@@ -1,24 +1,29 @@
 """
 Affichage Rich et sauvegarde BDD pour l'Agent 1B
+
+Rich est importé à la première utilisation : la sauvegarde et les sorties
+headless (voir src/agent_1b/sinks.py) ne le chargent pas.
 """
 
 import structlog
-from datetime import datetime
-from pathlib import Path
-
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.syntax import Syntax
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import box
+from typing import Optional
 
 from src.agent_1b.models import DocumentAnalysis, Criticality
 from src.storage.database import get_session
 from src.storage.analysis_repository import AnalysisRepository
 
 logger = structlog.get_logger()
-console = Console()
+
+_console = None
+
+
+def get_console():
+    """Console Rich partagée (créée au premier affichage)"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 
 def display_document_analysis(analysis: DocumentAnalysis) -> None:
@@ -28,6 +33,11 @@ def display_document_analysis(analysis: DocumentAnalysis) -> None:
     Args:
         analysis: DocumentAnalysis Pydantic
     """
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    console = get_console()
     
     # Couleurs par criticité
     criticality_color = {
@@ -76,7 +86,7 @@ def display_document_analysis(analysis: DocumentAnalysis) -> None:
     scores_table.add_row(
         "1️⃣  Mots-Clés",
         f"{analysis.relevance_score.keyword_score * 100:.1f}%",
-        "30%",
+        f"{analysis.relevance_score.keyword_weight * 100:.0f}%",
         keywords_text
     )
     
@@ -85,7 +95,7 @@ def display_document_analysis(analysis: DocumentAnalysis) -> None:
     scores_table.add_row(
         "2️⃣  Codes NC",
         f"{analysis.relevance_score.nc_code_score * 100:.1f}%",
-        "30%",
+        f"{analysis.relevance_score.nc_code_weight * 100:.0f}%",
         nc_text
     )
     
@@ -94,7 +104,7 @@ def display_document_analysis(analysis: DocumentAnalysis) -> None:
     scores_table.add_row(
         "3️⃣  Sémantique LLM",
         f"{analysis.relevance_score.semantic_score * 100:.1f}%",
-        "40%",
+        f"{analysis.relevance_score.semantic_weight * 100:.0f}%",
         semantic_text
     )
     
@@ -166,6 +176,14 @@ def display_document_analysis(analysis: DocumentAnalysis) -> None:
     console.print("\n" + "=" * 90 + "\n")
 
 
+def display_saved_analysis(analysis_id: str) -> None:
+    """Confirme la sauvegarde d'une analyse en BDD"""
+    console = get_console()
+    console.print(f"\n[bold green]✓ Analyse sauvegardée en BDD[/bold green]")
+    console.print(f"  ID: [cyan]{analysis_id}[/cyan]")
+    console.print(f"  Status: [yellow]pending[/yellow]")
+
+
 def save_analysis_to_database(analysis: DocumentAnalysis) -> str:
     """
     Sauvegarde l'analyse en base de données
@@ -194,41 +212,52 @@ def save_analysis_to_database(analysis: DocumentAnalysis) -> str:
             confidence=db_analysis.confidence
         )
         
-        console.print(f"\n[bold green]✓ Analyse sauvegardée en BDD[/bold green]")
-        console.print(f"  ID: [cyan]{db_analysis.id}[/cyan]")
-        console.print(f"  Status: [yellow]{db_analysis.validation_status}[/yellow]")
-        
         return db_analysis.id
         
     except Exception as e:
         logger.error("failed_to_save_analysis", error=str(e))
-        console.print(f"[bold red]✗ Erreur lors de la sauvegarde: {e}[/bold red]")
         return None
     
     finally:
         session.close()
 
 
-def process_and_display_analysis(analysis: DocumentAnalysis, save_to_db: bool = True) -> str:
+def process_and_display_analysis(
+    analysis: DocumentAnalysis,
+    save_to_db: bool = True,
+    sink=None,  # AnalysisSink
+    writer=None  # AnalysisBatchWriter
+) -> Optional[str]:
     """
-    Traite une analyse complète : affichage + sauvegarde
+    Traite une analyse complète : sauvegarde + sortie
     
     Args:
         analysis: DocumentAnalysis Pydantic
         save_to_db: Sauvegarder en BDD ?
+        sink: Sortie (rich, jsonl, none) ; défaut: settings.analysis_output_sink
+        writer: Écriture groupée (sinon une transaction par analyse) ; la
+            sortie est alors publiée après le commit du lot
         
     Returns:
         ID de l'analyse en BDD (ou None si pas sauvegardée)
     """
-    # Afficher l'analyse
-    display_document_analysis(analysis)
+    from src.agent_1b.sinks import get_sink
+    
+    sink = sink or get_sink()
+    
+    if save_to_db and writer is not None:
+        return writer.add(
+            analysis,
+            on_saved=lambda analysis_id: sink.emit(analysis, analysis_id)
+        )
     
     # Sauvegarder en BDD si demandé
-    if save_to_db:
-        analysis_id = save_analysis_to_database(analysis)
-        return analysis_id
+    analysis_id = save_analysis_to_database(analysis) if save_to_db else None
+    
+    # Publier l'analyse
+    sink.emit(analysis, analysis_id)
     
-    return None
+    return analysis_id
 
 
 def display_analysis_summary(analysis_id: str) -> None:
@@ -238,6 +267,9 @@ def display_analysis_summary(analysis_id: str) -> None:
     Args:
         analysis_id: ID de l'analyse
     """
+    from rich.table import Table
+    
+    console = get_console()
     session = get_session()
     
     try:
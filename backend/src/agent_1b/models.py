@@ -159,6 +159,37 @@ class SemanticAnalysisResult(BaseModel):
     )
 
 
+class ChunkExtraction(BaseModel):
+    """Extraction partielle sur un passage du document (mode map-reduce)"""
+
+    relevance: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Pertinence du passage pour l'entreprise (0-1)"
+    )
+
+    applicability_signals: List[str] = Field(
+        default_factory=list,
+        description="Éléments du passage indiquant (ou excluant) l'applicabilité"
+    )
+
+    obligations: List[str] = Field(
+        default_factory=list,
+        description="Obligations ou actions requises mentionnées dans le passage"
+    )
+
+    products: List[str] = Field(
+        default_factory=list,
+        description="Produits/matériaux/codes NC mentionnés dans le passage"
+    )
+
+    geography: List[str] = Field(
+        default_factory=list,
+        description="Pays/régions mentionnés dans le passage"
+    )
+
+
 class RelevanceScore(BaseModel):
     """Score de pertinence final agrégé"""
     
@@ -0,0 +1,244 @@
+"""
+Priorité d'analyse des documents (Agent 1B)
+
+Avant l'appel LLM, chaque document reçoit un pré-score peu coûteux :
+- filtres Niveaux 1 et 2 (mots-clés, codes NC) du profil compilé
+- priorité de la source (config/sources.json) pour sa réglementation
+- récence de la date de publication
+
+Le pré-score détermine une classe de priorité (critical, high, medium, low) :
+les documents critiques passent devant le backlog. PriorityMetrics suit la
+profondeur de la file et l'attente par classe de priorité.
+"""
+
+import json
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from pydantic import BaseModel
+
+from src.agent_1b.tools.compiled_profile import get_compiled_profile
+from src.agent_1b.tools.document_preprocessor import prepare_document
+from src.agent_1b.tools.relevance_scorer import RelevanceScorer
+from src.config import settings
+
+logger = structlog.get_logger()
+
+# Classes de priorité, de la plus urgente à la moins urgente
+PRIORITY_CLASSES = ("critical", "high", "medium", "low")
+
+# Poids des priorités déclarées dans config/sources.json
+SOURCE_PRIORITY_WEIGHTS = {"critical": 1.0, "high": 0.75, "medium": 0.5, "low": 0.25}
+
+# Composition du pré-score : filtres, source, récence
+PRE_SCORE_WEIGHTS = (0.6, 0.25, 0.15)
+
+# Seuils des classes de priorité sur le pré-score
+PRIORITY_THRESHOLDS = {"critical": 0.7, "high": 0.5, "medium": 0.3}
+
+
+class PreScore(BaseModel):
+    """Pré-score d'un document (sans appel LLM)"""
+    document_id: str
+    score: float
+    priority: str
+    filter_score: float = 0.0
+    source_priority: float = 0.0
+    recency: float = 0.0
+    has_critical_codes: bool = False
+
+    def sort_key(self, sequence: int = 0) -> Tuple[int, float, int]:
+        """Clé de tri : classe, pré-score décroissant, ordre d'arrivée"""
+        return (PRIORITY_CLASSES.index(self.priority), -self.score, sequence)
+
+
+def default_sources_path() -> Path:
+    return Path(settings.base_dir) / "config" / "sources.json"
+
+
+def load_source_priorities(path: Optional[Path] = None) -> Dict[str, float]:
+    """
+    Priorité de chaque réglementation d'après les sources surveillées
+
+    Args:
+        path: Fichier JSON (défaut: config/sources.json)
+
+    Returns:
+        Dictionnaire réglementation (majuscules) -> poids (la plus haute des sources)
+    """
+    if path is None:
+        return _load_default_source_priorities()
+    return _read_source_priorities(Path(path))
+
+
+@lru_cache(maxsize=1)
+def _load_default_source_priorities() -> Dict[str, float]:
+    return _read_source_priorities(default_sources_path())
+
+
+def _read_source_priorities(path: Path) -> Dict[str, float]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sources = json.load(f).get("sources", [])
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("sources_config_unavailable", path=str(path), error=str(e))
+        return {}
+
+    priorities: Dict[str, float] = {}
+    for source in sources:
+        regulation = (source.get("regulation_type") or "").upper()
+        weight = SOURCE_PRIORITY_WEIGHTS.get(source.get("priority", "medium"), 0.5)
+        priorities[regulation] = max(weight, priorities.get(regulation, 0.0))
+    return priorities
+
+
+class DocumentPrioritizer:
+    """Calcule le pré-score et la classe de priorité des documents d'un profil"""
+
+    def __init__(
+        self,
+        company_profile: Dict,
+        scorer: Optional[RelevanceScorer] = None,
+        source_priorities: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            company_profile: Profil entreprise (filtres compilés partagés avec Agent1B)
+            scorer: Poids des niveaux par réglementation (défaut: config/scoring_rules.json)
+            source_priorities: Poids par réglementation (défaut: config/sources.json)
+        """
+        self.compiled_profile = get_compiled_profile(company_profile)
+        self.scorer = scorer or RelevanceScorer.from_config()
+        self.source_priorities = (
+            source_priorities if source_priorities is not None else load_source_priorities()
+        )
+        self.half_life_days = max(1, settings.analysis_recency_half_life_days)
+
+    def pre_score(
+        self,
+        document_id: str,
+        content: str,
+        title: str,
+        regulation_type: Optional[str] = None,
+        publication_date: Optional[datetime] = None,
+        now: Optional[datetime] = None
+    ) -> PreScore:
+        """
+        Pré-score d'un document
+
+        Args:
+            document_id: ID du document
+            content: Texte du document
+            title: Titre du document
+            regulation_type: Type de réglementation
+            publication_date: Date de publication (None = récence nulle)
+            now: Date de référence (défaut: maintenant)
+
+        Returns:
+            PreScore
+        """
+        regulation_type = regulation_type or "CBAM"
+        prepared = prepare_document(document_id, content, title, regulation_type)
+        keyword_result = self.compiled_profile.keyword_filter.analyze(
+            prepared.content, document_lower=prepared.content_lower
+        )
+        nc_code_result = self.compiled_profile.nc_code_filter.analyze(
+            prepared.content, document_codes=prepared.nc_codes
+        )
+
+        keyword_weight, nc_code_weight, _ = self.scorer.weights_for(regulation_type)
+        filter_weight = keyword_weight + nc_code_weight
+        filter_score = (
+            (keyword_weight * keyword_result.score + nc_code_weight * nc_code_result.score) / filter_weight
+            if filter_weight > 0 else keyword_result.score
+        )
+        source_priority = self.source_priorities.get(regulation_type.upper(), SOURCE_PRIORITY_WEIGHTS["medium"])
+        recency = self._recency(publication_date, now or datetime.utcnow())
+
+        w_filter, w_source, w_recency = PRE_SCORE_WEIGHTS
+        score = round(w_filter * filter_score + w_source * source_priority + w_recency * recency, 4)
+        has_critical_codes = bool(nc_code_result.critical_codes)
+
+        return PreScore(
+            document_id=document_id,
+            score=score,
+            priority=self._priority(score, has_critical_codes),
+            filter_score=round(filter_score, 4),
+            source_priority=source_priority,
+            recency=round(recency, 4),
+            has_critical_codes=has_critical_codes
+        )
+
+    def _recency(self, publication_date: Optional[datetime], now: datetime) -> float:
+        """1 pour un document du jour, 0.5 après half_life_days"""
+        if not isinstance(publication_date, datetime):
+            return 0.0
+        age_days = max(0.0, (now - publication_date.replace(tzinfo=None)).total_seconds() / 86400)
+        return 0.5 ** (age_days / self.half_life_days)
+
+    @staticmethod
+    def _priority(score: float, has_critical_codes: bool) -> str:
+        if has_critical_codes or score >= PRIORITY_THRESHOLDS["critical"]:
+            return "critical"
+        if score >= PRIORITY_THRESHOLDS["high"]:
+            return "high"
+        if score >= PRIORITY_THRESHOLDS["medium"]:
+            return "medium"
+        return "low"
+
+
+class PriorityMetrics:
+    """Profondeur de la file d'analyse et attente par classe de priorité"""
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self._waits: Dict[str, List[float]] = {priority: [] for priority in PRIORITY_CLASSES}
+        self._latencies: Dict[str, List[float]] = {priority: [] for priority in PRIORITY_CLASSES}
+
+    def enqueued(self) -> float:
+        """Un document entre dans la file ; retourne l'horodatage d'entrée"""
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        return time.perf_counter()
+
+    def started(self, priority: str, enqueued_at: float) -> float:
+        """Un document sort de la file pour être analysé ; retourne l'attente"""
+        self.depth = max(0, self.depth - 1)
+        wait = time.perf_counter() - enqueued_at
+        self._waits[priority].append(wait)
+        return wait
+
+    def completed(self, priority: str, enqueued_at: float) -> None:
+        """Analyse terminée (latence depuis l'entrée dans la file)"""
+        self._latencies[priority].append(time.perf_counter() - enqueued_at)
+
+    def snapshot(self) -> Dict:
+        """
+        Métriques courantes
+
+        Returns:
+            dict: depth, max_depth et, par classe, count / attente / latence (secondes)
+        """
+        per_priority = {}
+        for priority in PRIORITY_CLASSES:
+            waits, latencies = self._waits[priority], self._latencies[priority]
+            if not waits:
+                continue
+            per_priority[priority] = {
+                "count": len(waits),
+                "avg_wait_seconds": round(sum(waits) / len(waits), 3),
+                "p95_wait_seconds": round(_percentile(waits, 0.95), 3),
+                "avg_latency_seconds": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                "p95_latency_seconds": round(_percentile(latencies, 0.95), 3) if latencies else None,
+            }
+        return {"depth": self.depth, "max_depth": self.max_depth, "per_priority": per_priority}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
@@ -0,0 +1,201 @@
+"""
+Re-scoring des analyses historiques (Agent 1B)
+
+Les scores des trois niveaux sont conservés sur chaque analyse : un
+changement de poids ou de seuils (config/scoring_rules.json) se répercute
+sur tout l'historique en une passe NumPy, sans nouvel appel LLM. Le score
+final, la criticité et is_relevant sont recalculés avec les mêmes règles que
+RelevanceScorer ; la confiance (qui dépend de la confiance LLM) est conservée.
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+from pydantic import BaseModel, Field
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from src.agent_1b.models import Criticality
+from src.agent_1b.tools.scoring_config import ScoringConfig, load_scoring_config
+from src.storage.models import Analysis, Document
+
+logger = structlog.get_logger()
+
+# Criticités par ordre croissant (index = niveau)
+CRITICALITY_LEVELS = [
+    Criticality.NOT_RELEVANT.value,
+    Criticality.LOW.value,
+    Criticality.MEDIUM.value,
+    Criticality.HIGH.value,
+    Criticality.CRITICAL.value,
+]
+
+
+class RescoringReport(BaseModel):
+    """Bilan d'un re-scoring (dry-run ou appliqué)"""
+    total: int = 0
+    rescored: int = 0
+    skipped: int = Field(default=0, description="Analyses sans scores par niveau (antérieures)")
+    score_changed: int = 0
+    criticality_changed: int = 0
+    relevance_changed: int = 0
+    transitions: Dict[str, int] = Field(default_factory=dict, description="Ex. {'MEDIUM->HIGH': 3}")
+    applied: bool = False
+    seconds: float = 0.0
+
+
+def compute_scores(
+    keyword_scores: np.ndarray,
+    nc_code_scores: np.ndarray,
+    semantic_scores: np.ndarray,
+    weights: np.ndarray,
+    thresholds: Dict[str, float],
+    has_critical_codes: np.ndarray,
+    semantic_applicable: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score final, criticité et pertinence pour N analyses
+
+    Args:
+        keyword_scores, nc_code_scores, semantic_scores: Scores des niveaux (N,)
+        weights: Poids par analyse (N, 3) : mots-clés, codes NC, sémantique
+        thresholds: Seuils critical/high/medium/low
+        has_critical_codes: Codes NC critiques trouvés (N,)
+        semantic_applicable: Applicabilité selon le LLM (N,)
+
+    Returns:
+        Tuple (score final arrondi, index dans CRITICALITY_LEVELS, is_relevant)
+    """
+    components = np.column_stack([keyword_scores, nc_code_scores, semantic_scores])
+    final_scores = np.round(np.einsum("ij,ij->i", components, weights), 3)
+
+    levels = np.select(
+        [
+            final_scores >= thresholds["critical"],
+            final_scores >= thresholds["high"],
+            final_scores >= thresholds["medium"],
+            final_scores >= thresholds["low"],
+        ],
+        [4, 3, 2, 1],
+        default=0
+    )
+
+    # Mêmes relèvements que RelevanceScorer._determine_criticality
+    high_applicability = semantic_applicable & (semantic_scores > 0.7)
+    levels = np.where((levels == 3) & has_critical_codes, 4, levels)
+    levels = np.where((levels == 2) & high_applicability, 3, levels)
+
+    return final_scores, levels, final_scores >= thresholds["low"]
+
+
+def weights_matrix(config: ScoringConfig, regulation_types: Sequence[Optional[str]]) -> np.ndarray:
+    """Poids (N, 3) de chaque analyse selon sa réglementation"""
+    names, inverse = np.unique(np.array([r or "" for r in regulation_types], dtype=object), return_inverse=True)
+    table = np.array([config.weights_for(name or None) for name in names], dtype=float).reshape(-1, 3)
+    return table[inverse]
+
+
+def rescore_analyses(
+    session: Session,
+    config: Optional[ScoringConfig] = None,
+    apply: bool = False
+) -> RescoringReport:
+    """
+    Recalcule score final, criticité et pertinence de tout l'historique
+
+    Args:
+        session: Session SQLAlchemy
+        config: Nouvelle configuration (défaut: config/scoring_rules.json)
+        apply: Écrit les analyses modifiées (sinon dry-run)
+
+    Returns:
+        RescoringReport
+    """
+    start = time.perf_counter()
+    config = config or load_scoring_config()
+    thresholds = config.thresholds()
+
+    rows = session.execute(
+        select(
+            Analysis.id,
+            Analysis.keyword_score,
+            Analysis.nc_code_score,
+            Analysis.semantic_score,
+            Analysis.final_score,
+            Analysis.criticality,
+            Analysis.is_relevant,
+            Analysis.has_critical_codes,
+            Analysis.semantic_applicable,
+            func.coalesce(Analysis.regulation_type, Document.regulation_type),
+        )
+        .join(Document, Analysis.document_id == Document.id)
+        .where(
+            Analysis.keyword_score.is_not(None),
+            Analysis.nc_code_score.is_not(None),
+            Analysis.semantic_score.is_not(None),
+        )
+    ).all()
+
+    report = RescoringReport(
+        total=session.query(func.count(Analysis.id)).scalar() or 0,
+        rescored=len(rows),
+        applied=apply
+    )
+    report.skipped = report.total - report.rescored
+
+    if rows:
+        (ids, keyword, nc_code, semantic, old_final, old_criticality,
+         old_relevant, critical_codes, applicable, regulation_types) = zip(*rows)
+
+        final_scores, levels, is_relevant = compute_scores(
+            np.array(keyword, dtype=float),
+            np.array(nc_code, dtype=float),
+            np.array(semantic, dtype=float),
+            weights_matrix(config, regulation_types),
+            thresholds,
+            np.array([bool(v) for v in critical_codes]),
+            np.array([bool(v) for v in applicable])
+        )
+        new_criticality = np.array(CRITICALITY_LEVELS, dtype=object)[levels]
+
+        old_final = np.array([np.nan if v is None else v for v in old_final], dtype=float)
+        score_changed = ~np.isclose(final_scores, old_final)
+        criticality_changed = new_criticality != np.array(old_criticality, dtype=object)
+        relevance_changed = is_relevant != np.array(old_relevant, dtype=bool)
+        changed = score_changed | criticality_changed | relevance_changed
+
+        report.score_changed = int(score_changed.sum())
+        report.criticality_changed = int(criticality_changed.sum())
+        report.relevance_changed = int(relevance_changed.sum())
+        for i in np.flatnonzero(criticality_changed):
+            transition = f"{old_criticality[i] or 'NONE'}->{new_criticality[i]}"
+            report.transitions[transition] = report.transitions.get(transition, 0) + 1
+
+        if apply and changed.any():
+            updates: List[Dict] = [
+                {
+                    "id": ids[i],
+                    "final_score": float(final_scores[i]),
+                    "criticality": new_criticality[i],
+                    "is_relevant": bool(is_relevant[i]),
+                }
+                for i in np.flatnonzero(changed)
+            ]
+            session.execute(update(Analysis), updates)
+            session.commit()
+
+    report.seconds = round(time.perf_counter() - start, 3)
+
+    logger.info(
+        "analyses_rescored",
+        applied=apply,
+        rescored=report.rescored,
+        skipped=report.skipped,
+        criticality_changed=report.criticality_changed,
+        relevance_changed=report.relevance_changed,
+        seconds=report.seconds
+    )
+
+    return report
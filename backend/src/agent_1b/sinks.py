@@ -0,0 +1,180 @@
+"""
+Sorties des analyses de l'Agent 1B
+
+- rich  : panneaux et tableaux Rich (démos, terminal interactif)
+- jsonl : une ligne JSON compacte par analyse (production, logs)
+- none  : aucune sortie (benchmarks)
+
+Seule la sortie "rich" charge l'affichage Rich (import différé) : les
+exécutions headless (scheduler, API) n'ont aucun coût de rendu.
+"""
+
+import json
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, TextIO
+
+import structlog
+
+from src.agent_1b.models import DocumentAnalysis
+from src.config import settings
+
+logger = structlog.get_logger()
+
+SINK_NAMES = ("auto", "rich", "jsonl", "none")
+
+
+class AnalysisSink(ABC):
+    """Sortie d'une analyse (après sauvegarde éventuelle en BDD)"""
+
+    name = "base"
+
+    @abstractmethod
+    def emit(self, analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> None:
+        """
+        Publie une analyse
+
+        Args:
+            analysis: DocumentAnalysis Pydantic
+            analysis_id: ID de l'analyse en BDD (None si non sauvegardée)
+        """
+
+    def close(self) -> None:
+        """Libère les ressources de la sortie"""
+
+
+class NullSink(AnalysisSink):
+    """Aucune sortie"""
+
+    name = "none"
+
+    def emit(self, analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> None:
+        return None
+
+
+class RichSink(AnalysisSink):
+    """Affichage Rich complet (src/agent_1b/display.py)"""
+
+    name = "rich"
+
+    def emit(self, analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> None:
+        from src.agent_1b.display import display_document_analysis, display_saved_analysis
+
+        display_document_analysis(analysis)
+        if analysis_id:
+            display_saved_analysis(analysis_id)
+
+
+class JsonLinesSink(AnalysisSink):
+    """Une ligne JSON compacte par analyse"""
+
+    name = "jsonl"
+
+    def __init__(self, path: Optional[Path] = None, stream: Optional[TextIO] = None):
+        """
+        Args:
+            path: Fichier de sortie (ajout en fin de fichier)
+            stream: Flux de sortie (défaut: stdout si pas de fichier)
+        """
+        self.path = Path(path) if path else None
+        self._stream = stream
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def emit(self, analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> None:
+        line = json.dumps(analysis_record(analysis, analysis_id), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            stream = self._get_stream()
+            stream.write(line + "\n")
+            stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _get_stream(self) -> TextIO:
+        if self.path is None:
+            return self._stream or sys.stdout
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+
+def analysis_record(analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> Dict:
+    """
+    Résumé compact d'une analyse (sortie jsonl)
+
+    Args:
+        analysis: DocumentAnalysis Pydantic
+        analysis_id: ID de l'analyse en BDD
+
+    Returns:
+        Dictionnaire sérialisable
+    """
+    score = analysis.relevance_score
+    return {
+        "analysis_id": analysis_id,
+        "document_id": analysis.document_id,
+        "company_profile_id": analysis.company_profile_id,
+        "timestamp": analysis.analysis_timestamp.isoformat(),
+        "criticality": score.criticality.value,
+        "final_score": score.final_score,
+        "scores": {
+            "keyword": round(score.keyword_score, 3),
+            "nc_code": round(score.nc_code_score, 3),
+            "semantic": round(score.semantic_score, 3),
+        },
+        "is_relevant": analysis.is_relevant,
+        "confidence": analysis.semantic_analysis.confidence_level,
+        "keywords": analysis.keyword_analysis.keywords_found,
+        "nc_codes": analysis.nc_code_analysis.exact_matches + analysis.nc_code_analysis.partial_matches,
+        "primary_process": analysis.primary_impact_process.value if analysis.primary_impact_process else None,
+    }
+
+
+def headless_sink_name() -> Optional[str]:
+    """
+    Sortie des exécutions sans terminal (scheduler, tâches de l'API)
+
+    Returns:
+        "jsonl" si la sortie est en mode auto, sinon None (réglage explicite conservé)
+    """
+    return "jsonl" if (settings.analysis_output_sink or "auto").lower() == "auto" else None
+
+
+_sinks: Dict[str, AnalysisSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_sink(name: Optional[str] = None) -> AnalysisSink:
+    """
+    Retourne la sortie demandée (instance partagée par nom)
+
+    Args:
+        name: rich, jsonl, none ou auto (défaut: settings.analysis_output_sink).
+            "auto" choisit rich dans un terminal interactif, jsonl sinon.
+
+    Returns:
+        AnalysisSink
+    """
+    name = (name or settings.analysis_output_sink or "auto").lower()
+    if name == "auto":
+        name = "rich" if sys.stdout.isatty() else "jsonl"
+    if name not in SINK_NAMES:
+        raise ValueError(f"Sortie inconnue: {name} (attendu: {', '.join(SINK_NAMES)})")
+
+    with _sinks_lock:
+        if name not in _sinks:
+            if name == "rich":
+                _sinks[name] = RichSink()
+            elif name == "jsonl":
+                _sinks[name] = JsonLinesSink(settings.analysis_output_path)
+            else:
+                _sinks[name] = NullSink()
+            logger.debug("analysis_sink_selected", sink=name)
+        return _sinks[name]
@@ -0,0 +1,77 @@
+"""
+Cache disque des extractions par passage (mode map-reduce)
+
+Chaque extraction est indexée par le hash du passage, du contexte entreprise
+et du modèle : un document amendé ne relance le LLM que sur les passages
+dont le texte a changé.
+"""
+
+import hashlib
+import json
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from src.agent_1b.models import ChunkExtraction
+
+logger = structlog.get_logger()
+
+
+class ChunkExtractionCache:
+    """Cache JSON (un fichier par passage) des ChunkExtraction"""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: Répertoire de stockage du cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(chunk_text: str, context: str, model_name: str) -> str:
+        """
+        Calcule la clé de cache d'un passage
+
+        Args:
+            chunk_text: Texte du passage
+            context: Contexte entreprise/réglementation rendu dans le prompt
+            model_name: Modèle LLM utilisé
+
+        Returns:
+            Empreinte SHA-256 hexadécimale
+        """
+        digest = hashlib.sha256()
+        for part in (model_name, context, chunk_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ChunkExtraction]:
+        """Retourne l'extraction en cache ou None"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return ChunkExtraction.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("chunk_cache_read_failed", key=key[:12], error=str(e))
+            return None
+
+    def set(self, key: str, extraction: ChunkExtraction) -> None:
+        """Enregistre une extraction (écriture atomique)"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps(extraction.model_dump(), ensure_ascii=False),
+                encoding="utf-8"
+            )
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning("chunk_cache_write_failed", key=key[:12], error=str(e))
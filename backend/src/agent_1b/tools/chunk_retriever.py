@@ -0,0 +1,388 @@
+"""
+Sélection de passages pertinents avant l'analyse LLM (Niveau 3)
+
+Découpe le document en blocs (articles, annexes, pages) et les classe avec un
+score lexical BM25 local construit à partir des mots-clés du profil, de ses
+codes NC et des termes propres à la réglementation. Seuls les meilleurs blocs
+sont envoyés au LLM, dans la limite d'un budget de tokens.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.agent_1b.tools.nc_code_filter import extract_nc_codes_from_profile
+from src.agent_1b.tools.scoring_config import load_scoring_config
+from src.utils.tokens import estimate_tokens, tokens_to_chars
+
+logger = structlog.get_logger()
+
+
+# Marqueur inséré entre deux passages non contigus
+TRUNCATION_MARKER = "\n\n[...CONTENU TRONQUÉ...]\n\n"
+
+# Débuts de sections naturelles : articles, annexes, pages (marqueurs de
+# l'extracteur, ou saut de page \f du texte normalisé stocké par l'Agent 1A)
+SECTION_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:Article|ARTICLE)[ \t]+\d+[a-z]?\b|(?:ANNEX|ANNEXE)\b[^\n]*|--- Page \d+ ---|\f)",
+    re.MULTILINE,
+)
+
+# Codes NC écrits avec points ou espaces (4016.93.00, 4016 93 00)
+NC_CODE_PATTERN = re.compile(r"\b(\d{4})(?:[ .](\d{2}))(?:[ .](\d{2}))?(?:[ .](\d{2}))?\b")
+
+TOKEN_PATTERN = re.compile(r"[0-9a-zà-öø-ÿœ]+")
+
+
+class TextChunk(BaseModel):
+    """Passage du document candidat à l'envoi au LLM"""
+    index: int
+    start: int
+    end: int
+    label: str
+    text: str
+
+
+class ContentSelection(BaseModel):
+    """Résultat de la sélection de passages"""
+    text: str
+    chunks_total: int
+    chunks_selected: List[int] = Field(default_factory=list)
+    original_tokens: int
+    selected_tokens: int
+    scores: Dict[int, float] = Field(default_factory=dict)
+
+
+# ============================================================================
+# DÉCOUPAGE
+# ============================================================================
+
+# Un même document est découpé une seule fois, quel que soit le nombre de
+# profils analysés (mode multi-profils) ; les listes retournées sont partagées
+# et ne doivent pas être modifiées.
+@lru_cache(maxsize=64)
+def split_into_chunks(
+    text: str,
+    max_chunk_chars: int = 4000,
+    min_chunk_chars: int = 400
+) -> List[TextChunk]:
+    """
+    Découpe un texte en blocs de la taille d'un article ou d'une page
+
+    Les frontières naturelles (Article N, ANNEX, --- Page N ---, saut de page
+    \\f) sont utilisées en priorité ; les blocs trop longs sont recoupés sur
+    les paragraphes et les blocs trop courts fusionnés avec le suivant.
+
+    Args:
+        text: Texte complet du document
+        max_chunk_chars: Taille maximale d'un bloc
+        min_chunk_chars: Taille minimale d'un bloc
+
+    Returns:
+        Liste de TextChunk dans l'ordre du document
+    """
+    if not text:
+        return []
+
+    boundaries = sorted({0} | {m.start() for m in SECTION_PATTERN.finditer(text)})
+    boundaries.append(len(text))
+
+    spans = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        if end > start:
+            spans.extend(_split_oversized(text, start, end, max_chunk_chars))
+
+    # Fusionner les blocs trop courts avec le suivant
+    merged = []
+    for start, end in spans:
+        if merged and (merged[-1][1] - merged[-1][0]) < min_chunk_chars \
+                and (end - merged[-1][0]) <= max_chunk_chars:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+
+    return [
+        TextChunk(
+            index=i,
+            start=start,
+            end=end,
+            label=_chunk_label(text, start, end, i),
+            text=text[start:end]
+        )
+        for i, (start, end) in enumerate(merged)
+    ]
+
+
+def _split_oversized(text: str, start: int, end: int, max_chars: int) -> List[tuple]:
+    """Recoupe une section trop longue sur les fins de paragraphe ou de ligne"""
+    spans = []
+    while end - start > max_chars:
+        window_end = start + max_chars
+        cut = text.rfind("\n\n", start + max_chars // 2, window_end)
+        if cut == -1:
+            cut = text.rfind("\n", start + max_chars // 2, window_end)
+        if cut == -1:
+            cut = window_end
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, end))
+    return spans
+
+
+def _chunk_label(text: str, start: int, end: int, index: int) -> str:
+    """Libellé lisible d'un bloc (première ligne de section, sinon numéro)"""
+    match = SECTION_PATTERN.match(text, start)
+    if match and match.group(0).endswith("\f"):
+        # Saut de page : libellé de la section qui ouvre la page, s'il y en a une
+        next_line = match.end() + 1 if text.startswith("\n", match.end()) else match.end()
+        match = SECTION_PATTERN.match(text, next_line, end) if next_line < end else None
+    if match and not match.group(0).endswith("\f"):
+        return match.group(0).strip().strip("-").strip()
+    return f"Bloc {index + 1}"
+
+
+# ============================================================================
+# SCORING BM25
+# ============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenise un texte pour le scoring lexical
+
+    Les codes NC écrits "4016.93.00" ou "4016 93 00" sont ramenés à leurs
+    préfixes de 4, 6 et 8 chiffres pour correspondre aux codes du profil.
+    """
+    lowered = text.lower()
+    tokens = []
+
+    def _replace_nc(match: re.Match) -> str:
+        digits = "".join(g for g in match.groups() if g)
+        tokens.extend(_nc_prefixes(digits))
+        return " "
+
+    lowered = NC_CODE_PATTERN.sub(_replace_nc, lowered)
+    tokens.extend(TOKEN_PATTERN.findall(lowered))
+    return tokens
+
+
+def _nc_prefixes(digits: str) -> List[str]:
+    """Préfixes significatifs d'un code NC (chapitre 4 chiffres, sous-position...)"""
+    return [digits[:n] for n in (4, 6, 8, 10) if len(digits) >= n]
+
+
+@lru_cache(maxsize=4096)
+def _term_counts(text: str) -> Counter:
+    """Fréquences des tokens d'un bloc (partagées entre les profils)"""
+    return Counter(tokenize(text))
+
+
+class BM25Ranker:
+    """Classement Okapi BM25 de blocs de texte"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Saturation de la fréquence des termes
+            b: Normalisation par la longueur des blocs
+        """
+        self.k1 = k1
+        self.b = b
+
+    def score(self, chunks: List[TextChunk], query_terms: List[str]) -> List[float]:
+        """
+        Calcule le score BM25 de chaque bloc pour les termes de la requête
+
+        Args:
+            chunks: Blocs à classer
+            query_terms: Termes de la requête (déjà tokenisés)
+
+        Returns:
+            Scores dans l'ordre des blocs
+        """
+        if not chunks:
+            return []
+
+        query = set(query_terms)
+        term_counts = [_term_counts(chunk.text) for chunk in chunks]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        avg_length = (sum(lengths) / len(lengths)) or 1.0
+        n_chunks = len(chunks)
+
+        doc_freq = {term: sum(1 for counts in term_counts if term in counts) for term in query}
+        idf = {
+            term: math.log(1 + (n_chunks - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items() if df
+        }
+
+        scores = []
+        for counts, length in zip(term_counts, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+            total = 0.0
+            for term, term_idf in idf.items():
+                tf = counts.get(term, 0)
+                if tf:
+                    total += term_idf * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(total)
+        return scores
+
+
+# ============================================================================
+# REQUÊTE ET SÉLECTION
+# ============================================================================
+
+def _load_regulation_focus_keywords() -> Dict[str, List[str]]:
+    """focus_keywords par réglementation (config/scoring_rules.json)"""
+    return {
+        reg.upper(): rules.focus_keywords
+        for reg, rules in load_scoring_config().regulation_specific.items()
+    }
+
+
+def build_query_terms(company_profile: Dict, regulation_type: str) -> List[str]:
+    """
+    Construit la requête lexicale à partir du profil et de la réglementation
+
+    Args:
+        company_profile: Profil entreprise (keywords, nc_codes...)
+        regulation_type: Type de réglementation (CBAM, EUDR...)
+
+    Returns:
+        Liste de termes tokenisés (dédupliqués)
+    """
+    phrases = list(company_profile.get("keywords", []))
+    phrases.append(regulation_type or "")
+    phrases.extend(_load_regulation_focus_keywords().get((regulation_type or "").upper(), []))
+
+    terms = []
+    for phrase in phrases:
+        terms.extend(tokenize(str(phrase)))
+
+    for code in extract_nc_codes_from_profile(company_profile):
+        digits = re.sub(r"\D", "", str(code))
+        terms.extend(_nc_prefixes(digits))
+
+    # Ignorer les mots vides très courts issus des expressions
+    return list(dict.fromkeys(t for t in terms if len(t) > 2))
+
+
+def select_relevant_content(
+    content: str,
+    query_terms: List[str],
+    token_budget: int,
+    max_chunk_chars: int = 4000,
+    preamble_ratio: float = 0.15
+) -> ContentSelection:
+    """
+    Sélectionne les passages les plus pertinents dans un budget de tokens
+
+    Le début du document (titre, considérants) est toujours conservé en
+    préambule, puis les blocs sont ajoutés par score BM25 décroissant.
+    Les blocs sans aucun terme de la requête ne sont pas envoyés.
+
+    Args:
+        content: Texte complet du document
+        query_terms: Termes de la requête (voir build_query_terms)
+        token_budget: Budget maximal de tokens pour le contenu
+        max_chunk_chars: Taille maximale d'un bloc
+        preamble_ratio: Part du budget réservée au préambule
+
+    Returns:
+        ContentSelection (texte assemblé dans l'ordre du document + statistiques)
+    """
+    original_tokens = estimate_tokens(content)
+
+    if original_tokens <= token_budget:
+        return ContentSelection(
+            text=content,
+            chunks_total=1,
+            chunks_selected=[0],
+            original_tokens=original_tokens,
+            selected_tokens=original_tokens
+        )
+
+    chunks = split_into_chunks(content, max_chunk_chars=max_chunk_chars)
+    scores = BM25Ranker().score(chunks, query_terms)
+
+    budget_chars = tokens_to_chars(token_budget)
+    preamble_chars = int(budget_chars * preamble_ratio)
+
+    # Préambule : début du premier bloc
+    pieces = {0: chunks[0].text[:preamble_chars]}
+    used = len(pieces[0])
+
+    ranked = sorted(
+        (i for i in range(1, len(chunks)) if scores[i] > 0),
+        key=lambda i: (-scores[i], i)
+    )
+    for i in ranked:
+        size = len(chunks[i].text)
+        if used + size + len(TRUNCATION_MARKER) > budget_chars:
+            continue
+        pieces[i] = chunks[i].text
+        used += size + len(TRUNCATION_MARKER)
+
+    # Le premier bloc entier s'il est lui-même pertinent et qu'il reste de la place
+    if scores[0] > 0 and used - len(pieces[0]) + len(chunks[0].text) <= budget_chars:
+        used += len(chunks[0].text) - len(pieces[0])
+        pieces[0] = chunks[0].text
+
+    selected = sorted(pieces)
+    parts = []
+    previous = None
+    for i in selected:
+        if previous is not None and (i != previous + 1 or len(pieces[previous]) < len(chunks[previous].text)):
+            parts.append(TRUNCATION_MARKER)
+        parts.append(pieces[i])
+        previous = i
+    if selected[-1] != len(chunks) - 1 or len(pieces[selected[-1]]) < len(chunks[-1].text):
+        parts.append(TRUNCATION_MARKER.rstrip())
+
+    text = "".join(parts)
+
+    return ContentSelection(
+        text=text,
+        chunks_total=len(chunks),
+        chunks_selected=selected,
+        original_tokens=original_tokens,
+        selected_tokens=estimate_tokens(text),
+        scores={i: round(scores[i], 3) for i in selected}
+    )
+
+
+def rank_chunks(
+    content: str,
+    query_terms: List[str],
+    max_chunks: int,
+    max_chunk_chars: int = 4000
+) -> List[TextChunk]:
+    """
+    Retourne les blocs les plus pertinents (mode map-reduce)
+
+    Le premier bloc (titre, considérants) est toujours retenu, suivi des
+    max_chunks - 1 blocs de meilleur score BM25 non nul.
+
+    Args:
+        content: Texte complet du document
+        query_terms: Termes de la requête (voir build_query_terms)
+        max_chunks: Nombre maximal de blocs retenus
+        max_chunk_chars: Taille maximale d'un bloc
+
+    Returns:
+        Liste de TextChunk dans l'ordre du document
+    """
+    chunks = split_into_chunks(content, max_chunk_chars=max_chunk_chars)
+    if len(chunks) <= max_chunks:
+        return chunks
+
+    scores = BM25Ranker().score(chunks, query_terms)
+    ranked = sorted(
+        (i for i in range(1, len(chunks)) if scores[i] > 0),
+        key=lambda i: (-scores[i], i)
+    )
+    keep = sorted({0, *ranked[:max_chunks - 1]})
+    return [chunks[i] for i in keep]
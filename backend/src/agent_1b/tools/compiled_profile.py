@@ -0,0 +1,209 @@
+"""
+Profil entreprise compilé pour l'Agent 1B
+
+Regroupe tout ce qui ne dépend que du profil : filtres mots-clés et codes NC
+(avec leurs index), codes critiques, champs du prompt et termes de requête
+BM25 par réglementation. Le profil compilé est construit une fois puis mis en
+cache en mémoire (et optionnellement sur disque), indexé par l'ID du profil et
+sa date de mise à jour : la préparation par document devient négligeable.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+import structlog
+
+from src.agent_1b.tools.chunk_retriever import build_query_terms
+from src.agent_1b.tools.keyword_filter import KeywordFilter
+from src.agent_1b.tools.nc_code_filter import NCCodeFilter, extract_nc_codes_from_profile
+from src.config import settings
+
+logger = structlog.get_logger()
+
+
+class CompiledProfile:
+    """Artefacts d'un profil entreprise réutilisés pour chaque document"""
+
+    def __init__(self, company_profile: Dict, cache_key: str):
+        """
+        Args:
+            company_profile: Profil entreprise (dict)
+            cache_key: Clé du cache (voir profile_cache_key)
+        """
+        self.cache_key = cache_key
+        self.profile_id = company_profile.get("company_id", "unknown")
+        self.company_name = company_profile.get("company_name", "Unknown")
+
+        self.keywords: List[str] = list(company_profile.get("keywords", []))
+        self.nc_codes: List[str] = extract_nc_codes_from_profile(company_profile)
+        self.critical_codes: FrozenSet[str] = frozenset(
+            (company_profile.get("config") or {}).get("critical_nc_codes", [])
+        )
+
+        self.keyword_filter = KeywordFilter(self.keywords)
+        self.nc_code_filter = NCCodeFilter(self.nc_codes, critical_codes=sorted(self.critical_codes))
+
+        self.prompt_fields = render_prompt_fields(company_profile, self.nc_codes)
+        self.company_context = render_company_context(self.prompt_fields)
+
+        self._profile = company_profile
+        self._query_terms: Dict[str, List[str]] = {}
+
+    def query_terms(self, regulation_type: str) -> List[str]:
+        """Termes de requête BM25 pour une réglementation (mémorisés)"""
+        key = (regulation_type or "").upper()
+        if key not in self._query_terms:
+            self._query_terms[key] = build_query_terms(self._profile, regulation_type)
+        return self._query_terms[key]
+
+
+def render_prompt_fields(company_profile: Dict, nc_codes: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Extrait les champs du profil utilisés dans les prompts
+
+    Args:
+        company_profile: Profil entreprise
+        nc_codes: Codes NC déjà extraits (sinon extraits du profil)
+
+    Returns:
+        Dictionnaire des variables de prompt
+    """
+    # nc_codes peut être une liste ou un dict imports/exports
+    if nc_codes is None:
+        nc_codes = extract_nc_codes_from_profile(company_profile)
+
+    return {
+        "company_name": company_profile.get("company_name", "Unknown"),
+        "industry": company_profile.get("industry", ""),
+        "products": ", ".join(company_profile.get("products", [])[:5]),  # Top 5 produits
+        "nc_codes": ", ".join(sorted(nc_codes)[:20]),  # Top 20 codes
+        "countries": company_profile.get("countries", ""),
+        "regulations": ", ".join(company_profile.get("regulations", [])),
+    }
+
+
+def render_company_context(fields: Dict[str, str]) -> str:
+    """Rend le contexte entreprise compact utilisé par les prompts map/reduce"""
+    return (
+        f"Nom: {fields['company_name']}\n"
+        f"Secteur: {fields['industry']}\n"
+        f"Produits: {fields['products']}\n"
+        f"Codes NC/SH: {fields['nc_codes']}\n"
+        f"Pays d'opération: {fields['countries']}\n"
+        f"Réglementations suivies: {fields['regulations']}"
+    )
+
+
+def profile_cache_key(company_profile: Dict) -> str:
+    """
+    Clé de cache d'un profil
+
+    Les profils en BDD sont indexés par (ID, updated_at). Les profils sans
+    date de mise à jour (fichiers JSON, tests) sont indexés par le hash de
+    leur contenu.
+
+    Args:
+        company_profile: Profil entreprise
+
+    Returns:
+        Clé de cache
+    """
+    profile_id = company_profile.get("company_id")
+    updated_at = company_profile.get("updated_at")
+    if profile_id and updated_at:
+        return f"{profile_id}@{updated_at}"
+
+    payload = json.dumps(company_profile, sort_keys=True, ensure_ascii=False, default=str)
+    return "sha256:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Borne de sécurité pour les profils sans ID (indexés par hash de contenu)
+MAX_COMPILED_PROFILES = 256
+
+_compiled_cache: Dict[str, CompiledProfile] = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_profile(company_profile: Dict) -> CompiledProfile:
+    """
+    Retourne le profil compilé (cache mémoire, puis disque si activé)
+
+    Args:
+        company_profile: Profil entreprise
+
+    Returns:
+        CompiledProfile
+    """
+    key = profile_cache_key(company_profile)
+
+    compiled = _compiled_cache.get(key)
+    if compiled is not None:
+        return compiled
+
+    with _compiled_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            return compiled
+
+        compiled = _load_pickle(key) if settings.compiled_profile_pickle else None
+        if compiled is None:
+            compiled = CompiledProfile(company_profile, key)
+            logger.info(
+                "company_profile_compiled",
+                company=compiled.company_name,
+                keywords=len(compiled.keywords),
+                nc_codes=len(compiled.nc_codes)
+            )
+            if settings.compiled_profile_pickle:
+                _save_pickle(key, compiled)
+
+        # Une seule version par profil : les entrées périmées sont remplacées
+        for stale in [k for k, v in _compiled_cache.items() if v.profile_id == compiled.profile_id != "unknown"]:
+            del _compiled_cache[stale]
+        if len(_compiled_cache) >= MAX_COMPILED_PROFILES:
+            _compiled_cache.clear()
+        _compiled_cache[key] = compiled
+        return compiled
+
+
+def clear_compiled_profiles() -> None:
+    """Vide le cache mémoire des profils compilés"""
+    with _compiled_lock:
+        _compiled_cache.clear()
+
+
+def _pickle_path(key: str) -> Path:
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return settings.data_dir / "cache" / "compiled_profiles" / f"{digest}.pkl"
+
+
+def _load_pickle(key: str) -> Optional[CompiledProfile]:
+    """Charge un profil compilé depuis le disque (None si absent ou illisible)"""
+    path = _pickle_path(key)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            compiled = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError) as e:
+        logger.warning("compiled_profile_load_failed", path=str(path), error=str(e))
+        return None
+    return compiled if getattr(compiled, "cache_key", None) == key else None
+
+
+def _save_pickle(key: str, compiled: CompiledProfile) -> None:
+    """Enregistre un profil compilé (écriture atomique)"""
+    path = _pickle_path(key)
+    tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning("compiled_profile_save_failed", path=str(path), error=str(e))
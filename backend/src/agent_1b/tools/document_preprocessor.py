@@ -0,0 +1,70 @@
+"""
+Prétraitement d'un document commun à tous les profils entreprise
+
+Mise en minuscules, extraction des codes NC et découpage en passages ne
+dépendent que du document : ils sont calculés une fois puis réutilisés par
+les filtres de chaque profil (mode multi-profils).
+"""
+
+from typing import List
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.agent_1b.tools.chunk_retriever import split_into_chunks
+from src.agent_1b.tools.nc_code_filter import extract_nc_codes_from_text
+
+logger = structlog.get_logger()
+
+
+class PreparedDocument(BaseModel):
+    """Document prétraité, indépendant du profil entreprise"""
+    document_id: str
+    title: str
+    regulation_type: str = "CBAM"
+    content: str = ""
+    content_lower: str = ""
+    nc_codes: List[str] = Field(default_factory=list)
+    chunks_total: int = 0
+
+
+def prepare_document(
+    document_id: str,
+    content: str,
+    title: str,
+    regulation_type: str = "CBAM"
+) -> PreparedDocument:
+    """
+    Prétraite un document une seule fois pour tous les profils
+
+    Le découpage en passages est mis en cache par le chunk_retriever : les
+    analyses sémantiques suivantes réutilisent les mêmes blocs.
+
+    Args:
+        document_id: ID du document
+        content: Texte complet du document
+        title: Titre du document
+        regulation_type: Type de réglementation
+
+    Returns:
+        PreparedDocument
+    """
+    content = content or ""
+    prepared = PreparedDocument(
+        document_id=document_id,
+        title=title,
+        regulation_type=regulation_type or "CBAM",
+        content=content,
+        content_lower=content.lower(),
+        nc_codes=extract_nc_codes_from_text(content),
+        chunks_total=len(split_into_chunks(content, max_chunk_chars=4000))
+    )
+
+    logger.debug(
+        "document_prepared",
+        document_id=document_id[:8],
+        nc_codes=len(prepared.nc_codes),
+        chunks=prepared.chunks_total
+    )
+
+    return prepared
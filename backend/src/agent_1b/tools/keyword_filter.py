@@ -6,7 +6,7 @@ Scanne le document pour trouver les mots-clés du profil entreprise.
 
 import re
 import structlog
-from typing import List, Dict
+from typing import List, Dict, Optional
 from src.agent_1b.models import KeywordAnalysisResult
 
 logger = structlog.get_logger()
@@ -23,19 +23,21 @@ class KeywordFilter:
         self.keywords = [k.lower().strip() for k in keywords]
         self.total_keywords = len(self.keywords)
     
-    def analyze(self, document_text: str) -> KeywordAnalysisResult:
+    def analyze(self, document_text: str, document_lower: Optional[str] = None) -> KeywordAnalysisResult:
         """
         Analyse le document pour trouver les mots-clés
         
         Args:
             document_text: Texte complet du document
+            document_lower: Texte déjà mis en minuscules (évite de le recalculer par profil)
             
         Returns:
             KeywordAnalysisResult avec score et détails
         """
         logger.info("keyword_filter_started", total_keywords=self.total_keywords)
         
-        document_lower = document_text.lower()
+        if document_lower is None:
+            document_lower = document_text.lower()
         
         keywords_found = []
         context_snippets = {}
@@ -6,12 +6,49 @@ Détecte les codes NC (nomenclature combinée) dans le document.
 
 import re
 import structlog
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 from src.agent_1b.models import NCCodeAnalysisResult
 
 logger = structlog.get_logger()
 
 
+class NCCodeTrie:
+    """
+    Trie des chiffres de codes NC pour la correspondance partielle
+
+    Deux codes correspondent si l'un est le préfixe de l'autre (ex: 4001 et
+    4001.22). Un seul parcours du trie remplace la comparaison avec chaque
+    code du profil.
+    """
+
+    _END = ""
+
+    def __init__(self, codes: List[str] = None):
+        self.root: Dict[str, Dict] = {}
+        for code in codes or []:
+            self.insert(code)
+
+    def insert(self, code: str) -> None:
+        """Ajoute un code (points ignorés)"""
+        node = self.root
+        for digit in code.replace('.', ''):
+            node = node.setdefault(digit, {})
+        node[self._END] = {}
+
+    def matches(self, code: str) -> bool:
+        """Vrai si le code est préfixe d'un code du trie, ou l'inverse"""
+        node = self.root
+        if self._END in node:
+            return True
+        for digit in code.replace('.', ''):
+            node = node.get(digit)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return True
+
+
 class NCCodeFilter:
     """Filtre de pertinence basé sur les codes NC/SH douaniers"""
     
@@ -27,12 +64,19 @@ class NCCodeFilter:
         self.company_nc_codes = [self._normalize_code(code) for code in company_nc_codes]
         self.critical_codes = [self._normalize_code(code) for code in (critical_codes or [])]
         
-    def analyze(self, document_text: str) -> NCCodeAnalysisResult:
+        # Index construits une fois : ensembles pour l'exact, tries pour le partiel
+        self._company_set = set(self.company_nc_codes)
+        self._company_trie = NCCodeTrie(self.company_nc_codes)
+        self._critical_set = frozenset(self.critical_codes)
+        self._critical_trie = NCCodeTrie(self.critical_codes) if self.critical_codes else None
+        
+    def analyze(self, document_text: str, document_codes: Optional[List[str]] = None) -> NCCodeAnalysisResult:
         """
         Analyse le document pour trouver les codes NC
         
         Args:
             document_text: Texte complet du document
+            document_codes: Codes NC déjà extraits du document (évite de rescanner par profil)
             
         Returns:
             NCCodeAnalysisResult avec score et détails
@@ -40,7 +84,8 @@ class NCCodeFilter:
         logger.info("nc_code_filter_started", company_codes=len(self.company_nc_codes))
         
         # Extraire tous les codes NC du document
-        document_codes = self._extract_nc_codes(document_text)
+        if document_codes is None:
+            document_codes = self._extract_nc_codes(document_text)
         
         logger.debug("nc_codes_extracted", count=len(document_codes))
         
@@ -54,20 +99,17 @@ class NCCodeFilter:
             is_match = False
             
             # Vérifier correspondance exacte
-            if doc_code in self.company_nc_codes:
+            if doc_code in self._company_set:
                 exact_matches.append(doc_code)
                 is_match = True
-            else:
-                # Vérifier correspondance partielle (ex: 4001 vs 4001.22)
-                for company_code in self.company_nc_codes:
-                    if self._is_partial_match(doc_code, company_code):
-                        partial_matches.append(doc_code)
-                        is_match = True
-                        break
+            elif self._company_trie.matches(doc_code):
+                # Correspondance partielle (ex: 4001 vs 4001.22)
+                partial_matches.append(doc_code)
+                is_match = True
             
             # Vérifier si code critique
-            if doc_code in self.critical_codes or any(
-                self._is_partial_match(doc_code, crit) for crit in self.critical_codes
+            if self._critical_trie and (
+                doc_code in self._critical_set or self._critical_trie.matches(doc_code)
             ):
                 critical_codes_found.append(doc_code)
             
@@ -99,10 +141,7 @@ class NCCodeFilter:
     
     def _extract_nc_codes(self, text: str) -> List[str]:
         """Extrait tous les codes NC du texte"""
-        matches = self.NC_CODE_PATTERN.findall(text)
-        # Normaliser et dédupliquer
-        codes = list(set(self._normalize_code(code) for code in matches))
-        return codes
+        return extract_nc_codes_from_text(text)
     
     def _normalize_code(self, code: str) -> str:
         """Normalise un code NC (enlever espaces, formater)"""
@@ -113,15 +152,12 @@ class NCCodeFilter:
         Vérifie si deux codes correspondent partiellement
         Ex: 4001 vs 4001.22 -> True
         """
-        # Le plus court code doit être le préfixe du plus long
-        shorter = min(code1, code2, key=len)
-        longer = max(code1, code2, key=len)
-        
-        # Enlever les points pour comparaison
-        shorter_clean = shorter.replace('.', '')
-        longer_clean = longer.replace('.', '')
+        # Le plus court code doit être le préfixe du plus long (points ignorés)
+        clean1 = code1.replace('.', '')
+        clean2 = code2.replace('.', '')
+        shorter, longer = sorted((clean1, clean2), key=len)
         
-        return longer_clean.startswith(shorter_clean)
+        return longer.startswith(shorter)
     
     def _calculate_score(self, exact_matches: List[str], partial_matches: List[str], critical_codes: List[str]) -> float:
         """
@@ -177,6 +213,53 @@ class NCCodeFilter:
         return context
 
 
+def extract_nc_codes_from_text(text: str) -> List[str]:
+    """
+    Extrait les codes NC cités dans un texte (normalisés et dédupliqués)
+
+    Args:
+        text: Texte du document
+
+    Returns:
+        Liste des codes NC trouvés
+    """
+    matches = NCCodeFilter.NC_CODE_PATTERN.findall(text)
+    return list(set(code.strip().replace(' ', '') for code in matches))
+
+
+def extract_nc_codes_from_profile(company_profile: Dict) -> List[str]:
+    """
+    Extrait tous les codes NC d'un profil entreprise
+
+    Supporte le format simple (liste) et le format structuré
+    (dict avec listes "imports" / "exports" de codes ou de dicts {"code": ...}).
+
+    Args:
+        company_profile: Profil entreprise
+
+    Returns:
+        Liste dédupliquée des codes NC
+    """
+    nc_codes = []
+    raw_codes = company_profile.get("nc_codes")
+
+    # Format simple : liste directe
+    if isinstance(raw_codes, list):
+        nc_codes = list(raw_codes)
+
+    # Format structuré : imports + exports
+    elif isinstance(raw_codes, dict):
+        for flow in ("imports", "exports"):
+            for item in raw_codes.get(flow, []):
+                if isinstance(item, dict):
+                    nc_codes.append(item.get("code", ""))
+                else:
+                    nc_codes.append(str(item))
+
+    # Nettoyer et dédupliquer
+    return list(set(filter(None, nc_codes)))
+
+
 def analyze_nc_codes(
     document_text: str,
     company_nc_codes: List[str],
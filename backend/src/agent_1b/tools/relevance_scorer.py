@@ -6,7 +6,7 @@ Combine les résultats des 3 filtres pour produire un score final.
 
 import structlog
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from src.agent_1b.models import (
@@ -19,6 +19,7 @@ from src.agent_1b.models import (
     DocumentAnalysis,
     AnalysisAlert
 )
+from src.agent_1b.tools.scoring_config import ScoringConfig, load_scoring_config
 
 logger = structlog.get_logger()
 
@@ -51,12 +52,44 @@ class RelevanceScorer:
             "medium": 0.40,
             "low": 0.20
         }
+        
+        # Règles par réglementation (voir from_config)
+        self.config: Optional[ScoringConfig] = None
+    
+    @classmethod
+    def from_config(cls, config: ScoringConfig = None) -> "RelevanceScorer":
+        """
+        Crée un scorer depuis la configuration de scoring
+        
+        Args:
+            config: Configuration (défaut: config/scoring_rules.json)
+            
+        Returns:
+            RelevanceScorer appliquant les weight_adjustments par réglementation
+        """
+        config = config or load_scoring_config()
+        keyword_weight, nc_code_weight, semantic_weight = config.weights_for(None)
+        scorer = cls(
+            keyword_weight=keyword_weight,
+            nc_code_weight=nc_code_weight,
+            semantic_weight=semantic_weight,
+            thresholds=config.thresholds()
+        )
+        scorer.config = config
+        return scorer
+    
+    def weights_for(self, regulation_type: Optional[str] = None) -> Tuple[float, float, float]:
+        """Poids (mots-clés, codes NC, sémantique) applicables à une réglementation"""
+        if self.config is not None and regulation_type:
+            return self.config.weights_for(regulation_type)
+        return self.keyword_weight, self.nc_code_weight, self.semantic_weight
     
     def calculate_score(
         self,
         keyword_result: KeywordAnalysisResult,
         nc_code_result: NCCodeAnalysisResult,
-        semantic_result: SemanticAnalysisResult
+        semantic_result: SemanticAnalysisResult,
+        regulation_type: Optional[str] = None
     ) -> RelevanceScore:
         """
         Calcule le score final pondéré
@@ -65,17 +98,20 @@ class RelevanceScorer:
             keyword_result: Résultat de l'analyse mots-clés
             nc_code_result: Résultat de l'analyse codes NC
             semantic_result: Résultat de l'analyse sémantique
+            regulation_type: Type de réglementation (poids spécifiques)
             
         Returns:
             RelevanceScore avec score final et criticité
         """
         logger.info("calculating_relevance_score")
         
+        keyword_weight, nc_code_weight, semantic_weight = self.weights_for(regulation_type)
+        
         # Calcul du score pondéré
         final_score = (
-            keyword_result.score * self.keyword_weight +
-            nc_code_result.score * self.nc_code_weight +
-            semantic_result.score * self.semantic_weight
+            keyword_result.score * keyword_weight +
+            nc_code_result.score * nc_code_weight +
+            semantic_result.score * semantic_weight
         )
         
         # Arrondir à 3 décimales
@@ -98,9 +134,9 @@ class RelevanceScorer:
             keyword_score=keyword_result.score,
             nc_code_score=nc_code_result.score,
             semantic_score=semantic_result.score,
-            keyword_weight=self.keyword_weight,
-            nc_code_weight=self.nc_code_weight,
-            semantic_weight=self.semantic_weight,
+            keyword_weight=keyword_weight,
+            nc_code_weight=nc_code_weight,
+            semantic_weight=semantic_weight,
             criticality=criticality
         )
     
@@ -243,7 +279,7 @@ def create_document_analysis(
         scorer = RelevanceScorer()
     
     # Calculer le score final
-    relevance_score = scorer.calculate_score(keyword_result, nc_code_result, semantic_result)
+    relevance_score = scorer.calculate_score(keyword_result, nc_code_result, semantic_result, regulation_type)
     
     # Identifier les processus impactés
     impacted_processes = scorer.identify_impacted_processes(semantic_result, regulation_type)
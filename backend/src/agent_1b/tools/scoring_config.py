@@ -0,0 +1,120 @@
+"""
+Configuration du scoring de pertinence (config/scoring_rules.json)
+
+Poids des trois niveaux, seuils de criticité et ajustements par
+réglementation. Les valeurs absentes du fichier reprennent celles des
+settings (KEYWORD_WEIGHT, CRITICAL_THRESHOLD, ...).
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from pydantic import BaseModel, Field
+
+from src.config import settings
+
+logger = structlog.get_logger()
+
+# Clés des poids dans scoring_rules.json
+WEIGHT_KEYS = ("keyword_match", "nc_code_relevance", "llm_semantic_score")
+
+# Seuils utilisés pour la criticité ("info" = plancher, ignoré)
+THRESHOLD_KEYS = ("critical", "high", "medium", "low")
+
+
+class RegulationScoring(BaseModel):
+    """Règles spécifiques à une réglementation"""
+    focus_keywords: List[str] = Field(default_factory=list)
+    mandatory_nc_codes: bool = False
+    weight_adjustments: Dict[str, float] = Field(default_factory=dict)
+
+
+class ScoringConfig(BaseModel):
+    """Poids, seuils et règles par réglementation"""
+    scoring_weights: Dict[str, float] = Field(default_factory=lambda: {
+        "keyword_match": settings.keyword_weight,
+        "nc_code_relevance": settings.nc_code_weight,
+        "llm_semantic_score": settings.llm_semantic_weight,
+    })
+    criticality_thresholds: Dict[str, float] = Field(default_factory=lambda: {
+        "critical": settings.critical_threshold,
+        "high": settings.high_threshold,
+        "medium": settings.medium_threshold,
+        "low": settings.low_threshold,
+    })
+    regulation_specific: Dict[str, RegulationScoring] = Field(default_factory=dict)
+
+    def weights_for(self, regulation_type: Optional[str] = None) -> Tuple[float, float, float]:
+        """
+        Poids (mots-clés, codes NC, sémantique) d'une réglementation
+
+        Les weight_adjustments d'une réglementation forment un jeu de poids
+        complet : un niveau absent pèse 0 (ex. Sanctions sans codes NC).
+
+        Args:
+            regulation_type: Type de réglementation (CBAM, EUDR...)
+
+        Returns:
+            Tuple (keyword_weight, nc_code_weight, semantic_weight)
+        """
+        rules = self.regulation_rules(regulation_type)
+        if rules and rules.weight_adjustments:
+            return tuple(rules.weight_adjustments.get(key, 0.0) for key in WEIGHT_KEYS)
+        return tuple(self.scoring_weights.get(key, 0.0) for key in WEIGHT_KEYS)
+
+    def thresholds(self) -> Dict[str, float]:
+        """Seuils de criticité critical/high/medium/low"""
+        return {key: self.criticality_thresholds[key] for key in THRESHOLD_KEYS}
+
+    def regulation_rules(self, regulation_type: Optional[str]) -> Optional[RegulationScoring]:
+        """Règles d'une réglementation (insensible à la casse)"""
+        key = (regulation_type or "").upper()
+        for name, rules in self.regulation_specific.items():
+            if name.upper() == key:
+                return rules
+        return None
+
+
+def default_scoring_rules_path() -> Path:
+    return Path(settings.base_dir) / "config" / "scoring_rules.json"
+
+
+def load_scoring_config(path: Optional[Path] = None) -> ScoringConfig:
+    """
+    Charge la configuration de scoring
+
+    Args:
+        path: Fichier JSON (défaut: config/scoring_rules.json)
+
+    Returns:
+        ScoringConfig (valeurs des settings si le fichier est absent ou invalide)
+    """
+    if path is None:
+        return _load_default_scoring_config()
+    return _read_scoring_config(Path(path))
+
+
+@lru_cache(maxsize=1)
+def _load_default_scoring_config() -> ScoringConfig:
+    return _read_scoring_config(default_scoring_rules_path())
+
+
+def _read_scoring_config(path: Path) -> ScoringConfig:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("scoring_rules_unavailable", path=str(path), error=str(e))
+        return ScoringConfig()
+
+    config = ScoringConfig()
+    config.scoring_weights.update(rules.get("scoring_weights", {}))
+    config.criticality_thresholds.update(rules.get("criticality_thresholds", {}))
+    config.regulation_specific = {
+        name: RegulationScoring(**conf)
+        for name, conf in rules.get("regulation_specific", {}).items()
+    }
+    return config
@@ -4,14 +4,25 @@ Filtre Niveau 3 - Analyse sémantique avec LLM
 Utilise Claude pour une analyse contextuelle approfondie.
 """
 
+import json
 import structlog
-from typing import List, Dict
-from langchain_anthropic import ChatAnthropic
+from typing import List, Dict, Optional
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 
-from src.agent_1b.models import SemanticAnalysisResult
+from src.agent_1b.models import ChunkExtraction, SemanticAnalysisResult
+from src.agent_1b.tools.chunk_cache import ChunkExtractionCache
+from src.agent_1b.tools.chunk_retriever import (
+    TextChunk,
+    rank_chunks,
+    select_relevant_content,
+)
+from src.agent_1b.tools.compiled_profile import get_compiled_profile
+from src.agent_1b.tools.structured_output import StructuredCall
 from src.config import settings
+from src.utils.llm_backend import create_chat_model
+from src.utils.llm_usage import LLMUsageTracker
+from src.utils.tokens import estimate_tokens
 
 logger = structlog.get_logger()
 
@@ -66,27 +77,103 @@ Procède à l'analyse maintenant.
 )
 
 
+# Prompt d'extraction par passage (mode map-reduce)
+CHUNK_EXTRACTION_PROMPT = PromptTemplate.from_template(
+    """Tu analyses UN passage d'un document réglementaire pour une entreprise.
+
+# ENTREPRISE
+{company_context}
+
+# DOCUMENT
+Titre: {document_title}
+Type: {regulation_type}
+Passage ({chunk_label}):
+{chunk_text}
+
+# TÂCHE
+Extrais uniquement ce que ce passage contient : signaux d'applicabilité (ou d'exclusion) pour l'entreprise,
+obligations, produits/matériaux/codes NC, pays/régions, et un score de pertinence du passage (0-1).
+Listes vides si rien n'est mentionné. Réponses courtes.
+
+{format_instructions}
+"""
+)
+
+
+# Prompt de synthèse des extractions (mode map-reduce)
+REDUCE_PROMPT = PromptTemplate.from_template(
+    """Tu es un expert en analyse réglementaire et compliance internationale.
+
+Des extractions partielles ont été réalisées sur les passages les plus pertinents d'un document.
+Synthétise-les en une analyse unique pour l'entreprise.
+
+# ENTREPRISE
+{company_context}
+
+# DOCUMENT
+Titre: {document_title}
+Type: {regulation_type}
+
+# EXTRACTIONS PAR PASSAGE (JSON)
+{extractions}
+
+# CONSIGNES
+- Un signal d'EXCLUSION explicite prime sur une simple mention du produit
+- Si les codes NC de l'entreprise sont explicitement listés, l'applicabilité est ÉLEVÉE
+- Score 0-1 : 0.0-0.2 non pertinent, 0.4-0.6 indirect, 0.6-0.8 direct, 0.8-1.0 critique
+
+# FORMAT DE RÉPONSE
+{format_instructions}
+"""
+)
+
+
 class SemanticAnalyzer:
     """Analyseur sémantique utilisant un LLM"""
     
-    def __init__(self, model_name: str = "claude-sonnet-4-5-20250929", temperature: float = 0.1):
+    def __init__(
+        self,
+        model_name: str = "claude-sonnet-4-5-20250929",
+        temperature: float = 0.1,
+        mode: Optional[str] = None,
+        llm: Optional[BaseChatModel] = None,
+        max_tokens: int = 2000
+    ):
         """
         Args:
             model_name: Nom du modèle Anthropic à utiliser
             temperature: Température pour la génération (0-1)
+            mode: "single" ou "map_reduce" (défaut: settings.semantic_analysis_mode)
+            llm: Modèle de chat à utiliser (défaut: selon settings.llm_backend)
+            max_tokens: Nombre maximal de tokens générés par appel
         """
-        self.llm = ChatAnthropic(
-            model=model_name,
-            api_key=settings.anthropic_api_key,
+        self.model_name = model_name
+        self.mode = mode or settings.semantic_analysis_mode
+        self.llm = llm or create_chat_model(
+            model_name,
+            provider="anthropic",
             temperature=temperature,
-            max_tokens=2000
+            max_tokens=max_tokens
         )
         
-        # Parser Pydantic pour structurer la sortie
-        self.output_parser = PydanticOutputParser(pydantic_object=SemanticAnalysisResult)
+        # Consommation du dernier appel à analyze() (appels, tokens, latence, coût)
+        self.last_usage: Dict = {}
+        
+        # Appels à sortie structurée (schéma natif + réparation bornée)
+        structured = {
+            "llm": self.llm,
+            "max_repair_attempts": settings.semantic_max_repair_attempts,
+            "native": settings.semantic_structured_output,
+            "method": settings.semantic_structured_output_method
+        }
+        self.chain = StructuredCall(SEMANTIC_ANALYSIS_PROMPT, schema=SemanticAnalysisResult, **structured)
+        self.map_chain = StructuredCall(CHUNK_EXTRACTION_PROMPT, schema=ChunkExtraction, **structured)
+        self.reduce_chain = StructuredCall(REDUCE_PROMPT, schema=SemanticAnalysisResult, **structured)
         
-        # Créer la chaîne LangChain
-        self.chain = SEMANTIC_ANALYSIS_PROMPT | self.llm | self.output_parser
+        self.chunk_cache = (
+            ChunkExtractionCache(settings.data_dir / "cache" / "semantic_chunks")
+            if settings.semantic_chunk_cache_enabled else None
+        )
     
     def analyze(
         self,
@@ -110,41 +197,51 @@ class SemanticAnalyzer:
         logger.info(
             "semantic_analysis_started",
             document_title=document_title[:50],
-            regulation_type=regulation_type
+            regulation_type=regulation_type,
+            model=self.model_name
         )
         
-        # Préparer le contenu (limiter à 8000 tokens ~= 32000 chars)
-        content_excerpt = self._prepare_content(document_content, max_chars=32000)
-        
-        # Extraire les infos du profil
-        company_name = company_profile.get("company_name", "Unknown")
-        industry = company_profile.get("industry", "")
-        products = ", ".join(company_profile.get("products", [])[:5])  # Top 5 produits
+        tracker = LLMUsageTracker()
+        try:
+            return self._analyze(
+                document_content, document_title, regulation_type, company_profile, tracker
+            )
+        finally:
+            self.last_usage = tracker.snapshot(self.model_name)
+    
+    def _analyze(
+        self,
+        document_content: str,
+        document_title: str,
+        regulation_type: str,
+        company_profile: Dict,
+        tracker: LLMUsageTracker
+    ) -> SemanticAnalysisResult:
+        """Choisit le mode d'analyse et invoque les chaînes avec le suivi de consommation"""
+        # Map-reduce réservé aux documents qui dépassent le budget d'un prompt unique
+        if self.mode == "map_reduce" and \
+                estimate_tokens(document_content) > settings.semantic_content_token_budget:
+            return self._analyze_map_reduce(
+                document_content, document_title, regulation_type, company_profile, tracker
+            )
         
-        # nc_codes peut être un dict ou une liste
-        nc_codes_raw = company_profile.get("nc_codes", {})
-        if isinstance(nc_codes_raw, dict):
-            nc_codes = ", ".join(list(nc_codes_raw.keys())[:20])  # Top 20 codes
-        else:
-            nc_codes = ", ".join(nc_codes_raw[:20])
+        # Préparer le contenu (passages les plus pertinents dans le budget de tokens)
+        content_excerpt = self._prepare_content(
+            document_content,
+            company_profile=company_profile,
+            regulation_type=regulation_type
+        )
         
-        countries = company_profile.get("countries", "")
-        regulations = ", ".join(company_profile.get("regulations", []))
+        profile_fields = self._profile_fields(company_profile)
         
         try:
             # Invoquer la chaîne LangChain
             result = self.chain.invoke({
-                "company_name": company_name,
-                "industry": industry,
-                "products": products,
-                "nc_codes": nc_codes,
-                "countries": countries,
-                "regulations": regulations,
+                **profile_fields,
                 "document_title": document_title,
                 "regulation_type": regulation_type,
-                "document_content": content_excerpt,
-                "format_instructions": self.output_parser.get_format_instructions()
-            })
+                "document_content": content_excerpt
+            }, config={"callbacks": [tracker]})
             
             logger.info(
                 "semantic_analysis_completed",
@@ -159,46 +256,208 @@ class SemanticAnalyzer:
             logger.error("semantic_analysis_failed", error=str(e))
             
             # Retourner un résultat par défaut en cas d'erreur
-            return SemanticAnalysisResult(
-                score=0.0,
-                is_applicable=False,
-                explanation="Erreur lors de l'analyse sémantique. Impossible d'obtenir une réponse du LLM.",
-                regulation_summary="Document non analysable par le LLM en raison d'une erreur technique.",
-                impact_explanation="",
-                confidence_level=0.0
+            return self._fallback_result()
+    
+    def _analyze_map_reduce(
+        self,
+        document_content: str,
+        document_title: str,
+        regulation_type: str,
+        company_profile: Dict,
+        tracker: LLMUsageTracker
+    ) -> SemanticAnalysisResult:
+        """
+        Analyse map-reduce: extraction parallèle par passage puis synthèse
+        
+        Args:
+            document_content: Texte complet du document
+            document_title: Titre du document
+            regulation_type: Type de réglementation
+            company_profile: Profil entreprise
+            tracker: Suivi de consommation LLM
+            
+        Returns:
+            SemanticAnalysisResult issu de l'appel de synthèse
+        """
+        query_terms = get_compiled_profile(company_profile).query_terms(regulation_type)
+        chunks = rank_chunks(document_content, query_terms, settings.semantic_map_max_chunks)
+        company_context = self._render_company_context(company_profile)
+        
+        extractions = self._extract_chunks(
+            chunks, company_context, document_title, regulation_type, tracker
+        )
+        
+        if not extractions:
+            logger.error("semantic_map_failed", chunks=len(chunks))
+            return self._fallback_result()
+        
+        # Passages les plus pertinents en premier, sans les extractions vides
+        summary = [
+            {"passage": label, **extraction.model_dump()}
+            for label, extraction in sorted(
+                extractions, key=lambda item: -item[1].relevance
             )
+            if extraction.relevance > 0 or extraction.applicability_signals
+        ]
+        
+        try:
+            result = self.reduce_chain.invoke({
+                "company_context": company_context,
+                "document_title": document_title,
+                "regulation_type": regulation_type,
+                "extractions": json.dumps(summary, ensure_ascii=False)
+            }, config={"callbacks": [tracker]})
+            
+            logger.info(
+                "semantic_analysis_completed",
+                mode="map_reduce",
+                chunks=len(chunks),
+                score=result.score,
+                is_applicable=result.is_applicable,
+                confidence=result.confidence_level
+            )
+            
+            return result
+            
+        except Exception as e:
+            logger.error("semantic_reduce_failed", error=str(e))
+            return self._fallback_result()
     
-    def _prepare_content(self, content: str, max_chars: int = 32000) -> str:
+    def _extract_chunks(
+        self,
+        chunks: List[TextChunk],
+        company_context: str,
+        document_title: str,
+        regulation_type: str,
+        tracker: LLMUsageTracker
+    ) -> List[tuple]:
         """
-        Prépare le contenu pour l'analyse (chunking si nécessaire)
+        Étape map: extrait les signaux de chaque passage (cache + appels parallèles)
         
         Args:
-            content: Contenu complet
-            max_chars: Nombre maximum de caractères
+            chunks: Passages à analyser
+            company_context: Contexte entreprise rendu
+            document_title: Titre du document
+            regulation_type: Type de réglementation
+            tracker: Suivi de consommation LLM
             
         Returns:
-            Contenu tronqué intelligemment
+            Liste de tuples (libellé du passage, ChunkExtraction) dans l'ordre du document
         """
-        if len(content) <= max_chars:
-            return content
+        results: Dict[int, ChunkExtraction] = {}
+        pending = []
+        context_key = f"{company_context}|{document_title}|{regulation_type}"
         
-        # Stratégie: Prendre le début (contient souvent le contexte) 
-        # et la fin (contient souvent les annexes/tableaux importants)
-        first_part_size = int(max_chars * 0.7)
-        last_part_size = int(max_chars * 0.3)
+        for chunk in chunks:
+            key = ChunkExtractionCache.make_key(chunk.text, context_key, self.model_name)
+            cached = self.chunk_cache.get(key) if self.chunk_cache else None
+            if cached is not None:
+                results[chunk.index] = cached
+            else:
+                pending.append((chunk, key))
         
-        first_part = content[:first_part_size]
-        last_part = content[-last_part_size:]
+        if pending:
+            outputs = self.map_chain.batch(
+                [
+                    {
+                        "company_context": company_context,
+                        "document_title": document_title,
+                        "regulation_type": regulation_type,
+                        "chunk_label": chunk.label,
+                        "chunk_text": chunk.text
+                    }
+                    for chunk, _ in pending
+                ],
+                config={
+                    "max_concurrency": settings.semantic_map_max_concurrency,
+                    "callbacks": [tracker]
+                },
+                return_exceptions=True
+            )
+            
+            for (chunk, key), output in zip(pending, outputs):
+                if isinstance(output, Exception):
+                    logger.warning("chunk_extraction_failed", chunk=chunk.label, error=str(output))
+                    continue
+                results[chunk.index] = output
+                if self.chunk_cache:
+                    self.chunk_cache.set(key, output)
         
-        excerpt = first_part + "\n\n[...CONTENU TRONQUÉ...]\n\n" + last_part
+        logger.info(
+            "semantic_map_completed",
+            chunks=len(chunks),
+            cache_hits=len(chunks) - len(pending),
+            llm_calls=len(pending),
+            failures=len(chunks) - len(results)
+        )
         
-        logger.warning(
-            "content_truncated",
-            original_length=len(content),
-            truncated_length=len(excerpt)
+        return [(chunk.label, results[chunk.index]) for chunk in chunks if chunk.index in results]
+    
+    def _profile_fields(self, company_profile: Dict) -> Dict[str, str]:
+        """
+        Extrait les champs du profil utilisés dans les prompts
+        
+        Args:
+            company_profile: Profil entreprise
+            
+        Returns:
+            Dictionnaire des variables de prompt (calculé une fois par profil)
+        """
+        return get_compiled_profile(company_profile).prompt_fields
+    
+    def _render_company_context(self, company_profile: Dict) -> str:
+        """Rend le contexte entreprise compact utilisé par les prompts map/reduce"""
+        return get_compiled_profile(company_profile).company_context
+    
+    @staticmethod
+    def _fallback_result() -> SemanticAnalysisResult:
+        """Résultat par défaut lorsque le LLM n'a pas pu répondre"""
+        return SemanticAnalysisResult(
+            score=0.0,
+            is_applicable=False,
+            explanation="Erreur lors de l'analyse sémantique. Impossible d'obtenir une réponse du LLM.",
+            regulation_summary="Document non analysable par le LLM en raison d'une erreur technique.",
+            impact_explanation="Impact non évalué : l'analyse sémantique a échoué, une revue manuelle est nécessaire.",
+            confidence_level=0.0
         )
+    
+    def _prepare_content(
+        self,
+        content: str,
+        company_profile: Dict = None,
+        regulation_type: str = "",
+        token_budget: int = None
+    ) -> str:
+        """
+        Prépare le contenu pour l'analyse (sélection des passages pertinents)
         
-        return excerpt
+        Le document est découpé en articles/pages, classés par BM25 sur les
+        mots-clés et codes NC du profil, puis assemblés dans le budget de tokens.
+        
+        Args:
+            content: Contenu complet
+            company_profile: Profil entreprise (construit la requête)
+            regulation_type: Type de réglementation (termes spécifiques)
+            token_budget: Budget de tokens (défaut: settings.semantic_content_token_budget)
+            
+        Returns:
+            Extrait composé des passages les plus pertinents
+        """
+        token_budget = token_budget or settings.semantic_content_token_budget
+        query_terms = get_compiled_profile(company_profile or {}).query_terms(regulation_type)
+        selection = select_relevant_content(content, query_terms, token_budget)
+        
+        if selection.chunks_total > 1:
+            logger.info(
+                "content_chunks_selected",
+                original_tokens=selection.original_tokens,
+                selected_tokens=selection.selected_tokens,
+                chunks_total=selection.chunks_total,
+                chunks_selected=len(selection.chunks_selected)
+            )
+        
+        return selection.text
+
 
 
 def analyze_semantically(
@@ -0,0 +1,185 @@
+"""
+Analyse sémantique en cascade (triage → premium)
+
+Un modèle rapide et peu coûteux produit d'abord l'analyse sémantique.
+Le document n'est ré-analysé par le modèle premium que si le score combiné
+(mots-clés + codes NC + triage) tombe dans une bande d'incertitude autour
+d'un seuil de criticité, c'est-à-dire là où l'avis du premium peut changer
+la décision.
+"""
+
+import time
+from typing import Dict, Optional
+
+import structlog
+from pydantic import BaseModel
+
+from src.agent_1b.models import (
+    KeywordAnalysisResult,
+    NCCodeAnalysisResult,
+    SemanticAnalysisResult,
+)
+from src.agent_1b.tools.relevance_scorer import RelevanceScorer
+from src.agent_1b.tools.semantic_analyzer import SemanticAnalyzer
+from src.config import settings
+
+logger = structlog.get_logger()
+
+
+class TierStats(BaseModel):
+    """Consommation cumulée d'un niveau de la cascade"""
+    model: str
+    documents: int = 0
+    llm_calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_s: float = 0.0
+    cost_usd: float = 0.0
+
+    def add(self, usage: Dict, latency_s: float) -> None:
+        """Ajoute la consommation d'une analyse (voir SemanticAnalyzer.last_usage)"""
+        self.documents += 1
+        self.llm_calls += usage.get("calls", 0)
+        self.errors += usage.get("errors", 0)
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.latency_s = round(self.latency_s + latency_s, 3)
+        self.cost_usd = round(self.cost_usd + usage.get("cost_usd", 0.0), 6)
+
+
+class TieredSemanticAnalyzer:
+    """Cascade triage/premium pour le Niveau 3 de l'Agent 1B"""
+
+    def __init__(
+        self,
+        scorer: RelevanceScorer,
+        triage_analyzer: Optional[SemanticAnalyzer] = None,
+        premium_analyzer: Optional[SemanticAnalyzer] = None,
+        uncertainty_band: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Args:
+            scorer: Scorer utilisé pour le score combiné provisoire
+            triage_analyzer: Analyseur rapide (défaut: settings.semantic_triage_model)
+            premium_analyzer: Analyseur premium (défaut: settings.semantic_premium_model)
+            uncertainty_band: Demi-largeur de la bande autour des seuils
+            enabled: Active la cascade (sinon premium uniquement)
+        """
+        self.scorer = scorer
+        self.enabled = settings.semantic_tiering_enabled if enabled is None else enabled
+        self.uncertainty_band = (
+            settings.semantic_uncertainty_band if uncertainty_band is None else uncertainty_band
+        )
+
+        self.premium_analyzer = premium_analyzer or SemanticAnalyzer(
+            model_name=settings.semantic_premium_model
+        )
+        self.triage_analyzer = None
+        if self.enabled:
+            self.triage_analyzer = triage_analyzer or SemanticAnalyzer(
+                model_name=settings.semantic_triage_model,
+                max_tokens=settings.semantic_triage_max_tokens
+            )
+
+        self.stats: Dict[str, TierStats] = {"premium": TierStats(model=self.premium_analyzer.model_name)}
+        if self.triage_analyzer:
+            self.stats["triage"] = TierStats(model=self.triage_analyzer.model_name)
+        self.escalations = 0
+
+    def analyze(
+        self,
+        document_content: str,
+        document_title: str,
+        regulation_type: str,
+        company_profile: Dict,
+        keyword_result: KeywordAnalysisResult,
+        nc_code_result: NCCodeAnalysisResult
+    ) -> SemanticAnalysisResult:
+        """
+        Analyse sémantique avec escalade éventuelle vers le modèle premium
+
+        Args:
+            document_content: Texte du document
+            document_title: Titre du document
+            regulation_type: Type de réglementation
+            company_profile: Profil entreprise
+            keyword_result: Résultat du Niveau 1
+            nc_code_result: Résultat du Niveau 2
+
+        Returns:
+            SemanticAnalysisResult du dernier niveau exécuté
+        """
+        args = (document_content, document_title, regulation_type, company_profile)
+
+        if not self.triage_analyzer:
+            return self._run_tier("premium", self.premium_analyzer, *args)
+
+        triage_result = self._run_tier("triage", self.triage_analyzer, *args)
+        reason = self.escalation_reason(triage_result, keyword_result, nc_code_result, regulation_type)
+
+        if reason is None:
+            logger.info("semantic_triage_accepted", score=triage_result.score)
+            return triage_result
+
+        self.escalations += 1
+        logger.info("semantic_escalated", reason=reason, triage_score=triage_result.score)
+        return self._run_tier("premium", self.premium_analyzer, *args)
+
+    def escalation_reason(
+        self,
+        triage_result: SemanticAnalysisResult,
+        keyword_result: KeywordAnalysisResult,
+        nc_code_result: NCCodeAnalysisResult,
+        regulation_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Détermine si le résultat du triage doit être confirmé par le premium
+
+        Args:
+            triage_result: Résultat du modèle de triage
+            keyword_result: Résultat du Niveau 1
+            nc_code_result: Résultat du Niveau 2
+            regulation_type: Type de réglementation (poids spécifiques)
+
+        Returns:
+            Motif d'escalade, ou None si le triage suffit
+        """
+        # Réponse de repli (erreur LLM) : le triage n'a rien décidé
+        if triage_result.confidence_level == 0.0:
+            return "triage_failed"
+
+        keyword_weight, nc_code_weight, semantic_weight = self.scorer.weights_for(regulation_type)
+        provisional = (
+            keyword_result.score * keyword_weight +
+            nc_code_result.score * nc_code_weight +
+            triage_result.score * semantic_weight
+        )
+        distance = min(abs(provisional - t) for t in self.scorer.thresholds.values())
+
+        if distance < self.uncertainty_band:
+            return "near_threshold"
+        return None
+
+    def get_stats(self) -> Dict:
+        """Statistiques par niveau pour le résultat du run"""
+        return {
+            "tiering_enabled": self.triage_analyzer is not None,
+            "uncertainty_band": self.uncertainty_band,
+            "escalations": self.escalations,
+            "tiers": {name: stats.model_dump() for name, stats in self.stats.items()},
+            "total_cost_usd": round(sum(s.cost_usd for s in self.stats.values()), 6),
+        }
+
+    def _run_tier(
+        self,
+        tier: str,
+        analyzer: SemanticAnalyzer,
+        *args
+    ) -> SemanticAnalysisResult:
+        """Exécute un niveau et enregistre sa consommation"""
+        start = time.perf_counter()
+        result = analyzer.analyze(*args)
+        self.stats[tier].add(analyzer.last_usage, time.perf_counter() - start)
+        return result
@@ -0,0 +1,161 @@
+"""
+Appels LLM à sortie structurée (Pydantic)
+
+Utilise la sortie structurée native du modèle (tool calling) quand elle est
+disponible : le schéma est transmis comme définition d'outil au lieu d'être
+recopié dans chaque prompt. Si la réponse ne valide pas le schéma, le prompt
+est renvoyé avec l'erreur pour une réparation, un nombre borné de fois.
+Les modèles sans tool calling retombent sur PydanticOutputParser.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Type
+
+import structlog
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+
+logger = structlog.get_logger()
+
+
+# Consigne courte utilisée à la place des format_instructions en mode natif
+NATIVE_FORMAT_INSTRUCTIONS = "Réponds uniquement en appelant l'outil {tool_name} avec tous les champs requis."
+JSON_SCHEMA_FORMAT_INSTRUCTIONS = "Réponds en JSON conforme au schéma fourni."
+
+REPAIR_INSTRUCTIONS = """
+
+# CORRECTION REQUISE
+Ta réponse précédente ne respecte pas le schéma attendu :
+{error}
+
+Réponse précédente :
+{previous}
+
+Renvoie une réponse complète et conforme."""
+
+
+class StructuredCall:
+    """prompt → LLM → objet Pydantic, avec réparation bornée"""
+
+    def __init__(
+        self,
+        prompt: PromptTemplate,
+        llm: BaseChatModel,
+        schema: Type[BaseModel],
+        max_repair_attempts: int = 1,
+        native: bool = True,
+        method: str = "function_calling"
+    ):
+        """
+        Args:
+            prompt: Prompt contenant la variable {format_instructions}
+            llm: Modèle de chat
+            schema: Modèle Pydantic attendu en sortie
+            max_repair_attempts: Nombre maximal de relances après une réponse invalide
+            native: Utiliser la sortie structurée native si le modèle la supporte
+            method: "function_calling" (tool use) ou "json_schema" (décodage contraint)
+        """
+        self.prompt = prompt
+        self.llm = llm
+        self.schema = schema
+        self.max_repair_attempts = max_repair_attempts
+        self.method = method
+        self.parser = PydanticOutputParser(pydantic_object=schema)
+        self.structured_llm = self._bind_schema() if native else None
+
+    @property
+    def is_native(self) -> bool:
+        return self.structured_llm is not None
+
+    def format_instructions(self) -> str:
+        """Consigne de format insérée dans le prompt"""
+        if self.is_native and self.method == "json_schema":
+            return JSON_SCHEMA_FORMAT_INSTRUCTIONS
+        if self.is_native:
+            return NATIVE_FORMAT_INSTRUCTIONS.format(tool_name=self.schema.__name__)
+        return self.parser.get_format_instructions()
+
+    def render(self, inputs: Dict[str, Any]) -> str:
+        """Rend le prompt complet (sans l'éventuelle consigne de réparation)"""
+        return self.prompt.format(**inputs, format_instructions=self.format_instructions())
+
+    def invoke(self, inputs: Dict[str, Any], config: Optional[RunnableConfig] = None) -> BaseModel:
+        """
+        Exécute l'appel et retourne l'objet validé
+
+        Args:
+            inputs: Variables du prompt (hors format_instructions)
+            config: Configuration LangChain (callbacks...)
+
+        Returns:
+            Instance du schéma
+
+        Raises:
+            OutputParserException: Si la réponse reste invalide après les réparations
+        """
+        base_prompt = self.render(inputs)
+        prompt_text = base_prompt
+
+        for attempt in range(self.max_repair_attempts + 1):
+            parsed, previous, error = self._call(prompt_text, config)
+            if parsed is not None:
+                if attempt:
+                    logger.info("structured_output_repaired", schema=self.schema.__name__, attempts=attempt)
+                return parsed
+
+            logger.warning(
+                "structured_output_invalid",
+                schema=self.schema.__name__,
+                attempt=attempt + 1,
+                error=str(error)[:200]
+            )
+            prompt_text = base_prompt + REPAIR_INSTRUCTIONS.format(
+                error=str(error)[:1000],
+                previous=previous[:4000]
+            )
+
+        raise OutputParserException(
+            f"Sortie {self.schema.__name__} invalide après {self.max_repair_attempts + 1} tentatives: {error}"
+        )
+
+    def batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        config: Optional[RunnableConfig] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Exécute plusieurs appels en parallèle (respecte config["max_concurrency"])"""
+        return RunnableLambda(self.invoke).batch(
+            inputs, config=config, return_exceptions=return_exceptions
+        )
+
+    def _call(self, prompt_text: str, config: Optional[RunnableConfig]) -> tuple:
+        """Un appel LLM : (objet validé ou None, réponse brute, erreur)"""
+        if self.is_native:
+            output = self.structured_llm.invoke(prompt_text, config=config)
+            raw = output.get("raw")
+            tool_calls = getattr(raw, "tool_calls", None) or []
+            previous = json.dumps(tool_calls[0]["args"], ensure_ascii=False) if tool_calls \
+                else str(getattr(raw, "content", ""))
+            if output.get("parsed") is not None:
+                return output["parsed"], previous, None
+            return None, previous, output.get("parsing_error") or "aucun appel d'outil dans la réponse"
+
+        message = self.llm.invoke(prompt_text, config=config)
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        try:
+            return self.parser.parse(content), content, None
+        except OutputParserException as e:
+            return None, content, e
+
+    def _bind_schema(self):
+        """Sortie structurée native si le modèle supporte le tool calling"""
+        try:
+            return self.llm.with_structured_output(self.schema, include_raw=True, method=self.method)
+        except NotImplementedError:
+            logger.info("structured_output_unsupported", llm=type(self.llm).__name__)
+            return None
@@ -0,0 +1,539 @@
+"""
+Index vectoriel TF-IDF haché (CPU, sans modèle externe)
+
+Chaque document est découpé en passages (voir chunk_retriever) représentés
+par un vecteur TF-IDF de dimension fixe obtenu par hachage des termes. Les
+matrices sont stockées en .npy et ouvertes en mémoire mappée : une requête
+se résume à un produit matriciel sur tout le corpus.
+
+Usages :
+- classer les documents "raw" par proximité avec le profil entreprise avant
+  l'analyse LLM (les plus pertinents passent en premier)
+- répondre à "réglementations les plus proches de X" pour l'UI
+
+L'index des documents en base est reconstruit après chaque collecte
+(pipeline, worker, scheduler : refresh_document_index) ; l'API sert le
+dernier index sauvegardé (get_document_index).
+"""
+
+import hashlib
+import json
+import math
+import shutil
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import numpy as np
+import structlog
+
+from src.agent_1b.tools.chunk_retriever import build_query_terms, split_into_chunks, tokenize
+from src.config import settings
+
+logger = structlog.get_logger()
+
+
+class HashedTfidfVectorizer:
+    """Vectorisation TF-IDF par hachage signé des termes (dimension fixe)"""
+
+    def __init__(self, dim: int = 4096):
+        """
+        Args:
+            dim: Nombre de composantes des vecteurs
+        """
+        self.dim = dim
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, term: str) -> Tuple[int, float]:
+        """Composante et signe d'un terme (hash stable entre processus)"""
+        cached = self._buckets.get(term)
+        if cached is None:
+            h = zlib.crc32(term.encode("utf-8"))
+            cached = (h % self.dim, 1.0 if (h >> 31) & 1 == 0 else -1.0)
+            self._buckets[term] = cached
+        return cached
+
+    def term_frequencies(self, tokens: Iterable[str]) -> np.ndarray:
+        """
+        Vecteur de fréquences (sous-linéaires) d'une liste de termes
+
+        Args:
+            tokens: Termes tokenisés
+
+        Returns:
+            Vecteur float32 de taille dim
+        """
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for term, count in counts.items():
+            index, sign = self._bucket(term)
+            vector[index] += sign * (1.0 + math.log(count))
+        return vector
+
+    def fit_idf(self, tf_matrix: np.ndarray) -> np.ndarray:
+        """IDF lissé par composante à partir d'une matrice de fréquences"""
+        n_rows = tf_matrix.shape[0]
+        doc_freq = np.count_nonzero(tf_matrix, axis=0)
+        return (np.log((1 + n_rows) / (1 + doc_freq)) + 1.0).astype(np.float32)
+
+    @staticmethod
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        """Normalisation L2 ligne par ligne (lignes nulles conservées)"""
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class VectorIndex:
+    """Index mémoire-mappé des passages et documents"""
+
+    CHUNKS_FILE = "chunks.npy"
+    DOCUMENTS_FILE = "documents.npy"
+    IDF_FILE = "idf.npy"
+    META_FILE = "meta.json"
+    CURRENT_FILE = "CURRENT"
+
+    def __init__(
+        self,
+        document_ids: List[str],
+        chunk_rows: np.ndarray,
+        chunk_matrix: np.ndarray,
+        document_matrix: np.ndarray,
+        idf: np.ndarray,
+        built_at: Optional[str] = None,
+        fingerprint: Optional[str] = None
+    ):
+        """
+        Args:
+            document_ids: Identifiants des documents (ordre des lignes de document_matrix)
+            chunk_rows: Index du document de chaque ligne de chunk_matrix
+            chunk_matrix: Vecteurs normalisés des passages
+            document_matrix: Vecteurs normalisés des documents
+            idf: Poids IDF par composante
+            built_at: Date de construction (ISO)
+            fingerprint: Empreinte du corpus indexé (détection d'obsolescence)
+        """
+        self.document_ids = document_ids
+        self.positions = {doc_id: i for i, doc_id in enumerate(document_ids)}
+        self.chunk_rows = chunk_rows
+        self.chunk_matrix = chunk_matrix
+        self.document_matrix = document_matrix
+        self.idf = idf
+        self.built_at = built_at
+        self.fingerprint = fingerprint
+        self.vectorizer = HashedTfidfVectorizer(dim=idf.shape[0])
+
+    # ------------------------------------------------------------------
+    # Construction / persistance
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[Tuple[str, str]],
+        dim: Optional[int] = None,
+        max_chunk_chars: int = 4000
+    ) -> "VectorIndex":
+        """
+        Construit l'index à partir de couples (id, contenu)
+
+        Args:
+            documents: Couples (document_id, texte)
+            dim: Dimension des vecteurs (défaut: settings.vector_index_dim)
+            max_chunk_chars: Taille maximale d'un passage
+
+        Returns:
+            VectorIndex en mémoire (voir save pour le persister)
+        """
+        vectorizer = HashedTfidfVectorizer(dim=dim or settings.vector_index_dim)
+
+        document_ids: List[str] = []
+        rows: List[int] = []
+        tf_rows: List[np.ndarray] = []
+        for doc_id, content in documents:
+            chunks = split_into_chunks(content or "", max_chunk_chars=max_chunk_chars)
+            if not chunks:
+                continue
+            for chunk in chunks:
+                tf_rows.append(vectorizer.term_frequencies(tokenize(chunk.text)))
+                rows.append(len(document_ids))
+            document_ids.append(doc_id)
+
+        if not tf_rows:
+            empty = np.zeros((0, vectorizer.dim), dtype=np.float32)
+            return cls([], np.zeros(0, dtype=np.int32), empty, empty.copy(),
+                       np.ones(vectorizer.dim, dtype=np.float32), datetime.utcnow().isoformat())
+
+        tf_matrix = np.vstack(tf_rows)
+        chunk_rows = np.asarray(rows, dtype=np.int32)
+        idf = vectorizer.fit_idf(tf_matrix)
+
+        chunk_matrix = vectorizer.normalize(tf_matrix * idf)
+
+        # Vecteur document = somme des passages, renormalisée
+        starts = np.flatnonzero(np.r_[True, chunk_rows[1:] != chunk_rows[:-1]])
+        document_matrix = vectorizer.normalize(np.add.reduceat(chunk_matrix, starts, axis=0))
+
+        logger.info("vector_index_built", documents=len(document_ids), chunks=len(chunk_rows), dim=vectorizer.dim)
+
+        return cls(
+            document_ids,
+            chunk_rows,
+            chunk_matrix.astype(np.float32),
+            document_matrix.astype(np.float32),
+            idf,
+            datetime.utcnow().isoformat()
+        )
+
+    def save(self, directory: Optional[Path] = None) -> Path:
+        """
+        Écrit l'index sur disque (remplacement atomique de l'index courant)
+
+        Les fichiers sont écrits dans un répertoire temporaire renommé en
+        version, puis le fichier CURRENT est remplacé : un lecteur voit
+        l'ancienne ou la nouvelle version complète, jamais un mélange.
+
+        Args:
+            directory: Répertoire cible (défaut: settings.data_dir / "vector_index")
+
+        Returns:
+            Répertoire de la version écrite
+        """
+        directory = Path(directory or default_index_dir())
+        directory.mkdir(parents=True, exist_ok=True)
+        previous = current_version(directory)
+
+        version = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid4().hex[:8]}"
+        tmp_dir = directory / f".{version}.tmp"
+        tmp_dir.mkdir()
+
+        arrays = {
+            self.CHUNKS_FILE: self.chunk_matrix,
+            self.DOCUMENTS_FILE: self.document_matrix,
+            self.IDF_FILE: self.idf,
+        }
+        for name, array in arrays.items():
+            with open(tmp_dir / name, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+
+        meta = {
+            "document_ids": self.document_ids,
+            "chunk_rows": self.chunk_rows.tolist(),
+            "dim": int(self.idf.shape[0]),
+            "built_at": self.built_at,
+            "fingerprint": self.fingerprint,
+        }
+        (tmp_dir / self.META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+        version_dir = directory / version
+        tmp_dir.rename(version_dir)
+        tmp = directory / f"{self.CURRENT_FILE}.{version}.tmp"
+        tmp.write_text(version, encoding="utf-8")
+        tmp.replace(directory / self.CURRENT_FILE)
+
+        # Version précédente conservée : un lecteur peut l'ouvrir en ce moment
+        for path in directory.iterdir():
+            if path.is_dir() and path.name not in (version, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+        return version_dir
+
+    @classmethod
+    def load(cls, directory: Optional[Path] = None, version: Optional[str] = None) -> Optional["VectorIndex"]:
+        """
+        Ouvre une version de l'index en mémoire mappée
+
+        Args:
+            directory: Répertoire de l'index (défaut: settings.data_dir / "vector_index")
+            version: Version à ouvrir (défaut: version courante, fichier CURRENT)
+
+        Returns:
+            VectorIndex, ou None si aucun index n'a été construit
+        """
+        directory = Path(directory or default_index_dir())
+        version = version or current_version(directory)
+        if version is None:
+            return None
+
+        directory = directory / version
+        meta = json.loads((directory / cls.META_FILE).read_text(encoding="utf-8"))
+        # Un tableau vide ne peut pas être mappé en mémoire
+        mmap_mode = "r" if meta["document_ids"] else None
+        return cls(
+            meta["document_ids"],
+            np.asarray(meta["chunk_rows"], dtype=np.int32),
+            np.load(directory / cls.CHUNKS_FILE, mmap_mode=mmap_mode),
+            np.load(directory / cls.DOCUMENTS_FILE, mmap_mode=mmap_mode),
+            np.load(directory / cls.IDF_FILE),
+            meta.get("built_at"),
+            meta.get("fingerprint")
+        )
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def vectorize(self, tokens: Sequence[str]) -> np.ndarray:
+        """Vecteur TF-IDF normalisé d'une requête déjà tokenisée"""
+        vector = self.vectorizer.term_frequencies(tokens) * self.idf
+        return self.vectorizer.normalize(vector)
+
+    def score_documents(self, query: np.ndarray) -> np.ndarray:
+        """
+        Score de chaque document : meilleure similarité cosinus de ses passages
+
+        Args:
+            query: Vecteur requête normalisé
+
+        Returns:
+            Tableau de scores aligné sur document_ids
+        """
+        scores = np.full(len(self.document_ids), -1.0, dtype=np.float32)
+        if len(self.document_ids) == 0:
+            return scores
+        chunk_scores = self.chunk_matrix @ query
+        np.maximum.at(scores, self.chunk_rows, chunk_scores)
+        return scores
+
+    def rank_for_profile(self, company_profile: Dict, regulation_type: str = "") -> List[Tuple[str, float]]:
+        """
+        Classe tous les documents de l'index par proximité avec un profil
+
+        Args:
+            company_profile: Profil entreprise (mots-clés, codes NC)
+            regulation_type: Type de réglementation (termes spécifiques)
+
+        Returns:
+            Couples (document_id, score) par score décroissant
+        """
+        query = self.vectorize(build_query_terms(company_profile, regulation_type))
+        scores = self.score_documents(query)
+        order = np.argsort(-scores, kind="stable")
+        return [(self.document_ids[i], float(scores[i])) for i in order]
+
+    def most_similar(self, document_id: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Documents les plus proches d'un document de l'index
+
+        Args:
+            document_id: Document de référence
+            limit: Nombre de résultats
+
+        Returns:
+            Couples (document_id, similarité cosinus) par similarité décroissante
+
+        Raises:
+            KeyError: Si le document n'est pas indexé
+        """
+        position = self.positions[document_id]
+        similarities = self.document_matrix @ self.document_matrix[position]
+        similarities = np.asarray(similarities, dtype=np.float32).copy()
+        similarities[position] = -np.inf
+
+        limit = min(limit, len(self.document_ids) - 1)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-similarities, limit - 1)[:limit]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(self.document_ids[i], float(similarities[i])) for i in top]
+
+
+# Répertoire -> (version, index) : rechargé quand une reconstruction publie une version
+_index_cache: Dict[str, Tuple[str, VectorIndex]] = {}
+_rebuild_lock = threading.Lock()
+
+
+def current_version(directory: Path) -> Optional[str]:
+    """Version publiée de l'index (fichier CURRENT), None si aucun index"""
+    try:
+        return (Path(directory) / VectorIndex.CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def corpus_fingerprint(session) -> str:
+    """
+    Empreinte du contenu des documents en base (identifiants et hashes)
+
+    Indépendante des dates de vérification : une collecte sans document
+    nouveau ou modifié ne déclenche pas de reconstruction.
+    """
+    from src.storage.models import Document
+
+    digest = hashlib.sha1()
+    count = 0
+    rows = (
+        session.query(Document.id, Document.hash_sha256)
+        .filter(Document.content_size.isnot(None))
+        .order_by(Document.id)
+    )
+    for document_id, hash_sha256 in rows.yield_per(1000):
+        digest.update(f"{document_id}:{hash_sha256}\n".encode("utf-8"))
+        count += 1
+    return f"{count}:{digest.hexdigest()}"
+
+
+def _lock_file(lock_file) -> None:
+    """Verrou exclusif bloquant sur un fichier ouvert (POSIX : flock, Windows : msvcrt)"""
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        while True:
+            try:
+                # LK_LOCK réessaie pendant 10 s puis lève OSError
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+
+def _unlock_file(lock_file) -> None:
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _exclusive(directory: Path) -> Iterator[None]:
+    """Une seule reconstruction à la fois (threads du processus et autres processus)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    with _rebuild_lock, open(directory / ".lock", "w") as lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+
+def rebuild_document_index(session, directory: Optional[Path] = None, force: bool = False) -> Optional[VectorIndex]:
+    """
+    Reconstruit et publie l'index des documents en base si le corpus a changé
+
+    Args:
+        session: Session SQLAlchemy
+        directory: Répertoire de l'index (défaut: settings.data_dir / "vector_index")
+        force: Reconstruire même si l'empreinte du corpus est inchangée
+
+    Returns:
+        Nouvel index, ou None si l'index publié était à jour
+    """
+    from src.storage.content_store import iter_document_texts
+
+    directory = Path(directory or default_index_dir())
+    with _exclusive(directory):
+        # Empreinte lue sous le verrou : une reconstruction concurrente a pu publier ce corpus
+        fingerprint = corpus_fingerprint(session)
+        current = VectorIndex.load(directory)
+        if not force and current is not None and current.fingerprint == fingerprint:
+            logger.info("vector_index_up_to_date", documents=len(current.document_ids))
+            return None
+
+        index = VectorIndex.build(iter_document_texts(session))
+        index.fingerprint = fingerprint
+        index.save(directory)
+    return index
+
+
+def refresh_document_index(
+    session_factory: Optional[Callable] = None,
+    directory: Optional[Path] = None
+) -> Optional[VectorIndex]:
+    """
+    Reconstruction après une collecte (sans effet si settings.vector_index_enabled est faux)
+
+    Une erreur est journalisée sans être propagée : la collecte reste valide
+    et l'API continue de servir l'index précédent.
+
+    Args:
+        session_factory: Fabrique de sessions SQLAlchemy (défaut: get_session)
+        directory: Répertoire de l'index (défaut: settings.data_dir / "vector_index")
+
+    Returns:
+        Nouvel index, ou None (index à jour, désactivé ou en erreur)
+    """
+    from src.storage.database import get_session
+
+    if not settings.vector_index_enabled:
+        return None
+
+    session = (session_factory or get_session)()
+    try:
+        return rebuild_document_index(session, directory)
+    except Exception as e:
+        logger.error("vector_index_rebuild_failed", error=str(e), exc_info=True)
+        return None
+    finally:
+        session.close()
+
+
+def get_document_index(directory: Optional[Path] = None) -> Optional[VectorIndex]:
+    """
+    Dernier index des documents publié (voir refresh_document_index)
+
+    Aucune reconstruction ici : l'index est gardé en mémoire et rechargé
+    seulement quand une nouvelle version est publiée (lecture du fichier CURRENT).
+
+    Args:
+        directory: Répertoire de l'index (défaut: settings.data_dir / "vector_index")
+
+    Returns:
+        VectorIndex, ou None si aucun index n'a encore été construit
+    """
+    directory = Path(directory or default_index_dir())
+    version = current_version(directory)
+    if version is None:
+        return None
+
+    cached = _index_cache.get(str(directory))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = VectorIndex.load(directory, version)
+    _index_cache[str(directory)] = (version, index)
+    return index
+
+
+def default_index_dir() -> Path:
+    """Répertoire par défaut de l'index"""
+    return settings.data_dir / "vector_index"
+
+
+def rank_documents_for_profile(
+    documents: Sequence[Tuple[str, str]],
+    company_profile: Dict,
+    regulation_type: str = ""
+) -> List[Tuple[str, float]]:
+    """
+    Classe un lot de documents (ex: backlog "raw") par proximité avec le profil
+
+    Les documents ne sont pas nécessairement indexés : l'index est construit
+    en mémoire pour le lot, ce qui reste un seul produit matriciel.
+
+    Args:
+        documents: Couples (document_id, contenu)
+        company_profile: Profil entreprise
+        regulation_type: Type de réglementation
+
+    Returns:
+        Couples (document_id, score) par score décroissant (documents vides en dernier)
+    """
+    index = VectorIndex.build(documents)
+    ranked = index.rank_for_profile(company_profile, regulation_type)
+    indexed = {doc_id for doc_id, _ in ranked}
+    return ranked + [(doc_id, 0.0) for doc_id, _ in documents if doc_id not in indexed]
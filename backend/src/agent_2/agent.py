@@ -2,12 +2,21 @@
 Agent 2 - Analyse d'impact (prototype base sur l'agent ReAct).
 """
 
+from datetime import datetime
+
+import structlog
 from langchain.agents import create_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from src.agent_2.prompts.agent_2_prompt import AGENT_2_PROMPT
 from src.agent_2.tools import get_agent_2_tools
 from src.config import settings
+from src.utils.llm_backend import create_chat_model, is_offline
+from src.utils.llm_usage import LLMUsageTracker
+from src.utils.metrics import current_metrics, span, with_metrics
+
+logger = structlog.get_logger()
+
+MODEL_NAME = "gemini-2.5-flash"
 
 
 class Agent2:
@@ -18,16 +27,12 @@ class Agent2:
     """
 
     def __init__(self):
-        if not settings.google_api_key:
+        if not settings.google_api_key and not is_offline():
             raise ValueError(
-                "GOOGLE_API_KEY renseigné dans .env"
+                "GOOGLE_API_KEY renseigné dans .env (ou LLM_BACKEND=offline)"
             )
 
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            api_key=settings.google_api_key,
-            temperature=0,
-        )
+        llm = create_chat_model(MODEL_NAME, provider="google", temperature=0)
 
         tools = get_agent_2_tools()
 
@@ -48,7 +53,7 @@ class Agent2:
             "Charge les donnees entreprise, genere les metriques d'impact "
             "et sauvegarde chaque resultat."
         )
-        return self.agent.invoke({"messages": [{"role": "user", "content": task}]})
+        return self._invoke(task, {"validation_status": validation_status, "limit": limit})
 
     def analyze_impact(self, analysis_id: str):
         """
@@ -59,7 +64,59 @@ class Agent2:
             "Charge les donnees entreprise, genere les metriques d'impact "
             "et sauvegarde le resultat."
         )
-        return self.agent.invoke({"messages": [{"role": "user", "content": task}]})
+        return self._invoke(task, {"analysis_id": analysis_id})
+
+    @with_metrics
+    def _invoke(self, task: str, params: dict):
+        """
+        Execute l'agent ReAct (tokens et temps mesures) et journalise l'execution.
+        """
+        tracker = LLMUsageTracker()
+        started_at = datetime.utcnow()
+        status, error = "error", None
+        try:
+            with span("agent_2"):
+                result = self.agent.invoke(
+                    {"messages": [{"role": "user", "content": task}]},
+                    config={"callbacks": [tracker]},
+                )
+            status = "success"
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            _save_execution_log(started_at, status, error, {
+                **params,
+                "llm_usage": tracker.snapshot(MODEL_NAME),
+                "metrics": current_metrics().snapshot(),
+            })
+
+
+def _save_execution_log(started_at: datetime, status: str, error, metadata: dict) -> None:
+    """Journal execution_logs (agent_2) ; un echec d'ecriture est seulement logge."""
+    from src.agent_2 import tools
+    from src.storage.models import ExecutionLog
+
+    end_time = datetime.utcnow()
+    # Meme base que les outils de l'agent (analyses, impacts)
+    session = tools.get_session()
+    try:
+        session.add(ExecutionLog(
+            agent_type="agent_2",
+            status=status,
+            start_time=started_at,
+            end_time=end_time,
+            duration_seconds=(end_time - started_at).total_seconds(),
+            errors=[error] if error else [],
+            log_metadata=metadata,
+        ))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error("execution_log_failed", agent_type="agent_2", error=str(e))
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
@@ -3,12 +3,12 @@ Outils pour Agent 2.
 """
 
 import json
-from typing import Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any, Literal
 
 from langchain.tools import tool
+from pydantic import Field
 
 from src.storage.database import get_session
-import re
 
 from src.storage.models import Analysis, CompanyProcess, Document, ImpactAssessment
 
@@ -115,44 +115,21 @@ def fetch_company_processes(limit: int = 5) -> List[Dict[str, Any]]:
 @tool
 def save_impact_assessment(
     analysis_id: str,
-    risk_main: str,
-    impact_level: str,
+    risk_main: Literal["fiscal", "operationnel", "conformite", "reputationnel", "juridique"],
+    impact_level: Literal["faible", "moyen", "eleve"],
     risk_details: str,
-    modality: str,
-    deadline: str,
+    modality: Literal["certificat", "reporting", "taxe", "quota", "interdiction", "autorisation"],
+    deadline: Annotated[str, Field(pattern=r"^((0[1-9]|1[0-2])-[0-9]{4})?$")],
     recommendation: str,
     llm_reasoning: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Sauvegarde une analyse d'impact.
-    """
-    allowed_risk_main = {"fiscal", "operationnel", "conformite", "reputationnel", "juridique"}
-    allowed_impact = {"faible", "moyen", "eleve"}
-    allowed_modality = {"certificat", "reporting", "taxe", "quota", "interdiction", "autorisation"}
-    deadline_pattern = re.compile(r"^(0[1-9]|1[0-2])-[0-9]{4}$")
-
-    errors = []
-    if risk_main not in allowed_risk_main:
-        errors.append(f"risk_main invalide: {risk_main}")
-    if impact_level not in allowed_impact:
-        errors.append(f"impact_level invalide: {impact_level}")
-    if modality not in allowed_modality:
-        errors.append(f"modality invalide: {modality}")
-    if deadline and not deadline_pattern.match(deadline):
-        errors.append(f"deadline invalide: {deadline} (format MM-YYYY)")
-
-    if errors:
-        return {
-            "saved": False,
-            "errors": errors,
-            "allowed": {
-                "risk_main": sorted(allowed_risk_main),
-                "impact_level": sorted(allowed_impact),
-                "modality": sorted(allowed_modality),
-                "deadline_format": "MM-YYYY",
-            },
-        }
 
+    Les valeurs autorisées (risk_main, impact_level, modality, deadline
+    MM-YYYY) font partie du schéma de l'outil : un appel invalide est rejeté
+    par la validation des arguments avant l'exécution.
+    """
     session = get_session()
     try:
         existing = session.query(ImpactAssessment)\
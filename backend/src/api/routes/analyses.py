@@ -4,6 +4,7 @@ Routes pour les analyses (réglementations pour le frontend)
 
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
 
@@ -12,18 +13,27 @@ from src.api.schemas import (
     RegulationListResponse,
     RegulationResponse,
     UpdateRegulationStatusRequest,
-    RegulationStatsResponse
+    RegulationStatsResponse,
+    SimilarRegulation,
+    SimilarRegulationsResponse
 )
 from src.storage.models import Analysis, Document
+from src.storage.pagination import CursorError, clear_count_cache, count_total, keyset_page
 from src.storage.repositories import AnalysisRepository
+from src.storage.search import search_matches, search_snippets
+from src.storage.stats import ANALYSES_HIGH_PRIORITY, ANALYSES_STATUS, read_stats
 
 router = APIRouter(prefix="/regulations", tags=["Regulations"])
 
 
-def map_analysis_to_regulation(analysis: Analysis) -> RegulationResponse:
+def map_analysis_to_regulation(analysis: Analysis, snippet: Optional[str] = None) -> RegulationResponse:
     """
     Convertit une Analysis backend en Regulation frontend
     
+    Args:
+        analysis: Analyse (document chargé)
+        snippet: Extrait de la recherche plein texte
+    
     Mapping des statuts:
     - pending → pending
     - approved → validated
@@ -41,7 +51,7 @@ def map_analysis_to_regulation(analysis: Analysis) -> RegulationResponse:
     return RegulationResponse(
         id=analysis.id,
         title=doc.title,
-        description=doc.content[:500] if doc.content else analysis.llm_reasoning or "",
+        description=doc.excerpt or analysis.llm_reasoning or "",
         status=status_mapping.get(analysis.validation_status, analysis.validation_status),
         type=doc.regulation_type,
         dateCreated=doc.created_at,
@@ -49,22 +59,29 @@ def map_analysis_to_regulation(analysis: Analysis) -> RegulationResponse:
         confidence=analysis.confidence,
         matched_keywords=analysis.matched_keywords,
         matched_nc_codes=analysis.matched_nc_codes,
-        llm_reasoning=analysis.llm_reasoning
+        llm_reasoning=analysis.llm_reasoning,
+        snippet=snippet
     )
 
 
 @router.get("", response_model=RegulationListResponse)
 def get_regulations(
     status: Optional[str] = Query(None, description="Filtrer par statut: all, pending, validated, rejected, to-review"),
-    search: Optional[str] = Query(None, description="Recherche dans le titre"),
+    search: Optional[str] = Query(None, description="Recherche plein texte (titre et contenu), ex. 4016.93"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Curseur next_cursor/prev_cursor d'une réponse précédente (remplace page)"),
+    count: str = Query("exact", pattern="^(exact|cached|none)$", description="Total : exact, cached (mis en cache) ou none"),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste des réglementations avec filtres.
     
-    Retourne les analyses avec leurs documents associés.
+    Retourne les analyses avec leurs documents associés. Avec une recherche,
+    les résultats sont classés par pertinence et accompagnés d'un extrait.
+    
+    Pagination : par curseur (plus récentes d'abord, clé created_at + id,
+    coût constant quelle que soit la profondeur) ou par numéro de page.
     """
     
     # Construire la requête de base avec eager loading du document
@@ -82,25 +99,44 @@ def get_regulations(
         backend_status = status_mapping.get(status, status)
         query = query.filter(Analysis.validation_status == backend_status)
     
-    # Filtrer par recherche dans le titre
-    if search:
-        query = query.filter(Document.title.ilike(f"%{search}%"))
+    # Recherche plein texte (index FTS5 / tsvector, voir src/storage/search.py)
+    matches = search_matches(db, search) if search else None
+    if matches is not None:
+        query = query.join(matches, matches.c.document_id == Document.id)
     
     # Compter le total
-    total = query.count()
+    total = count_total(query, count, cache_key=f"regulations:{status}:{search}")
     
     # Pagination
-    offset = (page - 1) * limit
-    analyses = query.order_by(Analysis.created_at.desc()).offset(offset).limit(limit).all()
+    next_cursor = prev_cursor = None
+    if matches is not None:
+        # Résultats classés par pertinence : pagination par numéro de page
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="cursor n'est pas disponible avec search")
+        offset = (page - 1) * limit
+        analyses = query.order_by(matches.c.rank, Analysis.created_at.desc()).offset(offset).limit(limit).all()
+    elif cursor is not None or page == 1:
+        try:
+            analyses, next_cursor, prev_cursor = keyset_page(query, Analysis.created_at, Analysis.id, limit, cursor)
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        offset = (page - 1) * limit
+        analyses = query.order_by(Analysis.created_at.desc(), Analysis.id.desc()).offset(offset).limit(limit).all()
     
     # Convertir en format frontend
-    regulations = [map_analysis_to_regulation(analysis) for analysis in analyses]
+    snippets = search_snippets(db, search, [a.document_id for a in analyses]) if matches is not None else {}
+    regulations = [
+        map_analysis_to_regulation(analysis, snippets.get(analysis.document_id)) for analysis in analyses
+    ]
     
     return RegulationListResponse(
         regulations=regulations,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
     )
 
 
@@ -120,6 +156,63 @@ def get_regulation_by_id(
     return map_analysis_to_regulation(analysis)
 
 
+@router.get("/{id}/similar", response_model=SimilarRegulationsResponse)
+def get_similar_regulations(
+    id: str,
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Récupère les réglementations dont le contenu est le plus proche.
+    
+    Similarité cosinus sur l'index TF-IDF haché des documents (dernier index
+    publié, reconstruit après chaque collecte).
+    """
+    from src.agent_1b.tools.vector_index import get_document_index
+    
+    analysis = db.query(Analysis).filter(Analysis.id == id).first()
+    
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Réglementation non trouvée")
+    
+    index = get_document_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Index de similarité pas encore construit")
+    
+    try:
+        neighbours = index.most_similar(analysis.document_id, limit=limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Document sans contenu indexé")
+    
+    document_ids = [doc_id for doc_id, _ in neighbours]
+    documents = {
+        doc.id: doc for doc in db.query(Document).filter(Document.id.in_(document_ids)).all()
+    }
+    
+    # Dernière analyse de chaque document voisin
+    analysis_ids = {}
+    for doc_id, analysis_id in (
+        db.query(Analysis.document_id, Analysis.id)
+        .filter(Analysis.document_id.in_(document_ids))
+        .order_by(Analysis.created_at)
+    ):
+        analysis_ids[doc_id] = analysis_id
+    
+    similar = [
+        SimilarRegulation(
+            id=analysis_ids.get(doc_id),
+            document_id=doc_id,
+            title=documents[doc_id].title,
+            type=documents[doc_id].regulation_type,
+            similarity=round(score, 4)
+        )
+        for doc_id, score in neighbours
+        if doc_id in documents
+    ]
+    
+    return SimilarRegulationsResponse(regulation_id=id, similar=similar)
+
+
 @router.put("/{id}/status", response_model=RegulationResponse)
 def update_regulation_status(
     id: str,
@@ -160,6 +253,8 @@ def update_regulation_status(
     
     db.commit()
     db.refresh(analysis)
+    # Totaux par statut modifiés
+    clear_count_cache()
     
     return map_analysis_to_regulation(analysis)
 
@@ -169,30 +264,25 @@ def get_regulation_stats(db: Session = Depends(get_db)):
     """
     Récupère les statistiques des réglementations.
     """
-    total = db.query(Analysis).count()
-    
-    # Compter par statut
-    pending_count = db.query(Analysis).filter(Analysis.validation_status == 'pending').count()
-    approved_count = db.query(Analysis).filter(Analysis.validation_status == 'approved').count()
-    rejected_count = db.query(Analysis).filter(Analysis.validation_status == 'rejected').count()
+    # Compteurs tenus à jour à chaque écriture (src/storage/stats.py) : une requête
+    stats = read_stats(db, [ANALYSES_STATUS, ANALYSES_HIGH_PRIORITY])
+    by_status = stats[ANALYSES_STATUS]
+    total = sum(by_status.values())
     
-    # Compter les récentes (dernière semaine)
+    # Compter les récentes (dernière semaine) : parcours de l'index idx_analyses_created
     from datetime import timedelta
     week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_count = db.query(Analysis).filter(Analysis.created_at >= week_ago).count()
+    recent_count = db.query(func.count(Analysis.id)).filter(Analysis.created_at >= week_ago).scalar()
     
-    # Priorités hautes (confidence > 0.8)
-    high_priority = db.query(Analysis).filter(
-        Analysis.confidence > 0.8,
-        Analysis.validation_status == 'pending'
-    ).count()
+    # Priorités hautes (confidence > 0.8) en attente
+    high_priority = stats[ANALYSES_HIGH_PRIORITY].get('pending', 0)
     
     return RegulationStatsResponse(
         total=total,
         by_status={
-            'pending': pending_count,
-            'validated': approved_count,
-            'rejected': rejected_count
+            'pending': by_status.get('pending', 0),
+            'validated': by_status.get('approved', 0),
+            'rejected': by_status.get('rejected', 0)
         },
         recent_count=recent_count,
         high_priority=high_priority
@@ -5,7 +5,6 @@ Routes pour les impact assessments (Agent 2 - Dashboard Décideur)
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from datetime import datetime
 
 from src.api.deps import get_db
 from src.api.schemas import (
@@ -14,6 +13,10 @@ from src.api.schemas import (
     DashboardStatsResponse
 )
 from src.storage.models import ImpactAssessment, Analysis, Document
+from src.storage.pagination import CursorError, count_total, keyset_page
+from src.storage.stats import (
+    ALL, ANALYSES_STATUS, IMPACTS_DEADLINE, IMPACTS_LEVEL, IMPACTS_RISK, IMPACTS_WITH_DEADLINE, read_stats
+)
 
 router = APIRouter(prefix="/impacts", tags=["Impact Assessments"])
 
@@ -47,12 +50,15 @@ def get_impacts(
     risk_main: Optional[str] = Query(None, description="Filtrer par type de risque: fiscal, operationnel, conformite, reputationnel, juridique"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Curseur next_cursor/prev_cursor d'une réponse précédente (remplace page)"),
+    count: str = Query("exact", pattern="^(exact|cached|none)$", description="Total : exact, cached (mis en cache) ou none"),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste des impact assessments avec filtres.
     
     Utilisé par le Dashboard Décideur pour afficher les impacts analysés par Agent 2.
+    Pagination par curseur (clé created_at + id) ou par numéro de page.
     """
     
     # Construire la requête de base avec eager loading
@@ -69,11 +75,22 @@ def get_impacts(
         query = query.filter(ImpactAssessment.risk_main == risk_main)
     
     # Compter le total
-    total = query.count()
+    total = count_total(query, count, cache_key=f"impacts:{impact_level}:{risk_main}")
     
     # Pagination
-    offset = (page - 1) * limit
-    impacts = query.order_by(ImpactAssessment.created_at.desc()).offset(offset).limit(limit).all()
+    next_cursor = prev_cursor = None
+    if cursor is not None or page == 1:
+        try:
+            impacts, next_cursor, prev_cursor = keyset_page(
+                query, ImpactAssessment.created_at, ImpactAssessment.id, limit, cursor
+            )
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        offset = (page - 1) * limit
+        impacts = query.order_by(
+            ImpactAssessment.created_at.desc(), ImpactAssessment.id.desc()
+        ).offset(offset).limit(limit).all()
     
     # Convertir en format frontend
     impact_list = [map_impact_to_response(impact) for impact in impacts]
@@ -82,7 +99,9 @@ def get_impacts(
         impacts=impact_list,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
     )
 
 
@@ -117,37 +136,26 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     - Répartition par type de risque
     """
     
+    # Compteurs tenus à jour à chaque écriture (src/storage/stats.py) : une requête
+    stats = read_stats(db, [ANALYSES_STATUS, IMPACTS_LEVEL, IMPACTS_RISK, IMPACTS_WITH_DEADLINE])
+    by_status = stats[ANALYSES_STATUS]
+    by_level = stats[IMPACTS_LEVEL]
+    by_risk = stats[IMPACTS_RISK]
+    
     # Total d'analyses validées
-    total_regulations = db.query(Analysis).filter(Analysis.validation_status == 'approved').count()
+    total_regulations = by_status.get('approved', 0)
     
     # Nombre total d'impacts
-    total_impacts = db.query(ImpactAssessment).count()
-    
-    # Compter par niveau d'impact
-    high_risks = db.query(ImpactAssessment).filter(ImpactAssessment.impact_level == 'eleve').count()
-    medium_risks = db.query(ImpactAssessment).filter(ImpactAssessment.impact_level == 'moyen').count()
-    low_risks = db.query(ImpactAssessment).filter(ImpactAssessment.impact_level == 'faible').count()
-    
-    # Deadlines critiques (< 6 mois à partir de maintenant)
-    from datetime import timedelta
-    six_months_later = datetime.utcnow() + timedelta(days=180)
-    # Convertir deadline format "MM-YYYY" en datetime pour comparaison
-    # Pour simplifier, on compte tous les impacts avec deadline non null
-    critical_deadlines = db.query(ImpactAssessment).filter(
-        ImpactAssessment.deadline.isnot(None)
-    ).count()
-    
-    # Répartition par type de risque
-    fiscal_risks = db.query(ImpactAssessment).filter(ImpactAssessment.risk_main == 'fiscal').count()
-    operational_risks = db.query(ImpactAssessment).filter(ImpactAssessment.risk_main == 'operationnel').count()
-    compliance_risks = db.query(ImpactAssessment).filter(ImpactAssessment.risk_main == 'conformite').count()
-    reputational_risks = db.query(ImpactAssessment).filter(ImpactAssessment.risk_main == 'reputationnel').count()
-    legal_risks = db.query(ImpactAssessment).filter(ImpactAssessment.risk_main == 'juridique').count()
+    total_impacts = sum(by_level.values())
+    
+    # Deadlines critiques : pour simplifier, tous les impacts avec deadline non null
+    # (deadline au format "MM-YYYY")
+    critical_deadlines = stats[IMPACTS_WITH_DEADLINE].get(ALL, 0)
     
     # Pourcentage en cours vs validées
-    total_analyses = db.query(Analysis).count()
-    pending_count = db.query(Analysis).filter(Analysis.validation_status == 'pending').count()
-    approved_count = db.query(Analysis).filter(Analysis.validation_status == 'approved').count()
+    total_analyses = sum(by_status.values())
+    pending_count = by_status.get('pending', 0)
+    approved_count = by_status.get('approved', 0)
     
     pending_pct = (pending_count / total_analyses * 100) if total_analyses > 0 else 0
     approved_pct = (approved_count / total_analyses * 100) if total_analyses > 0 else 0
@@ -155,18 +163,15 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     return DashboardStatsResponse(
         total_regulations=total_regulations,
         total_impacts=total_impacts,
-        high_risks=high_risks,
-        medium_risks=medium_risks,
-        low_risks=low_risks,
+        high_risks=by_level.get('eleve', 0),
+        medium_risks=by_level.get('moyen', 0),
+        low_risks=by_level.get('faible', 0),
         critical_deadlines=critical_deadlines,
         pending_percentage=round(pending_pct, 1),
         approved_percentage=round(approved_pct, 1),
         by_risk_type={
-            'fiscal': fiscal_risks,
-            'operationnel': operational_risks,
-            'conformite': compliance_risks,
-            'reputationnel': reputational_risks,
-            'juridique': legal_risks
+            risk: by_risk.get(risk, 0)
+            for risk in ('fiscal', 'operationnel', 'conformite', 'reputationnel', 'juridique')
         }
     )
 
@@ -177,17 +182,14 @@ def get_timeline_stats(db: Session = Depends(get_db)):
     Récupère la répartition des impacts par deadline (pour graphique timeline).
     """
     
-    # Récupérer tous les impacts avec leurs deadlines
-    impacts = db.query(ImpactAssessment.deadline, ImpactAssessment.impact_level).all()
-    
-    # Grouper par deadline
+    # Compteurs par deadline et niveau ("MM-YYYY|niveau"), tenus à jour à chaque écriture
     timeline = {}
-    for impact in impacts:
-        if impact.deadline:
-            if impact.deadline not in timeline:
-                timeline[impact.deadline] = {'total': 0, 'eleve': 0, 'moyen': 0, 'faible': 0}
-            timeline[impact.deadline]['total'] += 1
-            timeline[impact.deadline][impact.impact_level] += 1
+    for bucket, count in sorted(read_stats(db, [IMPACTS_DEADLINE])[IMPACTS_DEADLINE].items()):
+        deadline, impact_level = bucket.rsplit('|', 1)
+        if deadline not in timeline:
+            timeline[deadline] = {'total': 0, 'eleve': 0, 'moyen': 0, 'faible': 0}
+        timeline[deadline]['total'] += count
+        timeline[deadline][impact_level] = timeline[deadline].get(impact_level, 0) + count
     
     return {
         'timeline': timeline
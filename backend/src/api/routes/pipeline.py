@@ -4,12 +4,16 @@ Routes pour déclencher manuellement le pipeline de veille réglementaire.
 Utile pour les démos et les tests sans attendre le scheduler hebdomadaire.
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Optional
 import structlog
 
-from src.orchestration.pipeline import run_pipeline
+from src.agent_1b.sinks import headless_sink_name
+from src.orchestration.pipeline import run_pipeline_async
+from src.orchestration.runs import RunRegistry
 
 logger = structlog.get_logger()
 
@@ -31,8 +35,66 @@ class PipelineStatus(BaseModel):
     details: Optional[dict] = None
 
 
-# Variable globale pour suivre si l'Agent 1 est en cours
-_agent1_running = False
+# Registre partagé (base de données) : une seule exécution par agent, quel que
+# soit le nombre de workers uvicorn ou de processus (scheduler, CLI)
+_registry = RunRegistry()
+
+
+def _start_or_conflict(run_type: str, params: dict, label: str):
+    """
+    Démarre une exécution, ou retourne l'exécution identique déjà en cours
+    
+    Returns:
+        (exécution créée, None) ou (None, exécution en cours avec les mêmes paramètres)
+    
+    Raises:
+        HTTPException 409: Exécution en cours avec d'autres paramètres
+    """
+    run = _registry.start(run_type, params)
+    if run is not None:
+        return run, None
+    
+    active = _registry.active(run_type)
+    if active is None or active["params"] == params:
+        # Déclenchement idempotent : même demande, même exécution
+        return None, active
+    raise HTTPException(
+        status_code=409,
+        detail=f"{label} est déjà en cours d'exécution (run {active['id']}). Veuillez patienter."
+    )
+
+
+def _last_executions(session, agent_types: list) -> dict:
+    """
+    Dernière exécution journalisée par agent, avec ses mesures par étape
+    (temps, CPU, mémoire, octets, tokens : voir src/utils/metrics.py)
+    """
+    from src.storage.repositories import ExecutionLogRepository
+    
+    repo = ExecutionLogRepository(session)
+    executions = {}
+    for agent_type in agent_types:
+        log = repo.get_last_execution(agent_type)
+        if log is None:
+            continue
+        metadata = log.log_metadata or {}
+        executions[agent_type] = {
+            "status": log.status,
+            "start_time": log.start_time.isoformat() if log.start_time else None,
+            "duration_seconds": log.duration_seconds,
+            "documents_processed": log.documents_processed,
+            "errors": len(log.errors or []),
+            "metrics": metadata.get("metrics"),
+        }
+    return executions
+
+
+def _already_running(active: Optional[dict], label: str) -> PipelineStatus:
+    return PipelineStatus(
+        status="already_running",
+        message=f"⏳ {label} est déjà en cours d'exécution",
+        details={"run": active}
+    )
 
 
 @router.post("/agent1/trigger", response_model=PipelineStatus)
@@ -53,14 +115,6 @@ async def trigger_agent1(
     - **cbam_categories**: Catégories CBAM (all, guidance, faq, legislation)
     - **max_cbam_documents**: Nombre max de documents CBAM
     """
-    global _agent1_running
-    
-    if _agent1_running:
-        raise HTTPException(
-            status_code=409,
-            detail="L'Agent 1 est déjà en cours d'exécution. Veuillez patienter."
-        )
-    
     # Compter les documents existants
     from src.storage.database import get_session
     from src.storage.repositories import DocumentRepository, AnalysisRepository
@@ -83,9 +137,14 @@ async def trigger_agent1(
         cbam_categories=request.cbam_categories
     )
     
-    # Lancer en arrière-plan
+    run, active = _start_or_conflict("agent1", request.model_dump(), "L'Agent 1")
+    if run is None:
+        return _already_running(active, "L'Agent 1")
+    
+    # Lancer en arrière-plan (le verrou est libéré à la fin de la tâche)
     background_tasks.add_task(
         _run_agent1_background,
+        run["id"],
         request.keyword,
         request.max_eurlex_documents,
         request.cbam_categories,
@@ -96,6 +155,7 @@ async def trigger_agent1(
         status="started",
         message=f"✅ Agent 1 démarré - Recherche '{request.keyword}'",
         details={
+            "run_id": run["id"],
             "keyword": request.keyword,
             "max_eurlex_documents": request.max_eurlex_documents,
             "cbam_categories": request.cbam_categories,
@@ -114,26 +174,24 @@ async def trigger_agent1_sync(request: PipelineRequest = PipelineRequest()):
     
     Attend la fin de l'exécution avant de retourner le résultat complet.
     ⚠️ Peut prendre plusieurs minutes selon le nombre de documents.
+    Le pipeline est attendu sans bloquer la boucle d'événements : les autres
+    requêtes (statut, /health) restent servies pendant l'exécution.
     """
-    global _agent1_running
-    
-    if _agent1_running:
-        raise HTTPException(
-            status_code=409,
-            detail="L'Agent 1 est déjà en cours d'exécution. Veuillez patienter."
-        )
-    
-    _agent1_running = True
+    run, active = await asyncio.to_thread(_start_or_conflict, "agent1", request.model_dump(), "L'Agent 1")
+    if run is None:
+        return _already_running(active, "L'Agent 1")
     
     try:
-        logger.info("agent1_sync_started", keyword=request.keyword)
+        logger.info("agent1_sync_started", keyword=request.keyword, run_id=run["id"])
         
-        result = run_pipeline(
+        result = await _registry.execute_async(run["id"], lambda progress: run_pipeline_async(
             keyword=request.keyword,
             max_eurlex_documents=request.max_eurlex_documents,
             cbam_categories=request.cbam_categories,
-            max_cbam_documents=request.max_cbam_documents
-        )
+            max_cbam_documents=request.max_cbam_documents,
+            output_sink=headless_sink_name(),
+            progress=progress
+        ))
         
         logger.info("agent1_sync_completed", result=result)
         
@@ -149,7 +207,7 @@ async def trigger_agent1_sync(request: PipelineRequest = PipelineRequest()):
         return PipelineStatus(
             status="completed",
             message=f"✅ Agent 1 terminé - {docs_found} docs trouvés, {docs_processed} traités, {analyses_created} analyses créées ({relevant_count} pertinentes)",
-            details=result
+            details={**result, "run_id": run["id"]}
         )
         
     except Exception as e:
@@ -158,16 +216,19 @@ async def trigger_agent1_sync(request: PipelineRequest = PipelineRequest()):
             status_code=500,
             detail=f"❌ Erreur Agent 1: {str(e)}"
         )
-    finally:
-        _agent1_running = False
 
 
 @router.get("/agent1/status", response_model=PipelineStatus)
 async def get_agent1_status():
     """
     Vérifie si l'Agent 1 est en cours d'exécution et donne des statistiques.
+    
+    Pendant une exécution (n'importe quel processus), `details.run` contient
+    la progression publiée par heartbeat (dont les mesures par étape).
+    `details.last_executions` donne les mesures des dernières exécutions
+    Agent 1A / 1B (temps réel, CPU, mémoire, octets, tokens par étape).
     """
-    global _agent1_running
+    active = _registry.active("agent1")
     
     # Récupérer des stats depuis la base
     from src.storage.database import get_session
@@ -184,18 +245,21 @@ async def get_agent1_status():
         pending_analyses = len(analysis_repo.find_by_validation_status("pending"))
         approved_analyses = len(analysis_repo.find_by_validation_status("approved"))
         rejected_analyses = len(analysis_repo.find_by_validation_status("rejected"))
+        last_executions = _last_executions(session, ["agent_1a", "agent_1b"])
     finally:
         session.close()
     
-    if _agent1_running:
+    if active:
         return PipelineStatus(
             status="running",
             message="⏳ L'Agent 1 est en cours d'exécution...",
             details={
+                "run": active,
                 "documents_total": total_docs,
                 "documents_by_status": docs_by_status,
                 "analyses_pending": pending_analyses,
-                "analyses_approved": approved_analyses
+                "analyses_approved": approved_analyses,
+                "last_executions": last_executions
             }
         )
     
@@ -207,45 +271,42 @@ async def get_agent1_status():
             "documents_by_status": docs_by_status,
             "analyses_pending": pending_analyses,
             "analyses_approved": approved_analyses,
-            "analyses_rejected": rejected_analyses
+            "analyses_rejected": rejected_analyses,
+            "last_executions": last_executions
         }
     )
 
 
-def _run_agent1_background(
+async def _run_agent1_background(
+    run_id: str,
     keyword: str,
     max_eurlex_documents: int,
     cbam_categories: str,
     max_cbam_documents: int
 ):
-    """Exécute l'Agent 1 (pipeline complet) en arrière-plan."""
-    global _agent1_running
-    _agent1_running = True
-    
+    """Exécute l'Agent 1 (pipeline complet) en arrière-plan, verrou déjà pris."""
     try:
-        logger.info("agent1_background_started", keyword=keyword)
+        logger.info("agent1_background_started", keyword=keyword, run_id=run_id)
         
-        result = run_pipeline(
+        result = await _registry.execute_async(run_id, lambda progress: run_pipeline_async(
             keyword=keyword,
             max_eurlex_documents=max_eurlex_documents,
             cbam_categories=cbam_categories,
-            max_cbam_documents=max_cbam_documents
-        )
+            max_cbam_documents=max_cbam_documents,
+            output_sink=headless_sink_name(),
+            progress=progress
+        ))
         
         logger.info("agent1_background_completed", result=result)
         
     except Exception as e:
         logger.error("agent1_background_failed", error=str(e), exc_info=True)
-    finally:
-        _agent1_running = False
 
 
 # ============================================================
 # AGENT 2 - Analyse d'impact
 # ============================================================
 
-_agent2_running = False
-
 
 class Agent2Request(BaseModel):
     """Paramètres pour déclencher l'Agent 2."""
@@ -267,13 +328,14 @@ async def trigger_agent2(
     - **analysis_id**: (optionnel) ID d'une analyse spécifique à traiter
     - **limit**: Nombre max d'analyses à traiter (défaut: 10)
     """
-    global _agent2_running
-    
-    if _agent2_running:
-        raise HTTPException(
-            status_code=409,
-            detail="L'Agent 2 est déjà en cours d'exécution. Veuillez patienter."
-        )
+    active = _registry.active("agent2")
+    if active:
+        if active["params"] != request.model_dump():
+            raise HTTPException(
+                status_code=409,
+                detail=f"L'Agent 2 est déjà en cours d'exécution (run {active['id']}). Veuillez patienter."
+            )
+        return _already_running(active, "L'Agent 2")
     
     # Compter les analyses à traiter AVANT de lancer
     from src.storage.database import get_session
@@ -318,8 +380,13 @@ async def trigger_agent2(
         analyses_to_process=analyses_to_process
     )
     
+    run, active = _start_or_conflict("agent2", request.model_dump(), "L'Agent 2")
+    if run is None:
+        return _already_running(active, "L'Agent 2")
+    
     background_tasks.add_task(
         _run_agent2_background,
+        run["id"],
         request.analysis_id,
         request.limit
     )
@@ -328,6 +395,7 @@ async def trigger_agent2(
         status="started",
         message=f"✅ Agent 2 démarré - {analyses_to_process} analyse(s) à traiter",
         details={
+            "run_id": run["id"],
             "analysis_id": request.analysis_id,
             "limit": request.limit,
             "total_approved": total_approved,
@@ -344,27 +412,17 @@ async def trigger_agent2_sync(request: Agent2Request = Agent2Request()):
     
     Attend la fin de l'exécution avant de retourner le résultat.
     """
-    global _agent2_running
-    
-    if _agent2_running:
-        raise HTTPException(
-            status_code=409,
-            detail="L'Agent 2 est déjà en cours d'exécution. Veuillez patienter."
-        )
-    
-    _agent2_running = True
+    run, active = await asyncio.to_thread(_start_or_conflict, "agent2", request.model_dump(), "L'Agent 2")
+    if run is None:
+        return _already_running(active, "L'Agent 2")
     
     try:
-        from src.agent_2.agent import Agent2
-        
-        logger.info("agent2_sync_started", analysis_id=request.analysis_id)
-        
-        agent = Agent2()
+        logger.info("agent2_sync_started", analysis_id=request.analysis_id, run_id=run["id"])
         
-        if request.analysis_id:
-            result = agent.analyze_impact(request.analysis_id)
-        else:
-            result = agent.run(validation_status="approved", limit=request.limit)
+        # Agent 2 (LangChain) est synchrone : exécuté dans un thread
+        result = await _registry.execute_async(
+            run["id"], lambda progress: asyncio.to_thread(_execute_agent2, request.analysis_id, request.limit)
+        )
         
         logger.info("agent2_sync_completed")
         
@@ -385,7 +443,7 @@ async def trigger_agent2_sync(request: Agent2Request = Agent2Request()):
         return PipelineStatus(
             status="completed",
             message="Agent 2 terminé avec succès",
-            details={"response": content[:1000] if content else "No response"}
+            details={"run_id": run["id"], "response": content[:1000] if content else "No response"}
         )
         
     except Exception as e:
@@ -394,8 +452,6 @@ async def trigger_agent2_sync(request: Agent2Request = Agent2Request()):
             status_code=500,
             detail=f"Erreur lors de l'exécution de l'Agent 2: {str(e)}"
         )
-    finally:
-        _agent2_running = False
 
 
 @router.get("/agent2/status", response_model=PipelineStatus)
@@ -403,7 +459,7 @@ async def get_agent2_status():
     """
     Vérifie si l'Agent 2 est actuellement en cours d'exécution et donne des stats.
     """
-    global _agent2_running
+    active = _registry.active("agent2")
     
     # Récupérer des stats depuis la base
     from src.storage.database import get_session
@@ -421,17 +477,20 @@ async def get_agent2_status():
         # Compter les impact assessments existants
         from src.storage.models import ImpactAssessment
         total_impacts = session.query(ImpactAssessment).count()
+        last_executions = _last_executions(session, ["agent_2"])
         
     finally:
         session.close()
     
-    if _agent2_running:
+    if active:
         return PipelineStatus(
             status="running",
             message="⏳ L'Agent 2 est en cours d'exécution...",
             details={
+                "run": active,
                 "analyses_approved": total_approved,
-                "impact_assessments_created": total_impacts
+                "impact_assessments_created": total_impacts,
+                "last_executions": last_executions
             }
         )
     
@@ -441,34 +500,62 @@ async def get_agent2_status():
         details={
             "analyses_approved": total_approved,
             "impact_assessments_created": total_impacts,
-            "pending": max(0, total_approved - total_impacts)
+            "pending": max(0, total_approved - total_impacts),
+            "last_executions": last_executions
         }
     )
 
 
-def _run_agent2_background(analysis_id: Optional[str], limit: int):
-    """Exécute l'Agent 2 en arrière-plan."""
-    global _agent2_running
-    _agent2_running = True
+def _execute_agent2(analysis_id: Optional[str], limit: int):
+    """Lance l'Agent 2 sur une analyse ou sur les analyses validées."""
+    from src.agent_2.agent import Agent2
     
+    agent = Agent2()
+    
+    if analysis_id:
+        return agent.analyze_impact(analysis_id)
+    return agent.run(validation_status="approved", limit=limit)
+
+
+def _run_agent2_background(run_id: str, analysis_id: Optional[str], limit: int):
+    """Exécute l'Agent 2 en arrière-plan, verrou déjà pris."""
     try:
-        from src.agent_2.agent import Agent2
-        
-        logger.info("agent2_background_started", analysis_id=analysis_id)
+        logger.info("agent2_background_started", analysis_id=analysis_id, run_id=run_id)
         
-        agent = Agent2()
-        
-        if analysis_id:
-            result = agent.analyze_impact(analysis_id)
-        else:
-            result = agent.run(validation_status="approved", limit=limit)
+        result = _registry.execute(run_id, lambda progress: _execute_agent2(analysis_id, limit))
         
         logger.info("agent2_background_completed", result=str(result)[:500])
         
     except Exception as e:
         logger.error("agent2_background_failed", error=str(e), exc_info=True)
+
+
+@router.get("/runs")
+async def list_runs(run_type: Optional[str] = None, limit: int = 20):
+    """
+    Dernières exécutions (tous processus), avec état et progression.
+    
+    - **run_type**: agent1 ou agent2 (optionnel)
+    - **limit**: Nombre max d'exécutions
+    """
+    from src.storage.database import get_session
+    from src.storage.run_repository import RunRepository
+    from src.orchestration.runs import run_to_dict
+    
+    session = get_session()
+    try:
+        return [run_to_dict(run) for run in RunRepository(session).list_recent(run_type, limit)]
     finally:
-        _agent2_running = False
+        session.close()
+
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    """Détail d'une exécution (progression en direct pendant l'exécution)."""
+    run = _registry.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Exécution {run_id} introuvable")
+    return run
 
 
 # Note: L'ancien endpoint /status a été remplacé par /agent1/status et /agent2/status
@@ -14,7 +14,7 @@ class RegulationResponse(BaseModel):
     """
     id: str  # analysis.id
     title: str  # document.title
-    description: str  # document.content (tronqué) ou llm_reasoning
+    description: str  # document.excerpt ou llm_reasoning
     status: str  # validation_status: pending → pending, approved → validated
     type: str  # document.regulation_type
     dateCreated: datetime  # document.created_at
@@ -25,6 +25,7 @@ class RegulationResponse(BaseModel):
     matched_keywords: Optional[List[str]] = None  # analysis.matched_keywords
     matched_nc_codes: Optional[List[str]] = None  # analysis.matched_nc_codes
     llm_reasoning: Optional[str] = None  # analysis.llm_reasoning
+    snippet: Optional[str] = None  # extrait de la recherche plein texte (texte brut, correspondances en <mark>)
     
     class Config:
         from_attributes = True
@@ -33,9 +34,11 @@ class RegulationResponse(BaseModel):
 class RegulationListResponse(BaseModel):
     """Liste paginée de réglementations"""
     regulations: List[RegulationResponse]
-    total: int
+    total: Optional[int] = None  # None avec count=none
     page: int
     limit: int
+    next_cursor: Optional[str] = None  # page suivante (plus anciennes)
+    prev_cursor: Optional[str] = None  # page précédente (plus récentes)
 
 
 class UpdateRegulationStatusRequest(BaseModel):
@@ -44,6 +47,21 @@ class UpdateRegulationStatusRequest(BaseModel):
     comment: Optional[str] = None
 
 
+class SimilarRegulation(BaseModel):
+    """Réglementation proche (similarité TF-IDF du contenu)"""
+    id: Optional[str] = None  # analysis.id (None si le document n'est pas encore analysé)
+    document_id: str
+    title: str
+    type: str
+    similarity: float
+
+
+class SimilarRegulationsResponse(BaseModel):
+    """Réglementations les plus proches d'une réglementation"""
+    regulation_id: str
+    similar: List[SimilarRegulation]
+
+
 class RegulationStatsResponse(BaseModel):
     """Statistiques des réglementations"""
     total: int
@@ -87,9 +105,11 @@ class ImpactAssessmentResponse(BaseModel):
 class ImpactAssessmentListResponse(BaseModel):
     """Liste paginée d'impact assessments"""
     impacts: List[ImpactAssessmentResponse]
-    total: int
+    total: Optional[int] = None  # None avec count=none
     page: int
     limit: int
+    next_cursor: Optional[str] = None  # page suivante (plus anciens)
+    prev_cursor: Optional[str] = None  # page précédente (plus récents)
 
 
 class DashboardStatsResponse(BaseModel):
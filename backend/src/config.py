@@ -1,7 +1,7 @@
 """Configuration globale de l'application."""
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,11 +26,24 @@ class Settings(BaseSettings):
     anthropic_api_key: str = Field(default="", description="ClÇ¸ API Anthropic (Claude)")
     google_api_key: str = Field(default="", description="Cle API Google (Gemini)")
 
+    # Backend LLM : "live" (API Anthropic/Google) ou "offline" (modèle local déterministe)
+    llm_backend: str = Field(default="live", description="live ou offline")
+    offline_llm_seed: int = Field(default=0)
+    offline_llm_latency_distribution: str = Field(default="fixed", description="fixed, uniform ou lognormal")
+    offline_llm_latency_ms: float = Field(default=0.0, description="Latence (médiane pour lognormal)")
+    offline_llm_latency_spread: float = Field(default=0.0, description="Demi-largeur (uniform) ou sigma (lognormal)")
+    offline_llm_error_rate: float = Field(default=0.0, description="Probabilité d'erreur simulée par appel")
+    offline_llm_output_tokens: int = Field(default=0, description="Tokens de sortie annoncés (0: estimés)")
+
     # Database
     database_url: str = Field(
         default="sqlite:///./data/datanova.db",
         description="URL de connexion à la base de donnÇ¸es",
     )
+    api_count_cache_seconds: int = Field(
+        default=30,
+        description="Durée de conservation des totaux des listes de l'API (count=cached)",
+    )
 
     # Email
     smtp_host: str = Field(default="smtp.gmail.com")
@@ -45,6 +58,27 @@ class Settings(BaseSettings):
     # Scheduling
     scheduler_enabled: bool = Field(default=True)
     cron_schedule: str = Field(default="0 8 * * 1", description="Chaque lundi Çÿ 8h")
+    scheduler_per_source: bool = Field(
+        default=True,
+        description="Un job par source activée, à sa cadence (scraping_frequency)",
+    )
+    scheduler_sources_file: str = Field(
+        default="data/sources_config.json",
+        description="Sources planifiées (relatif à base_dir)",
+    )
+    scheduler_jitter_seconds: int = Field(default=300, description="Décalage aléatoire max des départs")
+    scheduler_misfire_grace_seconds: int = Field(
+        default=3600,
+        description="Retard max pour rattraper une exécution manquée (une seule fois)",
+    )
+    scheduler_max_concurrent_sources: int = Field(
+        default=2,
+        description="Collectes simultanées max, toutes sources confondues",
+    )
+    scheduler_budget_wait_seconds: int = Field(
+        default=1800,
+        description="Attente max d'une place dans le budget avant d'ignorer le job",
+    )
 
     # Logging
     log_level: str = Field(default="INFO")
@@ -55,14 +89,104 @@ class Settings(BaseSettings):
         default="https://taxation-customs.ec.europa.eu/carbon-border-adjustment-mechanism/cbam-legislation-and-guidance_en"
     )
 
+    # Index vectoriel TF-IDF haché (classement du backlog, documents similaires)
+    vector_index_enabled: bool = Field(default=True)
+    vector_index_dim: int = Field(default=4096, description="Dimension des vecteurs hachés")
+
+    # Agent 1A - Normalisation du texte extrait
+    text_normalization_enabled: bool = Field(
+        default=True,
+        description="Supprime en-têtes/pieds répétés, numéros de page et césures avant stockage",
+    )
+
     # Company Profile
     default_company_profile: str = Field(default="aerorubber_industries")
+    compiled_profile_pickle: bool = Field(
+        default=False,
+        description="Conserve aussi les profils compilés (Agent 1B) sur disque",
+    )
+    pipeline_all_profiles: bool = Field(
+        default=False,
+        description="Analyse les documents pour tous les profils actifs (mode multi-profils)",
+    )
+    analysis_flush_size: int = Field(
+        default=50,
+        description="Analyses écrites par transaction (0 = sauvegarde document par document)",
+    )
+    pipeline_streaming: bool = Field(
+        default=False,
+        description="Pipeline en flux : chaque document est analysé dès sa sauvegarde (profil unique)",
+    )
+    stream_queue_size: int = Field(default=8, description="Taille des files entre étages du pipeline en flux")
+    stream_fetch_workers: int = Field(default=4, description="Téléchargements simultanés (pipeline en flux)")
+    stream_extract_workers: int = Field(default=2, description="Extractions PDF simultanées (pipeline en flux)")
+    stream_analysis_workers: int = Field(default=1, description="Analyses Agent 1B simultanées (pipeline en flux)")
+    analysis_priority_enabled: bool = Field(
+        default=True,
+        description="Analyse par ordre de priorité (pré-score mots-clés/NC, source, récence)",
+    )
+    analysis_recency_half_life_days: int = Field(
+        default=365,
+        description="Demi-vie (jours) de la récence dans le pré-score de priorité",
+    )
+    # File de travaux distribuée (python -m src.main --worker)
+    job_lease_seconds: int = Field(default=300, description="Durée du bail d'un travail (prolongée par heartbeat)")
+    job_max_attempts: int = Field(default=3, description="Tentatives avant lettre morte")
+    job_retry_backoff_seconds: float = Field(default=30.0, description="Délai avant 1re nouvelle tentative (doublé ensuite)")
+    job_poll_interval_seconds: float = Field(default=2.0, description="Attente d'un worker quand la file est vide")
+    # Collecte incrémentale Agent 1A (points de reprise dans execution_logs)
+    incremental_collection: bool = Field(default=True, description="Ne traiter que les nouveautés depuis la dernière collecte réussie")
+    incremental_revalidate_days: float = Field(default=28.0, description="Cadence de revérification (hash distant) des documents EUR-Lex déjà connus")
+    # Registre d'exécutions (une exécution Agent 1 / Agent 2 à la fois, tous processus confondus)
+    run_lock_ttl_seconds: int = Field(default=120, description="Durée du verrou d'exécution (prolongée par heartbeat)")
+    run_heartbeat_interval_seconds: float = Field(default=15.0, description="Intervalle des heartbeats et de l'écriture de la progression")
+    analysis_output_sink: str = Field(
+        default="auto",
+        description="Sortie des analyses Agent 1B: rich, jsonl, none ou auto (rich si terminal interactif)",
+    )
+    analysis_output_path: Optional[Path] = Field(
+        default=None,
+        description="Fichier JSON lines de la sortie jsonl (défaut: stdout)",
+    )
 
     # Agent 1B - Scoring weights
     keyword_weight: float = Field(default=0.3)
     nc_code_weight: float = Field(default=0.3)
     llm_semantic_weight: float = Field(default=0.4)
 
+    # Agent 1B - Analyse sémantique
+    semantic_content_token_budget: int = Field(
+        default=8000,
+        description="Budget de tokens du contenu envoyé au LLM (passages sélectionnés par BM25)",
+    )
+    semantic_analysis_mode: str = Field(
+        default="single",
+        description="Mode d'analyse sémantique: single (un prompt) ou map_reduce (par passage puis synthèse)",
+    )
+    semantic_map_max_chunks: int = Field(default=12, description="Passages analysés en mode map_reduce")
+    semantic_map_max_concurrency: int = Field(default=4, description="Appels LLM simultanés en mode map_reduce")
+    semantic_chunk_cache_enabled: bool = Field(default=True, description="Cache disque des extractions par passage")
+    semantic_structured_output: bool = Field(
+        default=True,
+        description="Sortie structurée native (tool calling) au lieu des format_instructions dans le prompt",
+    )
+    semantic_structured_output_method: str = Field(
+        default="json_schema",
+        description="function_calling (tool use, tous modèles) ou json_schema (décodage contraint)",
+    )
+    semantic_max_repair_attempts: int = Field(default=1, description="Relances après une réponse hors schéma")
+    semantic_premium_model: str = Field(default="claude-sonnet-4-5-20250929")
+    semantic_triage_model: str = Field(default="claude-haiku-4-5-20251001")
+    semantic_triage_max_tokens: int = Field(default=1200)
+    semantic_tiering_enabled: bool = Field(
+        default=True,
+        description="Triage par le modèle rapide, escalade au premium près des seuils",
+    )
+    semantic_uncertainty_band: float = Field(
+        default=0.08,
+        description="Demi-largeur de la bande d'incertitude autour des seuils de criticité",
+    )
+
     # Criticality thresholds
     critical_threshold: float = Field(default=0.8)
     high_threshold: float = Field(default=0.6)
@@ -23,6 +23,42 @@ def main():
         action="store_true",
         help="Exécuter l'agent une seule fois (mode développement)",
     )
+    parser.add_argument(
+        "--all-profiles",
+        action="store_true",
+        help="Analyser les documents pour tous les profils entreprise actifs",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Worker de la file de travaux (fetch, extract, analyse, impact)",
+    )
+    parser.add_argument(
+        "--job-types",
+        default=None,
+        help="Types de travaux pris par le worker, séparés par des virgules (défaut: tous)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Met en file la collecte et le backlog (documents raw, analyses validées) puis quitte",
+    )
+    parser.add_argument(
+        "--full-collection",
+        action="store_true",
+        help="Revérifier tous les documents connus (désactive la collecte incrémentale)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Pipeline en flux : chaque document est analysé dès sa sauvegarde",
+    )
+    parser.add_argument(
+        "--output",
+        choices=["auto", "rich", "jsonl", "none"],
+        default=None,
+        help="Sortie des analyses Agent 1B (défaut: ANALYSIS_OUTPUT_SINK, auto = rich si terminal)",
+    )
     parser.add_argument(
         "--log-level",
         default=settings.log_level,
@@ -31,20 +67,48 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.output:
+        settings.analysis_output_sink = args.output
+
+    if args.worker:
+        mode = "worker"
+    elif args.enqueue:
+        mode = "enqueue"
+    else:
+        mode = "once" if args.run_once else "scheduler"
 
     logger.info(
         "démarrage_agent",
-        mode="once" if args.run_once else "scheduler",
+        mode=mode,
+        output=settings.analysis_output_sink,
         company_profile=settings.default_company_profile,
     )
 
     try:
-        if args.run_once:
+        if args.worker:
+            # Worker de la file distribuée (autant d'instances que voulu)
+            from src.orchestration.worker import Worker
+
+            job_types = args.job_types.split(",") if args.job_types else None
+            Worker(job_types=job_types).run()
+        elif args.enqueue:
+            import asyncio
+
+            from src.orchestration.worker import enqueue_backlog, enqueue_collection
+
+            asyncio.run(enqueue_collection())
+            enqueue_backlog()
+        elif args.run_once:
             # Mode exécution unique (développement)
-            from src.orchestration.pipeline import run_pipeline
+            from src.orchestration.runs import run_pipeline_exclusive
 
             logger.info("exécution_unique_démarrée")
-            run_pipeline()
+            run_pipeline_exclusive(
+                "cli",
+                all_profiles=args.all_profiles or None,
+                streaming=args.streaming or None,
+                incremental=False if args.full_collection else None,
+            )
             logger.info("exécution_unique_terminée")
         else:
             # Mode scheduler (production)
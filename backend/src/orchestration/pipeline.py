@@ -5,27 +5,45 @@ Orchestration du workflow: Agent 1A → Agent 1B → Notifications
 """
 
 import asyncio
+from datetime import datetime
+
 import structlog
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
+from src.config import settings
 from src.storage.database import get_session
-from src.storage.models import Document
+from src.storage.models import Document, ExecutionLog
 from src.agent_1a.agent import run_agent_1a_combined
 from src.agent_1b.agent import Agent1B
 from src.agent_1b.display import process_and_display_analysis
+from src.agent_1b.priority import DocumentPrioritizer, PreScore, PriorityMetrics
+from src.agent_1b.sinks import AnalysisSink, get_sink
+from src.agent_1b.tools.vector_index import refresh_document_index
+from src.storage.analysis_repository import AnalysisBatchWriter
+from src.utils.metrics import current_metrics, span, with_metrics
 
 logger = structlog.get_logger()
 
 
+@with_metrics
 def run_pipeline(
     keyword: str = "CBAM",
     max_eurlex_documents: int = 10,
     cbam_categories: str = "all",
-    max_cbam_documents: int = 50
+    max_cbam_documents: int = 50,
+    all_profiles: Optional[bool] = None,
+    output_sink: Optional[str] = None,
+    streaming: Optional[bool] = None,
+    progress: Optional[Callable[..., None]] = None,
+    incremental: Optional[bool] = None,
+    collect: bool = True
 ) -> Dict:
     """
     Exécute le pipeline complet de veille réglementaire.
     
+    Point d'entrée synchrone (CLI, scheduler, file de travaux). Depuis une
+    boucle d'événements (routes FastAPI), utiliser run_pipeline_async.
+    
     Workflow:
     1. Lancer Agent 1A pour collecter les nouveaux documents
     2. Si Agent 1A réussit → Charger le profil entreprise
@@ -33,191 +51,604 @@ def run_pipeline(
     4. Pour chaque document:
        - Lancer Agent 1B pour l'analyser
        - Mettre à jour workflow_status = 'analyzed'
-    5. Retourner les statistiques
+    5. Retourner les statistiques (avec mesures par étape, voir src/utils/metrics.py)
     
     Args:
         keyword: Mot-clé pour EUR-Lex (CBAM, EUDR, CSRD)
         max_eurlex_documents: Nombre max de documents EUR-Lex
         cbam_categories: Catégories CBAM (all, guidance, faq, etc.)
         max_cbam_documents: Nombre max de documents CBAM
+        all_profiles: Analyser pour tous les profils actifs (défaut: settings.pipeline_all_profiles)
+        output_sink: Sortie des analyses rich, jsonl, none ou auto (défaut: settings.analysis_output_sink)
+        streaming: Pipeline en flux, chaque document analysé dès sa sauvegarde
+            (défaut: settings.pipeline_streaming ; profil unique seulement)
+        progress: Reçoit les compteurs de progression en mots-clés
+            (voir src/orchestration/runs.py::RunProgress)
+        incremental: Collecte depuis la dernière exécution réussie
+            (défaut: settings.incremental_collection ; pipeline en flux non concerné)
+        collect: Lancer Agent 1A ; False pour analyser seulement les documents
+            déjà collectés (jobs par source du scheduler)
         
     Returns:
         dict: Résultat avec statistiques complètes
     """
+    all_profiles, streaming, sink = _pipeline_options(all_profiles, streaming, output_sink)
+    progress = progress or (lambda **counters: None)
+    started_at = datetime.utcnow()
     
-    logger.info("pipeline_started")
+    logger.info("pipeline_started", all_profiles=all_profiles, streaming=streaming, output_sink=sink.name)
     
     try:
+        if streaming and collect:
+            from src.orchestration.streaming import run_streaming_pipeline
+            
+            progress(stage="streaming")
+            return asyncio.run(run_streaming_pipeline(
+                load_company_profile(),
+                keyword=keyword,
+                max_eurlex_documents=max_eurlex_documents,
+                cbam_categories=cbam_categories,
+                max_cbam_documents=max_cbam_documents,
+                output_sink=sink.name
+            ))
+        
         # ====================================================================
         # ÉTAPE 1 : AGENT 1A - COLLECTE DES DOCUMENTS
         # ====================================================================
-        logger.info("step_1_launching_agent_1a")
+        if collect:
+            logger.info("step_1_launching_agent_1a")
+            progress(stage="agent_1a")
+            
+            result_1a = _check_agent_1a(asyncio.run(run_agent_1a_combined(
+                keyword=keyword,
+                max_eurlex_documents=max_eurlex_documents,
+                cbam_categories=cbam_categories,
+                max_cbam_documents=max_cbam_documents,
+                incremental=incremental
+            )), progress)
+        else:
+            result_1a = _collect_skipped()
         
-        result_1a = asyncio.run(run_agent_1a_combined(
-            keyword=keyword,
-            max_eurlex_documents=max_eurlex_documents,
-            cbam_categories=cbam_categories,
-            max_cbam_documents=max_cbam_documents
-        ))
+        return _analyze_collected(result_1a, all_profiles, sink, progress, started_at)
         
-        # Vérifier si Agent 1A a réussi
-        if result_1a.get("status") != "success":
-            error_msg = result_1a.get("error", "Unknown error")
-            logger.error("agent_1a_failed", error=error_msg)
-            raise Exception(f"Agent 1A failed: {error_msg}")
+    except Exception as e:
+        logger.error("pipeline_failed", error=str(e), exc_info=True)
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
+@with_metrics
+async def run_pipeline_async(
+    keyword: str = "CBAM",
+    max_eurlex_documents: int = 10,
+    cbam_categories: str = "all",
+    max_cbam_documents: int = 50,
+    all_profiles: Optional[bool] = None,
+    output_sink: Optional[str] = None,
+    streaming: Optional[bool] = None,
+    progress: Optional[Callable[..., None]] = None,
+    incremental: Optional[bool] = None,
+    collect: bool = True
+) -> Dict:
+    """
+    Pipeline complet, à attendre depuis une boucle d'événements (routes
+    FastAPI, AsyncIOScheduler)
+    
+    Agent 1A s'exécute dans la boucle appelante (requêtes HTTP concurrentes,
+    extraction PDF et écritures en base dans des threads) ; les étapes
+    synchrones suivantes (base de données, Agent 1B) sont déléguées à un
+    thread : la boucle reste disponible pour les autres requêtes.
+    
+    Args:
+        Voir run_pipeline
         
-        logger.info(
-            "agent_1a_completed",
-            documents_processed=result_1a.get("documents_processed", 0),
-            documents_unchanged=result_1a.get("documents_unchanged", 0)
-        )
+    Returns:
+        dict: Résultat avec statistiques complètes (même format que run_pipeline)
+    """
+    all_profiles, streaming, sink = _pipeline_options(all_profiles, streaming, output_sink)
+    progress = progress or (lambda **counters: None)
+    started_at = datetime.utcnow()
+    
+    logger.info("pipeline_started", all_profiles=all_profiles, streaming=streaming, output_sink=sink.name,
+                mode="async")
+    
+    try:
+        if streaming and collect:
+            from src.orchestration.streaming import run_streaming_pipeline
+            
+            progress(stage="streaming")
+            company_profile = await asyncio.to_thread(load_company_profile)
+            return await run_streaming_pipeline(
+                company_profile,
+                keyword=keyword,
+                max_eurlex_documents=max_eurlex_documents,
+                cbam_categories=cbam_categories,
+                max_cbam_documents=max_cbam_documents,
+                output_sink=sink.name
+            )
         
-        # ====================================================================
-        # ÉTAPE 2 : CHARGER LE PROFIL ENTREPRISE
-        # ====================================================================
-        logger.info("step_2_loading_company_profile")
+        if collect:
+            logger.info("step_1_launching_agent_1a")
+            progress(stage="agent_1a")
+            
+            result_1a = _check_agent_1a(await run_agent_1a_combined(
+                keyword=keyword,
+                max_eurlex_documents=max_eurlex_documents,
+                cbam_categories=cbam_categories,
+                max_cbam_documents=max_cbam_documents,
+                incremental=incremental
+            ), progress)
+        else:
+            result_1a = _collect_skipped()
+        
+        # Le contexte (mesures, span courant) suit le thread
+        return await asyncio.to_thread(_analyze_collected, result_1a, all_profiles, sink, progress, started_at)
+        
+    except Exception as e:
+        logger.error("pipeline_failed", error=str(e), exc_info=True)
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
+def _pipeline_options(
+    all_profiles: Optional[bool],
+    streaming: Optional[bool],
+    output_sink: Optional[str]
+) -> Tuple[bool, bool, AnalysisSink]:
+    """Options par défaut (settings) : tous profils, flux, sortie des analyses"""
+    if all_profiles is None:
+        all_profiles = settings.pipeline_all_profiles
+    if streaming is None:
+        streaming = settings.pipeline_streaming
+    if streaming and all_profiles:
+        logger.warning("streaming_disabled_for_all_profiles")
+        streaming = False
+    return all_profiles, streaming, get_sink(output_sink)
+
+
+def _check_agent_1a(result_1a: Dict, progress: Callable[..., None]) -> Dict:
+    """
+    Vérifie le résultat d'Agent 1A et publie la progression
+    
+    Raises:
+        Exception: Agent 1A en erreur
+    """
+    if result_1a.get("status") != "success":
+        error_msg = result_1a.get("error", "Unknown error")
+        logger.error("agent_1a_failed", error=error_msg)
+        raise Exception(f"Agent 1A failed: {error_msg}")
+    
+    logger.info(
+        "agent_1a_completed",
+        documents_processed=result_1a.get("documents_processed", 0),
+        documents_unchanged=result_1a.get("documents_unchanged", 0)
+    )
+    progress(
+        stage="agent_1a_completed",
+        documents_found=result_1a.get("total_found", 0),
+        documents_processed=result_1a.get("documents_processed", 0),
+        metrics=current_metrics().snapshot()
+    )
+    return result_1a
+
+
+def _collect_skipped() -> Dict:
+    # Collecte faite par les jobs par source (src/orchestration/scheduler.py)
+    logger.info("step_1_skipped_collect_disabled")
+    return {"status": "skipped"}
+
+
+def _analyze_collected(
+    result_1a: Dict,
+    all_profiles: bool,
+    sink: AnalysisSink,
+    progress: Callable[..., None],
+    started_at: datetime
+) -> Dict:
+    """
+    Étapes 2 à 5 du pipeline (synchrones : base de données, Agent 1B)
+    
+    Args:
+        result_1a: Résultat de la collecte
+        all_profiles: Analyser pour tous les profils actifs
+        sink: Sortie des analyses
+        progress: Compteurs de progression
+        started_at: Début du pipeline (journal d'exécution)
         
-        company_profile = load_company_profile()
+    Returns:
+        dict: Résultat du pipeline
+    """
+    # Index de similarité (/similar) reconstruit avec les documents collectés
+    if result_1a.get("status") == "success":
+        with span("vector_index"):
+            refresh_document_index(get_session)
+    
+    # ====================================================================
+    # ÉTAPE 2 : CHARGER LE PROFIL ENTREPRISE
+    # ====================================================================
+    logger.info("step_2_loading_company_profile")
+    
+    with span("load_profile"):
+        if all_profiles:
+            company_profiles = load_active_company_profiles()
+            company_profile = company_profiles[0]
+        else:
+            company_profile = load_company_profile()
+    
+    logger.info(
+        "company_profile_loaded",
+        company=company_profile.get("company_name"),
+        keywords=len(company_profile.get("keywords", [])),
+        nc_codes=len(company_profile.get("nc_codes", {}))
+    )
+    
+    # ====================================================================
+    # ÉTAPE 3 : RÉCUPÉRER LES DOCUMENTS NON ANALYSÉS
+    # ====================================================================
+    logger.info("step_3_fetching_unanalyzed_documents")
+    
+    session = get_session()
+    
+    try:
+        # Chercher les documents avec workflow_status = 'raw'
+        with span("fetch_unanalyzed") as stage:
+            unanalyzed_docs = session.query(Document).filter(
+                Document.workflow_status == "raw"
+            ).all()
+            stage.add(items=len(unanalyzed_docs))
         
         logger.info(
-            "company_profile_loaded",
-            company=company_profile.get("company_name"),
-            keywords=len(company_profile.get("keywords", [])),
-            nc_codes=len(company_profile.get("nc_codes", {}))
+            "unanalyzed_documents_found",
+            count=len(unanalyzed_docs)
         )
         
+        if len(unanalyzed_docs) == 0:
+            logger.info("no_documents_to_analyze")
+            return {
+                "status": "success",
+                "agent_1a": result_1a,
+                "agent_1b": {
+                    "documents_analyzed": 0,
+                    "relevant_count": 0,
+                    "critical_count": 0
+                }
+            }
+        
+        if all_profiles:
+            progress(stage="agent_1b", documents_total=len(unanalyzed_docs))
+            result = {
+                "status": "success",
+                "agent_1a": result_1a,
+                "agent_1b": _analyze_for_all_profiles(session, unanalyzed_docs, company_profiles, sink)
+            }
+            logger.info("pipeline_completed", result=result)
+            return result
+        
+        # Les documents prioritaires (pré-score), sinon les plus proches du
+        # profil, passent en premier
+        pre_scores = {}
+        with span("prioritize", items=len(unanalyzed_docs)):
+            if settings.analysis_priority_enabled:
+                unanalyzed_docs, pre_scores = _order_by_priority(unanalyzed_docs, company_profile)
+            if not pre_scores and settings.vector_index_enabled:
+                unanalyzed_docs = _order_by_profile_similarity(unanalyzed_docs, company_profile)
+        priority_metrics = PriorityMetrics()
+        enqueued_at = {doc.id: priority_metrics.enqueued() for doc in unanalyzed_docs if doc.id in pre_scores}
+        
         # ====================================================================
-        # ÉTAPE 3 : RÉCUPÉRER LES DOCUMENTS NON ANALYSÉS
+        # ÉTAPE 4 : AGENT 1B - ANALYSE DES DOCUMENTS
         # ====================================================================
-        logger.info("step_3_fetching_unanalyzed_documents")
+        logger.info("step_4_launching_agent_1b", count=len(unanalyzed_docs))
+        progress(stage="agent_1b", documents_total=len(unanalyzed_docs), documents_analyzed=0, errors=0)
         
-        session = get_session()
+        # Temps d'analyse, dont l'attente LLM (tokens via LLMUsageTracker)
+        stage = span("analysis")
+        agent = Agent1B(company_profile)
         
-        try:
-            # Chercher les documents avec workflow_status = 'raw'
-            unanalyzed_docs = session.query(Document).filter(
-                Document.workflow_status == "raw"
-            ).all()
-            
-            logger.info(
-                "unanalyzed_documents_found",
-                count=len(unanalyzed_docs)
-            )
-            
-            if len(unanalyzed_docs) == 0:
-                logger.info("no_documents_to_analyze")
-                return {
-                    "status": "success",
-                    "agent_1a": result_1a,
-                    "agent_1b": {
-                        "documents_analyzed": 0,
-                        "relevant_count": 0,
-                        "critical_count": 0
-                    }
-                }
-            
-            # ====================================================================
-            # ÉTAPE 4 : AGENT 1B - ANALYSE DES DOCUMENTS
-            # ====================================================================
-            logger.info("step_4_launching_agent_1b", count=len(unanalyzed_docs))
-            
-            agent = Agent1B(company_profile)
-            
-            analyses_created = []
-            relevant_count = 0
-            critical_count = 0
-            analysis_errors = []
-            
-            for idx, doc in enumerate(unanalyzed_docs, 1):
-                try:
-                    logger.info(
-                        "analyzing_document",
-                        index=f"{idx}/{len(unanalyzed_docs)}",
-                        document_id=doc.id,
-                        title=doc.title[:60]
-                    )
-                    
-                    # Analyser le document
-                    analysis = agent.analyze_document(
-                        document_id=doc.id,
-                        document_content=doc.content or "",
-                        document_title=doc.title,
-                        regulation_type=doc.regulation_type or "CBAM"
-                    )
-                    
-                    # Sauvegarder l'analyse en BDD
-                    analysis_id = process_and_display_analysis(analysis, save_to_db=True)
-                    
-                    if analysis_id:
-                        analyses_created.append(analysis_id)
-                    
-                    # Compter les stats
-                    if analysis.is_relevant:
-                        relevant_count += 1
-                    if analysis.relevance_score.criticality.value == "CRITICAL":
-                        critical_count += 1
-                    
-                    # Mettre à jour le workflow_status
+        analyses_created = []
+        relevant_count = 0
+        critical_count = 0
+        analysis_errors = []
+        
+        # Écriture groupée : analyses et statuts commités tous les N documents
+        writer = AnalysisBatchWriter(session) if settings.analysis_flush_size > 0 else None
+        
+        for idx, doc in enumerate(unanalyzed_docs, 1):
+            pre_score = pre_scores.get(doc.id)
+            try:
+                if pre_score:
+                    priority_metrics.started(pre_score.priority, enqueued_at[doc.id])
+                logger.info(
+                    "analyzing_document",
+                    index=f"{idx}/{len(unanalyzed_docs)}",
+                    document_id=doc.id,
+                    title=doc.title[:60],
+                    priority=pre_score.priority if pre_score else None
+                )
+                
+                # Analyser le document
+                analysis = agent.analyze_document(
+                    document_id=doc.id,
+                    document_content=doc.content or "",
+                    document_title=doc.title,
+                    regulation_type=doc.regulation_type or "CBAM"
+                )
+                
+                # Sauvegarder l'analyse en BDD (au prochain flush du lot en mode groupé)
+                analysis_id = process_and_display_analysis(
+                    analysis, save_to_db=True, sink=sink, writer=writer
+                )
+                
+                if analysis_id:
+                    analyses_created.append(analysis_id)
+                
+                # Mettre à jour le workflow_status (en mode groupé : par le writer,
+                # avec l'analyse, à l'abri du rollback d'un document en échec)
+                if writer is None:
                     doc.workflow_status = "analyzed"
                     doc.analyzed_at = analysis.analysis_timestamp
                     session.commit()
-                    
-                    logger.info(
-                        "document_analyzed",
-                        document_id=doc.id,
-                        is_relevant=analysis.is_relevant,
-                        criticality=analysis.relevance_score.criticality.value
-                    )
-                    
-                except Exception as e:
-                    logger.error(
-                        "analysis_failed",
-                        document_id=doc.id,
-                        error=str(e),
-                        exc_info=True
-                    )
-                    analysis_errors.append({
-                        "document_id": doc.id,
-                        "error": str(e)
-                    })
-                    session.rollback()
+                
+                # Compter les stats
+                if analysis.is_relevant:
+                    relevant_count += 1
+                if analysis.relevance_score.criticality.value == "CRITICAL":
+                    critical_count += 1
+                
+                if pre_score:
+                    priority_metrics.completed(pre_score.priority, enqueued_at[doc.id])
+                
+                logger.info(
+                    "document_analyzed",
+                    document_id=doc.id,
+                    is_relevant=analysis.is_relevant,
+                    criticality=analysis.relevance_score.criticality.value
+                )
+                
+            except Exception as e:
+                logger.error(
+                    "analysis_failed",
+                    document_id=doc.id,
+                    error=str(e),
+                    exc_info=True
+                )
+                analysis_errors.append({
+                    "document_id": doc.id,
+                    "error": str(e)
+                })
+                session.rollback()
             
-            logger.info(
-                "agent_1b_completed",
-                analyzed=len(analyses_created),
-                relevant=relevant_count,
-                critical=critical_count,
+            progress(
+                documents_analyzed=len(analyses_created),
+                relevant_count=relevant_count,
                 errors=len(analysis_errors)
             )
-            
-            # ====================================================================
-            # RÉSULTAT FINAL
-            # ====================================================================
-            
-            result = {
-                "status": "success",
-                "agent_1a": result_1a,
-                "agent_1b": {
-                    "documents_analyzed": len(analyses_created),
-                    "relevant_count": relevant_count,
-                    "critical_count": critical_count,
-                    "errors": len(analysis_errors)
-                }
-            }
-            
-            logger.info("pipeline_completed", result=result)
-            
-            return result
-            
-        finally:
-            session.close()
+        stage.finish(items=len(unanalyzed_docs))
+        
+        if writer:
+            try:
+                with span("flush"):
+                    writer.flush()
+            except Exception as e:
+                # Les documents du dernier lot restent "raw" (réanalysés au prochain run)
+                logger.error("analyses_batch_failed", error=str(e), exc_info=True)
+                analysis_errors.append({"document_id": None, "error": str(e)})
+                analyses_created = analyses_created[:writer.written]
+        
+        logger.info(
+            "agent_1b_completed",
+            analyzed=len(analyses_created),
+            relevant=relevant_count,
+            critical=critical_count,
+            errors=len(analysis_errors),
+            semantic_tiers=agent.get_semantic_stats(),
+            priority=priority_metrics.snapshot()
+        )
+        
+        # ====================================================================
+        # RÉSULTAT FINAL
+        # ====================================================================
+        
+        result = {
+            "status": "success",
+            "agent_1a": result_1a,
+            "agent_1b": {
+                "documents_analyzed": len(analyses_created),
+                "relevant_count": relevant_count,
+                "critical_count": critical_count,
+                "errors": len(analysis_errors),
+                "semantic_tiers": agent.get_semantic_stats(),
+                "priority": priority_metrics.snapshot()
+            },
+            "metrics": current_metrics().snapshot()
+        }
+        progress(metrics=result["metrics"])
+        _save_execution_log(session, started_at, result["agent_1b"], analysis_errors, result["metrics"])
+        
+        logger.info("pipeline_completed", result=result)
         
+        return result
+        
+    finally:
+        session.close()
+
+
+def _save_execution_log(
+    session,
+    started_at: datetime,
+    result_1b: Dict,
+    errors: List[Dict],
+    metrics: Dict
+) -> None:
+    """
+    Journalise l'analyse Agent 1B (execution_logs), mesures par étape dans log_metadata
+    
+    Un échec d'écriture n'interrompt pas le pipeline.
+    """
+    end_time = datetime.utcnow()
+    try:
+        session.add(ExecutionLog(
+            agent_type="agent_1b",
+            status="success",
+            start_time=started_at,
+            end_time=end_time,
+            duration_seconds=(end_time - started_at).total_seconds(),
+            documents_processed=result_1b["documents_analyzed"],
+            errors=[str(e["error"]) for e in errors],
+            log_metadata={
+                "relevant_count": result_1b["relevant_count"],
+                "critical_count": result_1b["critical_count"],
+                "priority": result_1b.get("priority"),
+                "metrics": metrics
+            }
+        ))
+        session.commit()
     except Exception as e:
-        logger.error("pipeline_failed", error=str(e), exc_info=True)
-        return {
-            "status": "error",
-            "error": str(e)
+        session.rollback()
+        logger.error("execution_log_failed", agent_type="agent_1b", error=str(e))
+
+
+def _analyze_for_all_profiles(
+    session,
+    documents: list,
+    company_profiles: List[dict],
+    sink: Optional[AnalysisSink] = None
+) -> Dict:
+    """
+    Analyse les documents pour tous les profils (prétraitement partagé).
+    
+    Les analyses de tous les profils sont enregistrées en une transaction.
+    
+    Args:
+        session: Session SQLAlchemy
+        documents: Documents à analyser
+        company_profiles: Profils actifs
+        sink: Sortie des analyses sauvegardées
+    
+    Returns:
+        dict: Statistiques Agent 1B
+    """
+    from src.agent_1b.batch import MultiProfileAnalyzer
+    from src.storage.analysis_repository import AnalysisRepository
+    
+    logger.info(
+        "step_4_launching_agent_1b_batch",
+        documents=len(documents),
+        profiles=len(company_profiles)
+    )
+    
+    analyzer = MultiProfileAnalyzer(company_profiles)
+    batch = analyzer.analyze([
+        (doc.id, doc.content or "", doc.title, doc.regulation_type or "CBAM")
+        for doc in documents
+    ])
+    
+    # Un document en erreur pour un profil reste "raw" pour être réanalysé
+    failed_documents = {error["document_id"] for error in batch.errors}
+    to_save = [a for a in batch.analyses if a.document_id not in failed_documents]
+    
+    saved = AnalysisRepository(session).bulk_save_from_document_analyses(to_save)
+    if sink:
+        for analysis, db_analysis in zip(to_save, saved):
+            sink.emit(analysis, db_analysis.id)
+    
+    per_profile = {}
+    for analysis in to_save:
+        stats = per_profile.setdefault(
+            analysis.company_profile_id, {"analyzed": 0, "relevant": 0, "critical": 0}
+        )
+        stats["analyzed"] += 1
+        stats["relevant"] += int(analysis.is_relevant)
+        stats["critical"] += int(analysis.relevance_score.criticality.value == "CRITICAL")
+    
+    return {
+        "documents_analyzed": len({a.document_id for a in to_save}),
+        "analyses_created": len(saved),
+        "profiles": len(company_profiles),
+        "relevant_count": sum(s["relevant"] for s in per_profile.values()),
+        "critical_count": sum(s["critical"] for s in per_profile.values()),
+        "errors": len(batch.errors),
+        "per_profile": per_profile,
+        "timings": {
+            "prepare_seconds": batch.prepare_seconds,
+            "filter_seconds": batch.filter_seconds,
+            "semantic_seconds": batch.semantic_seconds
+        },
+        "semantic_tiers": analyzer.get_semantic_stats()
+    }
+
+
+def _order_by_priority(documents: list, company_profile: dict) -> Tuple[list, Dict[str, PreScore]]:
+    """
+    Trie les documents par classe de priorité puis pré-score (sans appel LLM).
+    
+    Args:
+        documents: Documents à analyser
+        company_profile: Profil entreprise
+    
+    Returns:
+        Tuple (documents triés, pré-scores par ID) ; ordre d'origine et
+        pré-scores vides en cas d'erreur
+    """
+    try:
+        prioritizer = DocumentPrioritizer(company_profile)
+        pre_scores = {
+            doc.id: prioritizer.pre_score(
+                doc.id, doc.content or "", doc.title, doc.regulation_type, doc.publication_date
+            )
+            for doc in documents
         }
+    except Exception as e:
+        logger.warning("document_prioritization_failed", error=str(e))
+        return documents, {}
+    
+    positions = {doc.id: i for i, doc in enumerate(documents)}
+    ordered = sorted(documents, key=lambda doc: pre_scores[doc.id].sort_key(positions[doc.id]))
+    counts = {}
+    for pre_score in pre_scores.values():
+        counts[pre_score.priority] = counts.get(pre_score.priority, 0) + 1
+    logger.info(
+        "documents_prioritized",
+        count=len(documents),
+        per_priority=counts,
+        top=[(doc.id[:8], pre_scores[doc.id].priority, pre_scores[doc.id].score) for doc in ordered[:3]]
+    )
+    return ordered, pre_scores
+
+
+def _order_by_profile_similarity(documents: list, company_profile: dict) -> list:
+    """
+    Trie les documents par similarité TF-IDF avec le profil entreprise.
+    
+    Args:
+        documents: Documents à analyser
+        company_profile: Profil entreprise
+    
+    Returns:
+        list: Documents triés (ordre d'origine en cas d'erreur)
+    """
+    from src.agent_1b.tools.vector_index import rank_documents_for_profile
+    
+    try:
+        ranking = rank_documents_for_profile(
+            [(doc.id, doc.content or "") for doc in documents],
+            company_profile
+        )
+    except Exception as e:
+        logger.warning("document_ranking_failed", error=str(e))
+        return documents
+    
+    positions = {doc_id: i for i, (doc_id, _) in enumerate(ranking)}
+    logger.info(
+        "documents_ranked_by_similarity",
+        count=len(documents),
+        top=[(doc_id[:8], round(score, 3)) for doc_id, score in ranking[:3]]
+    )
+    return sorted(documents, key=lambda doc: positions.get(doc.id, len(positions)))
 
 
 def load_company_profile(company_name: str = "HUTCHINSON") -> dict:
@@ -250,15 +681,51 @@ def load_company_profile(company_name: str = "HUTCHINSON") -> dict:
         if not profile.active:
             raise ValueError(f"Profil entreprise '{company_name}' est désactivé")
         
-        return {
-            "company_id": profile.id,
-            "company_name": profile.company_name,
-            "nc_codes": profile.nc_codes or [],
-            "keywords": profile.keywords or [],
-            "regulations": profile.regulations or ["CBAM"],
-            "contact_emails": profile.contact_emails or [],
-            "config": profile.config or {}
-        }
+        return _profile_to_dict(profile)
     
     finally:
         session.close()
+
+
+def load_active_company_profiles() -> List[dict]:
+    """
+    Charge tous les profils entreprise actifs (mode multi-profils).
+    
+    Returns:
+        list: Profils formattés pour Agent 1B
+        
+    Raises:
+        ValueError: Si aucun profil actif n'existe en BDD
+    """
+    from src.storage.repositories import CompanyProfileRepository
+    
+    session = get_session()
+    
+    try:
+        profiles = CompanyProfileRepository(session).list_active_profiles()
+        
+        if not profiles:
+            raise ValueError(
+                "Aucun profil entreprise actif en BDD. "
+                "Exécutez d'abord: python scripts/init_db.py"
+            )
+        
+        return [_profile_to_dict(profile) for profile in profiles]
+    
+    finally:
+        session.close()
+
+
+def _profile_to_dict(profile) -> dict:
+    """Formatte un CompanyProfile SQLAlchemy pour Agent 1B"""
+    return {
+        "company_id": profile.id,
+        "company_name": profile.company_name,
+        "nc_codes": profile.nc_codes or [],
+        "keywords": profile.keywords or [],
+        "regulations": profile.regulations or ["CBAM"],
+        "contact_emails": profile.contact_emails or [],
+        "config": profile.config or {},
+        # Clé du cache des profils compilés (Agent 1B)
+        "updated_at": profile.updated_at.isoformat() if profile.updated_at else None
+    }
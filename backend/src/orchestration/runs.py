@@ -0,0 +1,273 @@
+"""
+Exécutions exclusives du pipeline (registre "pipeline_runs" + verrou inter-processus)
+
+Remplace les indicateurs globaux par processus : l'API (plusieurs workers
+uvicorn), le scheduler et la CLI partagent le même verrou en base.
+
+Usage:
+    registry = RunRegistry()
+    run = registry.start("agent1", params)
+    if run is None:
+        ...  # déjà en cours : registry.active("agent1")
+    else:
+        registry.execute(run["id"], lambda progress: run_pipeline(..., progress=progress))
+
+    # Depuis une boucle d'événements (API)
+    await registry.execute_async(run["id"], lambda progress: run_pipeline_async(..., progress=progress))
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from src.config import settings
+from src.storage.database import get_session
+from src.storage.models import PipelineRun
+from src.storage.run_repository import RunRepository
+
+logger = structlog.get_logger()
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def run_to_dict(run: PipelineRun) -> Dict:
+    """Sérialise une exécution (réponse API, détachée de la session)"""
+    return {
+        "id": run.id,
+        "run_type": run.run_type,
+        "state": run.state,
+        "owner": run.owner,
+        "params": run.params or {},
+        "progress": run.progress or {},
+        "error": run.error,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "heartbeat_at": run.heartbeat_at.isoformat() if run.heartbeat_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+
+def _final_state(result) -> Tuple[str, Optional[str]]:
+    """État final d'un résultat (convention {"status": "error"} de run_pipeline)"""
+    if isinstance(result, dict) and result.get("status") == "error":
+        return "failed", str(result.get("error"))
+    return "succeeded", None
+
+
+def _jsonable(value: Dict) -> Dict:
+    """Résultat stockable en colonne JSON (dates, enums... en texte)"""
+    return json.loads(json.dumps(value, default=str))
+
+
+class RunProgress:
+    """
+    Compteurs de progression d'une exécution (thread-safe)
+
+    Appelé par le pipeline (progress(stage="agent_1b", documents_analyzed=3)) ;
+    le thread de heartbeat écrit le dernier état en base.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict = {}
+
+    def __call__(self, **counters) -> None:
+        with self._lock:
+            self._counters.update(counters)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._counters)
+
+
+class RunRegistry:
+    """Démarre, suit et termine les exécutions exclusives"""
+
+    def __init__(
+        self,
+        session_factory: Callable = get_session,
+        owner: Optional[str] = None,
+        lock_ttl_seconds: Optional[int] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            session_factory: Fabrique de sessions SQLAlchemy
+            owner: Identifiant du processus (défaut: hôte-pid)
+            lock_ttl_seconds: Durée du verrou (défaut: settings.run_lock_ttl_seconds)
+            heartbeat_interval: Intervalle des heartbeats (défaut: settings.run_heartbeat_interval_seconds)
+        """
+        self.session_factory = session_factory
+        self.owner = owner or default_owner()
+        self.lock_ttl_seconds = lock_ttl_seconds or settings.run_lock_ttl_seconds
+        self.heartbeat_interval = heartbeat_interval or settings.run_heartbeat_interval_seconds
+
+    def start(self, run_type: str, params: Optional[Dict] = None, lock_name: Optional[str] = None) -> Optional[Dict]:
+        """
+        Prend le verrou et enregistre l'exécution
+
+        Args:
+            run_type: agent1, agent2 ou collect
+            params: Paramètres du déclenchement
+            lock_name: Nom du verrou (défaut: run_type)
+
+        Returns:
+            Exécution créée (dict), ou None si le verrou est déjà pris
+        """
+        session = self.session_factory()
+        try:
+            run = RunRepository(session).start(run_type, self.owner, params, self.lock_ttl_seconds, lock_name)
+            return run_to_dict(run) if run else None
+        finally:
+            session.close()
+
+    def active(self, lock_name: str) -> Optional[Dict]:
+        """Exécution détentrice du verrou (tous processus), ou None"""
+        session = self.session_factory()
+        try:
+            run = RunRepository(session).find_active(lock_name)
+            return run_to_dict(run) if run else None
+        finally:
+            session.close()
+
+    def get(self, run_id: str) -> Optional[Dict]:
+        session = self.session_factory()
+        try:
+            run = RunRepository(session).find_by_id(run_id)
+            return run_to_dict(run) if run else None
+        finally:
+            session.close()
+
+    def execute(self, run_id: str, fn: Callable[[RunProgress], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Exécute fn sous le verrou de l'exécution (heartbeat + progression), puis
+        enregistre l'état final et libère le verrou
+
+        Un résultat {"status": "error"} (convention de run_pipeline) termine
+        l'exécution en "failed".
+
+        Args:
+            run_id: Exécution démarrée par start()
+            fn: Reçoit le RunProgress à alimenter, retourne le résultat
+
+        Returns:
+            Résultat de fn (les exceptions sont propagées)
+        """
+        progress, stop, heartbeat = self._begin(run_id)
+        state, result, error = "failed", None, None
+        try:
+            result = fn(progress)
+            state, error = _final_state(result)
+            return result
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._end(run_id, progress, stop, heartbeat, state, result, error)
+
+    async def execute_async(
+        self,
+        run_id: str,
+        fn: Callable[[RunProgress], Awaitable[Optional[Dict]]]
+    ) -> Optional[Dict]:
+        """
+        Comme execute, pour une coroutine (routes FastAPI) : les écritures du
+        registre en fin d'exécution sont faites hors de la boucle d'événements
+
+        Args:
+            run_id: Exécution démarrée par start()
+            fn: Reçoit le RunProgress à alimenter, retourne une coroutine
+
+        Returns:
+            Résultat de fn (les exceptions sont propagées)
+        """
+        progress, stop, heartbeat = self._begin(run_id)
+        state, result, error = "failed", None, None
+        try:
+            result = await fn(progress)
+            state, error = _final_state(result)
+            return result
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            await asyncio.to_thread(self._end, run_id, progress, stop, heartbeat, state, result, error)
+
+    def _begin(self, run_id: str) -> Tuple[RunProgress, threading.Event, threading.Thread]:
+        progress = RunProgress()
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(run_id, progress, stop), daemon=True)
+        heartbeat.start()
+        return progress, stop, heartbeat
+
+    def _end(
+        self,
+        run_id: str,
+        progress: RunProgress,
+        stop: threading.Event,
+        heartbeat: threading.Thread,
+        state: str,
+        result,
+        error: Optional[str]
+    ) -> None:
+        """Arrête le heartbeat, enregistre l'état final et libère le verrou"""
+        stop.set()
+        heartbeat.join()
+        session = self.session_factory()
+        try:
+            RunRepository(session).finish(
+                run_id, self.owner, state,
+                result=_jsonable(result) if isinstance(result, dict) else None,
+                error=error,
+                progress=progress.snapshot()
+            )
+        except Exception as e:
+            # Le verrou expirera de lui-même (lock_ttl_seconds)
+            logger.error("run_finish_failed", run_id=run_id, error=str(e))
+        finally:
+            session.close()
+
+    def _heartbeat(self, run_id: str, progress: RunProgress, stop: threading.Event) -> None:
+        """Prolonge le verrou et publie la progression tant que l'exécution tourne"""
+        while not stop.wait(self.heartbeat_interval):
+            session = self.session_factory()
+            try:
+                if not RunRepository(session).heartbeat(run_id, self.owner, progress.snapshot(),
+                                                        self.lock_ttl_seconds):
+                    logger.warning("run_heartbeat_rejected", run_id=run_id, owner=self.owner)
+                    return
+            except Exception as e:
+                logger.warning("run_heartbeat_failed", run_id=run_id, error=str(e))
+            finally:
+                session.close()
+
+
+def run_pipeline_exclusive(trigger: str, registry: Optional[RunRegistry] = None, **pipeline_kwargs) -> Optional[Dict]:
+    """
+    Exécute run_pipeline sous le verrou "agent1" (scheduler, CLI)
+
+    Args:
+        trigger: Origine du déclenchement (scheduler, cli), enregistrée dans params
+        registry: Registre (défaut: RunRegistry())
+        **pipeline_kwargs: Paramètres de run_pipeline
+
+    Returns:
+        Résultat du pipeline, ou None si une exécution Agent 1 est déjà en cours
+    """
+    from src.orchestration.pipeline import run_pipeline
+
+    registry = registry or RunRegistry()
+    params = {"trigger": trigger, **{k: v for k, v in pipeline_kwargs.items() if v is not None}}
+    run = registry.start("agent1", params)
+    if run is None:
+        active = registry.active("agent1") or {}
+        logger.warning("pipeline_run_skipped_already_running", trigger=trigger,
+                       run_id=active.get("id"), owner=active.get("owner"))
+        return None
+    return registry.execute(run["id"], lambda progress: run_pipeline(progress=progress, **pipeline_kwargs))
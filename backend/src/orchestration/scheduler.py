@@ -1,61 +1,252 @@
 """
-Scheduler pour l'exécution automatique hebdomadaire
+Scheduler pour l'exécution automatique de la veille
 
-Utilise APScheduler pour planifier les exécutions.
+Utilise APScheduler pour planifier les exécutions :
+- par source (settings.scheduler_per_source) : un job par source activée de
+  data/sources_config.json, à sa cadence (scraping_frequency : daily, weekly,
+  monthly), puis analyse des nouveaux documents par le pipeline
+- sinon (ou si aucune source n'est activée) : un job unique qui exécute tout
+  le pipeline selon settings.cron_schedule
+
+Protection des jobs par source :
+- jitter : départs étalés de quelques minutes (pas de rafale sur les sites)
+- coalesce + misfire_grace_time : les exécutions manquées (arrêt, veille) ne
+  sont rattrapées qu'une fois
+- max_instances=1 et verrou "collect:<source>" en base (voir
+  src/storage/run_repository.py) : pas de chevauchement, même entre processus
+- budget partagé (settings.scheduler_max_concurrent_sources) : nombre de
+  collectes simultanées borné, toutes sources confondues
 """
 
+import asyncio
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 import structlog
 
+from src.agent_1a.agent import run_agent_1a_combined
+from src.agent_1b.sinks import headless_sink_name
+from src.agent_1b.tools.vector_index import refresh_document_index
 from src.config import settings
-from src.orchestration.pipeline import run_pipeline
+from src.orchestration.runs import RunRegistry, run_pipeline_exclusive
 
 logger = structlog.get_logger()
 
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+# Jours crontab (0/7 = dimanche) -> noms APScheduler (0 = lundi en 3.x)
+_CRONTAB_DAYS = {"0": "sun", "1": "mon", "2": "tue", "3": "wed", "4": "thu", "5": "fri", "6": "sat", "7": "sun"}
+
 
 def scheduled_job():
-    """Job planifié qui exécute le pipeline."""
+    """Job planifié qui exécute le pipeline (ignoré si une exécution est déjà en cours)."""
     logger.info("job_planifié_démarré")
-    
+
     try:
-        result = run_pipeline()
-        logger.info("job_planifié_terminé", result=result)
+        result = run_pipeline_exclusive("scheduler", output_sink=headless_sink_name())
+        if result is not None:
+            logger.info("job_planifié_terminé", result=result)
     except Exception as e:
         logger.error("job_planifié_erreur", error=str(e), exc_info=True)
 
 
+def default_schedule_path() -> Path:
+    return Path(settings.base_dir) / settings.scheduler_sources_file
+
+
+def load_scheduled_sources(path: Optional[Path] = None) -> List[Dict]:
+    """
+    Sources activées à planifier
+
+    Args:
+        path: Fichier des sources (défaut: settings.scheduler_sources_file)
+
+    Returns:
+        Sources activées (id, regulation_type, scraping_frequency...)
+    """
+    path = path or default_schedule_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sources = json.load(f).get("sources", [])
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("sources_config_unavailable", path=str(path), error=str(e))
+        return []
+    return [source for source in sources if source.get("enabled")]
+
+
+def _day_of_week(field: str) -> str:
+    """Champ jour de semaine crontab (0 = dimanche) en noms APScheduler"""
+    return ",".join(
+        "-".join(_CRONTAB_DAYS.get(day, day) for day in part.split("-"))
+        for part in field.split(",")
+    )
+
+
+def cron_trigger(cron: str, frequency: Optional[str] = None, jitter: Optional[int] = None) -> CronTrigger:
+    """
+    Déclencheur d'une cadence, à l'heure de l'expression crontab de référence
+
+    Args:
+        cron: Expression crontab (minute heure jour mois jour_semaine)
+        frequency: daily, weekly ou monthly (défaut: l'expression telle quelle)
+        jitter: Décalage aléatoire max en secondes
+
+    Returns:
+        CronTrigger
+    """
+    values = cron.split()
+    if len(values) != 5:
+        raise ValueError(f"Expression crontab invalide: {cron}")
+    minute, hour, day, month, day_of_week = values
+
+    if frequency is None:
+        fields = {"day": day, "month": month, "day_of_week": _day_of_week(day_of_week)}
+    elif frequency == "daily":
+        fields = {}
+    elif frequency == "weekly":
+        fields = {"day_of_week": _day_of_week(day_of_week) if day_of_week != "*" else "mon"}
+    elif frequency == "monthly":
+        fields = {"day": day if day != "*" else "1"}
+    else:
+        raise ValueError(f"Fréquence inconnue: {frequency} (attendu: {', '.join(FREQUENCIES)})")
+    return CronTrigger(minute=minute, hour=hour, jitter=jitter, **fields)
+
+
+def collect_source(
+    source: Dict,
+    budget: threading.Semaphore,
+    registry: Optional[RunRegistry] = None,
+    analyze: bool = True
+) -> Optional[Dict]:
+    """
+    Job d'une source : collecte Agent 1A sous verrou, puis analyse des nouveaux documents
+
+    Args:
+        source: Source de data/sources_config.json
+        budget: Budget de collectes simultanées partagé par les jobs
+        registry: Registre d'exécutions (défaut: RunRegistry())
+        analyze: Lancer le pipeline sans collecte si de nouveaux documents sont arrivés
+
+    Returns:
+        Résultat de la collecte, ou None si ignorée (source déjà en cours, budget épuisé)
+    """
+    source_id = source["id"]
+    if not budget.acquire(timeout=settings.scheduler_budget_wait_seconds):
+        logger.warning("source_job_skipped_budget_exhausted", source=source_id)
+        return None
+
+    try:
+        registry = registry or RunRegistry()
+        keyword = source.get("regulation_type") or "CBAM"
+        params = {"trigger": "scheduler", "source": source_id, "keyword": keyword}
+        run = registry.start("collect", params, lock_name=f"collect:{source_id}")
+        if run is None:
+            logger.warning("source_job_skipped_already_running", source=source_id)
+            return None
+
+        logger.info("source_job_started", source=source_id, run_id=run["id"])
+        result = registry.execute(run["id"], lambda progress: asyncio.run(run_agent_1a_combined(
+            keyword=keyword,
+            # La recherche des documents d'orientation est propre à CBAM
+            max_cbam_documents=50 if keyword.upper() == "CBAM" else 0
+        )))
+    finally:
+        budget.release()
+
+    logger.info(
+        "source_job_completed",
+        source=source_id,
+        status=result.get("status"),
+        documents_processed=result.get("documents_processed", 0)
+    )
+    if result.get("status") == "success" and result.get("documents_processed", 0) > 0:
+        refresh_document_index()
+        if analyze:
+            run_pipeline_exclusive("scheduler", collect=False, output_sink=headless_sink_name())
+    return result
+
+
+def _source_job(source: Dict, budget: threading.Semaphore) -> None:
+    try:
+        collect_source(source, budget)
+    except Exception as e:
+        logger.error("source_job_error", source=source.get("id"), error=str(e), exc_info=True)
+
+
+def build_source_jobs(scheduler, sources: List[Dict], budget: Optional[threading.Semaphore] = None) -> List:
+    """
+    Ajoute un job par source à sa cadence
+
+    Args:
+        scheduler: Scheduler APScheduler
+        sources: Sources activées (voir load_scheduled_sources)
+        budget: Budget partagé (défaut: settings.scheduler_max_concurrent_sources)
+
+    Returns:
+        Jobs ajoutés
+    """
+    budget = budget or threading.BoundedSemaphore(settings.scheduler_max_concurrent_sources)
+    jobs = []
+    for source in sources:
+        frequency = source.get("scraping_frequency") or "weekly"
+        if frequency not in FREQUENCIES:
+            logger.warning("source_frequency_unknown", source=source["id"], frequency=frequency)
+            frequency = "weekly"
+        jobs.append(scheduler.add_job(
+            _source_job,
+            trigger=cron_trigger(settings.cron_schedule, frequency, jitter=settings.scheduler_jitter_seconds),
+            args=[source, budget],
+            id=f"collect_{source['id']}",
+            name=f"Veille {source.get('name', source['id'])} ({frequency})",
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=settings.scheduler_misfire_grace_seconds,
+            replace_existing=True,
+        ))
+    return jobs
+
+
 def start_scheduler():
     """
     Démarre le scheduler en mode bloquant.
-    
-    Configure l'exécution hebdomadaire selon le cron configuré.
-    Par défaut: chaque lundi à 8h00
+
+    Un job par source activée (settings.scheduler_per_source), sinon exécution
+    du pipeline complet selon le cron configuré (par défaut: chaque lundi à 8h00).
     """
-    
+
     if not settings.scheduler_enabled:
         logger.warning("scheduler_désactivé")
         return
-    
+
     scheduler = BlockingScheduler()
-    
-    # Ajouter le job avec le cron configuré
-    trigger = CronTrigger.from_crontab(settings.cron_schedule)
-    
-    scheduler.add_job(
-        scheduled_job,
-        trigger=trigger,
-        id="weekly_regulatory_monitoring",
-        name="Veille Réglementaire Hebdomadaire",
-        replace_existing=True,
-    )
-    
+
+    sources = load_scheduled_sources() if settings.scheduler_per_source else []
+    if sources:
+        build_source_jobs(scheduler, sources)
+    else:
+        # Ajouter le job avec le cron configuré
+        scheduler.add_job(
+            scheduled_job,
+            trigger=cron_trigger(settings.cron_schedule),
+            id="weekly_regulatory_monitoring",
+            name="Veille Réglementaire Hebdomadaire",
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True,
+        )
+
     logger.info(
         "scheduler_configuré",
         cron=settings.cron_schedule,
-        next_run=scheduler.get_jobs()[0].next_run_time if scheduler.get_jobs() else None
+        # Jobs en attente : next_run_time n'est calculé qu'au démarrage
+        jobs={job.id: str(job.trigger) for job in scheduler.get_jobs()},
+        max_concurrent_sources=settings.scheduler_max_concurrent_sources if sources else None
     )
-    
+
     try:
         logger.info("scheduler_démarré")
         scheduler.start()
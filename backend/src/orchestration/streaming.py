@@ -0,0 +1,503 @@
+"""
+Pipeline en flux : collecte → analyse sans barrière entre les agents
+
+scrape → fetch → extract → persist → analyse
+
+Chaque étage a ses workers et une file bornée (backpressure) vers l'étage
+suivant : un document est analysé dès qu'il est sauvegardé, sans attendre le
+téléchargement le plus lent. La file d'analyse est ordonnée par priorité
+(src/agent_1b/priority.py) : un document critique passe devant le backlog.
+Le délai jusqu'à la première analyse publiée est mesuré séparément de la
+durée totale.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import structlog
+from sqlalchemy.orm import selectinload
+
+from src.agent_1a.agent import document_label, extract_normalized_content, save_extracted_document
+from src.agent_1a.tools.cbam_guidance_scraper import search_cbam_guidance
+from src.agent_1a.tools.document_fetcher import fetch_document
+from src.agent_1a.tools.scraper import search_eurlex
+from src.agent_1b.agent import Agent1B
+from src.agent_1b.display import process_and_display_analysis
+from src.agent_1b.models import DocumentAnalysis
+from src.agent_1b.priority import DocumentPrioritizer, PreScore, PriorityMetrics
+from src.agent_1b.sinks import AnalysisSink, get_sink
+from src.agent_1b.tools.vector_index import refresh_document_index
+from src.config import settings
+from src.storage.analysis_repository import AnalysisBatchWriter
+from src.storage.database import get_session
+from src.storage.models import Document
+from src.storage.repositories import DocumentRepository
+
+logger = structlog.get_logger()
+
+
+class _FirstAnalysisSink(AnalysisSink):
+    """Relaie vers la sortie configurée et date la première analyse publiée"""
+
+    def __init__(self, sink: AnalysisSink, started: float):
+        self.sink = sink
+        self.name = sink.name
+        self.started = started
+        self.first_seconds: Optional[float] = None
+
+    def emit(self, analysis: DocumentAnalysis, analysis_id: Optional[str] = None) -> None:
+        if self.first_seconds is None:
+            self.first_seconds = round(time.perf_counter() - self.started, 3)
+            logger.info("first_analysis_published", document_id=analysis.document_id, seconds=self.first_seconds)
+        self.sink.emit(analysis, analysis_id)
+
+
+class StreamingPipeline:
+    """
+    Pipeline Agent 1A → Agent 1B par étages reliés par des files bornées
+
+    Usage:
+        pipeline = StreamingPipeline(company_profile)
+        result = await pipeline.run(keyword="CBAM")
+    """
+
+    def __init__(
+        self,
+        company_profile: dict,
+        sink: Optional[AnalysisSink] = None,
+        queue_size: Optional[int] = None,
+        fetch_workers: Optional[int] = None,
+        extract_workers: Optional[int] = None,
+        analysis_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            company_profile: Profil entreprise (format Agent 1B)
+            sink: Sortie des analyses (défaut: settings.analysis_output_sink)
+            queue_size: Taille des files entre étages (défaut: settings.stream_queue_size)
+            fetch_workers: Téléchargements simultanés (défaut: settings.stream_fetch_workers)
+            extract_workers: Extractions PDF simultanées (défaut: settings.stream_extract_workers)
+            analysis_workers: Analyses simultanées (défaut: settings.stream_analysis_workers)
+        """
+        self.company_profile = company_profile
+        self.sink = sink or get_sink()
+        self.queue_size = max(1, queue_size or settings.stream_queue_size)
+        self.fetch_workers = max(1, fetch_workers or settings.stream_fetch_workers)
+        self.extract_workers = max(1, extract_workers or settings.stream_extract_workers)
+        self.analysis_workers = max(1, analysis_workers or settings.stream_analysis_workers)
+
+        self.counts: Dict[str, int] = {
+            "eurlex_found": 0,
+            "cbam_found": 0,
+            "unchanged": 0,
+            "downloaded": 0,
+            "skipped": 0,
+            "extracted": 0,
+            "saved": 0,
+            "analyzed": 0,
+            "relevant": 0,
+            "critical": 0,
+        }
+        self.errors: Dict[str, List[Dict]] = {"download": [], "extraction": [], "save": [], "analysis": []}
+        # Temps passé dans chaque étage (somme sur les workers)
+        self.busy: Dict[str, float] = {"scrape": 0.0, "fetch": 0.0, "extract": 0.0, "persist": 0.0, "analyse": 0.0}
+
+    async def run(
+        self,
+        keyword: str = "CBAM",
+        max_eurlex_documents: int = 10,
+        cbam_categories: str = "all",
+        max_cbam_documents: int = 50
+    ) -> Dict:
+        """
+        Exécute le pipeline jusqu'à épuisement de toutes les files
+
+        Les documents déjà "raw" en BDD (runs précédents) sont analysés en
+        parallèle de la collecte.
+
+        Args:
+            keyword: Mot-clé pour EUR-Lex (CBAM, EUDR, CSRD)
+            max_eurlex_documents: Nombre max de documents EUR-Lex
+            cbam_categories: Catégories CBAM (all, guidance, faq, etc.)
+            max_cbam_documents: Nombre max de documents CBAM
+
+        Returns:
+            dict: Statistiques par agent et durées (première analyse, total)
+        """
+        started = time.perf_counter()
+        self.timed_sink = _FirstAnalysisSink(self.sink, started)
+        self.agent = Agent1B(self.company_profile)
+        self.prioritizer = (
+            DocumentPrioritizer(self.company_profile) if settings.analysis_priority_enabled else None
+        )
+        self.priority_metrics = PriorityMetrics()
+        self._queued_for_analysis = set()
+        self._sequence = 0
+
+        self.fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.extract_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.persist_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        # Non bornée : elle ne contient que des IDs et des pré-scores, et tout
+        # le backlog doit y être pour qu'un document critique passe devant
+        self.analysis_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+
+        logger.info(
+            "streaming_pipeline_started",
+            queue_size=self.queue_size,
+            fetch_workers=self.fetch_workers,
+            extract_workers=self.extract_workers,
+            analysis_workers=self.analysis_workers,
+            output_sink=self.sink.name
+        )
+
+        self.lookup_session = get_session()
+        self.persist_session = get_session()
+        self.analysis_session = get_session()
+        self.writer = (
+            AnalysisBatchWriter(self.analysis_session) if settings.analysis_flush_size > 0 else None
+        )
+
+        stages = [
+            (self.fetch_queue, [self._fetch_worker() for _ in range(self.fetch_workers)]),
+            (self.extract_queue, [self._extract_worker() for _ in range(self.extract_workers)]),
+            (self.persist_queue, [self._persist_worker()]),  # un seul écrivain (SQLite)
+            (self.analysis_queue, [self._analysis_worker() for _ in range(self.analysis_workers)]),
+        ]
+        stage_tasks = [[asyncio.create_task(worker) for worker in workers] for _, workers in stages]
+
+        try:
+            await asyncio.gather(
+                self._scrape_eurlex(keyword, max_eurlex_documents),
+                self._scrape_cbam(cbam_categories, max_cbam_documents),
+                self._enqueue_backlog(),
+            )
+            self.lookup_session.close()
+
+            # Drainage étage par étage : une file vide et ses workers arrêtés,
+            # plus rien ne peut arriver dans la suivante
+            for (queue, _), tasks in zip(stages, stage_tasks):
+                await queue.join()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if self.writer:
+                try:
+                    self.writer.flush()
+                except Exception as e:
+                    # Les documents du dernier lot restent "raw" (réanalysés au prochain run)
+                    logger.error("analyses_batch_failed", error=str(e), exc_info=True)
+                    self.errors["analysis"].append({"document_id": None, "error": str(e)})
+                self.counts["analyzed"] = self.writer.written
+        finally:
+            for tasks in stage_tasks:
+                for task in tasks:
+                    task.cancel()
+            self.lookup_session.close()
+            self.persist_session.close()
+            self.analysis_session.close()
+
+        # Index de similarité (/similar) reconstruit avec les documents collectés
+        await asyncio.to_thread(refresh_document_index, get_session)
+
+        total_seconds = round(time.perf_counter() - started, 3)
+        result = self._result(keyword, cbam_categories, total_seconds)
+        logger.info("streaming_pipeline_completed", result=result)
+        return result
+
+    # ========================================
+    # ÉTAGE 1 : SCRAPING
+    # ========================================
+
+    async def _scrape_eurlex(self, keyword: str, max_results: int) -> None:
+        start = time.perf_counter()
+        results = await search_eurlex(keyword, max_results=max_results)
+        self.busy["scrape"] += time.perf_counter() - start
+        if results.status != "success":
+            logger.error("eurlex_search_failed", error=results.error)
+        self.counts["eurlex_found"] = len(results.documents)
+
+        for doc in results.documents:
+            # Utiliser pdf_url pour télécharger le PDF au lieu du HTML
+            url = str(doc.pdf_url) if doc.pdf_url else str(doc.url)
+            existing = DocumentRepository(self.lookup_session).find_by_url(url)
+            if existing and existing.hash_sha256 == doc.metadata.get("remote_hash"):
+                self.counts["unchanged"] += 1
+                logger.info("document_unchanged", celex=doc.celex_number)
+                continue
+            await self.fetch_queue.put({
+                "source": "eurlex",
+                "doc": doc,
+                "url": url,
+                "existing_hash": existing.hash_sha256 if existing else None,
+            })
+
+    async def _scrape_cbam(self, categories: str, max_results: int) -> None:
+        start = time.perf_counter()
+        results = await search_cbam_guidance(categories=categories, max_results=max_results)
+        self.busy["scrape"] += time.perf_counter() - start
+        if results.status != "success":
+            logger.error("cbam_search_failed", error=results.error)
+        self.counts["cbam_found"] = len(results.documents)
+
+        for doc in results.documents:
+            url = str(doc.url)
+            # Pour CBAM, on vérifie juste l'existence (pas de hash remote)
+            if DocumentRepository(self.lookup_session).find_by_url(url):
+                self.counts["unchanged"] += 1
+                logger.info("document_unchanged", title=doc.title)
+                continue
+            await self.fetch_queue.put({"source": "cbam", "doc": doc, "url": url, "existing_hash": None})
+
+    async def _enqueue_backlog(self) -> None:
+        """Documents restés "raw" lors des runs précédents"""
+        backlog = self.lookup_session.query(Document).options(selectinload(Document.body)).filter(
+            Document.workflow_status == "raw"
+        ).all()
+        logger.info("streaming_backlog_found", count=len(backlog))
+        for doc in backlog:
+            await self._enqueue_analysis(doc.id, doc.title, doc.content, doc.regulation_type, doc.publication_date)
+
+    # ========================================
+    # ÉTAGES 2 À 4 : TÉLÉCHARGEMENT, EXTRACTION, SAUVEGARDE
+    # ========================================
+
+    async def _fetch_worker(self) -> None:
+        while True:
+            item = await self.fetch_queue.get()
+            start = time.perf_counter()
+            doc_id = document_label(item["source"], item["doc"])
+            try:
+                fetch_result = await fetch_document(
+                    item["url"],
+                    output_dir="data/documents",
+                    skip_if_exists=True,
+                    existing_hash=item["existing_hash"]
+                )
+                if not fetch_result.success:
+                    raise Exception(fetch_result.error or "Download failed")
+
+                if fetch_result.document.status == "skipped":
+                    self.counts["skipped"] += 1
+                    logger.info("document_skipped", source=item["source"], id=doc_id, reason="unchanged")
+                    continue
+
+                self.counts["downloaded"] += 1
+                item["file_path"] = fetch_result.document.file_path
+                await self.extract_queue.put(item)
+
+            except Exception as e:
+                logger.error("download_failed", source=item["source"], id=doc_id, error=str(e))
+                self.errors["download"].append({"source": item["source"], "id": doc_id, "error": str(e)})
+            finally:
+                self.busy["fetch"] += time.perf_counter() - start
+                self.fetch_queue.task_done()
+
+    async def _extract_worker(self) -> None:
+        while True:
+            item = await self.extract_queue.get()
+            start = time.perf_counter()
+            doc_id = document_label(item["source"], item["doc"])
+            try:
+                # Extraire seulement les PDFs
+                if not item["file_path"].endswith(".pdf"):
+                    self.counts["skipped"] += 1
+                    logger.info("skipping_non_pdf", source=item["source"], id=doc_id)
+                    continue
+
+                # pdfplumber est synchrone : un thread pour ne pas bloquer les autres étages
+                item["content"], item["normalization"] = await asyncio.to_thread(
+                    asyncio.run, extract_normalized_content(item["file_path"], item["source"], doc_id)
+                )
+                self.counts["extracted"] += 1
+                await self.persist_queue.put(item)
+
+            except Exception as e:
+                logger.error("extraction_failed", source=item["source"], id=doc_id, error=str(e))
+                self.errors["extraction"].append({"source": item["source"], "id": doc_id, "error": str(e)})
+            finally:
+                self.busy["extract"] += time.perf_counter() - start
+                self.extract_queue.task_done()
+
+    async def _persist_worker(self) -> None:
+        repo = DocumentRepository(self.persist_session)
+        while True:
+            item = await self.persist_queue.get()
+            start = time.perf_counter()
+            title = item["doc"].title
+            try:
+                saved_doc, status = save_extracted_document(repo, item)
+                # Commit immédiat : le document est visible de l'étage d'analyse
+                self.persist_session.commit()
+                self.counts["saved"] += 1
+                logger.info("document_saved", source=item["source"], title=title[:50], status=status, doc_id=saved_doc.id)
+
+                if saved_doc.workflow_status == "raw":
+                    await self._enqueue_analysis(
+                        saved_doc.id, saved_doc.title, saved_doc.content,
+                        saved_doc.regulation_type, saved_doc.publication_date
+                    )
+
+            except Exception as e:
+                self.persist_session.rollback()
+                logger.error("save_failed", source=item["source"], title=title[:50], error=str(e))
+                self.errors["save"].append({"source": item["source"], "title": title[:50], "error": str(e)})
+            finally:
+                self.busy["persist"] += time.perf_counter() - start
+                self.persist_queue.task_done()
+
+    # ========================================
+    # ÉTAGE 5 : ANALYSE (AGENT 1B)
+    # ========================================
+
+    async def _enqueue_analysis(
+        self,
+        document_id: str,
+        title: str,
+        content: Optional[str],
+        regulation_type: Optional[str],
+        publication_date=None
+    ) -> None:
+        if document_id in self._queued_for_analysis:
+            return
+        self._queued_for_analysis.add(document_id)
+        self._sequence += 1
+
+        pre_score = None
+        if self.prioritizer:
+            try:
+                pre_score = await asyncio.to_thread(
+                    self.prioritizer.pre_score, document_id, content or "", title, regulation_type, publication_date
+                )
+            except Exception as e:
+                logger.warning("document_prioritization_failed", document_id=document_id, error=str(e))
+        if pre_score is None:
+            # Sans pré-score : ordre d'arrivée, derrière les documents critiques
+            pre_score = PreScore(document_id=document_id, score=0.0, priority="medium")
+
+        await self.analysis_queue.put(
+            (*pre_score.sort_key(self._sequence), pre_score, self.priority_metrics.enqueued())
+        )
+
+    async def _analysis_worker(self) -> None:
+        while True:
+            *_, pre_score, enqueued_at = await self.analysis_queue.get()
+            document_id = pre_score.document_id
+            self.priority_metrics.started(pre_score.priority, enqueued_at)
+            start = time.perf_counter()
+            try:
+                document = self.analysis_session.query(Document).options(selectinload(Document.body)).filter(
+                    Document.id == document_id
+                ).one()
+                title, content = document.title, document.content or ""
+                regulation_type = document.regulation_type or "CBAM"
+
+                # Appels LLM bloquants : exécutés hors de la boucle d'événements
+                analysis = await asyncio.to_thread(
+                    self.agent.analyze_document,
+                    document_id=document_id,
+                    document_content=content,
+                    document_title=title,
+                    regulation_type=regulation_type
+                )
+
+                # Sauvegarde (et publication) dans la boucle : une seule session d'écriture
+                process_and_display_analysis(
+                    analysis, save_to_db=True, sink=self.timed_sink, writer=self.writer
+                )
+                if self.writer and self.timed_sink.first_seconds is None:
+                    # Première alerte publiée sans attendre un lot complet
+                    self.writer.flush()
+                if self.writer is None:
+                    self.analysis_session.query(Document).filter(Document.id == document_id).update({
+                        "workflow_status": "analyzed",
+                        "analyzed_at": analysis.analysis_timestamp,
+                    })
+                    self.analysis_session.commit()
+
+                self.priority_metrics.completed(pre_score.priority, enqueued_at)
+                self.counts["analyzed"] += 1
+                self.counts["relevant"] += int(analysis.is_relevant)
+                self.counts["critical"] += int(analysis.relevance_score.criticality.value == "CRITICAL")
+                logger.info(
+                    "document_analyzed",
+                    document_id=document_id,
+                    priority=pre_score.priority,
+                    is_relevant=analysis.is_relevant,
+                    criticality=analysis.relevance_score.criticality.value
+                )
+
+            except Exception as e:
+                self.analysis_session.rollback()
+                logger.error("analysis_failed", document_id=document_id, error=str(e), exc_info=True)
+                self.errors["analysis"].append({"document_id": document_id, "error": str(e)})
+            finally:
+                self.busy["analyse"] += time.perf_counter() - start
+                self.analysis_queue.task_done()
+
+    def _result(self, keyword: str, cbam_categories: str, total_seconds: float) -> Dict:
+        counts = self.counts
+        return {
+            "status": "success",
+            "mode": "streaming",
+            "agent_1a": {
+                "status": "success",
+                "keyword": keyword,
+                "cbam_categories": cbam_categories,
+                "sources": {
+                    "eurlex": {"found": counts["eurlex_found"]},
+                    "cbam_guidance": {"found": counts["cbam_found"]},
+                },
+                "total_found": counts["eurlex_found"] + counts["cbam_found"],
+                "documents_processed": counts["saved"],
+                "documents_unchanged": counts["unchanged"],
+                "download_errors": len(self.errors["download"]),
+                "extraction_errors": len(self.errors["extraction"]),
+                "save_errors": len(self.errors["save"]),
+            },
+            "agent_1b": {
+                "documents_analyzed": counts["analyzed"],
+                "relevant_count": counts["relevant"],
+                "critical_count": counts["critical"],
+                "errors": len(self.errors["analysis"]),
+                "semantic_tiers": self.agent.get_semantic_stats(),
+                "priority": self.priority_metrics.snapshot(),
+            },
+            "timings": {
+                "time_to_first_analysis_seconds": self.timed_sink.first_seconds,
+                "total_seconds": total_seconds,
+                "stage_busy_seconds": {stage: round(seconds, 3) for stage, seconds in self.busy.items()},
+            },
+        }
+
+
+async def run_streaming_pipeline(
+    company_profile: dict,
+    keyword: str = "CBAM",
+    max_eurlex_documents: int = 10,
+    cbam_categories: str = "all",
+    max_cbam_documents: int = 50,
+    output_sink: Optional[str] = None
+) -> Dict:
+    """
+    Exécute le pipeline en flux (voir StreamingPipeline)
+
+    Args:
+        company_profile: Profil entreprise (format Agent 1B)
+        keyword: Mot-clé pour EUR-Lex (CBAM, EUDR, CSRD)
+        max_eurlex_documents: Nombre max de documents EUR-Lex
+        cbam_categories: Catégories CBAM (all, guidance, faq, etc.)
+        max_cbam_documents: Nombre max de documents CBAM
+        output_sink: Sortie des analyses rich, jsonl, none ou auto
+
+    Returns:
+        dict: Résultat au format de run_pipeline, avec "timings"
+    """
+    pipeline = StreamingPipeline(company_profile, sink=get_sink(output_sink))
+    return await pipeline.run(
+        keyword=keyword,
+        max_eurlex_documents=max_eurlex_documents,
+        cbam_categories=cbam_categories,
+        max_cbam_documents=max_cbam_documents
+    )
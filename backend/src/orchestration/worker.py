@@ -0,0 +1,429 @@
+"""
+Worker de la file de travaux distribuée
+
+Chaque étape du pipeline est un travail de la table "jobs" (voir
+src/storage/job_repository.py) :
+
+    fetch → extract (+ sauvegarde) → analyse → impact
+
+N'importe quel nombre de workers, sur une ou plusieurs machines reliées à la
+même base, prend les travaux disponibles. Un travail terminé ajoute le
+travail suivant dans la même transaction. L'impact (Agent 2) n'est mis en
+file que pour les analyses validées (voir enqueue_backlog).
+
+Usage:
+    python -m src.main --enqueue            # collecte + backlog → travaux
+    python -m src.main --worker             # autant de workers que voulu
+    python -m src.main --worker --job-types analyse,impact
+"""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import structlog
+from sqlalchemy import select
+
+from src.agent_1b.tools.vector_index import refresh_document_index
+from src.config import settings
+from src.storage.database import get_session
+from src.storage.job_repository import JobRepository
+from src.storage.models import Analysis, Document, ImpactAssessment
+
+logger = structlog.get_logger()
+
+# Un handler reçoit le payload et retourne (résultat, travaux suivants)
+FollowUp = Tuple[str, Dict, Optional[str]]
+JobHandler = Callable[[Dict], Tuple[Optional[Dict], List[FollowUp]]]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:6]}"
+
+
+class Worker:
+    """
+    Prend et exécute les travaux de la file jusqu'à arrêt
+
+    Usage:
+        Worker().run()
+        Worker(job_types=["analyse"]).run(stop_when_idle=True)
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        job_types: Optional[Sequence[str]] = None,
+        worker_id: Optional[str] = None,
+        session_factory: Callable = get_session,
+        lease_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            handlers: Handler par type de travail (défaut: DEFAULT_HANDLERS)
+            job_types: Types pris par ce worker (défaut: tous ceux des handlers)
+            worker_id: Identifiant (défaut: hôte-pid-aléatoire)
+            session_factory: Fabrique de sessions SQLAlchemy
+            lease_seconds: Durée du bail (défaut: settings.job_lease_seconds)
+            poll_interval: Attente quand la file est vide (défaut: settings.job_poll_interval_seconds)
+        """
+        self.handlers = handlers or DEFAULT_HANDLERS
+        self.job_types = list(job_types or self.handlers)
+        self.worker_id = worker_id or default_worker_id()
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.poll_interval = settings.job_poll_interval_seconds if poll_interval is None else poll_interval
+        self.stop_event = threading.Event()
+        # Recherche des baux expirés : une écriture de moins par travail
+        self._recovery_interval = max(1.0, self.lease_seconds / 3)
+        self._last_recovery = 0.0
+
+        self.processed = 0
+        self.failed = 0
+        # Documents sauvegardés depuis la dernière reconstruction de l'index de similarité
+        self._index_stale = False
+
+    def run(self, max_jobs: Optional[int] = None, stop_when_idle: bool = False) -> int:
+        """
+        Boucle du worker
+
+        Args:
+            max_jobs: Nombre max de travaux avant arrêt
+            stop_when_idle: S'arrêter dès que la file est vide
+
+        Returns:
+            Nombre de travaux exécutés
+        """
+        logger.info("worker_started", worker_id=self.worker_id, job_types=self.job_types)
+        executed = 0
+        while not self.stop_event.is_set() and (max_jobs is None or executed < max_jobs):
+            if self.run_once():
+                executed += 1
+                continue
+            # File vide : collecte terminée, index de similarité reconstruit une fois
+            if self._index_stale:
+                self._index_stale = False
+                refresh_document_index(self.session_factory)
+            if stop_when_idle:
+                break
+            self.stop_event.wait(self.poll_interval)
+        logger.info("worker_stopped", worker_id=self.worker_id, processed=self.processed, failed=self.failed)
+        return executed
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def run_once(self) -> bool:
+        """
+        Prend et exécute un travail
+
+        Returns:
+            False si aucun travail n'était disponible
+        """
+        session = self.session_factory()
+        try:
+            repo = JobRepository(session)
+            recover = time.monotonic() - self._last_recovery >= self._recovery_interval
+            if recover:
+                self._last_recovery = time.monotonic()
+            job = repo.claim(self.worker_id, self.job_types, self.lease_seconds, recover=recover)
+            if job is None:
+                return False
+
+            job_id, job_type, payload = job.id, job.job_type, dict(job.payload or {})
+            heartbeat_stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=(job_id, heartbeat_stop), daemon=True
+            )
+            heartbeat.start()
+            start = time.perf_counter()
+            try:
+                result, follow_ups = self.handlers[job_type](payload)
+            except Exception as e:
+                heartbeat_stop.set()
+                heartbeat.join()
+                self.failed += 1
+                status = repo.fail(job_id, self.worker_id, f"{type(e).__name__}: {e}")
+                logger.error("job_failed", job_id=job_id, job_type=job_type, status=status, error=str(e))
+                return True
+
+            heartbeat_stop.set()
+            heartbeat.join()
+            if repo.complete(job_id, self.worker_id, result, follow_ups):
+                self.processed += 1
+                if job_type == "extract" and (result or {}).get("status") in ("new", "modified"):
+                    self._index_stale = True
+                logger.info(
+                    "job_completed",
+                    job_id=job_id,
+                    job_type=job_type,
+                    seconds=round(time.perf_counter() - start, 3),
+                    follow_ups=len(follow_ups)
+                )
+            return True
+        finally:
+            session.close()
+
+    def _heartbeat(self, job_id: str, stop: threading.Event) -> None:
+        """Prolonge le bail tant que le travail s'exécute"""
+        interval = max(0.1, self.lease_seconds / 3)
+        while not stop.wait(interval):
+            session = self.session_factory()
+            try:
+                if not JobRepository(session).heartbeat(job_id, self.worker_id, self.lease_seconds):
+                    logger.warning("job_heartbeat_rejected", job_id=job_id, worker_id=self.worker_id)
+                    return
+            except Exception as e:
+                logger.warning("job_heartbeat_failed", job_id=job_id, error=str(e))
+            finally:
+                session.close()
+
+
+# ========================================
+# HANDLERS
+# ========================================
+
+def handle_fetch(payload: Dict) -> Tuple[Dict, List[FollowUp]]:
+    """Télécharge un document ; travail suivant : extract"""
+    from src.agent_1a.tools.document_fetcher import fetch_document
+
+    fetch_result = asyncio.run(fetch_document(
+        payload["url"],
+        output_dir="data/documents",
+        skip_if_exists=True,
+        existing_hash=payload.get("existing_hash")
+    ))
+    if not fetch_result.success:
+        raise RuntimeError(fetch_result.error or "Download failed")
+    if fetch_result.document.status == "skipped":
+        return {"status": "skipped"}, []
+
+    file_path = fetch_result.document.file_path
+    return (
+        {"status": "downloaded", "file_path": file_path},
+        [("extract", {**payload, "file_path": file_path}, f"extract:{payload['url']}")]
+    )
+
+
+def handle_extract(payload: Dict) -> Tuple[Dict, List[FollowUp]]:
+    """Extrait et sauvegarde un document ; travail suivant : analyse (document "raw")"""
+    from src.agent_1a.agent import document_label, extract_normalized_content, save_extracted_document
+    from src.agent_1a.tools.cbam_guidance_scraper import CbamDocument
+    from src.agent_1a.tools.scraper import EurlexDocument
+    from src.storage.repositories import DocumentRepository
+
+    source, file_path = payload["source"], payload["file_path"]
+    if not file_path.endswith(".pdf"):
+        return {"status": "skipped", "reason": "not_pdf"}, []
+
+    doc = (EurlexDocument if source == "eurlex" else CbamDocument)(**payload["document"])
+    content, normalization = asyncio.run(
+        extract_normalized_content(file_path, source, document_label(source, doc))
+    )
+
+    session = get_session()
+    try:
+        saved_doc, status = save_extracted_document(DocumentRepository(session), {
+            "source": source,
+            "doc": doc,
+            "url": payload["url"],
+            "file_path": file_path,
+            "content": content,
+            "normalization": normalization,
+        })
+        session.commit()
+        document_id, workflow_status = saved_doc.id, saved_doc.workflow_status
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    follow_ups = []
+    if workflow_status == "raw":
+        follow_ups.append(("analyse", {"document_id": document_id}, f"analyse:{document_id}"))
+    return {"status": status, "document_id": document_id}, follow_ups
+
+
+_agents: Dict[str, object] = {}
+_agents_lock = threading.Lock()
+
+
+def _get_agent():
+    """Agent1B du profil par défaut (un par version de profil et par processus)"""
+    from src.agent_1b.agent import Agent1B
+    from src.agent_1b.tools.compiled_profile import profile_cache_key
+    from src.orchestration.pipeline import load_company_profile
+
+    profile = load_company_profile()
+    key = profile_cache_key(profile)
+    with _agents_lock:
+        if key not in _agents:
+            _agents.clear()
+            _agents[key] = Agent1B(profile)
+        return _agents[key]
+
+
+def handle_analyse(payload: Dict) -> Tuple[Dict, List[FollowUp]]:
+    """Analyse un document (Agent 1B) ; idempotent si le document est déjà analysé"""
+    from src.agent_1b.display import save_analysis_to_database
+    from src.agent_1b.sinks import get_sink, headless_sink_name
+
+    document_id = payload["document_id"]
+    session = get_session()
+    try:
+        document = session.get(Document, document_id)
+        if document is None:
+            return {"status": "missing"}, []
+        if document.workflow_status != "raw":
+            return {"status": "already_analyzed"}, []
+        title, content, regulation_type = document.title, document.content or "", document.regulation_type
+    finally:
+        session.close()
+
+    analysis = _get_agent().analyze_document(
+        document_id=document_id,
+        document_content=content,
+        document_title=title,
+        regulation_type=regulation_type or "CBAM"
+    )
+    analysis_id = save_analysis_to_database(analysis)
+    if not analysis_id:
+        raise RuntimeError(f"Analysis of document {document_id} could not be saved")
+    get_sink(headless_sink_name()).emit(analysis, analysis_id)
+
+    return {
+        "status": "analyzed",
+        "analysis_id": analysis_id,
+        "criticality": analysis.relevance_score.criticality.value,
+        "is_relevant": analysis.is_relevant,
+    }, []
+
+
+def handle_impact(payload: Dict) -> Tuple[Dict, List[FollowUp]]:
+    """Analyse d'impact (Agent 2) d'une analyse validée ; idempotent"""
+    from src.agent_2.agent import Agent2
+
+    analysis_id = payload["analysis_id"]
+    session = get_session()
+    try:
+        exists = session.query(ImpactAssessment.id).filter(ImpactAssessment.analysis_id == analysis_id).first()
+    finally:
+        session.close()
+    if exists:
+        return {"status": "already_assessed"}, []
+
+    Agent2().analyze_impact(analysis_id)
+    return {"status": "assessed"}, []
+
+
+DEFAULT_HANDLERS: Dict[str, JobHandler] = {
+    "fetch": handle_fetch,
+    "extract": handle_extract,
+    "analyse": handle_analyse,
+    "impact": handle_impact,
+}
+
+
+# ========================================
+# PRODUCTEURS
+# ========================================
+
+async def enqueue_collection(
+    keyword: str = "CBAM",
+    max_eurlex_documents: int = 10,
+    cbam_categories: str = "all",
+    max_cbam_documents: int = 50
+) -> int:
+    """
+    Scrape les sources et met en file un travail fetch par document nouveau ou modifié
+
+    Returns:
+        Nombre de travaux fetch ajoutés
+    """
+    from src.agent_1a.tools.cbam_guidance_scraper import search_cbam_guidance
+    from src.agent_1a.tools.scraper import search_eurlex
+    from src.storage.repositories import DocumentRepository
+
+    eurlex_results, cbam_results = await asyncio.gather(
+        search_eurlex(keyword, max_results=max_eurlex_documents),
+        search_cbam_guidance(categories=cbam_categories, max_results=max_cbam_documents)
+    )
+
+    session = get_session()
+    try:
+        documents = DocumentRepository(session)
+        jobs = JobRepository(session)
+        enqueued = 0
+
+        for doc in eurlex_results.documents:
+            url = str(doc.pdf_url) if doc.pdf_url else str(doc.url)
+            existing = documents.find_by_url(url)
+            if existing and existing.hash_sha256 == doc.metadata.get("remote_hash"):
+                continue
+            jobs.enqueue("fetch", {
+                "source": "eurlex",
+                "url": url,
+                "document": doc.model_dump(mode="json"),
+                "existing_hash": existing.hash_sha256 if existing else None,
+            }, dedupe_key=f"fetch:{url}", commit=False)
+            enqueued += 1
+
+        for doc in cbam_results.documents:
+            url = str(doc.url)
+            if documents.find_by_url(url):
+                continue
+            jobs.enqueue("fetch", {
+                "source": "cbam",
+                "url": url,
+                "document": doc.model_dump(mode="json"),
+            }, dedupe_key=f"fetch:{url}", commit=False)
+            enqueued += 1
+
+        session.commit()
+    finally:
+        session.close()
+
+    logger.info("collection_jobs_enqueued", fetch_jobs=enqueued)
+    return enqueued
+
+
+def enqueue_backlog(limit: int = 1000) -> Dict[str, int]:
+    """
+    Met en file les documents "raw" (analyse) et les analyses validées sans
+    analyse d'impact (impact)
+
+    Args:
+        limit: Nombre max de travaux par type
+
+    Returns:
+        Nombre de travaux demandés par type (un travail déjà actif n'est pas dupliqué)
+    """
+    session = get_session()
+    try:
+        jobs = JobRepository(session)
+        raw_ids = [row.id for row in session.query(Document.id).filter(Document.workflow_status == "raw").limit(limit)]
+        for document_id in raw_ids:
+            jobs.enqueue("analyse", {"document_id": document_id}, dedupe_key=f"analyse:{document_id}", commit=False)
+
+        assessed = select(ImpactAssessment.analysis_id)
+        approved_ids = [
+            row.id for row in session.query(Analysis.id)
+            .filter(Analysis.validation_status == "approved", Analysis.id.not_in(assessed))
+            .limit(limit)
+        ]
+        for analysis_id in approved_ids:
+            jobs.enqueue("impact", {"analysis_id": analysis_id}, dedupe_key=f"impact:{analysis_id}", commit=False)
+
+        session.commit()
+    finally:
+        session.close()
+
+    counts = {"analyse": len(raw_ids), "impact": len(approved_ids)}
+    logger.info("backlog_jobs_enqueued", **counts)
+    return counts
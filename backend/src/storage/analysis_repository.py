@@ -4,11 +4,14 @@ Repository pour les analyses - Gestion de la table "analyses"
 
 import json
 import structlog
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
 from datetime import datetime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
-from src.storage.models import Analysis, Document
+from src.config import settings
+from src.storage.models import Analysis, Document, generate_uuid
+from src.storage.stats import record_inserted_analyses
 
 logger = structlog.get_logger()
 
@@ -27,7 +30,14 @@ class AnalysisRepository:
         matched_keywords: List[str] = None,
         matched_nc_codes: List[str] = None,
         llm_reasoning: str = None,
-        metadata: Dict = None
+        metadata: Dict = None,
+        keyword_score: float = None,
+        nc_code_score: float = None,
+        semantic_score: float = None,
+        final_score: float = None,
+        criticality: str = None,
+        has_critical_codes: bool = None,
+        semantic_applicable: bool = None
     ) -> Analysis:
         """
         Crée une nouvelle analyse
@@ -40,6 +50,10 @@ class AnalysisRepository:
             matched_nc_codes: Codes NC trouvés
             llm_reasoning: Explication du LLM
             metadata: Métadonnées additionnelles
+            keyword_score, nc_code_score, semantic_score, final_score: Scores (0-1)
+            criticality: Criticité calculée
+            has_critical_codes: Codes NC critiques trouvés
+            semantic_applicable: Applicabilité selon le LLM
             
         Returns:
             Analysis créée
@@ -51,6 +65,13 @@ class AnalysisRepository:
             matched_keywords=matched_keywords or [],
             matched_nc_codes=matched_nc_codes or [],
             llm_reasoning=llm_reasoning,
+            keyword_score=keyword_score,
+            nc_code_score=nc_code_score,
+            semantic_score=semantic_score,
+            final_score=final_score,
+            criticality=criticality,
+            has_critical_codes=has_critical_codes,
+            semantic_applicable=semantic_applicable,
             validation_status="pending"
         )
         
@@ -82,36 +103,10 @@ class AnalysisRepository:
         Returns:
             Analysis sauvegardée
         """
-        # Déterminer la pertinence basée sur le score final
-        is_relevant = document_analysis.is_relevant
-        
-        # Confiance = combinaison du score final et de la confiance sémantique
-        confidence = (
-            document_analysis.relevance_score.final_score * 0.6 +
-            document_analysis.semantic_analysis.confidence_level * 0.4
-        )
-        
-        # Mots-clés trouvés
-        matched_keywords = document_analysis.keyword_analysis.keywords_found
-        
-        # Codes NC trouvés
-        matched_nc_codes = (
-            document_analysis.nc_code_analysis.exact_matches +
-            document_analysis.nc_code_analysis.partial_matches
-        )
-        
-        # Construire le reasoning LLM
-        llm_reasoning = self._build_llm_reasoning(document_analysis)
+        fields = self._fields_from_document_analysis(document_analysis)
         
         # Créer l'analyse
-        analysis = self.create(
-            document_id=document_id,
-            is_relevant=is_relevant,
-            confidence=min(1.0, max(0.0, confidence)),  # Clamp 0-1
-            matched_keywords=matched_keywords,
-            matched_nc_codes=matched_nc_codes,
-            llm_reasoning=llm_reasoning
-        )
+        analysis = self.create(document_id=document_id, **fields)
         
         # Mettre à jour le statut du document
         document = self.session.query(Document).filter_by(id=document_id).first()
@@ -122,6 +117,84 @@ class AnalysisRepository:
         
         return analysis
     
+    def bulk_save_from_document_analyses(
+        self,
+        document_analyses: List  # List[DocumentAnalysis]
+    ) -> List[Analysis]:
+        """
+        Sauvegarde un lot d'analyses (tous profils) en une seule transaction
+        
+        Les documents concernés passent en workflow_status "analyzed" avec une
+        seule requête UPDATE.
+        
+        Args:
+            document_analyses: Objets DocumentAnalysis (Pydantic) dont le
+                company_profile_id est l'ID du profil en BDD
+            
+        Returns:
+            Analyses sauvegardées, dans l'ordre d'entrée
+        """
+        if not document_analyses:
+            return []
+        
+        analyses = [
+            Analysis(
+                document_id=document_analysis.document_id,
+                company_profile_id=document_analysis.company_profile_id,
+                validation_status="pending",
+                **self._fields_from_document_analysis(document_analysis)
+            )
+            for document_analysis in document_analyses
+        ]
+        self.session.add_all(analyses)
+        
+        document_ids = {analysis.document_id for analysis in analyses}
+        self.session.query(Document).filter(Document.id.in_(document_ids)).update(
+            {"workflow_status": "analyzed", "analyzed_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        self.session.commit()
+        
+        logger.info(
+            "analyses_bulk_created",
+            count=len(analyses),
+            documents=len(document_ids),
+            relevant=sum(1 for analysis in analyses if analysis.is_relevant)
+        )
+        
+        return analyses
+    
+    def _fields_from_document_analysis(self, document_analysis) -> Dict:
+        """Colonnes d'une Analysis calculées depuis une DocumentAnalysis Pydantic"""
+        # Confiance = combinaison du score final et de la confiance sémantique
+        confidence = (
+            document_analysis.relevance_score.final_score * 0.6 +
+            document_analysis.semantic_analysis.confidence_level * 0.4
+        )
+        
+        return {
+            # Déterminer la pertinence basée sur le score final
+            "is_relevant": document_analysis.is_relevant,
+            "confidence": min(1.0, max(0.0, confidence)),  # Clamp 0-1
+            # Mots-clés trouvés
+            "matched_keywords": document_analysis.keyword_analysis.keywords_found,
+            # Codes NC trouvés
+            "matched_nc_codes": (
+                document_analysis.nc_code_analysis.exact_matches +
+                document_analysis.nc_code_analysis.partial_matches
+            ),
+            # Construire le reasoning LLM
+            "llm_reasoning": self._build_llm_reasoning(document_analysis),
+            # Scores par niveau (voir src/agent_1b/rescoring.py)
+            "keyword_score": document_analysis.relevance_score.keyword_score,
+            "nc_code_score": document_analysis.relevance_score.nc_code_score,
+            "semantic_score": document_analysis.relevance_score.semantic_score,
+            "final_score": document_analysis.relevance_score.final_score,
+            "criticality": document_analysis.relevance_score.criticality.value,
+            "has_critical_codes": bool(document_analysis.nc_code_analysis.critical_codes),
+            "semantic_applicable": document_analysis.semantic_analysis.is_applicable,
+        }
+    
     def find_by_id(self, analysis_id: str) -> Optional[Analysis]:
         """Récupère une analyse par son ID"""
         return self.session.query(Analysis).filter_by(id=analysis_id).first()
@@ -207,3 +280,126 @@ class AnalysisRepository:
         )
         
         return "\n".join(sections)
+
+
+class AnalysisBatchWriter:
+    """
+    Écriture groupée des analyses et des transitions de statut des documents
+    
+    Les analyses sont accumulées puis écrites toutes les flush_size analyses :
+    un INSERT multi-lignes, un UPDATE groupé des documents par clé primaire et
+    un seul commit. Les IDs sont attribués dès add() ; les callbacks on_saved
+    sont appelés après le commit du lot.
+    
+    Les statuts des documents sont gardés avec les analyses du lot, pas sur
+    les objets de la session : un rollback de l'appelant (échec d'un autre
+    document) ne sépare pas une analyse en attente du statut de son document.
+    
+    Usage:
+        with AnalysisBatchWriter(session, flush_size=50) as writer:
+            for analysis in analyses:
+                writer.add(analysis)
+    """
+    
+    def __init__(self, session: Session, flush_size: Optional[int] = None):
+        """
+        Args:
+            session: Session SQLAlchemy (partagée avec l'appelant)
+            flush_size: Analyses par transaction (défaut: settings.analysis_flush_size)
+        """
+        self.session = session
+        self.repository = AnalysisRepository(session)
+        self.flush_size = max(1, flush_size or settings.analysis_flush_size)
+        self.written = 0
+        self.flushes = 0
+        
+        self._rows: List[Dict] = []
+        self._document_updates: Dict[str, datetime] = {}
+        self._callbacks: List[Tuple[Callable[[str], None], str]] = []
+    
+    def add(
+        self,
+        document_analysis,  # DocumentAnalysis Pydantic
+        company_profile_id: Optional[str] = None,
+        on_saved: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Ajoute une analyse au lot (écriture au prochain flush)
+        
+        Args:
+            document_analysis: Objet DocumentAnalysis (Pydantic)
+            company_profile_id: ID du profil en BDD (mode multi-profils)
+            on_saved: Appelé avec l'ID de l'analyse après le commit
+            
+        Returns:
+            ID de l'analyse
+        """
+        analysis_id = generate_uuid()
+        self._rows.append({
+            "id": analysis_id,
+            "document_id": document_analysis.document_id,
+            "company_profile_id": company_profile_id,
+            "validation_status": "pending",
+            "created_at": datetime.utcnow(),
+            **self.repository._fields_from_document_analysis(document_analysis)
+        })
+        
+        self._document_updates[document_analysis.document_id] = document_analysis.analysis_timestamp
+        
+        if on_saved:
+            self._callbacks.append((on_saved, analysis_id))
+        
+        if len(self._rows) >= self.flush_size:
+            self.flush()
+        
+        return analysis_id
+    
+    def flush(self) -> int:
+        """
+        Écrit le lot courant en une transaction
+        
+        Returns:
+            Nombre d'analyses écrites
+        """
+        rows, self._rows = self._rows, []
+        document_updates, self._document_updates = self._document_updates, {}
+        callbacks, self._callbacks = self._callbacks, []
+        
+        try:
+            if rows:
+                self.session.execute(insert(Analysis), rows)
+                # INSERT hors unité de travail ORM : compteurs des dashboards mis à jour ici
+                record_inserted_analyses(self.session, rows)
+            if document_updates:
+                self.session.execute(update(Document), [
+                    {"id": document_id, "workflow_status": "analyzed", "analyzed_at": analyzed_at}
+                    for document_id, analyzed_at in document_updates.items()
+                ])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        
+        if not rows:
+            return 0
+        
+        self.written += len(rows)
+        self.flushes += 1
+        logger.info(
+            "analyses_batch_flushed",
+            count=len(rows),
+            documents=len(document_updates),
+            relevant=sum(1 for row in rows if row["is_relevant"])
+        )
+        
+        for callback, analysis_id in callbacks:
+            callback(analysis_id)
+        
+        return len(rows)
+    
+    def __enter__(self) -> "AnalysisBatchWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
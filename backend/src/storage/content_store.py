@@ -0,0 +1,92 @@
+"""
+Stockage compressé du texte des documents - Table "document_contents"
+
+Le texte extrait (plusieurs centaines de Ko par règlement) n'est plus une
+colonne de "documents" : il est compressé dans une table séparée, chargée
+à la demande (Document.content). Les listes de l'API et les requêtes du
+pipeline ne lisent ainsi que des lignes courtes ; l'aperçu affiché est
+précalculé dans Document.excerpt.
+
+Codec : zlib (bibliothèque standard). La colonne "codec" permet d'ajouter
+d'autres algorithmes sans migrer les lignes existantes.
+"""
+
+import zlib
+from typing import Iterator, Optional, Tuple
+
+DEFAULT_CODEC = "zlib"
+EXCERPT_LENGTH = 500
+ZLIB_LEVEL = 6
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> bytes:
+    """
+    Compresse un texte
+
+    Args:
+        text: Texte du document
+        codec: Algorithme (zlib ou none)
+
+    Returns:
+        Données compressées
+    """
+    data = text.encode("utf-8")
+    if codec == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if codec == "none":
+        return data
+    raise ValueError(f"Codec inconnu: {codec}")
+
+
+def decompress_text(data: bytes, codec: str = DEFAULT_CODEC) -> str:
+    """
+    Décompresse un texte stocké
+
+    Args:
+        data: Données compressées
+        codec: Algorithme utilisé à l'écriture
+
+    Returns:
+        Texte du document
+    """
+    if codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec != "none":
+        raise ValueError(f"Codec inconnu: {codec}")
+    return data.decode("utf-8")
+
+
+def make_excerpt(text: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """
+    Aperçu du document (espaces normalisés, tronqué)
+
+    Args:
+        text: Texte du document
+        length: Longueur maximale
+
+    Returns:
+        Aperçu, ou None si le texte est vide
+    """
+    if not text:
+        return None
+    # Seul le début du texte est normalisé (documents de plusieurs Mo)
+    excerpt = " ".join(text[:length * 2].split())[:length]
+    return excerpt or None
+
+
+def iter_document_texts(session, batch_size: int = 100) -> Iterator[Tuple[str, str]]:
+    """
+    Textes de tous les documents, lus par lots sans charger les objets Document
+
+    Args:
+        session: Session SQLAlchemy
+        batch_size: Taille des lots lus en base
+
+    Yields:
+        Tuples (document_id, texte)
+    """
+    from src.storage.models import DocumentContent
+
+    rows = session.query(DocumentContent.document_id, DocumentContent.codec, DocumentContent.data)
+    for document_id, codec, data in rows.yield_per(batch_size):
+        yield document_id, decompress_text(data, codec)
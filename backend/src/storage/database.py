@@ -5,7 +5,7 @@ Documentation: docs/DATABASE_SCHEMA.md
 """
 
 import os
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from src.storage.models import Base
@@ -112,16 +112,18 @@ def get_session() -> Session:
 
 def init_db():
     """
-    Initialise la base de données (crée toutes les tables)
+    Initialise la base de données (crée ou met à jour toutes les tables)
     
     Usage:
         from src.storage.database import init_db
         init_db()
     
-    Note: Utilise Base.metadata.create_all() - idempotent
+    Note: Applique les migrations Alembic (src/storage/migrations) - idempotent
     """
+    from src.storage.migrations_runner import upgrade_database
+    
     print("🔨 Création des tables de base de données...")
-    Base.metadata.create_all(bind=engine)
+    upgrade_database(engine)
     print("✅ Base de données initialisée avec succès!")
     
     # Afficher les tables créées
@@ -139,6 +141,9 @@ def drop_all_tables():
     """
     print("⚠️  Suppression de toutes les tables...")
     Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        # Version des migrations : init_db recrée ensuite tout le schéma
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
     print("✅ Toutes les tables ont été supprimées")
 
 
@@ -0,0 +1,304 @@
+"""
+Repository de la file de travaux - Gestion de la table "jobs"
+
+Plusieurs workers (processus ou machines) partagent la table :
+- PostgreSQL : SELECT ... FOR UPDATE SKIP LOCKED, chaque worker prend une
+  ligne différente sans attendre les autres
+- SQLite : UPDATE conditionnel (compare-and-set) sur le statut, un seul
+  worker gagne chaque ligne
+
+Un travail pris a un bail (lease) prolongé par des heartbeats. Un bail expiré
+remet le travail en file ; après max_attempts échecs il passe en lettre
+morte (status "dead").
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.storage.models import Job
+
+logger = structlog.get_logger()
+
+JOB_TYPES = ("fetch", "extract", "analyse", "impact")
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class JobRepository:
+    """Repository pour la file de travaux partagée"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Optional[Dict] = None,
+        priority: int = 0,
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        available_at: Optional[datetime] = None,
+        commit: bool = True
+    ) -> Job:
+        """
+        Ajoute un travail à la file
+
+        Args:
+            job_type: fetch, extract, analyse ou impact
+            payload: Paramètres (JSON)
+            priority: Priorité (la plus haute d'abord)
+            dedupe_key: Si un travail actif a la même clé, il est retourné tel quel
+            max_attempts: Tentatives avant lettre morte (défaut: settings.job_max_attempts)
+            available_at: Date de disponibilité (défaut: maintenant)
+            commit: Commiter immédiatement
+
+        Returns:
+            Job créé (ou travail actif existant)
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Type de travail inconnu: {job_type} (attendu: {', '.join(JOB_TYPES)})")
+
+        if dedupe_key:
+            existing = self.session.query(Job).filter(
+                Job.dedupe_key == dedupe_key,
+                Job.status.in_(ACTIVE_STATUSES)
+            ).first()
+            if existing:
+                return existing
+
+        job = Job(
+            job_type=job_type,
+            payload=payload or {},
+            priority=priority,
+            dedupe_key=dedupe_key,
+            max_attempts=max_attempts or settings.job_max_attempts,
+            available_at=available_at or datetime.utcnow()
+        )
+        self.session.add(job)
+        if commit:
+            self.session.commit()
+        else:
+            self.session.flush()
+        return job
+
+    def claim(
+        self,
+        worker_id: str,
+        job_types: Optional[Sequence[str]] = None,
+        lease_seconds: Optional[int] = None,
+        recover: bool = True
+    ) -> Optional[Job]:
+        """
+        Prend le prochain travail disponible (priorité, puis ancienneté)
+
+        Args:
+            worker_id: Identifiant du worker
+            job_types: Types acceptés (défaut: tous)
+            lease_seconds: Durée du bail (défaut: settings.job_lease_seconds)
+            recover: Remettre d'abord en file les baux expirés (voir recover_expired)
+
+        Returns:
+            Job pris (status "running") ou None si la file est vide
+        """
+        if recover:
+            self.recover_expired()
+
+        now = datetime.utcnow()
+        lease = timedelta(seconds=lease_seconds or settings.job_lease_seconds)
+        query = (
+            select(Job.id)
+            .where(Job.status == "pending", Job.available_at <= now)
+            .order_by(Job.priority.desc(), Job.available_at, Job.created_at)
+        )
+        if job_types:
+            query = query.where(Job.job_type.in_(list(job_types)))
+
+        if self._dialect() == "postgresql":
+            job_id = self.session.execute(
+                query.limit(1).with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            candidates = [job_id] if job_id else []
+        else:
+            candidates = list(self.session.execute(query.limit(5)).scalars())
+
+        for job_id in candidates:
+            claimed = self.session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "pending")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    attempts=Job.attempts + 1,
+                    lease_expires_at=now + lease,
+                    heartbeat_at=now
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.session.commit()
+            if claimed:
+                job = self.session.get(Job, job_id, populate_existing=True)
+                logger.info(
+                    "job_claimed",
+                    job_id=job.id,
+                    job_type=job.job_type,
+                    worker_id=worker_id,
+                    attempt=job.attempts
+                )
+                return job
+
+        self.session.commit()
+        return None
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: Optional[int] = None) -> bool:
+        """
+        Prolonge le bail d'un travail en cours
+
+        Returns:
+            False si le worker n'a plus le bail (expiré et repris par un autre)
+        """
+        now = datetime.utcnow()
+        lease = timedelta(seconds=lease_seconds or settings.job_lease_seconds)
+        extended = self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(lease_expires_at=now + lease, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.session.commit()
+        return bool(extended)
+
+    def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        result: Optional[Dict] = None,
+        follow_ups: Optional[List[Tuple[str, Dict, Optional[str]]]] = None
+    ) -> bool:
+        """
+        Termine un travail et ajoute ses travaux suivants dans la même transaction
+
+        Args:
+            job_id: ID du travail
+            worker_id: Worker détenteur du bail
+            result: Résultat (JSON)
+            follow_ups: Travaux suivants (job_type, payload, dedupe_key)
+
+        Returns:
+            False si le bail a été perdu (rien n'est écrit)
+        """
+        done = self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(status="done", result=result, finished_at=datetime.utcnow(), last_error=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not done:
+            self.session.rollback()
+            logger.warning("job_lease_lost", job_id=job_id, worker_id=worker_id)
+            return False
+
+        for job_type, payload, dedupe_key in follow_ups or []:
+            self.enqueue(job_type, payload, dedupe_key=dedupe_key, commit=False)
+        self.session.commit()
+        return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Enregistre l'échec d'un travail : nouvelle tentative avec backoff
+        exponentiel, ou lettre morte après max_attempts
+
+        Returns:
+            Nouveau statut ("pending" ou "dead"), None si le bail a été perdu
+        """
+        job = self.session.get(Job, job_id, populate_existing=True)
+        if job is None or job.worker_id != worker_id or job.status != "running":
+            self.session.rollback()
+            return None
+
+        job.last_error = error[:2000]
+        job.worker_id = None
+        job.lease_expires_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = "dead"
+            job.finished_at = datetime.utcnow()
+            logger.error("job_dead_lettered", job_id=job.id, job_type=job.job_type, attempts=job.attempts, error=error)
+        else:
+            job.status = "pending"
+            backoff = settings.job_retry_backoff_seconds * 2 ** (job.attempts - 1)
+            job.available_at = datetime.utcnow() + timedelta(seconds=backoff)
+            logger.warning("job_retry_scheduled", job_id=job.id, job_type=job.job_type,
+                           attempt=job.attempts, retry_in_seconds=backoff, error=error)
+        self.session.commit()
+        return job.status
+
+    def recover_expired(self) -> int:
+        """
+        Remet en file les travaux dont le bail a expiré (worker arrêté)
+
+        Returns:
+            Nombre de travaux récupérés (remis en file ou en lettre morte)
+        """
+        now = datetime.utcnow()
+        recovered = self.session.execute(
+            update(Job)
+            .where(Job.status == "running", Job.lease_expires_at < now)
+            .values(
+                status=case((Job.attempts >= Job.max_attempts, "dead"), else_="pending"),
+                worker_id=None,
+                lease_expires_at=None,
+                available_at=now,
+                last_error="lease expired"
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.session.commit()
+        if recovered:
+            logger.warning("job_leases_expired", count=recovered)
+        return recovered
+
+    def requeue_dead(self, job_type: Optional[str] = None) -> int:
+        """
+        Remet en file les lettres mortes (tentatives remises à zéro)
+
+        Returns:
+            Nombre de travaux remis en file
+        """
+        query = update(Job).where(Job.status == "dead")
+        if job_type:
+            query = query.where(Job.job_type == job_type)
+        requeued = self.session.execute(
+            query.values(status="pending", attempts=0, available_at=datetime.utcnow(), finished_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.session.commit()
+        return requeued
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Nombre de travaux par type et par statut
+
+        Returns:
+            Ex. {"analyse": {"pending": 12, "running": 3, "done": 40}}
+        """
+        rows = self.session.execute(
+            select(Job.job_type, Job.status, func.count(Job.id)).group_by(Job.job_type, Job.status)
+        ).all()
+        stats: Dict[str, Dict[str, int]] = {}
+        for job_type, status, count in rows:
+            stats.setdefault(job_type, {})[status] = count
+        return stats
+
+    def find_dead(self, limit: int = 100) -> List[Job]:
+        """Lettres mortes, les plus récentes d'abord"""
+        return self.session.query(Job)\
+            .filter(Job.status == "dead")\
+            .order_by(Job.finished_at.desc())\
+            .limit(limit)\
+            .all()
+
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
@@ -0,0 +1,67 @@
+"""
+Environnement Alembic (migrations du schéma)
+
+URL de connexion : settings.database_url (voir src/storage/database.py), ou
+connexion fournie par src/storage/migrations_runner.py (init_db, tests).
+"""
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from src.storage.models import Base
+from src.storage.search import is_search_table
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    # Index plein texte : tables propres au dialecte, hors des modèles
+    return not (type_ == "table" and is_search_table(name))
+
+
+def _database_url() -> str:
+    url = config.get_main_option("sqlalchemy.url")
+    if url:
+        return url
+    from src.storage.database import get_database_url
+    return get_database_url()
+
+
+def run_migrations_offline() -> None:
+    """Génère le SQL sans connexion (alembic upgrade head --sql)"""
+    context.configure(
+        url=_database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_name=_include_name,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(_database_url())
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    # render_as_batch : ALTER TABLE de SQLite (recréation de la table)
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True,
+                      include_name=_include_name)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,162 @@
+"""Schéma initial (tables créées par init_db / create_all avant les migrations)
+
+Les bases existantes sont marquées à cette révision sans la rejouer (voir
+src/storage/migrations_runner.py::upgrade_database) : elle doit rester
+identique au schéma de create_all d'avant les migrations. Les tables et
+colonnes ajoutées depuis sont dans les révisions suivantes (0001a, ...).
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 22:56:46.645680
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('company_processes',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('company_name', sa.String(length=200), nullable=False),
+    sa.Column('processes', sa.JSON(), nullable=True),
+    sa.Column('transport_modes', sa.JSON(), nullable=True),
+    sa.Column('suppliers', sa.JSON(), nullable=True),
+    sa.Column('products', sa.JSON(), nullable=True),
+    sa.Column('import_export_flows', sa.JSON(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('company_profiles',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('company_name', sa.String(length=200), nullable=False),
+    sa.Column('nc_codes', sa.JSON(), nullable=False),
+    sa.Column('keywords', sa.JSON(), nullable=False),
+    sa.Column('regulations', sa.JSON(), nullable=False),
+    sa.Column('contact_emails', sa.JSON(), nullable=False),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('documents',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('source_url', sa.String(length=1000), nullable=False),
+    sa.Column('regulation_type', sa.String(length=50), nullable=False),
+    sa.Column('publication_date', sa.DateTime(), nullable=True),
+    sa.Column('hash_sha256', sa.String(length=64), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('nc_codes', sa.JSON(), nullable=True),
+    sa.Column('document_metadata', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('workflow_status', sa.String(length=20), nullable=False),
+    sa.Column('analyzed_at', sa.DateTime(), nullable=True),
+    sa.Column('validated_at', sa.DateTime(), nullable=True),
+    sa.Column('validated_by', sa.String(length=200), nullable=True),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_checked', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hash_sha256')
+    )
+    op.create_table('execution_logs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('agent_type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=True),
+    sa.Column('duration_seconds', sa.Float(), nullable=True),
+    sa.Column('documents_processed', sa.Integer(), nullable=True),
+    sa.Column('documents_new', sa.Integer(), nullable=True),
+    sa.Column('documents_modified', sa.Integer(), nullable=True),
+    sa.Column('errors', sa.JSON(), nullable=True),
+    sa.Column('log_metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_login', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+
+    op.create_table('analyses',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('document_id', sa.String(), nullable=False),
+    sa.Column('is_relevant', sa.Boolean(), nullable=False),
+    sa.Column('confidence', sa.Float(), nullable=False),
+    sa.Column('matched_keywords', sa.JSON(), nullable=True),
+    sa.Column('matched_nc_codes', sa.JSON(), nullable=True),
+    sa.Column('llm_reasoning', sa.Text(), nullable=True),
+    sa.Column('validation_status', sa.String(length=20), nullable=False),
+    sa.Column('validation_comment', sa.Text(), nullable=True),
+    sa.Column('validated_by', sa.String(length=200), nullable=True),
+    sa.Column('validated_at', sa.DateTime(), nullable=True),
+    sa.Column('regulation_type', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('impact_assessments',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('analysis_id', sa.String(), nullable=False),
+    sa.Column('risk_main', sa.String(length=50), nullable=False),
+    sa.Column('impact_level', sa.String(length=20), nullable=False),
+    sa.Column('risk_details', sa.Text(), nullable=True),
+    sa.Column('modality', sa.String(length=50), nullable=True),
+    sa.Column('deadline', sa.String(length=7), nullable=True),
+    sa.Column('recommendation', sa.Text(), nullable=True),
+    sa.Column('llm_reasoning', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['analysis_id'], ['analyses.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('alerts',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('impact_assessment_id', sa.String(), nullable=False),
+    sa.Column('alert_type', sa.String(length=50), nullable=False),
+    sa.Column('alert_data', sa.JSON(), nullable=False),
+    sa.Column('recipients', sa.JSON(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['impact_assessment_id'], ['impact_assessments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('alerts')
+    op.drop_table('impact_assessments')
+    op.drop_table('analyses')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    op.drop_table('execution_logs')
+    op.drop_table('documents')
+    op.drop_table('company_profiles')
+    op.drop_table('company_processes')
@@ -0,0 +1,135 @@
+"""Profil et scores des analyses, file de travaux, registre d'exécutions
+
+- analyses : company_profile_id (FK → company_profiles, mode multi-profils)
+  et les scores détaillés de l'Agent 1B (keyword_score, nc_code_score,
+  semantic_score, final_score, criticality, has_critical_codes,
+  semantic_applicable), tous nullables
+- jobs : file de travaux distribuée (src/storage/job_repository.py)
+- pipeline_runs, run_locks : registre et verrou des exécutions
+  (src/storage/run_repository.py)
+
+Une base marquée 0001 par upgrade_database a pu recevoir ces tables par
+create_all (init_db d'avant les migrations) : seuls les tables et colonnes
+absentes sont créées.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 00:12:37.204918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copie figée des colonnes de src.storage.models.Analysis
+SCORE_COLUMNS = [
+    ('keyword_score', sa.Float()),
+    ('nc_code_score', sa.Float()),
+    ('semantic_score', sa.Float()),
+    ('final_score', sa.Float()),
+    ('criticality', sa.String(length=20)),
+    ('has_critical_codes', sa.Boolean()),
+    ('semantic_applicable', sa.Boolean()),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    existing = {column['name'] for column in inspector.get_columns('analyses')}
+    has_profile_fk = any(
+        fk['constrained_columns'] == ['company_profile_id'] for fk in inspector.get_foreign_keys('analyses')
+    )
+    with op.batch_alter_table('analyses', schema=None) as batch_op:
+        if 'company_profile_id' not in existing:
+            batch_op.add_column(sa.Column('company_profile_id', sa.String(), nullable=True))
+        if not has_profile_fk:
+            batch_op.create_foreign_key(
+                'fk_analyses_company_profile_id', 'company_profiles', ['company_profile_id'], ['id']
+            )
+        for name, type_ in SCORE_COLUMNS:
+            if name not in existing:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+    if 'jobs' not in tables:
+        op.create_table('jobs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('job_type', sa.String(length=20), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=500), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('jobs', schema=None) as batch_op:
+            batch_op.create_index('idx_jobs_claim', ['status', 'available_at'], unique=False)
+            batch_op.create_index('idx_jobs_dedupe', ['dedupe_key'], unique=False)
+            batch_op.create_index('idx_jobs_lease', ['status', 'lease_expires_at'], unique=False)
+
+    if 'pipeline_runs' not in tables:
+        op.create_table('pipeline_runs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('run_type', sa.String(length=20), nullable=False),
+        sa.Column('state', sa.String(length=20), nullable=False),
+        sa.Column('owner', sa.String(length=100), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('pipeline_runs', schema=None) as batch_op:
+            batch_op.create_index('idx_pipeline_runs_type_started', ['run_type', 'started_at'], unique=False)
+
+    if 'run_locks' not in tables:
+        op.create_table('run_locks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('run_id', sa.String(), nullable=False),
+        sa.Column('owner', sa.String(length=100), nullable=False),
+        sa.Column('acquired_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('run_locks')
+    with op.batch_alter_table('pipeline_runs', schema=None) as batch_op:
+        batch_op.drop_index('idx_pipeline_runs_type_started')
+
+    op.drop_table('pipeline_runs')
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('idx_jobs_lease')
+        batch_op.drop_index('idx_jobs_dedupe')
+        batch_op.drop_index('idx_jobs_claim')
+
+    op.drop_table('jobs')
+    with op.batch_alter_table('analyses', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_analyses_company_profile_id', type_='foreignkey')
+        for name, _ in reversed(SCORE_COLUMNS):
+            batch_op.drop_column(name)
+        batch_op.drop_column('company_profile_id')
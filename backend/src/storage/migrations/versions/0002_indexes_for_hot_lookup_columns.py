@@ -0,0 +1,54 @@
+"""Index des colonnes filtrées et triées par les requêtes fréquentes
+
+- documents : source_url (find_by_url, un appel par document collecté),
+  (workflow_status, created_at) (documents "raw" du pipeline)
+- analyses : (validation_status, created_at), (document_id, created_at),
+  created_at (listes de l'API triées par date)
+- impact_assessments : analysis_id, (impact_level, created_at),
+  (risk_main, created_at)
+
+PostgreSQL : index créés avec CONCURRENTLY, sans bloquer les écritures.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18 22:57:03.468570
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("idx_documents_source_url", "documents", ["source_url"]),
+    ("idx_documents_workflow_created", "documents", ["workflow_status", "created_at"]),
+    ("idx_analyses_validation_created", "analyses", ["validation_status", "created_at"]),
+    ("idx_analyses_document_created", "analyses", ["document_id", "created_at"]),
+    ("idx_analyses_created", "analyses", ["created_at"]),
+    ("idx_impacts_analysis", "impact_assessments", ["analysis_id"]),
+    ("idx_impacts_level_created", "impact_assessments", ["impact_level", "created_at"]),
+    ("idx_impacts_risk_created", "impact_assessments", ["risk_main", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
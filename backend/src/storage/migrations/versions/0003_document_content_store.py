@@ -0,0 +1,104 @@
+"""Texte des documents compressé dans une table séparée
+
+- document_contents : texte compressé (zlib), une ligne par document,
+  chargé à la demande (Document.content)
+- documents : excerpt (aperçu précalculé des listes de l'API) et
+  content_size ; la colonne content est supprimée après copie
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 23:41:12.512094
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 200
+EXCERPT_LENGTH = 500
+
+
+def _excerpt(text: str):
+    # Copie figée de src.storage.content_store.make_excerpt
+    return " ".join(text[:EXCERPT_LENGTH * 2].split())[:EXCERPT_LENGTH] or None
+
+
+def _batches(bind, query):
+    """Lignes par lots, triées par id (pas de chargement de tous les textes)"""
+    last_id = ""
+    while True:
+        rows = bind.execute(query, {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'document_contents',
+        sa.Column('document_id', sa.String(), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('raw_size', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('document_id'),
+    )
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=EXCERPT_LENGTH), nullable=True))
+        batch_op.add_column(sa.Column('content_size', sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    documents = sa.table('documents', sa.column('id', sa.String), sa.column('content', sa.Text),
+                         sa.column('excerpt', sa.String), sa.column('content_size', sa.Integer))
+    contents = sa.table('document_contents', sa.column('document_id', sa.String), sa.column('codec', sa.String),
+                        sa.column('raw_size', sa.Integer), sa.column('data', sa.LargeBinary))
+    query = sa.text(
+        "SELECT id, content FROM documents WHERE content IS NOT NULL AND id > :last_id ORDER BY id LIMIT :limit"
+    )
+    for rows in _batches(bind, query):
+        bind.execute(contents.insert(), [
+            {"document_id": id_, "codec": "zlib", "raw_size": len(text.encode("utf-8")),
+             "data": zlib.compress(text.encode("utf-8"), 6)}
+            for id_, text in rows
+        ])
+        for id_, text in rows:
+            bind.execute(
+                documents.update().where(documents.c.id == id_)
+                .values(excerpt=_excerpt(text), content_size=len(text))
+            )
+
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    documents = sa.table('documents', sa.column('id', sa.String), sa.column('content', sa.Text))
+    query = sa.text(
+        "SELECT document_id, codec, data FROM document_contents WHERE document_id > :last_id "
+        "ORDER BY document_id LIMIT :limit"
+    )
+    for rows in _batches(bind, query):
+        for id_, codec, data in rows:
+            raw = zlib.decompress(data) if codec == "zlib" else data
+            bind.execute(documents.update().where(documents.c.id == id_).values(content=raw.decode("utf-8")))
+
+    with op.batch_alter_table('documents') as batch_op:
+        batch_op.drop_column('excerpt')
+        batch_op.drop_column('content_size')
+    op.drop_table('document_contents')
@@ -0,0 +1,107 @@
+"""Index plein texte des documents (titre et contenu)
+
+- SQLite : table virtuelle FTS5 documents_fts (titre, contenu) et
+  documents_fts_keys (rowid -> document_id)
+- PostgreSQL : table document_search (tsvector) avec index GIN
+
+L'index est rempli par lots à partir des documents existants (texte
+décompressé de document_contents), puis tenu à jour par
+DocumentRepository.upsert_document (voir src/storage/search.py).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:32:48.207715
+
+"""
+import hashlib
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 200
+POSTGRES_MAX_CHARS = 500_000
+
+# Copie figée de src.storage.search
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "title, content, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TABLE IF NOT EXISTS documents_fts_keys (rowid INTEGER PRIMARY KEY, document_id VARCHAR NOT NULL)",
+]
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS document_search ("
+    "document_id VARCHAR PRIMARY KEY REFERENCES documents (id) ON DELETE CASCADE, "
+    "search_vector TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_document_search_vector ON document_search USING GIN (search_vector)",
+]
+SQLITE_INSERT = [
+    "INSERT INTO documents_fts (rowid, title, content) VALUES (:rowid, :title, :content)",
+    "INSERT INTO documents_fts_keys (rowid, document_id) VALUES (:rowid, :document_id)",
+]
+POSTGRES_INSERT = (
+    "INSERT INTO document_search (document_id, search_vector) VALUES (:document_id, "
+    "setweight(to_tsvector('simple', :title), 'A') || setweight(to_tsvector('simple', :content), 'B')) "
+    "ON CONFLICT (document_id) DO NOTHING"
+)
+
+
+def _fts_rowid(document_id: str) -> int:
+    # Copie figée de src.storage.search.fts_rowid
+    return int.from_bytes(hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+
+    for statement in SQLITE_CREATE if dialect == "sqlite" else POSTGRES_CREATE:
+        op.execute(statement)
+    if dialect == "sqlite":
+        # Index éventuellement déjà créé par create_all : rempli à neuf
+        op.execute("DELETE FROM documents_fts")
+        op.execute("DELETE FROM documents_fts_keys")
+
+    query = sa.text(
+        "SELECT d.id, d.title, c.codec, c.data FROM documents d "
+        "LEFT JOIN document_contents c ON c.document_id = d.id "
+        "WHERE d.id > :last_id ORDER BY d.id LIMIT :limit"
+    )
+    inserts = [sa.text(statement) for statement in (SQLITE_INSERT if dialect == "sqlite" else [POSTGRES_INSERT])]
+    last_id = ""
+    while True:
+        rows = bind.execute(query, {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        params = []
+        for document_id, title, codec, data in rows:
+            content = ""
+            if data is not None:
+                content = (zlib.decompress(data) if codec == "zlib" else bytes(data)).decode("utf-8")
+            if dialect == "postgresql":
+                content = content[:POSTGRES_MAX_CHARS]
+            params.append({"document_id": document_id, "title": title or "", "content": content,
+                           "rowid": _fts_rowid(document_id)})
+        for insert in inserts:
+            bind.execute(insert, params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS documents_fts")
+        op.execute("DROP TABLE IF EXISTS documents_fts_keys")
+    elif dialect == "postgresql":
+        op.execute("DROP TABLE IF EXISTS document_search")
@@ -0,0 +1,64 @@
+"""Index des listes de l'API étendus à la clé de pagination (created_at, id)
+
+Pagination par curseur (src/storage/pagination.py) : filtre et tri sur
+(created_at, id) servis par l'index, sans tri en mémoire.
+
+- analyses : idx_analyses_validation_created, idx_analyses_created
+  complétés par id
+- impact_assessments : idx_impacts_level_created, idx_impacts_risk_created
+  complétés par id ; nouvel index idx_impacts_created (liste sans filtre)
+
+PostgreSQL : index créés avec CONCURRENTLY, sans bloquer les écritures.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:58:21.730264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, table, colonnes avant, colonnes après) ; None : index absent
+INDEXES = [
+    ("idx_analyses_validation_created", "analyses",
+     ["validation_status", "created_at"], ["validation_status", "created_at", "id"]),
+    ("idx_analyses_created", "analyses", ["created_at"], ["created_at", "id"]),
+    ("idx_impacts_level_created", "impact_assessments",
+     ["impact_level", "created_at"], ["impact_level", "created_at", "id"]),
+    ("idx_impacts_risk_created", "impact_assessments",
+     ["risk_main", "created_at"], ["risk_main", "created_at", "id"]),
+    ("idx_impacts_created", "impact_assessments", None, ["created_at", "id"]),
+]
+
+
+def _replace(indexes) -> None:
+    """Recrée chaque index (nom, table, colonnes cibles ; None : supprimé)"""
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns in indexes:
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+                if columns is not None:
+                    op.create_index(name, table, columns, postgresql_concurrently=True)
+    else:
+        for name, table, columns in indexes:
+            op.drop_index(name, table_name=table, if_exists=True)
+            if columns is not None:
+                op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace([(name, table, new) for name, table, _, new in INDEXES])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace([(name, table, old) for name, table, old, _ in reversed(INDEXES)])
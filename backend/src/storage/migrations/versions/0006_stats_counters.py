@@ -0,0 +1,60 @@
+"""Compteurs des statistiques des dashboards
+
+Table stats_counters (metric, bucket) -> count, remplie par des GROUP BY
+sur les analyses et impact assessments existants, puis tenue à jour à chaque
+écriture (voir src/storage/stats.py).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 01:24:10.518337
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copie figée des compteurs de src.storage.stats (metric, bucket, table, filtre)
+BACKFILL = [
+    ("'analyses_status'", "validation_status", "analyses", "1 = 1"),
+    ("'analyses_high_priority'", "validation_status", "analyses", "confidence > 0.8"),
+    ("'impacts_level'", "impact_level", "impact_assessments", "1 = 1"),
+    ("'impacts_risk'", "risk_main", "impact_assessments", "1 = 1"),
+    ("'impacts_with_deadline'", "'*'", "impact_assessments", "deadline IS NOT NULL AND deadline <> ''"),
+    ("'impacts_deadline'", "deadline || '|' || impact_level", "impact_assessments",
+     "deadline IS NOT NULL AND deadline <> ''"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stats_counters',
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('bucket', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('metric', 'bucket'),
+    )
+
+    bind = op.get_bind()
+    for metric, bucket, table, condition in BACKFILL:
+        # Pas de GROUP BY sur une constante (refusé par PostgreSQL)
+        group_by = "" if bucket.startswith("'") else f" GROUP BY {bucket}"
+        bind.execute(sa.text(
+            f"INSERT INTO stats_counters (metric, bucket, count, updated_at) "
+            f"SELECT {metric}, {bucket}, COUNT(*), :now FROM {table} WHERE {condition}{group_by}"
+        ), {"now": datetime.utcnow()})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stats_counters')
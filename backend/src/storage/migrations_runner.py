@@ -0,0 +1,95 @@
+"""
+Application des migrations du schéma (Alembic) depuis le code
+
+init_db (API, scripts/init_db.py) et les tests appliquent les migrations de
+src/storage/migrations au lieu de Base.metadata.create_all. Une base créée
+avant les migrations (tables présentes, pas de table alembic_version) est
+d'abord marquée à la révision initiale, puis mise à jour. Sous SQLite, les
+clés étrangères sont désactivées pendant les migrations (recréations de
+tables) puis réactivées.
+
+En ligne de commande (depuis backend/) : alembic upgrade head
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import structlog
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+logger = structlog.get_logger()
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Configuration Alembic sans alembic.ini
+
+    Args:
+        connection: Connexion à utiliser (défaut: settings.database_url)
+
+    Returns:
+        Config Alembic
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_database(engine: Engine, revision: str = "head") -> None:
+    """
+    Met le schéma à jour (idempotent)
+
+    Args:
+        engine: Moteur de la base à migrer
+        revision: Révision cible (défaut: la dernière)
+    """
+    tables = set(inspect(engine).get_table_names())
+    with engine.connect() as connection:
+        foreign_keys = _disable_sqlite_foreign_keys(connection)
+        try:
+            config = alembic_config(connection)
+            if "alembic_version" not in tables and "documents" in tables:
+                # Base créée par create_all : le schéma initial est déjà là
+                logger.info("database_stamped", revision=BASELINE_REVISION)
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, revision)
+            connection.commit()
+        finally:
+            if foreign_keys:
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
+    logger.info("database_migrated", revision=revision)
+
+
+def _disable_sqlite_foreign_keys(connection: Connection) -> bool:
+    """
+    Désactive les clés étrangères SQLite le temps des migrations
+
+    Les migrations "batch" recréent les tables (copie puis DROP de
+    l'ancienne) : avec PRAGMA foreign_keys=ON (src/storage/database.py), le
+    DROP supprime en cascade les lignes des tables filles (ON DELETE CASCADE)
+    ou échoue. Le PRAGMA est sans effet dans une transaction : il est
+    exécuté et commité avant les migrations.
+
+    Args:
+        connection: Connexion des migrations
+
+    Returns:
+        True si les clés étrangères étaient actives (à réactiver ensuite)
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    enabled = bool(connection.exec_driver_sql("PRAGMA foreign_keys").scalar())
+    if enabled:
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    connection.commit()
+    return enabled
@@ -7,10 +7,14 @@ Documentation complète: docs/DATABASE_SCHEMA.md
 from datetime import datetime
 from uuid import uuid4
 from sqlalchemy import (
-    Column, String, DateTime, Text, JSON, Boolean, Float, Integer, ForeignKey
+    Column, String, DateTime, Text, JSON, Boolean, Float, Integer, ForeignKey, Index, LargeBinary
 )
 from sqlalchemy.orm import declarative_base, relationship
 
+from src.storage.content_store import DEFAULT_CODEC, EXCERPT_LENGTH, compress_text, decompress_text, make_excerpt
+from src.storage.search import attach_search_ddl
+from src.storage.stats import attach_stats_tracking
+
 Base = declarative_base()
 
 
@@ -30,7 +34,10 @@ class Document(Base):
         regulation_type: Type de réglementation (CBAM, EUDR, etc.)
         publication_date: Date de publication officielle
         hash_sha256: Hash SHA-256 du contenu (détection changements)
-        content: Texte extrait du PDF
+        content: Texte extrait du PDF (propriété, stocké compressé dans
+            "document_contents" et chargé à la demande)
+        excerpt: Aperçu du texte (500 premiers caractères)
+        content_size: Taille du texte en caractères
         nc_codes: Liste des codes NC trouvés (JSON)
         metadata: Métadonnées diverses (JSON)
         status: new, modified, unchanged
@@ -38,6 +45,12 @@ class Document(Base):
         last_checked: Date de dernière vérification
     """
     __tablename__ = "documents"
+    __table_args__ = (
+        # find_by_url (un appel par document collecté)
+        Index("idx_documents_source_url", "source_url"),
+        # Documents "raw" du pipeline, find_by_workflow_status (tri par date)
+        Index("idx_documents_workflow_created", "workflow_status", "created_at"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     title = Column(String(500), nullable=False)
@@ -45,7 +58,8 @@ class Document(Base):
     regulation_type = Column(String(50), nullable=False)
     publication_date = Column(DateTime, nullable=True)
     hash_sha256 = Column(String(64), unique=True, nullable=False)
-    content = Column(Text, nullable=True)
+    excerpt = Column(String(EXCERPT_LENGTH), nullable=True)
+    content_size = Column(Integer, nullable=True)
     nc_codes = Column(JSON, nullable=True)
     document_metadata = Column(JSON, nullable=True)
     status = Column(String(20), nullable=False, default="new")
@@ -63,11 +77,65 @@ class Document(Base):
     
     # Relations
     analyses = relationship("Analysis", back_populates="document", cascade="all, delete-orphan")
+    # Texte compressé : chargé seulement à l'accès à content
+    body = relationship("DocumentContent", uselist=False, lazy="select", cascade="all, delete-orphan")
+    
+    @property
+    def content(self):
+        """Texte extrait (décompressé à la lecture)"""
+        return self.body.text if self.body is not None else None
+    
+    @content.setter
+    def content(self, text):
+        if text is None:
+            self.body = None
+        elif self.body is None:
+            self.body = DocumentContent(text=text)
+        else:
+            self.body.text = text
+        self.excerpt = make_excerpt(text)
+        self.content_size = len(text) if text is not None else None
     
     def __repr__(self):
         return f"<Document(id={self.id}, title={self.title[:50]}, status={self.status})>"
 
 
+# Index plein texte (FTS5 / tsvector) créé et supprimé avec la table
+attach_search_ddl(Document.__table__)
+
+
+class DocumentContent(Base):
+    """
+    Texte compressé des documents (voir src/storage/content_store.py)
+    
+    Attributes:
+        document_id: Document (1-1)
+        codec: Algorithme de compression (zlib)
+        raw_size: Taille du texte non compressé en octets
+        data: Texte compressé
+    """
+    __tablename__ = "document_contents"
+    
+    document_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(10), nullable=False, default=DEFAULT_CODEC)
+    raw_size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    
+    @property
+    def text(self):
+        """Texte décompressé"""
+        return decompress_text(self.data, self.codec or DEFAULT_CODEC)
+    
+    @text.setter
+    def text(self, value):
+        self.codec = self.codec or DEFAULT_CODEC
+        self.data = compress_text(value, self.codec)
+        self.raw_size = len(value.encode("utf-8"))
+    
+    def __repr__(self):
+        return f"<DocumentContent(document_id={self.document_id}, codec={self.codec}, raw_size={self.raw_size})>"
+
+
 class Analysis(Base):
     """
     Résultats d'analyse de pertinence par Agent 1B (LLM unique)
@@ -75,20 +143,35 @@ class Analysis(Base):
     Attributes:
         id: Identifiant unique
         document_id: Référence au document analysé
+        company_profile_id: Profil entreprise analysé (mode multi-profils)
         is_relevant: Document pertinent (True/False)
         confidence: Niveau de confiance LLM (0-1)
         matched_keywords: Liste des mots-clés trouvés (JSON)
         matched_nc_codes: Codes NC correspondants (JSON)
         llm_reasoning: Explication complète du LLM
+        keyword_score, nc_code_score, semantic_score: Scores des 3 niveaux (0-1)
+        final_score: Score pondéré (0-1)
+        criticality: CRITICAL, HIGH, MEDIUM, LOW, NOT_RELEVANT
+        has_critical_codes: Codes NC critiques trouvés (règle de criticité)
+        semantic_applicable: Applicabilité selon le LLM (règle de criticité)
         validation_status: pending, approved, rejected (validation UI)
         validation_comment: Commentaire du juriste
         validated_by: Email du validateur
         validated_at: Date de validation
     """
     __tablename__ = "analyses"
+    __table_args__ = (
+        # Listes filtrées par statut de validation, triées par date (curseur created_at + id)
+        Index("idx_analyses_validation_created", "validation_status", "created_at", "id"),
+        # Analyses d'un document (historique, jointures)
+        Index("idx_analyses_document_created", "document_id", "created_at"),
+        # Listes sans filtre triées par date (curseur created_at + id)
+        Index("idx_analyses_created", "created_at", "id"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     document_id = Column(String, ForeignKey("documents.id"), nullable=False)
+    company_profile_id = Column(String, ForeignKey("company_profiles.id"), nullable=True)
     
     # Analyse LLM unique (remplace triple filtrage)
     is_relevant = Column(Boolean, nullable=False, default=False)
@@ -97,6 +180,15 @@ class Analysis(Base):
     matched_nc_codes = Column(JSON, nullable=True)
     llm_reasoning = Column(Text, nullable=True)
     
+    # Scores par niveau (re-scoring sans nouvel appel LLM)
+    keyword_score = Column(Float, nullable=True)
+    nc_code_score = Column(Float, nullable=True)
+    semantic_score = Column(Float, nullable=True)
+    final_score = Column(Float, nullable=True)
+    criticality = Column(String(20), nullable=True)
+    has_critical_codes = Column(Boolean, nullable=True)
+    semantic_applicable = Column(Boolean, nullable=True)
+    
     # Validation humaine (UI)
     validation_status = Column(String(20), nullable=False, default="pending")
     # Valeurs: pending, approved, rejected
@@ -131,6 +223,13 @@ class ImpactAssessment(Base):
         llm_reasoning: Explication detaillee LLM
     """
     __tablename__ = "impact_assessments"
+    __table_args__ = (
+        Index("idx_impacts_analysis", "analysis_id"),
+        # find_by_impact_level / find_by_risk et listes de l'API (curseur created_at + id)
+        Index("idx_impacts_level_created", "impact_level", "created_at", "id"),
+        Index("idx_impacts_risk_created", "risk_main", "created_at", "id"),
+        Index("idx_impacts_created", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=generate_uuid)
     analysis_id = Column(String, ForeignKey("analyses.id"), nullable=False)
@@ -186,6 +285,31 @@ class Alert(Base):
         return f"<Alert(id={self.id}, type={self.alert_type}, status={self.status})>"
 
 
+class StatsCounter(Base):
+    """
+    Compteurs des statistiques des dashboards, mis à jour à chaque écriture
+    des analyses et impact assessments (voir src/storage/stats.py)
+    
+    Attributes:
+        metric: Statistique (analyses_status, impacts_level, impacts_deadline...)
+        bucket: Valeur comptée (statut, niveau, "MM-YYYY|niveau"...)
+        count: Nombre de lignes
+        updated_at: Dernière mise à jour
+    """
+    __tablename__ = "stats_counters"
+    
+    metric = Column(String(50), primary_key=True)
+    bucket = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<StatsCounter(metric={self.metric}, bucket={self.bucket}, count={self.count})>"
+
+
+attach_stats_tracking(Analysis, ImpactAssessment)
+
+
 class ExecutionLog(Base):
     """
     Logs d'exécution des agents (monitoring)
@@ -222,6 +346,112 @@ class ExecutionLog(Base):
         return f"<ExecutionLog(id={self.id}, agent={self.agent_type}, status={self.status})>"
 
 
+class Job(Base):
+    """
+    File de travaux partagée par les workers (fetch, extract, analyse, impact)
+    
+    Attributes:
+        id: Identifiant unique
+        job_type: fetch, extract, analyse ou impact
+        payload: Paramètres du travail (JSON)
+        dedupe_key: Clé d'unicité des travaux actifs (ex. "analyse:<document_id>")
+        status: pending, running, done ou dead (lettre morte)
+        priority: Priorité (la plus haute d'abord)
+        attempts: Nombre de prises en charge
+        max_attempts: Tentatives avant lettre morte
+        available_at: Date à partir de laquelle le travail peut être pris (backoff)
+        worker_id: Worker détenteur du bail
+        lease_expires_at: Fin du bail (prolongée par les heartbeats)
+        heartbeat_at: Dernier heartbeat du worker
+        last_error: Dernière erreur
+        result: Résultat du travail (JSON)
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("idx_jobs_claim", "status", "available_at"),
+        Index("idx_jobs_lease", "status", "lease_expires_at"),
+        Index("idx_jobs_dedupe", "dedupe_key"),
+    )
+    
+    id = Column(String, primary_key=True, default=generate_uuid)
+    job_type = Column(String(20), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    dedupe_key = Column(String(500), nullable=True)
+    status = Column(String(20), nullable=False, default="pending")
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    worker_id = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, type={self.job_type}, status={self.status}, attempts={self.attempts})>"
+
+
+class PipelineRun(Base):
+    """
+    Registre des exécutions du pipeline (Agent 1, Agent 2), partagé entre processus
+    
+    Attributes:
+        id: Identifiant unique
+        run_type: agent1 ou agent2
+        state: running, succeeded, failed ou interrupted (heartbeat perdu)
+        owner: Processus propriétaire (hôte-pid)
+        params: Paramètres du déclenchement (JSON)
+        progress: Compteurs de progression (JSON)
+        result: Résultat final (JSON)
+        error: Erreur éventuelle
+        heartbeat_at: Dernier heartbeat du propriétaire
+    """
+    __tablename__ = "pipeline_runs"
+    __table_args__ = (
+        Index("idx_pipeline_runs_type_started", "run_type", "started_at"),
+    )
+    
+    id = Column(String, primary_key=True, default=generate_uuid)
+    run_type = Column(String(20), nullable=False)
+    state = Column(String(20), nullable=False, default="running")
+    owner = Column(String(100), nullable=False)
+    params = Column(JSON, nullable=True)
+    progress = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<PipelineRun(id={self.id}, type={self.run_type}, state={self.state})>"
+
+
+class RunLock(Base):
+    """
+    Verrou d'exécution inter-processus (une ligne par type d'exécution)
+    
+    Attributes:
+        name: Nom du verrou (run_type)
+        run_id: Exécution détentrice
+        owner: Processus détenteur
+        expires_at: Expiration (prolongée par heartbeat ; un verrou expiré peut être repris)
+    """
+    __tablename__ = "run_locks"
+    
+    name = Column(String(50), primary_key=True)
+    run_id = Column(String, nullable=False)
+    owner = Column(String(100), nullable=False)
+    acquired_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<RunLock(name={self.name}, run_id={self.run_id}, owner={self.owner})>"
+
+
 class CompanyProfile(Base):
     """
     Profils entreprise pour filtrage personnalisé (Agent 1B)
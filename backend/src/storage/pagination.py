@@ -0,0 +1,173 @@
+"""
+Pagination par curseur (keyset) et totaux des listes de l'API
+
+Les listes triées par date (analyses, impact assessments) sont paginées sur
+la clé (created_at, id) : chaque page est lue à partir de la dernière ligne
+de la page précédente via l'index (..., created_at, id), au lieu de
+OFFSET qui relit toutes les lignes des pages précédentes.
+
+Le curseur est opaque pour le client (base64 de la clé et du sens).
+
+Totaux (paramètre count des routes) :
+- exact : COUNT(*) de la requête filtrée à chaque appel
+- cached : même total, gardé settings.api_count_cache_seconds par filtre
+  (polling du frontend)
+- none : pas de total
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+from src.config import settings
+
+COUNT_MODES = ("exact", "cached", "none")
+_COUNT_CACHE_MAX_ENTRIES = 1000
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class CursorError(ValueError):
+    """Curseur illisible (modifié, ou émis par une autre liste)"""
+
+
+class Page(NamedTuple):
+    items: List
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, row_id: str, direction: str = "next") -> str:
+    """
+    Curseur opaque d'une ligne
+
+    Args:
+        created_at: Date de création de la ligne
+        row_id: ID de la ligne
+        direction: next (lignes plus anciennes) ou prev (plus récentes)
+
+    Returns:
+        Curseur (base64 URL-safe)
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, str]:
+    """
+    Décode un curseur
+
+    Args:
+        cursor: Curseur reçu du client
+
+    Returns:
+        Tuple (created_at, id, direction)
+
+    Raises:
+        CursorError: Curseur invalide
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        direction = payload["d"]
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(payload["c"]), str(payload["i"]), direction
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError(f"Curseur invalide: {cursor}") from e
+
+
+def keyset_page(query, created_column, id_column, limit: int, cursor: Optional[str] = None) -> Page:
+    """
+    Page d'une requête triée du plus récent au plus ancien (created_at, id)
+
+    Args:
+        query: Requête filtrée (sans tri ni pagination)
+        created_column: Colonne created_at de l'entité listée
+        id_column: Colonne id de l'entité listée
+        limit: Taille de la page
+        cursor: Curseur reçu (None: première page)
+
+    Returns:
+        Page (items, next_cursor, prev_cursor)
+
+    Raises:
+        CursorError: Curseur invalide
+    """
+    key = tuple_(created_column, id_column)
+    direction = "next"
+    if cursor is not None:
+        created_at, row_id, direction = decode_cursor(cursor)
+        if direction == "next":
+            query = query.filter(key < tuple_(created_at, row_id))
+        else:
+            query = query.filter(key > tuple_(created_at, row_id))
+
+    if direction == "next":
+        query = query.order_by(created_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_column.asc(), id_column.asc())
+
+    # Une ligne de plus : indique s'il reste une page dans ce sens
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if direction == "prev":
+        items.reverse()
+    if not items:
+        return Page(items, None, None)
+
+    def _cursor(item, cursor_direction: str) -> str:
+        return encode_cursor(getattr(item, created_column.key), getattr(item, id_column.key), cursor_direction)
+
+    if direction == "next":
+        next_cursor = _cursor(items[-1], "next") if has_more else None
+        prev_cursor = _cursor(items[0], "prev") if cursor is not None else None
+    else:
+        next_cursor = _cursor(items[-1], "next")
+        prev_cursor = _cursor(items[0], "prev") if has_more else None
+    return Page(items, next_cursor, prev_cursor)
+
+
+def count_total(query, mode: str = "exact", cache_key: Optional[str] = None) -> Optional[int]:
+    """
+    Total de la requête filtrée selon le mode demandé
+
+    Args:
+        query: Requête filtrée (sans tri ni pagination)
+        mode: exact, cached ou none
+        cache_key: Liste et filtres (mode cached)
+
+    Returns:
+        Total, ou None (mode none)
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Mode de comptage inconnu: {mode} (attendu: {', '.join(COUNT_MODES)})")
+    if mode == "none":
+        return None
+    if mode == "exact" or cache_key is None:
+        return query.order_by(None).count()
+
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(cache_key)
+    if cached is not None and now - cached[0] < settings.api_count_cache_seconds:
+        return cached[1]
+
+    total = query.order_by(None).count()
+    with _count_cache_lock:
+        if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.clear()
+        _count_cache[cache_key] = (now, total)
+    return total
+
+
+def clear_count_cache() -> None:
+    """Vide le cache des totaux (tests, changement massif des données)"""
+    with _count_cache_lock:
+        _count_cache.clear()
@@ -17,6 +17,7 @@ from src.storage.models import (
     CompanyProcess,
     ImpactAssessment,
 )
+from src.storage.search import index_document
 
 
 class DocumentRepository:
@@ -37,6 +38,7 @@ class DocumentRepository:
         """
         self.session.add(document)
         self.session.flush()  # Pour obtenir l'ID sans commit
+        index_document(self.session, document.id, document.title, document.content)
         return document
     
     def find_by_id(self, document_id: str) -> Optional[Document]:
@@ -112,6 +114,7 @@ class DocumentRepository:
                 existing.document_metadata = document_metadata
                 existing.last_checked = datetime.utcnow()
                 self.session.flush()
+                index_document(self.session, existing.id, existing.title, content)
                 return (existing, "modified")
             else:
                 existing.status = "unchanged"
@@ -136,6 +139,7 @@ class DocumentRepository:
             )
             self.session.add(document)
             self.session.flush()
+            index_document(self.session, document.id, title, content)
             return (document, "new")
     
     def list_new_documents(self, limit: int = 50) -> List[Document]:
@@ -183,6 +187,18 @@ class DocumentRepository:
             document.last_checked = datetime.utcnow()
             self.session.flush()
     
+    def mark_checked(self, source_url: str) -> None:
+        """
+        Enregistrer une vérification sans changement (document distant inchangé)
+        
+        Args:
+            source_url: URL du document
+        """
+        document = self.find_by_url(source_url)
+        if document:
+            document.last_checked = datetime.utcnow()
+            self.session.flush()
+    
     def count_by_status(self) -> dict:
         """
         Compter les documents par statut
@@ -502,6 +518,23 @@ class ExecutionLogRepository:
             .order_by(ExecutionLog.start_time.desc())\
             .first()
     
+    def get_last_successful_execution(self, agent_type: str) -> Optional[ExecutionLog]:
+        """
+        Récupérer la dernière exécution réussie d'un agent
+        
+        Usage: Points de reprise de la collecte incrémentale (log_metadata)
+        
+        Args:
+            agent_type: agent_1a ou agent_1b
+        
+        Returns:
+            Dernier log "success" ou None
+        """
+        return self.session.query(ExecutionLog)\
+            .filter(ExecutionLog.agent_type == agent_type, ExecutionLog.status == "success")\
+            .order_by(ExecutionLog.start_time.desc())\
+            .first()
+    
     def list_failed_executions(self, agent_type: Optional[str] = None) -> List[ExecutionLog]:
         """
         Lister les exécutions échouées
@@ -527,7 +560,8 @@ class ExecutionLogRepository:
         documents_processed: int = 0,
         documents_new: int = 0,
         documents_modified: int = 0,
-        errors: Optional[List[str]] = None
+        errors: Optional[List[str]] = None,
+        log_metadata: Optional[dict] = None
     ) -> None:
         """
         Finaliser une exécution
@@ -539,6 +573,7 @@ class ExecutionLogRepository:
             documents_new: Nombre de nouveaux
             documents_modified: Nombre de modifiés
             errors: Liste d'erreurs (optionnel)
+            log_metadata: Métadonnées (optionnel, ex. points de reprise)
         """
         log = self.find_by_id(log_id)
         if log:
@@ -549,6 +584,8 @@ class ExecutionLogRepository:
             log.documents_new = documents_new
             log.documents_modified = documents_modified
             log.errors = errors or []
+            if log_metadata is not None:
+                log.log_metadata = log_metadata
             self.session.flush()
 
 
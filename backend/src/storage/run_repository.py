@@ -0,0 +1,219 @@
+"""
+Repository du registre d'exécutions - Tables "pipeline_runs" et "run_locks"
+
+Une seule exécution par type (agent1, agent2) à la fois, quel que soit le
+nombre de processus (uvicorn --workers N, scheduler, CLI) :
+- le verrou est une ligne de "run_locks" (clé primaire = type d'exécution,
+  ou nom explicite, ex. "collect:cbam-legislation" par source planifiée),
+  prise par INSERT ou reprise par UPDATE conditionnel si elle a expiré
+- PostgreSQL : pg_try_advisory_xact_lock sérialise en plus la prise du
+  verrou sans attente entre processus concurrents
+
+Le propriétaire prolonge le verrou par heartbeat ; s'il meurt, le verrou
+expire et l'exécution est marquée "interrupted" à la reprise suivante.
+"""
+
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import structlog
+from sqlalchemy import delete, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.storage.models import PipelineRun, RunLock
+
+logger = structlog.get_logger()
+
+RUN_TYPES = ("agent1", "agent2", "collect")
+FINAL_STATES = ("succeeded", "failed", "interrupted")
+
+
+class RunRepository:
+    """Repository pour le registre d'exécutions et son verrou"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def start(
+        self,
+        run_type: str,
+        owner: str,
+        params: Optional[Dict] = None,
+        lock_ttl_seconds: Optional[int] = None,
+        lock_name: Optional[str] = None
+    ) -> Optional[PipelineRun]:
+        """
+        Prend le verrou du type d'exécution et enregistre une nouvelle exécution
+
+        Args:
+            run_type: agent1, agent2 ou collect
+            owner: Processus propriétaire (hôte-pid)
+            params: Paramètres du déclenchement
+            lock_ttl_seconds: Durée du verrou (défaut: settings.run_lock_ttl_seconds)
+            lock_name: Nom du verrou (défaut: run_type)
+
+        Returns:
+            PipelineRun créée, ou None si une exécution est déjà en cours
+        """
+        if run_type not in RUN_TYPES:
+            raise ValueError(f"Type d'exécution inconnu: {run_type} (attendu: {', '.join(RUN_TYPES)})")
+
+        name = lock_name or run_type
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=lock_ttl_seconds or settings.run_lock_ttl_seconds)
+
+        if self._dialect() == "postgresql":
+            key = zlib.crc32(f"run_lock:{name}".encode())
+            if not self.session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar():
+                self.session.rollback()
+                return None
+
+        run = PipelineRun(run_type=run_type, owner=owner, params=params or {}, progress={},
+                          started_at=now, heartbeat_at=now)
+        self.session.add(run)
+        self.session.flush()
+
+        # Reprise d'un verrou expiré (propriétaire arrêté sans le libérer)
+        stale = self.session.query(RunLock).filter(
+            RunLock.name == name, RunLock.expires_at < now
+        ).first()
+        if stale is not None:
+            taken = self.session.execute(
+                update(RunLock)
+                .where(RunLock.name == name, RunLock.run_id == stale.run_id, RunLock.expires_at < now)
+                .values(run_id=run.id, owner=owner, acquired_at=now, expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not taken:
+                self.session.rollback()
+                return None
+            self.session.execute(
+                update(PipelineRun)
+                .where(PipelineRun.id == stale.run_id, PipelineRun.state == "running")
+                .values(state="interrupted", finished_at=now, error="heartbeat lost")
+                .execution_options(synchronize_session=False)
+            )
+            logger.warning("run_lock_recovered", lock=name, previous_run_id=stale.run_id,
+                           previous_owner=stale.owner)
+        else:
+            self.session.add(RunLock(name=name, run_id=run.id, owner=owner,
+                                     acquired_at=now, expires_at=expires_at))
+            try:
+                self.session.flush()
+            except IntegrityError:
+                # Verrou détenu par une exécution vivante
+                self.session.rollback()
+                return None
+
+        self.session.commit()
+        logger.info("run_started", run_id=run.id, run_type=run_type, lock=name, owner=owner)
+        return run
+
+    def heartbeat(
+        self,
+        run_id: str,
+        owner: str,
+        progress: Optional[Dict] = None,
+        lock_ttl_seconds: Optional[int] = None
+    ) -> bool:
+        """
+        Prolonge le verrou et enregistre la progression
+
+        Returns:
+            False si le verrou a été perdu (expiré et repris par un autre processus)
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=lock_ttl_seconds or settings.run_lock_ttl_seconds)
+        extended = self.session.execute(
+            update(RunLock)
+            .where(RunLock.run_id == run_id, RunLock.owner == owner)
+            .values(expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if extended:
+            values = {"heartbeat_at": now}
+            if progress is not None:
+                values["progress"] = progress
+            self.session.execute(
+                update(PipelineRun)
+                .where(PipelineRun.id == run_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        self.session.commit()
+        return bool(extended)
+
+    def finish(
+        self,
+        run_id: str,
+        owner: str,
+        state: str,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None,
+        progress: Optional[Dict] = None
+    ) -> None:
+        """
+        Termine une exécution et libère son verrou (dans la même transaction)
+
+        Args:
+            run_id: ID de l'exécution
+            owner: Processus propriétaire
+            state: succeeded, failed ou interrupted
+            result: Résultat final
+            error: Erreur éventuelle
+            progress: Derniers compteurs de progression
+        """
+        if state not in FINAL_STATES:
+            raise ValueError(f"État final inconnu: {state} (attendu: {', '.join(FINAL_STATES)})")
+
+        values = {"state": state, "finished_at": datetime.utcnow(), "result": result,
+                  "error": error[:2000] if error else None}
+        if progress is not None:
+            values["progress"] = progress
+        self.session.execute(
+            update(PipelineRun)
+            .where(PipelineRun.id == run_id, PipelineRun.owner == owner)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.execute(
+            delete(RunLock)
+            .where(RunLock.run_id == run_id, RunLock.owner == owner)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        logger.info("run_finished", run_id=run_id, state=state)
+
+    def find_by_id(self, run_id: str) -> Optional[PipelineRun]:
+        """Trouver une exécution par ID"""
+        return self.session.get(PipelineRun, run_id, populate_existing=True)
+
+    def find_active(self, lock_name: str) -> Optional[PipelineRun]:
+        """
+        Exécution détentrice du verrou (non expiré)
+
+        Args:
+            lock_name: Nom du verrou (le type d'exécution par défaut)
+
+        Returns:
+            PipelineRun en cours ou None
+        """
+        lock = self.session.query(RunLock).filter(
+            RunLock.name == lock_name, RunLock.expires_at >= datetime.utcnow()
+        ).first()
+        if lock is None:
+            return None
+        return self.find_by_id(lock.run_id)
+
+    def list_recent(self, run_type: Optional[str] = None, limit: int = 20) -> List[PipelineRun]:
+        """Dernières exécutions, les plus récentes d'abord"""
+        query = self.session.query(PipelineRun)
+        if run_type:
+            query = query.filter(PipelineRun.run_type == run_type)
+        return query.order_by(PipelineRun.started_at.desc()).limit(limit).all()
+
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
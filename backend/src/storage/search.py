@@ -0,0 +1,233 @@
+"""
+Recherche plein texte des documents (titre et contenu)
+
+Index selon la base :
+- SQLite : table virtuelle FTS5 "documents_fts" (classement bm25, extraits
+  avec snippet()) et table "documents_fts_keys" (rowid FTS5 -> document_id)
+- PostgreSQL : table "document_search" (tsvector, titre en poids A et
+  contenu en poids B) avec index GIN (classement ts_rank_cd, extraits avec
+  ts_headline)
+
+Le texte des documents étant compressé (voir src/storage/content_store.py),
+l'index est une table à part, créée avec la table "documents" (create_all ou
+migration 0004) et tenue à jour par DocumentRepository.upsert_document.
+
+Les termes recherchés sont combinés en ET ; un terme avec ponctuation
+("4016.93") est recherché tel quel. Les extraits sont du texte brut où les
+correspondances sont entourées de <mark>...</mark>.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+import structlog
+from sqlalchemy import DDL, Float, String, bindparam, event, text
+
+logger = structlog.get_logger()
+
+SEARCH_TABLES = ("documents_fts", "document_search")
+
+# Configuration tsvector : "simple" (pas de racinisation, textes FR et EN)
+POSTGRES_TEXT_CONFIG = "simple"
+# Limite du tsvector PostgreSQL (1 Mo) : seul le début des très longs textes est indexé
+POSTGRES_MAX_CHARS = 500_000
+SNIPPET_TOKENS = 24
+
+# document_id n'est pas une colonne FTS5 : la lire chargerait la ligne entière
+# (texte compris) pour chaque correspondance ; elle est lue dans documents_fts_keys
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "title, content, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TABLE IF NOT EXISTS documents_fts_keys (rowid INTEGER PRIMARY KEY, document_id VARCHAR NOT NULL)",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS documents_fts", "DROP TABLE IF EXISTS documents_fts_keys"]
+POSTGRES_CREATE = [
+    "CREATE TABLE IF NOT EXISTS document_search ("
+    "document_id VARCHAR PRIMARY KEY REFERENCES documents (id) ON DELETE CASCADE, "
+    "search_vector TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_document_search_vector ON document_search USING GIN (search_vector)",
+]
+POSTGRES_DROP = ["DROP TABLE IF EXISTS document_search"]
+
+
+def attach_search_ddl(table) -> None:
+    """
+    Crée/supprime l'index de recherche avec la table "documents"
+    (Base.metadata.create_all / drop_all)
+
+    Args:
+        table: Table "documents"
+    """
+    for dialect, create, drop in (("sqlite", SQLITE_CREATE, SQLITE_DROP),
+                                  ("postgresql", POSTGRES_CREATE, POSTGRES_DROP)):
+        for statement in create:
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect=dialect))
+        for statement in drop:
+            event.listen(table, "before_drop", DDL(statement).execute_if(dialect=dialect))
+
+
+def is_search_table(name: str) -> bool:
+    """Table de l'index (ou table interne FTS5), absente des modèles SQLAlchemy"""
+    return name.startswith(SEARCH_TABLES)
+
+
+def _dialect(session) -> str:
+    return session.get_bind().dialect.name
+
+
+def fts_rowid(document_id: str) -> int:
+    """
+    rowid FTS5 d'un document (hash 63 bits de son ID) : réindexation et
+    extraits par clé primaire
+
+    Args:
+        document_id: ID du document
+
+    Returns:
+        Entier positif stable
+    """
+    return int.from_bytes(hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def _tsvector() -> str:
+    return (f"setweight(to_tsvector('{POSTGRES_TEXT_CONFIG}', :title), 'A') || "
+            f"setweight(to_tsvector('{POSTGRES_TEXT_CONFIG}', :content), 'B')")
+
+
+def _tsquery() -> str:
+    return f"websearch_to_tsquery('{POSTGRES_TEXT_CONFIG}', :query)"
+
+
+def fts_query(search: str) -> Optional[str]:
+    """
+    Requête FTS5 : chaque terme entre guillemets (ponctuation et opérateurs
+    FTS5 non interprétés), termes combinés en ET
+
+    Args:
+        search: Saisie de l'utilisateur
+
+    Returns:
+        Expression MATCH, ou None si aucun terme
+    """
+    terms = re.findall(r'[^\s"]+', search)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def index_document(session, document_id: str, title: str, content: Optional[str]) -> None:
+    """
+    Indexe (ou réindexe) un document, dans la transaction de la session
+
+    Args:
+        session: Session SQLAlchemy
+        document_id: ID du document
+        title: Titre
+        content: Texte extrait
+    """
+    params = {"document_id": document_id, "title": title or "", "content": content or ""}
+    dialect = _dialect(session)
+    if dialect == "sqlite":
+        params["rowid"] = fts_rowid(document_id)
+        session.execute(text("DELETE FROM documents_fts WHERE rowid = :rowid"), params)
+        session.execute(text(
+            "INSERT INTO documents_fts (rowid, title, content) VALUES (:rowid, :title, :content)"
+        ), params)
+        session.execute(text(
+            "INSERT OR REPLACE INTO documents_fts_keys (rowid, document_id) VALUES (:rowid, :document_id)"
+        ), params)
+    elif dialect == "postgresql":
+        params["content"] = params["content"][:POSTGRES_MAX_CHARS]
+        session.execute(text(
+            f"INSERT INTO document_search (document_id, search_vector) VALUES (:document_id, {_tsvector()}) "
+            "ON CONFLICT (document_id) DO UPDATE SET search_vector = EXCLUDED.search_vector"
+        ), params)
+    else:
+        logger.warning("search_index_unsupported_dialect", dialect=dialect)
+
+
+def search_matches(session, search: str):
+    """
+    Documents correspondant à la recherche, à joindre aux requêtes des listes
+
+    Args:
+        session: Session SQLAlchemy
+        search: Saisie de l'utilisateur
+
+    Returns:
+        Sous-requête (document_id, rank) où un rank plus petit est plus
+        pertinent, ou None si la recherche est vide
+    """
+    dialect = _dialect(session)
+    if dialect == "sqlite":
+        query = fts_query(search)
+        if query is None:
+            return None
+        # Poids bm25 par colonne : titre, contenu
+        statement = text(
+            "SELECT k.document_id, m.rank FROM ("
+            "SELECT rowid AS fts_rowid, bm25(documents_fts, 10.0, 1.0) AS rank "
+            "FROM documents_fts WHERE documents_fts MATCH :query"
+            ") AS m JOIN documents_fts_keys k ON k.rowid = m.fts_rowid"
+        )
+    elif dialect == "postgresql":
+        query = search.strip()
+        if not query:
+            return None
+        statement = text(
+            f"SELECT document_id, -ts_rank_cd(search_vector, {_tsquery()}) AS rank "
+            f"FROM document_search WHERE search_vector @@ {_tsquery()}"
+        )
+    else:
+        raise ValueError(f"Recherche plein texte non supportée: {dialect}")
+    return statement.bindparams(query=query).columns(document_id=String, rank=Float).subquery("search_matches")
+
+
+def search_snippets(session, search: str, document_ids: List[str]) -> Dict[str, str]:
+    """
+    Extraits autour des correspondances (page de résultats), dans le contenu
+    ou le titre selon la colonne la plus pertinente
+
+    Args:
+        session: Session SQLAlchemy
+        search: Saisie de l'utilisateur
+        document_ids: Documents de la page
+
+    Returns:
+        Dictionnaire document_id -> extrait (<mark>...</mark>)
+    """
+    if not document_ids:
+        return {}
+    dialect = _dialect(session)
+    if dialect == "sqlite":
+        query = fts_query(search)
+        if query is None:
+            return {}
+        rowids = {fts_rowid(document_id): document_id for document_id in document_ids}
+        rows = session.execute(
+            text(
+                f"SELECT rowid, snippet(documents_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) "
+                "FROM documents_fts WHERE documents_fts MATCH :query AND rowid IN :rowids"
+            ).bindparams(bindparam("rowids", expanding=True)),
+            {"query": query, "rowids": list(rowids)},
+        )
+        return {rowids[rowid]: snippet for rowid, snippet in rows}
+
+    # PostgreSQL : le texte compressé est lu en Python, ts_headline en une requête
+    from sqlalchemy.orm import selectinload
+    from src.storage.models import Document
+
+    documents = session.query(Document).options(selectinload(Document.body)).filter(
+        Document.id.in_(document_ids)
+    ).all()
+    rows = session.execute(
+        text(
+            f"SELECT t.id, ts_headline('{POSTGRES_TEXT_CONFIG}', t.body, {_tsquery()}, "
+            f"'StartSel=<mark>, StopSel=</mark>, MaxWords={SNIPPET_TOKENS}, MinWords={SNIPPET_TOKENS // 2}') "
+            "FROM unnest(CAST(:ids AS text[]), CAST(:bodies AS text[])) AS t(id, body)"
+        ),
+        {"query": search.strip(), "ids": [doc.id for doc in documents],
+         "bodies": [(doc.content or "")[:POSTGRES_MAX_CHARS] for doc in documents]},
+    )
+    return {document_id: snippet for document_id, snippet in rows}
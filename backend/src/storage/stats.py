@@ -0,0 +1,294 @@
+"""
+Statistiques des dashboards (réglementations, impacts, timeline)
+
+Les compteurs sont gardés dans la table "stats_counters" (une ligne par
+statistique et valeur comptée) et mis à jour dans la transaction de chaque
+écriture :
+- écritures ORM des analyses et impact assessments (pipeline, validation
+  par l'API, Agent 2) : événement after_flush de la session
+- insertion par lots de AnalysisBatchWriter (INSERT sans unité de travail
+  ORM) : record_inserted_analyses()
+
+Les routes de statistiques lisent ainsi quelques lignes quel que soit
+l'historique. aggregate_stats() recalcule les mêmes compteurs avec des
+GROUP BY (migration 0006, scripts/rebuild_stats.py).
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger()
+
+# Statistiques (colonne metric)
+ANALYSES_STATUS = "analyses_status"  # bucket : validation_status
+ANALYSES_HIGH_PRIORITY = "analyses_high_priority"  # confidence > seuil, bucket : validation_status
+IMPACTS_LEVEL = "impacts_level"  # bucket : impact_level
+IMPACTS_RISK = "impacts_risk"  # bucket : risk_main
+IMPACTS_WITH_DEADLINE = "impacts_with_deadline"  # bucket : ALL
+IMPACTS_DEADLINE = "impacts_deadline"  # bucket : "MM-YYYY|impact_level"
+
+ALL = "*"
+HIGH_PRIORITY_CONFIDENCE = 0.8
+
+Key = Tuple[str, str]
+
+# Colonnes dont dépendent les compteurs, par table
+TRACKED_COLUMNS = {
+    "analyses": ("validation_status", "confidence"),
+    "impact_assessments": ("impact_level", "risk_main", "deadline"),
+}
+
+
+def analysis_keys(validation_status: str, confidence: Optional[float]) -> List[Key]:
+    """
+    Compteurs incrémentés par une analyse
+
+    Args:
+        validation_status: pending, approved, rejected
+        confidence: Confiance du LLM
+
+    Returns:
+        Liste de (metric, bucket)
+    """
+    keys = [(ANALYSES_STATUS, validation_status)]
+    if confidence is not None and confidence > HIGH_PRIORITY_CONFIDENCE:
+        keys.append((ANALYSES_HIGH_PRIORITY, validation_status))
+    return keys
+
+
+def impact_keys(impact_level: str, risk_main: str, deadline: Optional[str]) -> List[Key]:
+    """
+    Compteurs incrémentés par un impact assessment
+
+    Args:
+        impact_level: faible, moyen, eleve
+        risk_main: Risque principal
+        deadline: Deadline MM-YYYY
+
+    Returns:
+        Liste de (metric, bucket)
+    """
+    keys = [(IMPACTS_LEVEL, impact_level), (IMPACTS_RISK, risk_main)]
+    if deadline:
+        keys.append((IMPACTS_WITH_DEADLINE, ALL))
+        keys.append((IMPACTS_DEADLINE, f"{deadline}|{impact_level}"))
+    return keys
+
+
+_KEYS = {"analyses": analysis_keys, "impact_assessments": impact_keys}
+
+
+def _row_keys(table: str, values: Dict) -> List[Key]:
+    return _KEYS[table](*(values[column] for column in TRACKED_COLUMNS[table]))
+
+
+def apply_deltas(session, deltas: Dict[Key, int]) -> None:
+    """
+    Ajoute les variations aux compteurs, dans la transaction de la session
+
+    Args:
+        session: Session SQLAlchemy
+        deltas: (metric, bucket) -> variation
+    """
+    from src.storage.models import StatsCounter
+
+    now = datetime.utcnow()
+    # Ordre fixe des lignes : pas d'interblocage entre transactions concurrentes (PostgreSQL)
+    rows = [{"metric": metric, "bucket": bucket, "count": delta, "updated_at": now}
+            for (metric, bucket), delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+
+    table = StatsCounter.__table__
+    connection = session.connection()
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        for row in rows:
+            updated = connection.execute(
+                table.update()
+                .where(table.c.metric == row["metric"], table.c.bucket == row["bucket"])
+                .values(count=table.c.count + row["count"], updated_at=now)
+            )
+            if updated.rowcount == 0:
+                connection.execute(table.insert().values(**row))
+        return
+
+    statement = insert(table)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.metric, table.c.bucket],
+        set_={"count": table.c.count + statement.excluded.count, "updated_at": statement.excluded.updated_at},
+    ), rows)
+
+
+def record_inserted_analyses(session, rows: Iterable[Dict]) -> None:
+    """
+    Compte des analyses insérées sans l'ORM (insert(Analysis) par lots)
+
+    Args:
+        session: Session SQLAlchemy de l'insertion
+        rows: Lignes insérées (validation_status, confidence)
+    """
+    deltas = Counter()
+    for row in rows:
+        deltas.update(_row_keys("analyses", row))
+    apply_deltas(session, deltas)
+
+
+def _values(obj, columns: Tuple[str, ...], before: bool) -> Dict:
+    """Valeurs des colonnes suivies avant ou après le flush (historique des attributs)"""
+    state = inspect(obj)
+    values = {}
+    for column in columns:
+        history = state.attrs[column].history
+        if before and history.deleted:
+            values[column] = history.deleted[0]
+        elif not before and history.added:
+            values[column] = history.added[0]
+        elif history.unchanged:
+            values[column] = history.unchanged[0]
+        elif before and history.added:
+            values[column] = None  # Aucune valeur avant (non chargée ou NULL)
+        else:
+            values[column] = getattr(obj, column)
+    return values
+
+
+def _before_flush(session, flush_context, instances) -> None:
+    # Valeurs des lignes supprimées chargées avant le DELETE
+    for obj in session.deleted:
+        columns = TRACKED_COLUMNS.get(getattr(obj, "__tablename__", None))
+        if columns:
+            for column in columns:
+                getattr(obj, column)
+
+
+def _after_flush(session, flush_context) -> None:
+    deltas = Counter()
+    for obj in session.new:
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_COLUMNS:
+            deltas.update(_row_keys(table, _values(obj, TRACKED_COLUMNS[table], before=False)))
+    for obj in session.deleted:
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_COLUMNS:
+            deltas.subtract(_row_keys(table, _values(obj, TRACKED_COLUMNS[table], before=True)))
+    for obj in session.dirty:
+        table = getattr(obj, "__tablename__", None)
+        if table not in TRACKED_COLUMNS:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[column].history.has_changes() for column in TRACKED_COLUMNS[table]):
+            continue
+        deltas.subtract(_row_keys(table, _values(obj, TRACKED_COLUMNS[table], before=True)))
+        deltas.update(_row_keys(table, _values(obj, TRACKED_COLUMNS[table], before=False)))
+    apply_deltas(session, deltas)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+def attach_stats_tracking(*models) -> None:
+    """
+    Met à jour les compteurs à chaque flush des sessions
+
+    Les attributs suivis chargent leur ancienne valeur avant d'être modifiés
+    (active_history) : un changement de statut décrémente l'ancien compteur
+    même si l'attribut avait expiré après un commit.
+
+    Args:
+        models: Modèles suivis (tables de TRACKED_COLUMNS)
+    """
+    for model in models:
+        for column in TRACKED_COLUMNS[model.__tablename__]:
+            event.listen(getattr(model, column), "set", _load_previous_value, active_history=True)
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+
+
+def aggregate_stats(session) -> Counter:
+    """
+    Compteurs recalculés depuis les tables (deux requêtes GROUP BY)
+
+    Args:
+        session: Session SQLAlchemy
+
+    Returns:
+        Counter (metric, bucket) -> nombre
+    """
+    from src.storage.models import Analysis, ImpactAssessment
+
+    counts = Counter()
+    high_priority = (Analysis.confidence > HIGH_PRIORITY_CONFIDENCE).label("high_priority")
+    for status, high, count in session.query(
+        Analysis.validation_status, high_priority, func.count()
+    ).group_by(Analysis.validation_status, high_priority):
+        counts[(ANALYSES_STATUS, status)] += count
+        if high:
+            counts[(ANALYSES_HIGH_PRIORITY, status)] += count
+
+    for level, risk, deadline, count in session.query(
+        ImpactAssessment.impact_level, ImpactAssessment.risk_main, ImpactAssessment.deadline, func.count()
+    ).group_by(ImpactAssessment.impact_level, ImpactAssessment.risk_main, ImpactAssessment.deadline):
+        for key in impact_keys(level, risk, deadline):
+            counts[key] += count
+    return counts
+
+
+def rebuild_stats(session) -> Dict[Key, Tuple[int, int]]:
+    """
+    Remplace les compteurs par les valeurs recalculées (à commiter par l'appelant)
+
+    Args:
+        session: Session SQLAlchemy
+
+    Returns:
+        Écarts corrigés : (metric, bucket) -> (ancien, nouveau)
+    """
+    from src.storage.models import StatsCounter
+
+    current = {(row.metric, row.bucket): row.count for row in session.query(StatsCounter)}
+    counts = aggregate_stats(session)
+    drift = {key: (current.get(key, 0), counts.get(key, 0))
+             for key in set(current) | set(counts) if current.get(key, 0) != counts.get(key, 0)}
+
+    session.query(StatsCounter).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    session.add_all([StatsCounter(metric=metric, bucket=bucket, count=count, updated_at=now)
+                     for (metric, bucket), count in sorted(counts.items()) if count])
+    session.flush()
+    logger.info("stats_rebuilt", counters=len(counts), drift=len(drift))
+    return drift
+
+
+def read_stats(session, metrics: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Compteurs des statistiques demandées (une requête sur la clé primaire)
+
+    Args:
+        session: Session SQLAlchemy
+        metrics: Statistiques (ANALYSES_STATUS, IMPACTS_LEVEL, ...)
+
+    Returns:
+        metric -> {bucket: nombre}
+    """
+    from src.storage.models import StatsCounter
+
+    metrics = list(metrics)
+    stats = {metric: {} for metric in metrics}
+    for metric, bucket, count in session.query(
+        StatsCounter.metric, StatsCounter.bucket, StatsCounter.count
+    ).filter(StatsCounter.metric.in_(metrics)):
+        if count:
+            stats[metric][bucket] = count
+    return stats
@@ -0,0 +1,71 @@
+"""
+Sélection du backend LLM (API réelle ou modèle hors ligne)
+
+Tous les agents créent leur modèle de chat via create_chat_model : avec
+LLM_BACKEND=offline, le pipeline, les benchmarks de l'Agent 1B et l'Agent 2
+tournent sans clé API sur OfflineChatModel.
+"""
+
+from langchain_core.language_models import BaseChatModel
+
+from src.config import settings
+from src.utils.offline_llm import OfflineChatModel
+
+
+def is_offline() -> bool:
+    """Vrai si le backend hors ligne est sélectionné"""
+    return settings.llm_backend.lower() == "offline"
+
+
+def create_chat_model(
+    model_name: str,
+    provider: str = "anthropic",
+    temperature: float = 0.0,
+    max_tokens: int = 2000
+) -> BaseChatModel:
+    """
+    Crée le modèle de chat selon settings.llm_backend
+
+    Args:
+        model_name: Nom du modèle (conservé en mode hors ligne pour le coût estimé)
+        provider: "anthropic" ou "google"
+        temperature: Température de génération
+        max_tokens: Nombre maximal de tokens générés
+
+    Returns:
+        Modèle de chat LangChain
+
+    Raises:
+        ValueError: Si le fournisseur est inconnu
+    """
+    if is_offline():
+        return OfflineChatModel(
+            model_name=model_name,
+            seed=settings.offline_llm_seed,
+            latency_distribution=settings.offline_llm_latency_distribution,
+            latency_ms=settings.offline_llm_latency_ms,
+            latency_spread=settings.offline_llm_latency_spread,
+            error_rate=settings.offline_llm_error_rate,
+            output_tokens=settings.offline_llm_output_tokens
+        )
+
+    if provider == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+
+        return ChatAnthropic(
+            model=model_name,
+            api_key=settings.anthropic_api_key,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+    if provider == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=model_name,
+            api_key=settings.google_api_key,
+            temperature=temperature
+        )
+
+    raise ValueError(f"Fournisseur LLM inconnu: {provider}")
@@ -0,0 +1,113 @@
+"""
+Suivi de la consommation LLM (appels, tokens, latence, coût)
+
+Le callback LLMUsageTracker se branche sur n'importe quelle chaîne LangChain
+(invoke ou batch) via config={"callbacks": [tracker]}.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.utils.metrics import record
+
+
+# Tarifs publics Anthropic en USD par million de tokens (entrée, sortie)
+MODEL_PRICING_USD_PER_MTOK: Dict[str, tuple] = {
+    "claude-haiku-4-5": (1.0, 5.0),
+    "claude-sonnet-4-5": (3.0, 15.0),
+    "claude-opus-4-5": (5.0, 25.0),
+}
+
+
+def estimate_cost_usd(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """
+    Estime le coût d'un appel à partir des tokens consommés
+
+    Args:
+        model_name: Nom du modèle (les suffixes de date sont ignorés)
+        input_tokens: Tokens envoyés
+        output_tokens: Tokens générés
+
+    Returns:
+        Coût en USD (0 si le modèle n'a pas de tarif connu)
+    """
+    for prefix, (input_price, output_price) in MODEL_PRICING_USD_PER_MTOK.items():
+        if model_name.startswith(prefix):
+            return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+    return 0.0
+
+
+class LLMUsageTracker(BaseCallbackHandler):
+    """Callback LangChain qui cumule appels, tokens et latence (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[Any, float] = {}
+        self.calls = 0
+        self.errors = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_s = 0.0
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self._record_latency(run_id)
+        # Étape en cours (voir src/utils/metrics.py)
+        record(llm_calls=1, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self._record_latency(run_id)
+        record(llm_calls=1)
+
+    def _record_latency(self, run_id: Optional[Any]) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.latency_s += time.perf_counter() - started
+
+    def snapshot(self, model_name: str = "") -> Dict[str, Any]:
+        """
+        Résumé sérialisable de la consommation
+
+        Args:
+            model_name: Modèle utilisé (pour l'estimation du coût)
+
+        Returns:
+            Dictionnaire calls/errors/tokens/latence/coût
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "latency_s": round(self.latency_s, 3),
+                "cost_usd": round(
+                    estimate_cost_usd(model_name, self.input_tokens, self.output_tokens), 6
+                ),
+            }
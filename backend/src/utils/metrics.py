@@ -0,0 +1,204 @@
+"""
+Mesures par étape (temps, CPU, mémoire, octets, tokens, éléments)
+
+Un collecteur (RunMetrics) est actif pour la durée d'une exécution (Agent 1A,
+pipeline, Agent 2) via une ContextVar ; les étapes ouvrent des spans et le
+code bas niveau (téléchargement, callback LLM) ajoute ses compteurs au span
+courant sans paramètre supplémentaire :
+
+    @with_metrics
+    async def run_agent_1a_combined(...):
+        stage = span("download")
+        ...
+        stage.finish(items=len(downloaded_files))
+
+    record(bytes=len(response.content))   # dans document_fetcher
+
+Mesures par étape (cumulées si l'étape est répétée) :
+- wall_s : temps réel
+- cpu_s : temps CPU du processus (tous threads) pendant l'étape
+- peak_rss_delta_mb : hausse du pic de mémoire résidente pendant l'étape
+- items, bytes, input_tokens, output_tokens, llm_calls : compteurs
+
+Sans collecteur actif, les spans et record() ne font rien.
+"""
+
+import asyncio
+import functools
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import structlog
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = structlog.get_logger()
+
+COUNTERS = ("items", "bytes", "input_tokens", "output_tokens", "llm_calls")
+
+_collector: ContextVar[Optional["RunMetrics"]] = ContextVar("run_metrics", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("metrics_span", default=None)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire résidente du processus (None si non disponible)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RunMetrics:
+    """Mesures cumulées par étape d'une exécution (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._rss_started = peak_rss_mb()
+
+    def add_stage(self, name: str, wall_s: float, cpu_s: float, rss_delta_mb: Optional[float],
+                  counters: Dict[str, int]) -> None:
+        with self._lock:
+            stage = self._stages.setdefault(name, {
+                "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_rss_delta_mb": 0.0,
+                **dict.fromkeys(COUNTERS, 0)
+            })
+            stage["calls"] += 1
+            stage["wall_s"] += wall_s
+            stage["cpu_s"] += cpu_s
+            if rss_delta_mb is not None:
+                stage["peak_rss_delta_mb"] += rss_delta_mb
+            for key, value in counters.items():
+                stage[key] = stage.get(key, 0) + value
+
+    def snapshot(self) -> Dict:
+        """
+        Returns:
+            {"stages": {nom: mesures}, "total": {wall_s, cpu_s, peak_rss_mb, peak_rss_delta_mb}}
+        """
+        rss = peak_rss_mb()
+        with self._lock:
+            stages = {
+                name: {key: round(value, 3) if isinstance(value, float) else value for key, value in stage.items()}
+                for name, stage in self._stages.items()
+            }
+        return {
+            "stages": stages,
+            "total": {
+                "wall_s": round(time.perf_counter() - self._started, 3),
+                "cpu_s": round(time.process_time() - self._cpu_started, 3),
+                "peak_rss_mb": round(rss, 1) if rss is not None else None,
+                "peak_rss_delta_mb": round(rss - self._rss_started, 1) if rss is not None else None,
+            }
+        }
+
+
+class Span:
+    """
+    Mesure d'une étape, démarrée à la création
+
+    Utilisable en context manager ou terminée explicitement par finish().
+    """
+
+    def __init__(self, name: str, **counters):
+        self.name = name
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.counters.update(counters)
+        self._lock = threading.Lock()
+        self._collector = _collector.get()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._rss_started = peak_rss_mb() if self._collector else None
+        self._token = _current_span.set(self)
+        self._finished = False
+
+    def add(self, **amounts) -> None:
+        with self._lock:
+            for key, value in amounts.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def finish(self, **amounts) -> None:
+        """Termine l'étape (compteurs finaux optionnels, ex. items=12)"""
+        if self._finished:
+            return
+        self._finished = True
+        self.add(**amounts)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Terminé depuis un autre contexte (tâche asyncio) : rien à restaurer
+            pass
+        if self._collector is None:
+            return
+
+        wall = time.perf_counter() - self._started
+        cpu = time.process_time() - self._cpu_started
+        rss = peak_rss_mb()
+        rss_delta = rss - self._rss_started if rss is not None and self._rss_started is not None else None
+        self._collector.add_stage(self.name, wall, cpu, rss_delta, self.counters)
+        logger.debug("stage_completed", stage=self.name, wall_s=round(wall, 3), cpu_s=round(cpu, 3), **{
+            key: value for key, value in self.counters.items() if value
+        })
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.finish()
+
+
+def span(name: str, **counters) -> Span:
+    """Démarre la mesure d'une étape (voir Span)"""
+    return Span(name, **counters)
+
+
+def record(**amounts) -> None:
+    """Ajoute des compteurs (bytes, input_tokens...) à l'étape en cours, s'il y en a une"""
+    current = _current_span.get()
+    if current is not None:
+        current.add(**amounts)
+
+
+def current_metrics() -> Optional[RunMetrics]:
+    """Collecteur actif (None hors exécution mesurée)"""
+    return _collector.get()
+
+
+def with_metrics(func):
+    """
+    Active un collecteur pendant l'appel (fonction ou coroutine)
+
+    Un collecteur déjà actif est réutilisé : les étapes d'Agent 1A lancé par
+    le pipeline sont cumulées avec celles du pipeline.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _collector.get() is not None:
+                return await func(*args, **kwargs)
+            token = _collector.set(RunMetrics())
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _collector.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _collector.get() is not None:
+            return func(*args, **kwargs)
+        token = _collector.set(RunMetrics())
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _collector.reset(token)
+    return wrapper
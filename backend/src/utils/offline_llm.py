@@ -0,0 +1,300 @@
+"""
+Modèle de chat hors ligne, déterministe (tests de charge et de régression)
+
+OfflineChatModel remplace ChatAnthropic / ChatGoogleGenerativeAI sans clé API :
+- les réponses sont dérivées du hash du prompt et respectent le schéma
+  demandé (sortie structurée par tool calling, format_instructions de
+  PydanticOutputParser ou outils d'un agent ReAct) ;
+- la latence, le taux d'erreur et les tokens de sortie sont configurables ;
+- une même entrée produit toujours la même réponse, et la n-ième tentative
+  d'un même prompt toujours la même latence/erreur : deux runs sont
+  comparables à l'identique.
+
+Activation: LLM_BACKEND=offline (voir src/utils/llm_backend.py).
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+from src.utils.tokens import estimate_tokens
+
+
+# Vocabulaire des textes générés (longueur minimale des champs respectée)
+VOCABULARY = (
+    "règlement obligation déclaration importateur produit émissions carbone "
+    "certificat douane code nomenclature conformité délai autorité fournisseur "
+    "installation rapport vérification pénalité exportation matériau caoutchouc "
+    "aluminium acier entreprise filiale transition annexe article période"
+).split()
+
+# Bloc JSON des format_instructions de PydanticOutputParser
+SCHEMA_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+class OfflineLLMError(RuntimeError):
+    """Erreur simulée par le modèle hors ligne"""
+
+
+class OfflineChatModel(BaseChatModel):
+    """Modèle de chat local à réponses déterministes"""
+
+    model_name: str = "offline"
+    seed: int = 0
+    latency_distribution: str = "fixed"
+    latency_ms: float = 0.0
+    latency_spread: float = 0.0
+    error_rate: float = 0.0
+    output_tokens: int = 0
+
+    _attempts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "seed": self.seed}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Any] = None, **kwargs):
+        """Associe des outils (schémas Pydantic, fonctions ou @tool)"""
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: Optional[Any] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        prompt = "\n".join(_message_text(message) for message in messages)
+        digest = hashlib.sha256(f"{self.seed}|{self.model_name}|{prompt}".encode("utf-8")).hexdigest()
+
+        # Latence et erreur : déterministes pour la n-ième tentative d'un prompt
+        # (tirage de l'erreur en premier : indépendant des réglages de latence)
+        call_rng = random.Random(f"{digest}:{self._next_attempt(digest)}")
+        fails = call_rng.random() < self.error_rate
+        time.sleep(self._sample_latency(call_rng) / 1000)
+        if fails:
+            raise OfflineLLMError(f"Erreur simulée ({self.model_name}, prompt {digest[:8]})")
+
+        # Contenu : déterministe pour un prompt donné
+        rng = random.Random(digest)
+        if tools:
+            message = self._tool_response(messages, tools, tool_choice, rng)
+        else:
+            message = AIMessage(content=self._text_response(prompt, rng))
+
+        input_tokens = estimate_tokens(prompt) + (estimate_tokens(json.dumps(tools)) if tools else 0)
+        output_text = message.content or json.dumps([call["args"] for call in message.tool_calls])
+        output_tokens = self.output_tokens or estimate_tokens(output_text)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        message.response_metadata = {"model_name": self.model_name, "offline": True}
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _next_attempt(self, digest: str) -> int:
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+            return attempt
+
+    def _sample_latency(self, rng: random.Random) -> float:
+        """Latence en ms selon la distribution configurée"""
+        if self.latency_ms <= 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            return max(0.0, rng.uniform(self.latency_ms - self.latency_spread, self.latency_ms + self.latency_spread))
+        if self.latency_distribution == "lognormal":
+            # latency_ms = médiane, latency_spread = sigma (queue lourde)
+            return self.latency_ms * rng.lognormvariate(0.0, self.latency_spread)
+        return self.latency_ms
+
+    def _text_response(self, prompt: str, rng: random.Random) -> str:
+        """JSON conforme au schéma des format_instructions, sinon texte libre"""
+        for block in reversed(SCHEMA_BLOCK_PATTERN.findall(prompt)):
+            try:
+                schema = json.loads(block)
+            except json.JSONDecodeError:
+                continue
+            if "properties" in schema:
+                return json.dumps(sample_from_schema(schema, rng), ensure_ascii=False)
+        return _sentence(rng, 40)
+
+    def _tool_response(
+        self,
+        messages: List[BaseMessage],
+        tools: List[Dict],
+        tool_choice: Optional[Any],
+        rng: random.Random
+    ) -> AIMessage:
+        """
+        Appel d'outil(s) conforme(s) aux schémas
+
+        Sortie structurée (un outil imposé) : un appel avec des arguments
+        générés. Agent ReAct : chaque outil est appelé une fois, dans l'ordre,
+        puis une réponse finale est rendue.
+        """
+        functions = [tool["function"] for tool in tools]
+
+        if tool_choice and len(functions) == 1:
+            return AIMessage(content="", tool_calls=[self._tool_call(functions[0], rng)])
+
+        outputs = [_parse_json(message.content) for message in messages if isinstance(message, ToolMessage)]
+        previous_calls = [
+            call for message in messages if isinstance(message, AIMessage) for call in message.tool_calls
+        ]
+
+        # Un appel par tour (les outils partagent la session BDD)
+        for function in functions:
+            done = [call["args"] for call in previous_calls if call["name"] == function["name"]]
+            id_arg, ids = _ids_for_arguments(function, outputs)
+            if id_arg:
+                remaining = [i for i in ids if i not in {args.get(id_arg) for args in done}]
+                if remaining:
+                    return AIMessage(content="", tool_calls=[self._tool_call(function, rng, {id_arg: remaining[0]})])
+            elif not done:
+                return AIMessage(content="", tool_calls=[self._tool_call(function, rng)])
+
+        return AIMessage(content=_sentence(rng, 40))
+
+    def _tool_call(self, function: Dict, rng: random.Random, overrides: Optional[Dict] = None) -> Dict:
+        args = {**sample_from_schema(function.get("parameters", {}), rng), **(overrides or {})}
+        digest = hashlib.sha256(json.dumps(args, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return {"name": function["name"], "args": args, "id": f"call_{digest[:16]}", "type": "tool_call"}
+
+
+def sample_from_schema(schema: Dict, rng: random.Random, defs: Optional[Dict] = None) -> Any:
+    """
+    Génère une valeur valide pour un schéma JSON (sous-ensemble Pydantic)
+
+    Args:
+        schema: Schéma JSON
+        rng: Générateur pseudo-aléatoire (déterministe)
+        defs: Définitions $defs du schéma racine
+
+    Returns:
+        Valeur conforme
+    """
+    defs = defs if defs is not None else schema.get("$defs", schema.get("definitions", {}))
+
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], rng, defs)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            return sample_from_schema(options[0], rng, defs)
+    if "allOf" in schema:
+        return sample_from_schema(schema["allOf"][0], rng, defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if kind == "object":
+        # Champs optionnels : valeur par défaut, sauf les textes vides qu'un
+        # vrai modèle renseigne (explications)
+        required = set(schema.get("required", []))
+        return {
+            name: prop["default"] if name not in required and prop.get("default", "") != ""
+            else sample_from_schema(prop, rng, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        low = schema.get("minItems", 1)
+        high = max(low, min(schema.get("maxItems", 3), 3))
+        return [sample_from_schema(schema.get("items", {}), rng, defs) for _ in range(rng.randint(low, high))]
+    if kind in ("number", "integer"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", max(low, 0) + 100))
+        if kind == "integer":
+            return rng.randint(int(low), int(high))
+        return round(rng.uniform(low, high), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    return _sample_string(schema, rng)
+
+
+def _sample_string(schema: Dict, rng: random.Random) -> str:
+    """Chaîne conforme à minLength/maxLength, pattern et format usuels"""
+    if schema.get("format") == "date-time":
+        return (datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 1500))).isoformat()
+    if schema.get("format") == "date":
+        return (datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 1500))).date().isoformat()
+
+    pattern = schema.get("pattern")
+    if pattern:
+        day = datetime(2026, 1, 1) + timedelta(days=rng.randint(0, 1500))
+        for candidate in (day.strftime("%m-%Y"), day.strftime("%Y-%m-%d"), day.strftime("%Y-%m"),
+                          str(rng.randint(1000, 9999)), day.strftime("%Y%m%d")):
+            if re.search(pattern, candidate):
+                return candidate
+
+    min_length = schema.get("minLength", 0)
+    max_length = schema.get("maxLength")
+    text = _sentence(rng, max(80, min_length))
+    return text[:max_length] if max_length else text
+
+
+def _sentence(rng: random.Random, min_length: int) -> str:
+    """Phrase déterministe d'au moins min_length caractères"""
+    words = []
+    while len(" ".join(words)) < min_length:
+        words.append(rng.choice(VOCABULARY))
+    return " ".join(words).capitalize() + "."
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return f"{message.type}: {content}"
+
+
+def _parse_json(content: Any) -> Any:
+    if isinstance(content, str):
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return None
+    return content
+
+
+def _ids_for_arguments(function: Dict, outputs: List[Any]) -> tuple:
+    """
+    Argument *_id requis de l'outil et identifiants ("id") renvoyés par les outils précédents
+
+    Returns:
+        Tuple (nom de l'argument ou None, identifiants disponibles)
+    """
+    required = function.get("parameters", {}).get("required", [])
+    id_arg = next((name for name in required if name.endswith("_id")), None)
+    if not id_arg:
+        return None, []
+    for output in outputs:
+        if isinstance(output, list) and output and all(isinstance(row, dict) and "id" in row for row in output):
+            return id_arg, [str(row["id"]) for row in output]
+    return id_arg, []
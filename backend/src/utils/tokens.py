@@ -0,0 +1,29 @@
+"""
+Estimation du nombre de tokens LLM
+
+Heuristique locale (sans appel API) : ~4 caractères par token pour les
+textes réglementaires EN/FR, cohérente avec le budget historique de
+l'Agent 1B (8000 tokens ~= 32000 caractères).
+"""
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estime le nombre de tokens d'un texte
+
+    Args:
+        text: Texte à estimer
+
+    Returns:
+        Nombre de tokens estimé
+    """
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def tokens_to_chars(tokens: int) -> int:
+    """Convertit un budget de tokens en nombre de caractères"""
+    return tokens * CHARS_PER_TOKEN
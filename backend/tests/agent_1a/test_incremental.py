@@ -0,0 +1,145 @@
+"""Tests de la collecte incrémentale Agent 1A (points de reprise par source)."""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.agent_1a.agent import run_agent_1a_combined
+from src.agent_1a.incremental import IncrementalPlanner, build_watermark, load_watermarks
+from src.storage.models import Base, Document, ExecutionLog
+
+
+def _eurlex_doc(celex, title=None):
+    return SimpleNamespace(
+        celex_number=celex, title=title or f"Règlement {celex}", document_type="REG", publication_date=None,
+        pdf_url=f"https://eur-lex.example/{celex}.pdf", url=f"https://eur-lex.example/{celex}", metadata={}
+    )
+
+
+def _cbam_doc(name, size="1 MB"):
+    return SimpleNamespace(
+        title=f"Guidance {name}", url=f"https://taxation-customs.example/{name}.pdf", date=None, size=size,
+        category="guidance", language="en", format="PDF"
+    )
+
+
+class FakeSources:
+    """Pages de résultats EUR-Lex et CBAM modifiables et compteur de requêtes de téléchargement"""
+
+    def __init__(self, tmp_path, listing, cbam_listing=()):
+        self.tmp_path = tmp_path
+        self.listing = listing
+        self.cbam_listing = list(cbam_listing)
+        self.fetched = []
+
+    async def search_eurlex(self, keyword, max_results):
+        return SimpleNamespace(status="success", error=None, documents=list(self.listing))
+
+    async def search_cbam_guidance(self, categories, max_results):
+        return SimpleNamespace(status="success", error=None, documents=list(self.cbam_listing))
+
+    async def fetch_document(self, url, output_dir, skip_if_exists, existing_hash):
+        self.fetched.append(url)
+        if existing_hash:
+            return SimpleNamespace(success=True, document=SimpleNamespace(status="skipped", file_path=None))
+        path = self.tmp_path / url.rsplit("/", 1)[-1]
+        path.write_bytes(url.encode())
+        return SimpleNamespace(success=True, document=SimpleNamespace(status="downloaded", file_path=str(path)))
+
+    async def extract(self, file_path, source, doc_id):
+        return SimpleNamespace(text=f"Texte {doc_id}", page_count=1, tables=[], nc_codes=[]), None
+
+    def run(self, Session, **kwargs):
+        self.fetched = []
+        with patch("src.storage.database.get_session", side_effect=Session), \
+             patch("src.agent_1a.agent.search_eurlex", self.search_eurlex), \
+             patch("src.agent_1a.agent.search_cbam_guidance", self.search_cbam_guidance), \
+             patch("src.agent_1a.agent.fetch_document", self.fetch_document), \
+             patch("src.agent_1a.agent.extract_normalized_content", self.extract):
+            return asyncio.run(run_agent_1a_combined(**kwargs))
+
+
+def test_second_run_fetches_only_new_and_stale_documents(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'collect.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    sources = FakeSources(tmp_path, [_eurlex_doc("32023R0956"), _eurlex_doc("32023R1773")])
+
+    first = sources.run(Session, incremental=True)
+    assert first["documents_processed"] == 2 and len(sources.fetched) == 2
+
+    # Rien de nouveau : aucune requête de téléchargement
+    second = sources.run(Session, incremental=True)
+    assert sources.fetched == [] and second["documents_unchanged"] == 2
+    assert second["incremental"]["listing_unchanged"]["eurlex"] is True
+
+    # Une nouveauté + un document connu à revérifier (dernière vérification trop ancienne)
+    session = Session()
+    stale = session.query(Document).filter(Document.source_url.like("%1773.pdf")).one()
+    stale.last_checked = datetime.utcnow() - timedelta(days=60)
+    session.commit()
+    sources.listing.append(_eurlex_doc("32024R0001"))
+    third = sources.run(Session, incremental=True)
+    assert sorted(sources.fetched) == ["https://eur-lex.example/32023R1773.pdf",
+                                       "https://eur-lex.example/32024R0001.pdf"]
+    assert third["incremental"]["sources"]["eurlex"] == {
+        "new": 1, "newer_than_watermark": 1, "revalidated": 1, "skipped": 1
+    }
+    session.expire_all()
+    assert session.get(Document, stale.id).last_checked > datetime.utcnow() - timedelta(minutes=1)
+
+    # Mode complet : tous les documents connus sont revérifiés
+    sources.run(Session, incremental=False)
+    assert len(sources.fetched) == 3
+
+    logs = session.query(ExecutionLog).order_by(ExecutionLog.start_time).all()
+    assert [log.status for log in logs] == ["success"] * 4
+    assert logs[-1].log_metadata["mode"] == "full"
+    assert {"scrape", "download", "extract", "save"} <= set(logs[0].log_metadata["metrics"]["stages"])
+    assert logs[0].duration_seconds is not None
+    assert load_watermarks(session)["eurlex"].last_celex == "32024R0001"
+
+
+def test_changed_listing_entry_is_revalidated_before_cadence():
+    now = datetime.utcnow()
+    previous = {"eurlex": build_watermark("eurlex", [_eurlex_doc("32023R0956")])}
+    recent = SimpleNamespace(last_checked=now - timedelta(days=1))
+
+    planner = IncrementalPlanner(previous, revalidate_days=28, now=now)
+    assert not planner.should_process("eurlex", _eurlex_doc("32023R0956"), recent)
+    # Même URL, titre republié (corrigendum) : revérifié tout de suite
+    assert planner.should_process("eurlex", _eurlex_doc("32023R0956", "Règlement rectifié"), recent)
+    assert not planner.is_newer("eurlex", _eurlex_doc("32022R0001"))
+    assert planner.is_newer("eurlex", _eurlex_doc("32024R0001"))
+
+
+def test_unchanged_cbam_listing_triggers_no_download(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'collect.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    sources = FakeSources(tmp_path, [], [_cbam_doc("guidance-1"), _cbam_doc("faq")])
+
+    first = sources.run(Session, incremental=True)
+    assert first["documents_processed"] == 2 and len(sources.fetched) == 2
+
+    # Documents connus depuis longtemps, page de résultats inchangée : aucune requête,
+    # comme le mode complet (existence seule pour CBAM)
+    session = Session()
+    for document in session.query(Document):
+        document.last_checked = datetime.utcnow() - timedelta(days=60)
+    session.commit()
+    second = sources.run(Session, incremental=True)
+    assert sources.fetched == [] and second["documents_unchanged"] == 2
+    assert second["incremental"]["sources"]["cbam"]["skipped"] == 2
+    sources.run(Session, incremental=False)
+    assert sources.fetched == []
+
+    # Entrée republiée (taille modifiée) : revérifiée
+    sources.cbam_listing[0] = _cbam_doc("guidance-1", size="2 MB")
+    sources.run(Session, incremental=True)
+    assert sources.fetched == ["https://taxation-customs.example/guidance-1.pdf"]
+    session.close()
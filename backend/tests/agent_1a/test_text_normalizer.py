@@ -0,0 +1,63 @@
+"""Tests de la normalisation du texte extrait (Agent 1A)."""
+
+from src.agent_1a.tools.text_normalizer import normalize_extracted_text, page_for_offset
+
+
+def _page(num: int, body: str) -> str:
+    return (
+        f"\n--- Page {num} ---\n"
+        "Official Journal of the European Union L 130/1\n"
+        f"{body}\n"
+        f"{num}\n"
+    )
+
+
+def _raw_document() -> str:
+    return "".join([
+        _page(1, "REGULATION (EU) 2023/956\nArticle 1\nSubject matter"),
+        _page(2, "Article 2\nThe reporting obli-\ngations   apply to importers."),
+        _page(3, "Article 3\nGoods of CN code 4016 93 00."),
+        _page(4, "Article 4\nEntry into force."),
+    ])
+
+
+def test_removes_repeated_headers_page_numbers_and_markers():
+    result = normalize_extracted_text(_raw_document())
+
+    assert "Official Journal" not in result.text
+    assert "--- Page" not in result.text
+    assert result.text.count("\f") == 3  # frontières de page gardées pour le découpage
+    assert "\n2\n" not in result.text
+    assert "Article 4\nEntry into force." in result.text
+    assert result.repeated_lines_removed == 8
+
+
+def test_dehyphenates_and_collapses_whitespace():
+    result = normalize_extracted_text(_raw_document())
+
+    assert "The reporting obligations apply to importers." in result.text
+    assert "4016 93 00" in result.text
+
+
+def test_page_offsets_map_back_to_source_pages():
+    result = normalize_extracted_text(_raw_document())
+
+    offset = result.text.index("Goods of CN code")
+    assert page_for_offset(result.page_offsets, offset) == 3
+    assert page_for_offset(result.page_offsets, 0) == 1
+
+
+def test_reports_savings():
+    raw = _raw_document()
+    result = normalize_extracted_text(raw)
+
+    assert result.original_chars == len(raw)
+    assert result.chars_saved > 0
+    assert result.stats()["tokens_saved"] > 0
+
+
+def test_short_text_without_markers_kept():
+    result = normalize_extracted_text("Article 1\nRubber  goods.")
+
+    assert result.text == "Article 1\nRubber goods."
+    assert result.page_offsets == [(1, 0)]
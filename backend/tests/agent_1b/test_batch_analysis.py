@@ -0,0 +1,111 @@
+"""Tests de l'analyse multi-profils (Agent 1B)."""
+
+import json
+from typing import List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.agent_1b.batch import MultiProfileAnalyzer
+from src.agent_1b.tools.relevance_scorer import RelevanceScorer
+from src.agent_1b.tools.semantic_analyzer import SemanticAnalyzer
+from src.agent_1b.tools.semantic_tiering import TieredSemanticAnalyzer
+from src.storage.analysis_repository import AnalysisRepository
+from src.storage.models import Analysis, Base, CompanyProfile, Document
+
+
+class CountingChatModel(BaseChatModel):
+    """Modèle déterministe qui enregistre les prompts reçus"""
+
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        payload = {
+            "score": 0.7,
+            "is_applicable": True,
+            "explanation": "Analyse déterministe de test produite sans appel réseau au fournisseur.",
+            "regulation_summary": "Résumé de test de la réglementation analysée, assez long pour le modèle.",
+            "impact_explanation": "Impact de test sur les produits importés par l'entreprise analysée.",
+            "confidence_level": 0.9,
+        }
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=json.dumps(payload)))])
+
+
+PROFILES = [
+    {"company_id": "p-rubber", "company_name": "RubberCo", "keywords": ["rubber"], "nc_codes": ["4016.93"]},
+    {"company_id": "p-alu", "company_name": "AluCo", "keywords": ["aluminium"], "nc_codes": ["7601.10"]},
+]
+
+DOCUMENTS = [
+    ("doc-1", "Article 1\nImports of rubber seals of CN code 4016.93 are covered.", "CBAM rubber", "CBAM"),
+    ("doc-2", "Article 1\nUnwrought aluminium of CN code 7601.10 is covered.", "CBAM aluminium", "CBAM"),
+]
+
+
+def _analyzer():
+    llm = CountingChatModel()
+    semantic = TieredSemanticAnalyzer(
+        RelevanceScorer(),
+        premium_analyzer=SemanticAnalyzer(mode="single", llm=llm),
+        enabled=False,
+    )
+    return MultiProfileAnalyzer(PROFILES, semantic_analyzer=semantic), llm
+
+
+def test_each_document_profile_pair_analysed_once():
+    analyzer, llm = _analyzer()
+
+    result = analyzer.analyze(DOCUMENTS + [DOCUMENTS[0]])
+
+    pairs = [(a.document_id, a.company_profile_id) for a in result.analyses]
+    assert pairs == [
+        ("doc-1", "p-rubber"), ("doc-1", "p-alu"),
+        ("doc-2", "p-rubber"), ("doc-2", "p-alu"),
+    ]
+    assert len(llm.prompts) == 4
+    assert "RubberCo" in llm.prompts[0] and "AluCo" in llm.prompts[1]
+
+
+def test_filters_are_computed_per_profile():
+    analyzer, _ = _analyzer()
+
+    analyses = {(a.document_id, a.company_profile_id): a for a in analyzer.analyze(DOCUMENTS).analyses}
+
+    assert analyses[("doc-1", "p-rubber")].keyword_analysis.keywords_found == ["rubber"]
+    assert analyses[("doc-1", "p-alu")].keyword_analysis.keywords_found == []
+    assert analyses[("doc-2", "p-alu")].nc_code_analysis.exact_matches == ["7601.10"]
+
+
+def test_bulk_save_records_profile_and_marks_documents_analyzed():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for profile in PROFILES:
+        session.add(CompanyProfile(
+            id=profile["company_id"], company_name=profile["company_name"], nc_codes=[],
+            keywords=[], regulations=[], contact_emails=[],
+        ))
+    for doc_id, content, title, regulation_type in DOCUMENTS:
+        session.add(Document(
+            id=doc_id, title=title, source_url=f"https://example.org/{doc_id}",
+            regulation_type=regulation_type, hash_sha256=doc_id, content=content,
+        ))
+    session.commit()
+
+    analyzer, _ = _analyzer()
+    saved = AnalysisRepository(session).bulk_save_from_document_analyses(
+        analyzer.analyze(DOCUMENTS).analyses
+    )
+
+    assert len(saved) == 4
+    assert {a.company_profile_id for a in session.query(Analysis)} == {"p-rubber", "p-alu"}
+    assert {d.workflow_status for d in session.query(Document)} == {"analyzed"}
+    session.close()
@@ -0,0 +1,97 @@
+"""Tests de la sélection de passages BM25 (Agent 1B)."""
+
+from src.agent_1a.tools.text_normalizer import normalize_extracted_text
+from src.agent_1b.tools.chunk_retriever import (
+    TRUNCATION_MARKER,
+    BM25Ranker,
+    build_query_terms,
+    select_relevant_content,
+    split_into_chunks,
+    tokenize,
+)
+from src.utils.tokens import estimate_tokens
+
+
+def _filler(n: int) -> str:
+    return "\n\n".join(f"General provision number {i} on administrative cooperation." for i in range(n))
+
+
+def _long_regulation() -> str:
+    parts = ["REGULATION (EU) 2023/956 establishing a carbon border adjustment mechanism\n\n" + _filler(10)]
+    for i in range(1, 30):
+        body = _filler(40)
+        if i == 17:
+            body += "\n\nGoods of CN code 4016 93 00 made of vulcanised rubber are covered."
+        parts.append(f"Article {i}\n{body}")
+    return "\n\n".join(parts)
+
+
+class TestTokenize:
+
+    def test_nc_codes_expanded_to_prefixes(self):
+        tokens = tokenize("CN code 4016 93 00 and 7601.10")
+        assert "4016" in tokens
+        assert "401693" in tokens
+        assert "40169300" in tokens
+        assert "760110" in tokens
+
+    def test_query_terms_from_nested_profile(self):
+        profile = {
+            "keywords": ["rubber"],
+            "nc_codes": {"imports": [{"code": "4016.93"}], "exports": ["7601.10"]},
+        }
+        terms = build_query_terms(profile, "CBAM")
+        assert "rubber" in terms
+        assert "401693" in terms
+        assert "760110" in terms
+        assert "cbam" in terms
+
+
+class TestChunking:
+
+    def test_splits_on_articles(self):
+        text = "Preamble " * 30 + "\n\n" + "\n".join(f"Article {i}\n" + "x " * 300 for i in range(1, 4))
+        chunks = split_into_chunks(text, max_chunk_chars=4000, min_chunk_chars=100)
+        assert [c.label for c in chunks[1:]] == ["Article 1", "Article 2", "Article 3"]
+        assert "".join(c.text for c in chunks) == text
+
+    def test_splits_on_pages_of_normalized_text(self):
+        bodies = ["Preamble " + "alpha " * 150, "Article 2\n" + "beta " * 150, "gamma " * 150]
+        raw = "".join(f"\n--- Page {n} ---\n{body}\n" for n, body in enumerate(bodies, start=1))
+        text = normalize_extracted_text(raw).text
+
+        chunks = split_into_chunks(text, max_chunk_chars=4000, min_chunk_chars=100)
+        assert [c.label for c in chunks] == ["Bloc 1", "Article 2", "Bloc 3"]
+        assert [word in c.text for c, word in zip(chunks, ["alpha", "beta", "gamma"])] == [True] * 3
+        assert "".join(c.text for c in chunks) == text
+
+    def test_oversized_sections_are_split(self):
+        text = "Article 1\n" + _filler(500)
+        chunks = split_into_chunks(text, max_chunk_chars=2000)
+        assert len(chunks) > 1
+        assert all(len(c.text) <= 2000 for c in chunks)
+
+
+class TestSelection:
+
+    def test_short_content_returned_unchanged(self):
+        selection = select_relevant_content("Article 1\nrubber", ["rubber"], token_budget=1000)
+        assert selection.text == "Article 1\nrubber"
+
+    def test_relevant_middle_article_kept_within_budget(self):
+        content = _long_regulation()
+        terms = build_query_terms({"keywords": ["rubber"], "nc_codes": ["4016.93"]}, "CBAM")
+
+        selection = select_relevant_content(content, terms, token_budget=2000)
+
+        assert "vulcanised rubber" in selection.text
+        assert "REGULATION (EU) 2023/956" in selection.text
+        assert TRUNCATION_MARKER.strip() in selection.text
+        assert selection.selected_tokens <= 2000
+        assert selection.selected_tokens < estimate_tokens(content)
+
+    def test_bm25_prefers_matching_chunk(self):
+        chunks = split_into_chunks(_long_regulation())
+        scores = BM25Ranker().score(chunks, ["rubber", "401693"])
+        best = max(range(len(chunks)), key=lambda i: scores[i])
+        assert "vulcanised rubber" in chunks[best].text
@@ -0,0 +1,67 @@
+"""Tests du profil entreprise compilé et du trie des codes NC (Agent 1B)."""
+
+from src.agent_1b.tools import compiled_profile as cp
+from src.agent_1b.tools.nc_code_filter import NCCodeFilter, NCCodeTrie
+from src.config import settings
+
+
+PROFILE = {
+    "company_id": "profile-1",
+    "company_name": "ACME",
+    "keywords": ["rubber", "aluminium"],
+    "nc_codes": {"imports": [{"code": "4001.21"}], "exports": ["7601"]},
+    "config": {"critical_nc_codes": ["4001.21"]},
+    "updated_at": "2026-01-01T00:00:00",
+}
+
+
+def test_compiled_once_per_profile_version():
+    cp.clear_compiled_profiles()
+
+    first = cp.get_compiled_profile(PROFILE)
+    again = cp.get_compiled_profile(dict(PROFILE))
+    updated = cp.get_compiled_profile({**PROFILE, "keywords": ["steel"], "updated_at": "2026-02-01T00:00:00"})
+
+    assert again is first
+    assert updated is not first
+    assert updated.keywords == ["steel"]
+    # L'ancienne version du profil est évincée du cache
+    assert list(cp._compiled_cache) == [updated.cache_key]
+
+
+def test_compiled_artefacts():
+    compiled = cp.get_compiled_profile(PROFILE)
+
+    assert sorted(compiled.nc_codes) == ["4001.21", "7601"]
+    assert compiled.critical_codes == {"4001.21"}
+    assert compiled.prompt_fields["nc_codes"] == "4001.21, 7601"
+    assert compiled.company_context.startswith("Nom: ACME")
+    assert compiled.query_terms("CBAM") is compiled.query_terms("cbam")
+
+
+def test_pickled_profile_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    monkeypatch.setattr(settings, "compiled_profile_pickle", True)
+    cp.clear_compiled_profiles()
+    cp.get_compiled_profile(PROFILE)
+
+    cp.clear_compiled_profiles()
+    reloaded = cp.get_compiled_profile(PROFILE)
+
+    assert list((tmp_path / "cache" / "compiled_profiles").glob("*.pkl"))
+    assert reloaded.nc_code_filter.analyze("Code 4001.21.00").critical_codes == ["4001.21.00"]
+
+
+def test_nc_trie_matches_prefixes_in_both_directions():
+    trie = NCCodeTrie(["4001.21", "7601"])
+
+    assert trie.matches("4001")
+    assert trie.matches("4001.21.10")
+    assert trie.matches("7601.10")
+    assert not trie.matches("4001.22")
+
+
+def test_same_length_codes_are_not_partial_matches():
+    result = NCCodeFilter(["7704.74"]).analyze("Code 4077.01 et 7704.74.10")
+
+    assert result.partial_matches == ["7704.74.10"]
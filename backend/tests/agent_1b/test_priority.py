@@ -0,0 +1,61 @@
+"""Tests de la priorité d'analyse (pré-score, classes, métriques)."""
+
+from datetime import datetime, timedelta
+
+from src.agent_1b.priority import DocumentPrioritizer, PriorityMetrics, load_source_priorities
+
+
+PROFILE = {
+    "company_id": "profile-priority",
+    "company_name": "ACME",
+    "keywords": ["rubber", "aluminium"],
+    "nc_codes": {"imports": [{"code": "4001.21"}], "exports": ["7601"]},
+    "config": {"critical_nc_codes": ["4001.21"]},
+    "updated_at": "2026-01-01T00:00:00",
+}
+
+NOW = datetime(2026, 6, 1)
+
+
+def test_source_priorities_from_sources_config():
+    priorities = load_source_priorities()
+
+    assert priorities["SANCTIONS"] == 1.0
+    assert priorities["CBAM"] == 0.75
+    assert priorities["CSRD"] == 0.5
+
+
+def test_critical_documents_sort_before_backlog():
+    prioritizer = DocumentPrioritizer(PROFILE, source_priorities={"CBAM": 0.75, "CSRD": 0.5})
+
+    faq = prioritizer.pre_score("faq", "Questions fréquentes sur le portail.", "FAQ", "CSRD",
+                                publication_date=NOW - timedelta(days=900), now=NOW)
+    recent = prioritizer.pre_score("recent", "Imports of rubber and aluminium.", "Guidance", "CBAM",
+                                   publication_date=NOW - timedelta(days=3), now=NOW)
+    critical = prioritizer.pre_score("act", "Natural rubber 4001.21 is covered.", "Implementing act", "CBAM",
+                                     publication_date=None, now=NOW)
+
+    assert critical.has_critical_codes and critical.priority == "critical"
+    assert recent.score > faq.score
+    assert faq.priority == "low"
+    assert recent.recency > 0.99 and critical.recency == 0.0
+
+    ordered = sorted([faq, recent, critical], key=lambda p: p.sort_key())
+    assert [p.document_id for p in ordered] == ["act", "recent", "faq"]
+
+
+def test_metrics_track_depth_and_wait_per_priority():
+    metrics = PriorityMetrics()
+    first = metrics.enqueued()
+    second = metrics.enqueued()
+
+    metrics.started("critical", second)
+    metrics.completed("critical", second)
+    metrics.started("low", first)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["depth"] == 0
+    assert snapshot["max_depth"] == 2
+    assert snapshot["per_priority"]["critical"]["count"] == 1
+    assert snapshot["per_priority"]["low"]["avg_latency_seconds"] is None
+    assert "high" not in snapshot["per_priority"]
@@ -0,0 +1,108 @@
+"""Tests du re-scoring vectorisé des analyses historiques (Agent 1B)."""
+
+import json
+import random
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.agent_1b.models import KeywordAnalysisResult, NCCodeAnalysisResult, SemanticAnalysisResult
+from src.agent_1b.rescoring import CRITICALITY_LEVELS, compute_scores, rescore_analyses, weights_matrix
+from src.agent_1b.tools.relevance_scorer import RelevanceScorer
+from src.agent_1b.tools.scoring_config import load_scoring_config
+from src.storage.models import Analysis, Base, Document
+
+
+def _semantic(score, applicable):
+    return SemanticAnalysisResult(
+        score=score,
+        is_applicable=applicable,
+        explanation="Explication de test suffisamment longue pour le modèle.",
+        regulation_summary="Résumé de test de la réglementation.",
+        confidence_level=0.8,
+    )
+
+
+def test_vectorised_scores_match_relevance_scorer():
+    config = load_scoring_config()
+    scorer = RelevanceScorer.from_config(config)
+    rng = random.Random(7)
+    rows = [
+        (rng.random(), rng.random(), rng.random(), rng.random() < 0.3, rng.random() < 0.5,
+         rng.choice(["CBAM", "EUDR", "Sanctions", "CSRD"]))
+        for _ in range(300)
+    ]
+
+    final, levels, relevant = compute_scores(
+        np.array([r[0] for r in rows]),
+        np.array([r[1] for r in rows]),
+        np.array([r[2] for r in rows]),
+        weights_matrix(config, [r[5] for r in rows]),
+        config.thresholds(),
+        np.array([r[3] for r in rows]),
+        np.array([r[4] for r in rows]),
+    )
+
+    for i, (kw, nc, sem, critical, applicable, regulation) in enumerate(rows):
+        expected = scorer.calculate_score(
+            KeywordAnalysisResult(score=kw, total_keywords_searched=1, keyword_density=0.0),
+            NCCodeAnalysisResult(score=nc, critical_codes=["4001"] if critical else []),
+            _semantic(sem, applicable),
+            regulation,
+        )
+        assert final[i] == expected.final_score
+        assert CRITICALITY_LEVELS[levels[i]] == expected.criticality.value
+        assert relevant[i] == (expected.final_score >= scorer.thresholds["low"])
+
+
+def test_regulation_weights_are_read_from_config():
+    scorer = RelevanceScorer.from_config(load_scoring_config())
+
+    assert scorer.weights_for("CBAM") == (0.2, 0.4, 0.4)
+    assert scorer.weights_for("Sanctions") == (0.2, 0.0, 0.8)
+    assert scorer.weights_for("CSRD") == (0.3, 0.3, 0.4)
+
+
+def test_dry_run_reports_changes_and_apply_writes(tmp_path):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Document(id="d-1", title="CBAM", source_url="https://example.org/1",
+                         regulation_type="CBAM", hash_sha256="h1"))
+    session.add_all([
+        # 0.5*0.3 + 0.5*0.3 + 0.5*0.4 = 0.5 -> MEDIUM
+        Analysis(id="a-1", document_id="d-1", keyword_score=0.5, nc_code_score=0.5, semantic_score=0.5,
+                 final_score=0.5, criticality="MEDIUM", is_relevant=True,
+                 has_critical_codes=False, semantic_applicable=False),
+        # 0.9*0.3 + 0.1*0.3 + 0.1*0.4 = 0.34 -> LOW
+        Analysis(id="a-2", document_id="d-1", keyword_score=0.9, nc_code_score=0.1, semantic_score=0.1,
+                 final_score=0.34, criticality="LOW", is_relevant=True,
+                 has_critical_codes=False, semantic_applicable=False),
+        # Analyse antérieure sans scores par niveau
+        Analysis(id="a-3", document_id="d-1", is_relevant=True),
+    ])
+    session.commit()
+
+    # Nouveaux seuils : medium 0.3 -> a-2 passe en MEDIUM ; high 0.45 -> a-1 passe en HIGH
+    path = tmp_path / "scoring_rules.json"
+    path.write_text(json.dumps({
+        "criticality_thresholds": {"critical": 0.8, "high": 0.45, "medium": 0.3, "low": 0.2},
+    }))
+    config = load_scoring_config(path)
+
+    report = rescore_analyses(session, config)
+
+    assert (report.total, report.rescored, report.skipped) == (3, 2, 1)
+    assert report.criticality_changed == 2
+    assert report.transitions == {"MEDIUM->HIGH": 1, "LOW->MEDIUM": 1}
+    assert session.get(Analysis, "a-1").criticality == "MEDIUM"
+
+    applied = rescore_analyses(session, config, apply=True)
+    session.expire_all()
+
+    assert applied.applied
+    assert session.get(Analysis, "a-1").criticality == "HIGH"
+    assert session.get(Analysis, "a-2").criticality == "MEDIUM"
+    assert rescore_analyses(session, config).criticality_changed == 0
+    session.close()
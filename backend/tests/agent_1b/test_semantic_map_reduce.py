@@ -0,0 +1,115 @@
+"""Tests du mode map-reduce de l'analyse sémantique (Agent 1B)."""
+
+import json
+from typing import List
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.agent_1b.tools.semantic_analyzer import SemanticAnalyzer
+from src.config import settings
+
+
+REDUCE_RESPONSE = {
+    "score": 0.82,
+    "is_applicable": True,
+    "explanation": "Le règlement couvre explicitement les articles en caoutchouc vulcanisé importés par l'entreprise.",
+    "regulation_summary": "Mécanisme d'ajustement carbone aux frontières pour les importations.",
+    "obligations_identified": ["Déclaration CBAM trimestrielle"],
+    "confidence_level": 0.8,
+}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Modèle de chat déterministe qui distingue les prompts map et reduce"""
+
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        if "EXTRACTIONS PAR PASSAGE" in prompt:
+            payload = REDUCE_RESPONSE
+        else:
+            relevant = "rubber" in prompt.split("Passage (", 1)[-1]
+            payload = {
+                "relevance": 0.9 if relevant else 0.0,
+                "applicability_signals": ["rubber goods covered"] if relevant else [],
+                "products": ["rubber"] if relevant else [],
+            }
+        message = AIMessage(content=json.dumps(payload))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _document(rubber_article: str) -> str:
+    filler = "\n\n".join(f"Administrative provision {i}." for i in range(200))
+    articles = [f"Article {i}\n{filler}" for i in range(1, 12)]
+    articles[6] += f"\n\n{rubber_article}"
+    return "REGULATION ON CARBON BORDER ADJUSTMENT\n\n" + "\n\n".join(articles)
+
+
+@pytest.fixture
+def map_reduce_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    monkeypatch.setattr(settings, "semantic_content_token_budget", 2000)
+    monkeypatch.setattr(settings, "semantic_map_max_chunks", 4)
+    monkeypatch.setattr(settings, "semantic_map_max_concurrency", 2)
+    monkeypatch.setattr(settings, "semantic_chunk_cache_enabled", True)
+
+
+def _analyze(llm, content):
+    analyzer = SemanticAnalyzer(mode="map_reduce", llm=llm)
+    return analyzer.analyze(
+        content,
+        "CBAM Regulation",
+        "CBAM",
+        {"company_name": "ACME", "keywords": ["rubber"], "nc_codes": ["4016.93"]},
+    )
+
+
+def test_map_reduce_merges_chunk_extractions(map_reduce_settings):
+    llm = ScriptedChatModel(prompts=[])
+
+    result = _analyze(llm, _document("Vulcanised rubber goods of CN code 4016 93 are covered."))
+
+    assert result.score == pytest.approx(0.82)
+    assert result.is_applicable is True
+    map_prompts = [p for p in llm.prompts if "EXTRACTIONS PAR PASSAGE" not in p]
+    reduce_prompts = [p for p in llm.prompts if "EXTRACTIONS PAR PASSAGE" in p]
+    assert 1 < len(map_prompts) <= 4
+    assert len(reduce_prompts) == 1
+    assert "rubber goods covered" in reduce_prompts[0]
+
+
+def test_amended_document_only_reruns_changed_chunks(map_reduce_settings):
+    first = ScriptedChatModel(prompts=[])
+    _analyze(first, _document("Vulcanised rubber goods of CN code 4016 93 are covered."))
+    first_map_calls = len([p for p in first.prompts if "EXTRACTIONS PAR PASSAGE" not in p])
+
+    second = ScriptedChatModel(prompts=[])
+    _analyze(second, _document("Vulcanised rubber goods of CN code 4016 93 are covered from 2027."))
+    second_map_calls = len([p for p in second.prompts if "EXTRACTIONS PAR PASSAGE" not in p])
+
+    assert first_map_calls > 1
+    assert second_map_calls == 1
+
+
+def test_short_document_uses_single_prompt(map_reduce_settings):
+    class SingleModel(ScriptedChatModel):
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            self.prompts.append(messages[-1].content)
+            message = AIMessage(content=json.dumps(REDUCE_RESPONSE))
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    llm = SingleModel(prompts=[])
+    result = _analyze(llm, "Article 1\nRubber goods are covered.")
+
+    assert result.is_applicable is True
+    assert len(llm.prompts) == 1
+    assert "# DOCUMENT À ANALYSER" in llm.prompts[0]
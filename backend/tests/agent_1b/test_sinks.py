@@ -0,0 +1,81 @@
+"""Tests des sorties des analyses (Agent 1B)."""
+
+import io
+import json
+
+import pytest
+
+from src.agent_1b import sinks
+from src.agent_1b.display import process_and_display_analysis
+from src.agent_1b.models import KeywordAnalysisResult, NCCodeAnalysisResult, SemanticAnalysisResult
+from src.agent_1b.tools.relevance_scorer import create_document_analysis
+from src.config import settings
+
+
+def _analysis():
+    return create_document_analysis(
+        document_id="doc-1",
+        company_profile_id="p-1",
+        document_title="CBAM",
+        regulation_type="CBAM",
+        keyword_result=KeywordAnalysisResult(
+            score=0.6, keywords_found=["rubber"], total_keywords_searched=2, keyword_density=0.5
+        ),
+        nc_code_result=NCCodeAnalysisResult(score=0.5, exact_matches=["4001.21"]),
+        semantic_result=SemanticAnalysisResult(
+            score=0.7,
+            is_applicable=True,
+            explanation="Explication de test suffisamment longue pour le modèle.",
+            regulation_summary="Résumé de test de la réglementation analysée, assez long pour le modèle.",
+            impact_explanation="Impact de test sur les produits importés par l'entreprise analysée.",
+            confidence_level=0.9,
+        ),
+    )
+
+
+def test_jsonl_sink_writes_one_compact_line_per_analysis():
+    stream = io.StringIO()
+    sink = sinks.JsonLinesSink(stream=stream)
+
+    sink.emit(_analysis(), "analysis-1")
+    sink.emit(_analysis())
+
+    lines = stream.getvalue().splitlines()
+    record = json.loads(lines[0])
+    assert len(lines) == 2
+    assert record["analysis_id"] == "analysis-1"
+    assert record["nc_codes"] == ["4001.21"]
+    assert record["scores"] == {"keyword": 0.6, "nc_code": 0.5, "semantic": 0.7}
+    assert ", " not in lines[0]
+
+
+def test_auto_sink_is_headless_without_terminal(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_output_sink", "auto")
+
+    assert sinks.get_sink().name == "jsonl"  # stdout capturé par pytest
+    assert sinks.get_sink("none") is sinks.get_sink("none")
+    assert sinks.headless_sink_name() == "jsonl"
+
+
+def test_process_uses_given_sink_without_rendering(monkeypatch):
+    emitted = []
+
+    class RecordingSink(sinks.AnalysisSink):
+        def emit(self, analysis, analysis_id=None):
+            emitted.append((analysis.document_id, analysis_id))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rendu Rich inattendu")
+
+    monkeypatch.setattr("src.agent_1b.display.display_document_analysis", fail)
+
+    assert process_and_display_analysis(_analysis(), save_to_db=False, sink=RecordingSink()) is None
+    assert emitted == [("doc-1", None)]
+
+
+def test_sink_without_emit_cannot_be_instantiated():
+    class IncompleteSink(sinks.AnalysisSink):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
@@ -0,0 +1,92 @@
+"""Tests des appels LLM à sortie structurée avec réparation (Agent 1B)."""
+
+from typing import List
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.agent_1b.models import SemanticAnalysisResult
+from src.agent_1b.tools.semantic_analyzer import SEMANTIC_ANALYSIS_PROMPT
+from src.agent_1b.tools.structured_output import StructuredCall
+
+
+VALID_ARGS = {
+    "score": 0.7,
+    "is_applicable": True,
+    "explanation": "Les importations de caoutchouc de l'entreprise entrent dans le champ du règlement.",
+    "regulation_summary": "Règlement établissant le mécanisme CBAM.",
+}
+
+
+class ToolCallingChatModel(BaseChatModel):
+    """Modèle qui répond par des appels d'outil scriptés"""
+
+    responses: List[dict]
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-calling-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        args = self.responses[min(len(self.prompts), len(self.responses)) - 1]
+        message = AIMessage(
+            content="",
+            tool_calls=[{"name": "SemanticAnalysisResult", "args": args, "id": f"call_{len(self.prompts)}"}],
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+INPUTS = {
+    "company_name": "ACME",
+    "industry": "Rubber",
+    "products": "",
+    "nc_codes": "4016.93",
+    "countries": "FR",
+    "regulations": "CBAM",
+    "document_title": "CBAM Regulation",
+    "regulation_type": "CBAM",
+    "document_content": "Article 1\nRubber goods.",
+}
+
+
+def test_native_mode_drops_schema_from_prompt():
+    llm = ToolCallingChatModel(responses=[VALID_ARGS], prompts=[])
+    call = StructuredCall(SEMANTIC_ANALYSIS_PROMPT, llm, SemanticAnalysisResult)
+
+    result = call.invoke(INPUTS)
+
+    assert call.is_native
+    assert result.score == pytest.approx(0.7)
+    assert '"properties"' not in llm.prompts[0]
+    assert "SemanticAnalysisResult" in llm.prompts[0]
+
+
+def test_invalid_output_is_repaired_once():
+    invalid = {**VALID_ARGS, "score": 1.7}
+    llm = ToolCallingChatModel(responses=[invalid, VALID_ARGS], prompts=[])
+    call = StructuredCall(SEMANTIC_ANALYSIS_PROMPT, llm, SemanticAnalysisResult, max_repair_attempts=1)
+
+    result = call.invoke(INPUTS)
+
+    assert result.score == pytest.approx(0.7)
+    assert len(llm.prompts) == 2
+    assert "CORRECTION REQUISE" in llm.prompts[1]
+    assert "1.7" in llm.prompts[1]
+
+
+def test_repair_attempts_are_bounded():
+    invalid = {**VALID_ARGS, "score": 1.7}
+    llm = ToolCallingChatModel(responses=[invalid], prompts=[])
+    call = StructuredCall(SEMANTIC_ANALYSIS_PROMPT, llm, SemanticAnalysisResult, max_repair_attempts=2)
+
+    with pytest.raises(OutputParserException):
+        call.invoke(INPUTS)
+    assert len(llm.prompts) == 3
@@ -0,0 +1,119 @@
+"""Tests de l'index vectoriel TF-IDF haché (Agent 1B)."""
+
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.agent_1b.tools.vector_index import (
+    VectorIndex, get_document_index, rank_documents_for_profile, rebuild_document_index
+)
+from src.storage.models import Base, Document
+
+
+DOCUMENTS = [
+    ("rubber", "Article 1\nImports of natural rubber and vulcanised rubber articles of CN code 4016 93 00."),
+    ("aluminium", "Article 1\nAluminium ingots and unwrought aluminium of CN code 7601 10 are covered."),
+    ("faq", "Frequently asked questions on the registration portal and user accounts."),
+    ("rubber-2", "Article 3\nDeclarants importing vulcanised rubber seals and rubber hoses of CN code 4016 report emissions."),
+]
+
+PROFILE = {"keywords": ["rubber", "caoutchouc"], "nc_codes": ["4016.93"]}
+
+
+def test_profile_ranking_puts_matching_documents_first():
+    ranking = rank_documents_for_profile(DOCUMENTS, PROFILE, "CBAM")
+
+    top_two = {doc_id for doc_id, _ in ranking[:2]}
+    assert top_two == {"rubber", "rubber-2"}
+    assert ranking[-1][1] <= ranking[0][1]
+
+
+def test_most_similar_from_memory_mapped_index(tmp_path):
+    VectorIndex.build(DOCUMENTS, dim=1024).save(tmp_path)
+
+    index = VectorIndex.load(tmp_path)
+    neighbours = index.most_similar("rubber", limit=2)
+
+    assert isinstance(index.chunk_matrix, np.memmap)
+    assert neighbours[0][0] == "rubber-2"
+    assert "rubber" not in [doc_id for doc_id, _ in neighbours]
+
+
+def test_empty_corpus_round_trip(tmp_path):
+    VectorIndex.build([("empty", "")]).save(tmp_path)
+
+    index = VectorIndex.load(tmp_path)
+
+    assert index.document_ids == []
+    assert rank_documents_for_profile([("empty", "")], PROFILE) == [("empty", 0.0)]
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([
+        Document(id=doc_id, title=doc_id, source_url=f"https://example.org/{doc_id}",
+                 regulation_type="CBAM", hash_sha256=f"h-{doc_id}", content=content)
+        for doc_id, content in DOCUMENTS
+    ])
+    session.commit()
+    return session
+
+
+def test_rebuild_only_when_corpus_content_changes(tmp_path):
+    session = _session()
+    assert get_document_index(tmp_path) is None
+
+    first = rebuild_document_index(session, tmp_path)
+    assert get_document_index(tmp_path).fingerprint == first.fingerprint
+
+    # Vérification sans changement (mark_checked) : index publié conservé
+    for document in session.query(Document):
+        document.last_checked = datetime.utcnow() + timedelta(days=1)
+    session.commit()
+    assert rebuild_document_index(session, tmp_path) is None
+
+    document = session.get(Document, "faq")
+    document.content, document.hash_sha256 = "Vulcanised rubber gaskets of CN code 4016 93.", "h-faq-2"
+    session.commit()
+    second = rebuild_document_index(session, tmp_path)
+
+    assert second is not None and second.fingerprint != first.fingerprint
+    served = get_document_index(tmp_path)
+    assert served.fingerprint == second.fingerprint
+    assert "faq" in {doc_id for doc_id, _ in served.most_similar("rubber", limit=3)}
+    # Version courante et précédente seulement sur disque
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 2
+    session.close()
+
+
+def test_get_document_index_never_rebuilds(tmp_path):
+    session = _session()
+    rebuild_document_index(session, tmp_path)
+    published = get_document_index(tmp_path)
+
+    session.add(Document(id="new", title="new", source_url="https://example.org/new",
+                         regulation_type="CBAM", hash_sha256="h-new", content="Steel and iron imports."))
+    session.commit()
+
+    assert get_document_index(tmp_path) is published
+    assert "new" not in published.positions
+    session.close()
+
+
+def test_rebuild_lock_without_fcntl(tmp_path):
+    # Windows : pas de fcntl, verrou par msvcrt.locking
+    calls = []
+    msvcrt = SimpleNamespace(LK_LOCK=1, LK_UNLCK=0, locking=lambda fd, mode, size: calls.append(mode))
+    session = _session()
+    with patch.dict(sys.modules, {"fcntl": None, "msvcrt": msvcrt}):
+        index = rebuild_document_index(session, tmp_path)
+
+    assert index is not None and calls == [msvcrt.LK_LOCK, msvcrt.LK_UNLCK]
+    session.close()
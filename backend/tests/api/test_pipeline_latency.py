@@ -0,0 +1,59 @@
+"""Tests de réactivité de l'API pendant une exécution du pipeline."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.routes import pipeline
+from src.orchestration.runs import RunRegistry
+from src.storage.models import Base
+
+
+def test_health_stays_responsive_during_sync_pipeline_run(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    registry = RunRegistry(sessionmaker(bind=engine), owner="api-test")
+
+    async def fake_collect(**kwargs):
+        await asyncio.sleep(0.3)  # requêtes HTTP des scrapers
+        return {"status": "success", "total_found": 2, "documents_processed": 2}
+
+    def fake_analyze(result_1a, all_profiles, sink, progress, started_at):
+        time.sleep(0.6)  # base de données + Agent 1B (synchrones)
+        return {"status": "success", "agent_1a": result_1a,
+                "agent_1b": {"documents_analyzed": 2, "relevant_count": 1}}
+
+    # Routes du pipeline et health check synchrone, comme src/api/main.py
+    app = FastAPI()
+    app.include_router(pipeline.router, prefix="/api")
+    app.get("/health")(lambda: {"status": "healthy"})
+
+    responses, latencies = [], []
+    with patch("src.api.routes.pipeline._registry", registry), \
+         patch("src.orchestration.pipeline.settings.pipeline_streaming", False), \
+         patch("src.orchestration.pipeline.run_agent_1a_combined", fake_collect), \
+         patch("src.orchestration.pipeline._analyze_collected", fake_analyze), \
+         TestClient(app) as client:
+        run = threading.Thread(target=lambda: responses.append(
+            client.post("/api/pipeline/agent1/trigger-sync", json={"keyword": "CBAM"})
+        ))
+        run.start()
+        while run.is_alive():
+            started = time.perf_counter()
+            assert client.get("/health").status_code == 200
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.02)
+        run.join()
+
+    assert responses[0].status_code == 200
+    assert responses[0].json()["status"] == "completed"
+    assert registry.get(responses[0].json()["details"]["run_id"])["state"] == "succeeded"
+    # La boucle d'événements n'est jamais bloquée par le pipeline (~0,9 s)
+    assert len(latencies) >= 5
+    assert max(latencies) < 0.25
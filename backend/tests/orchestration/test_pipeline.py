@@ -11,10 +11,11 @@ from src.storage.models import Document
 class TestPipeline:
     """Tests du pipeline complet"""
     
+    @patch('src.orchestration.pipeline.refresh_document_index')
     @patch('src.orchestration.pipeline.asyncio.run')
     @patch('src.orchestration.pipeline.get_session')
     @patch('src.orchestration.pipeline.Agent1B')
-    def test_pipeline_success(self, mock_agent1b, mock_get_session, mock_asyncio_run):
+    def test_pipeline_success(self, mock_agent1b, mock_get_session, mock_asyncio_run, mock_refresh):
         """Test du pipeline avec succès complet"""
         
         # Mock Agent 1A result
@@ -50,8 +51,10 @@ class TestPipeline:
         
         mock_agent1b.return_value.analyze_document.return_value = mock_analysis
         
-        # Mock process_and_display_analysis
-        with patch('src.orchestration.pipeline.process_and_display_analysis', return_value="analysis-123"):
+        # Mock process_and_display_analysis (sauvegarde document par document :
+        # en mode groupé, le statut est écrit par AnalysisBatchWriter)
+        with patch('src.orchestration.pipeline.process_and_display_analysis', return_value="analysis-123"), \
+                patch('src.orchestration.pipeline.settings.analysis_flush_size', 0):
             result = run_pipeline()
         
         # Vérifications
@@ -63,6 +66,9 @@ class TestPipeline:
         # Vérifier que le workflow_status a été mis à jour
         assert mock_doc.workflow_status == "analyzed"
         mock_session.commit.assert_called()
+        
+        # Index de similarité reconstruit après la collecte
+        mock_refresh.assert_called_once()
     
     @patch('src.orchestration.pipeline.asyncio.run')
     def test_pipeline_agent1a_fails(self, mock_asyncio_run):
@@ -80,9 +86,10 @@ class TestPipeline:
         assert result["status"] == "error"
         assert "Agent 1A failed" in result["error"]
     
+    @patch('src.orchestration.pipeline.refresh_document_index')
     @patch('src.orchestration.pipeline.asyncio.run')
     @patch('src.orchestration.pipeline.get_session')
-    def test_pipeline_no_documents_to_analyze(self, mock_get_session, mock_asyncio_run):
+    def test_pipeline_no_documents_to_analyze(self, mock_get_session, mock_asyncio_run, mock_refresh):
         """Test quand il n'y a pas de documents à analyser"""
         
         # Mock Agent 1A success
@@ -105,10 +112,11 @@ class TestPipeline:
         assert result["status"] == "success"
         assert result["agent_1b"]["documents_analyzed"] == 0
     
+    @patch('src.orchestration.pipeline.refresh_document_index')
     @patch('src.orchestration.pipeline.asyncio.run')
     @patch('src.orchestration.pipeline.get_session')
     @patch('src.orchestration.pipeline.Agent1B')
-    def test_pipeline_agent1b_partial_failure(self, mock_agent1b, mock_get_session, mock_asyncio_run):
+    def test_pipeline_agent1b_partial_failure(self, mock_agent1b, mock_get_session, mock_asyncio_run, mock_refresh):
         """Test quand Agent 1B échoue sur certains documents mais continue"""
         
         # Mock Agent 1A success
@@ -0,0 +1,88 @@
+"""Tests du scheduler par source (cadences, budget partagé, chevauchement)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.orchestration.runs import RunRegistry
+from src.orchestration.scheduler import build_source_jobs, collect_source, cron_trigger
+from src.storage.models import Base
+
+
+def _source(source_id, frequency, regulation="CBAM"):
+    return {"id": source_id, "name": source_id, "regulation_type": regulation,
+            "enabled": True, "scraping_frequency": frequency}
+
+
+def _fields(trigger):
+    return {field.name: str(field) for field in trigger.fields}
+
+
+def test_one_job_per_source_at_its_cadence():
+    scheduler = BackgroundScheduler()
+    sources = [_source("eu-sanctions", "daily", "SANCTIONS"), _source("cbam-legislation", "weekly"),
+               _source("csrd-legislation", "monthly", "CSRD")]
+
+    with patch("src.orchestration.scheduler.settings.cron_schedule", "30 6 * * 1"), \
+         patch("src.orchestration.scheduler.settings.scheduler_jitter_seconds", 120):
+        jobs = {job.id: job for job in build_source_jobs(scheduler, sources)}
+
+    assert set(jobs) == {"collect_eu-sanctions", "collect_cbam-legislation", "collect_csrd-legislation"}
+    daily, weekly, monthly = (_fields(jobs[f"collect_{s['id']}"].trigger) for s in sources)
+    assert (daily["hour"], daily["minute"], daily["day_of_week"], daily["day"]) == ("6", "30", "*", "*")
+    assert weekly["day_of_week"] == "mon" and weekly["day"] == "*"
+    assert monthly["day"] == "1" and monthly["day_of_week"] == "*"
+    for job in jobs.values():
+        assert job.coalesce and job.max_instances == 1 and job.trigger.jitter == 120
+    # Les deux jobs partagent le même budget
+    assert jobs["collect_eu-sanctions"].args[1] is jobs["collect_csrd-legislation"].args[1]
+    # Jour crontab 1 = lundi (APScheduler 3.x compte 0 = lundi)
+    assert _fields(cron_trigger("0 8 * * 1"))["day_of_week"] == "mon"
+
+
+def test_budget_bounds_concurrency_and_source_lock_prevents_overlap(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    budget = threading.BoundedSemaphore(1)
+    running, peak, keywords = [], [], []
+
+    async def fake_collect(keyword, max_cbam_documents):
+        running.append(keyword)
+        peak.append(len(running))
+        keywords.append((keyword, max_cbam_documents))
+        time.sleep(0.05)
+        running.remove(keyword)
+        return {"status": "success", "documents_processed": 1}
+
+    def job(source):
+        collect_source(source, budget, RunRegistry(Session, owner=f"scheduler-{source['id']}"))
+
+    with patch("src.orchestration.scheduler.run_agent_1a_combined", fake_collect), \
+         patch("src.orchestration.scheduler.run_pipeline_exclusive") as analyze, \
+         patch("src.orchestration.scheduler.refresh_document_index") as refresh:
+        threads = [threading.Thread(target=job, args=(source,))
+                   for source in (_source("cbam-legislation", "weekly"), _source("eu-sanctions", "daily", "SANCTIONS"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 1
+        assert sorted(keywords) == [("CBAM", 50), ("SANCTIONS", 0)]
+        assert analyze.call_count == 2 and analyze.call_args.kwargs["collect"] is False
+        assert refresh.call_count == 2
+
+        # Collecte de la même source encore en cours (autre processus) : ignorée
+        other = RunRegistry(Session, owner="scheduler-2")
+        held = other.start("collect", lock_name="collect:cbam-legislation")
+        assert collect_source(_source("cbam-legislation", "weekly"), budget, RunRegistry(Session)) is None
+        assert len(keywords) == 2
+        # Les autres sources ne sont pas bloquées et le budget a été rendu
+        assert collect_source(_source("eu-sanctions", "daily", "SANCTIONS"), budget,
+                              RunRegistry(Session))["status"] == "success"
+        other.execute(held["id"], lambda progress: {"status": "success"})
@@ -0,0 +1,113 @@
+"""Tests du pipeline en flux (collecte → analyse par étages)."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.agent_1b.models import KeywordAnalysisResult, NCCodeAnalysisResult, SemanticAnalysisResult
+from src.agent_1b.sinks import NullSink
+from src.agent_1b.tools.relevance_scorer import create_document_analysis
+from src.orchestration.streaming import StreamingPipeline
+from src.storage.models import Analysis, Base, Document
+
+SLOW_DOWNLOAD_SECONDS = 0.6
+
+
+def _analysis(document_id):
+    return create_document_analysis(
+        document_id=document_id,
+        company_profile_id="p-1",
+        document_title="CBAM",
+        regulation_type="CBAM",
+        keyword_result=KeywordAnalysisResult(
+            score=0.6, keywords_found=["rubber"], total_keywords_searched=2, keyword_density=0.5
+        ),
+        nc_code_result=NCCodeAnalysisResult(score=0.5, exact_matches=["4001.21"]),
+        semantic_result=SemanticAnalysisResult(
+            score=0.7,
+            is_applicable=True,
+            explanation="Explication de test suffisamment longue pour le modèle.",
+            regulation_summary="Résumé de test de la réglementation analysée, assez long pour le modèle.",
+            impact_explanation="Impact de test sur les produits importés par l'entreprise analysée.",
+            confidence_level=0.9,
+        ),
+    )
+
+
+class FakeAgent:
+    def __init__(self, company_profile):
+        self.analyzed = []
+
+    def analyze_document(self, document_id, document_content, document_title, regulation_type):
+        self.analyzed.append(document_id)
+        return _analysis(document_id)
+
+    def get_semantic_stats(self):
+        return {}
+
+
+def _eurlex_doc(name):
+    return SimpleNamespace(
+        celex_number=name, title=f"Règlement {name}", document_type="REG", publication_date=None,
+        pdf_url=f"https://eur-lex.example/{name}.pdf", url=f"https://eur-lex.example/{name}", metadata={}
+    )
+
+
+def test_first_analysis_does_not_wait_for_slowest_download(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stream.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(Document(id="backlog", title="Backlog", source_url="https://example.org/backlog",
+                         regulation_type="CBAM", hash_sha256="h0", content="ancien", workflow_status="raw"))
+    session.commit()
+    session.close()
+
+    async def search_eurlex(keyword, max_results):
+        return SimpleNamespace(status="success", error=None,
+                               documents=[_eurlex_doc("fast"), _eurlex_doc("slow"), _eurlex_doc("broken")])
+
+    async def search_cbam_guidance(categories, max_results):
+        return SimpleNamespace(status="success", error=None, documents=[])
+
+    async def fetch_document(url, output_dir, skip_if_exists, existing_hash):
+        name = url.rsplit("/", 1)[-1]
+        if name == "broken.pdf":
+            return SimpleNamespace(success=False, error="HTTP 500", document=None)
+        await asyncio.sleep(SLOW_DOWNLOAD_SECONDS if name == "slow.pdf" else 0.01)
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        return SimpleNamespace(success=True, document=SimpleNamespace(status="downloaded", file_path=str(path)))
+
+    async def extract_normalized_content(file_path, source, doc_id):
+        return SimpleNamespace(text=f"Texte {doc_id}", page_count=1, tables=[], nc_codes=[]), None
+
+    with patch("src.orchestration.streaming.get_session", side_effect=Session), \
+         patch("src.orchestration.streaming.Agent1B", FakeAgent), \
+         patch("src.orchestration.streaming.search_eurlex", search_eurlex), \
+         patch("src.orchestration.streaming.search_cbam_guidance", search_cbam_guidance), \
+         patch("src.orchestration.streaming.fetch_document", fetch_document), \
+         patch("src.orchestration.streaming.extract_normalized_content", extract_normalized_content), \
+         patch("src.orchestration.streaming.refresh_document_index"):
+        start = time.perf_counter()
+        result = asyncio.run(StreamingPipeline({"company_name": "Test"}, sink=NullSink(), queue_size=1).run())
+        elapsed = time.perf_counter() - start
+
+    timings = result["timings"]
+    assert timings["time_to_first_analysis_seconds"] < SLOW_DOWNLOAD_SECONDS
+    assert timings["total_seconds"] >= SLOW_DOWNLOAD_SECONDS
+    assert elapsed >= SLOW_DOWNLOAD_SECONDS
+    assert result["agent_1a"]["documents_processed"] == 2
+    assert result["agent_1a"]["download_errors"] == 1
+    assert result["agent_1b"]["documents_analyzed"] == 3
+    per_priority = result["agent_1b"]["priority"]["per_priority"]
+    assert sum(stats["count"] for stats in per_priority.values()) == 3
+
+    session = Session()
+    assert {d.workflow_status for d in session.query(Document)} == {"analyzed"}
+    assert session.query(Analysis).count() == 3
+    session.close()
@@ -0,0 +1,88 @@
+"""Tests des workers de la file de travaux distribuée."""
+
+import threading
+import time
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.orchestration.worker import Worker
+from src.storage.job_repository import JobRepository
+from src.storage.models import Base, Job
+
+JOB_SECONDS = 0.08
+JOBS = 24
+
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _handlers(seen):
+    def fetch(payload):
+        time.sleep(JOB_SECONDS)  # Téléchargement / appel LLM simulé
+        return {"ok": True}, [("analyse", {"n": payload["n"]}, f"analyse:{payload['n']}")]
+
+    def analyse(payload):
+        time.sleep(JOB_SECONDS)
+        seen.append(payload["n"])
+        return {"ok": True}, []
+
+    return {"fetch": fetch, "analyse": analyse}
+
+
+def _run(tmp_path, workers):
+    Session = _session_factory(tmp_path / f"w{workers}")
+    session = Session()
+    for n in range(JOBS // 2):
+        JobRepository(session).enqueue("fetch", {"n": n})
+    session.close()
+
+    seen = []
+    pool = [Worker(_handlers(seen), worker_id=f"w{i}", session_factory=Session, poll_interval=0.01)
+            for i in range(workers)]
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker.run, kwargs={"stop_when_idle": True}) for worker in pool]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    session = Session()
+    statuses = {status for (status,) in session.query(Job.status)}
+    session.close()
+    return elapsed, sorted(seen), statuses, [worker.processed for worker in pool]
+
+
+def test_throughput_scales_with_workers(tmp_path):
+    (tmp_path / "w1").mkdir()
+    (tmp_path / "w4").mkdir()
+
+    single, seen_single, statuses, _ = _run(tmp_path, 1)
+    parallel, seen_parallel, statuses_parallel, per_worker = _run(tmp_path, 4)
+
+    assert seen_single == seen_parallel == list(range(JOBS // 2))
+    assert statuses == statuses_parallel == {"done"}
+    assert sum(per_worker) == JOBS and min(per_worker) > 0
+    # Idéal x4 ; marge pour l'ordonnancement des threads et les commits SQLite
+    assert single / parallel > 2.5
+
+
+def test_similarity_index_refreshed_once_when_queue_drains(tmp_path):
+    Session = _session_factory(tmp_path)
+    session = Session()
+    for n, status in enumerate(["new", "unchanged", "modified"]):
+        JobRepository(session).enqueue("extract", {"n": n, "status": status})
+    session.close()
+
+    handlers = {"extract": lambda payload: ({"status": payload["status"]}, [])}
+    worker = Worker(handlers, session_factory=Session, poll_interval=0.01)
+    with patch("src.orchestration.worker.refresh_document_index") as refresh:
+        worker.run(stop_when_idle=True)
+
+    assert worker.processed == 3
+    refresh.assert_called_once_with(Session)
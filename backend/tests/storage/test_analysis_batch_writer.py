@@ -0,0 +1,98 @@
+"""Tests de l'écriture groupée des analyses."""
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.agent_1b.models import KeywordAnalysisResult, NCCodeAnalysisResult, SemanticAnalysisResult
+from src.agent_1b.tools.relevance_scorer import create_document_analysis
+from src.storage.analysis_repository import AnalysisBatchWriter
+from src.storage.models import Analysis, Base, Document
+
+
+def _analysis(document_id):
+    return create_document_analysis(
+        document_id=document_id,
+        company_profile_id="p-1",
+        document_title="CBAM",
+        regulation_type="CBAM",
+        keyword_result=KeywordAnalysisResult(
+            score=0.6, keywords_found=["rubber"], total_keywords_searched=2, keyword_density=0.5
+        ),
+        nc_code_result=NCCodeAnalysisResult(score=0.5, exact_matches=["4001.21"]),
+        semantic_result=SemanticAnalysisResult(
+            score=0.7,
+            is_applicable=True,
+            explanation="Explication de test suffisamment longue pour le modèle.",
+            regulation_summary="Résumé de test de la réglementation analysée, assez long pour le modèle.",
+            impact_explanation="Impact de test sur les produits importés par l'entreprise analysée.",
+            confidence_level=0.9,
+        ),
+    )
+
+
+def _session(document_count):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Document(id=f"d-{i}", title=f"Doc {i}", source_url=f"https://example.org/{i}",
+                 regulation_type="CBAM", hash_sha256=f"h{i}")
+        for i in range(document_count)
+    ])
+    session.commit()
+    commits = []
+    event.listen(session, "after_commit", lambda s: commits.append(1))
+    return session, commits
+
+
+def test_one_transaction_per_flush_size():
+    session, commits = _session(5)
+    saved = []
+
+    with AnalysisBatchWriter(session, flush_size=2) as writer:
+        ids = [writer.add(_analysis(f"d-{i}"), on_saved=saved.append) for i in range(5)]
+
+    assert len(commits) == 3
+    assert saved == ids
+    assert writer.written == 5
+    assert {d.workflow_status for d in session.query(Document)} == {"analyzed"}
+    row = session.get(Analysis, ids[0])
+    assert row.validation_status == "pending"
+    assert row.final_score is not None and row.matched_nc_codes == ["4001.21"]
+
+
+def test_document_status_committed_with_batch():
+    session, commits = _session(2)
+    documents = session.query(Document).order_by(Document.id).all()
+
+    writer = AnalysisBatchWriter(session, flush_size=10)
+    for document in documents:
+        writer.add(_analysis(document.id))
+
+    assert commits == [] and session.query(Analysis).count() == 0
+    assert [d.workflow_status for d in documents] == ["raw", "raw"]
+
+    writer.flush()
+    session.expire_all()
+
+    assert len(commits) == 1
+    assert session.query(Analysis).count() == 2
+    assert [d.workflow_status for d in session.query(Document).order_by(Document.id)] == ["analyzed", "analyzed"]
+
+
+def test_failed_document_mid_batch_keeps_other_statuses():
+    session, commits = _session(3)
+
+    writer = AnalysisBatchWriter(session, flush_size=10)
+    writer.add(_analysis("d-0"))
+    # Échec de d-1 dans le pipeline : rollback de la session en cours de lot
+    session.rollback()
+    writer.add(_analysis("d-2"))
+    writer.flush()
+    session.expire_all()
+
+    assert len(commits) == 1
+    assert sorted(a.document_id for a in session.query(Analysis)) == ["d-0", "d-2"]
+    assert [d.workflow_status for d in session.query(Document).order_by(Document.id)] == [
+        "analyzed", "raw", "analyzed"
+    ]
@@ -0,0 +1,107 @@
+"""Tests du texte compressé des documents (chargement différé, aperçu, migration)."""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, joinedload
+
+from src.storage.content_store import decompress_text, iter_document_texts
+from src.storage.migrations_runner import upgrade_database
+from src.storage.models import Analysis, Document, DocumentContent
+
+BODY = "Article 1\n\n  Le présent règlement établit un mécanisme d'ajustement carbone aux frontières. " * 400
+
+
+def _document(doc_id, content=BODY):
+    return Document(id=doc_id, title=f"Règlement {doc_id}", source_url=f"https://eur-lex.example/{doc_id}",
+                    regulation_type="CBAM", hash_sha256=doc_id, content=content)
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_content_is_compressed_and_loaded_only_on_access(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'content.db'}")
+    upgrade_database(engine)
+    with Session(engine) as session:
+        session.add_all([_document("doc-1"), _document("doc-2", content=None)])
+        session.add(Analysis(id="a-1", document_id="doc-1", is_relevant=True, confidence=0.9))
+        session.commit()
+
+    with Session(engine) as session:
+        stored = session.get(DocumentContent, "doc-1")
+        assert stored.codec == "zlib" and stored.raw_size == len(BODY.encode("utf-8"))
+        assert len(stored.data) < stored.raw_size / 10
+        assert decompress_text(stored.data, stored.codec) == BODY
+        assert session.get(DocumentContent, "doc-2") is None
+
+    statements = _count_statements(engine)
+    with Session(engine) as session:
+        # Requête des listes de l'API : le texte n'est pas lu
+        analysis = session.query(Analysis).options(joinedload(Analysis.document)).one()
+        assert not any("document_contents" in sql for sql in statements)
+        doc = analysis.document
+        assert doc.excerpt.startswith("Article 1 Le présent règlement") and len(doc.excerpt) == 500
+        assert doc.content_size == len(BODY)
+
+        assert doc.content == BODY
+        assert any("document_contents" in sql for sql in statements)
+
+        doc.content = "Texte modifié"
+        session.commit()
+        assert (doc.excerpt, doc.content_size) == ("Texte modifié", 13)
+        assert dict(iter_document_texts(session)) == {"doc-1": "Texte modifié"}
+
+        session.delete(doc)
+        session.commit()
+        assert session.query(DocumentContent).count() == 0
+
+
+def test_migration_moves_existing_content(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    upgrade_database(engine, "0002")
+    with engine.begin() as connection:
+        for doc_id, content in (("doc-1", BODY), ("doc-2", None)):
+            connection.execute(text(
+                "INSERT INTO documents (id, title, source_url, regulation_type, hash_sha256, content, status, "
+                "workflow_status, first_seen, last_checked, created_at) VALUES (:id, 'Titre', 'https://x', 'CBAM', "
+                ":id, :content, 'new', 'raw', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ), {"id": doc_id, "content": content})
+
+    upgrade_database(engine)
+
+    with Session(engine) as session:
+        first, second = session.get(Document, "doc-1"), session.get(Document, "doc-2")
+        assert first.content == BODY and first.content_size == len(BODY) and len(first.excerpt) == 500
+        assert second.content is None and second.excerpt is None
+
+
+@pytest.mark.parametrize("with_analysis", [False, True])
+def test_migration_keeps_content_with_foreign_keys_enabled(tmp_path, with_analysis):
+    # Moteur configuré comme src/storage/database.py (PRAGMA foreign_keys=ON à la connexion)
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    event.listen(engine, "connect", lambda dbapi_conn, record: dbapi_conn.execute("PRAGMA foreign_keys=ON"))
+    upgrade_database(engine, "0002")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO documents (id, title, source_url, regulation_type, hash_sha256, content, status, "
+            "workflow_status, first_seen, last_checked, created_at) VALUES ('doc-1', 'Titre', 'https://x', 'CBAM', "
+            "'doc-1', :content, 'new', 'analyzed', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ), {"content": BODY})
+        if with_analysis:
+            connection.execute(text(
+                "INSERT INTO analyses (id, document_id, is_relevant, confidence, validation_status, created_at) "
+                "VALUES ('a-1', 'doc-1', 1, 0.9, 'pending', CURRENT_TIMESTAMP)"
+            ))
+
+    upgrade_database(engine)
+
+    with Session(engine) as session:
+        # Recréation de documents : ni cascade sur document_contents, ni échec sur analyses
+        assert session.get(Document, "doc-1").content == BODY
+        assert session.query(Analysis).count() == int(with_analysis)
+        # Contraintes de nouveau actives après la migration
+        assert session.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    engine.dispose()
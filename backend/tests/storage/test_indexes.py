@@ -0,0 +1,166 @@
+"""Tests des migrations et de l'utilisation des index (plans de requête SQLite / PostgreSQL)."""
+
+import os
+from datetime import datetime
+
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text, tuple_
+from sqlalchemy.orm import Session
+
+from src.storage.migrations_runner import alembic_config, upgrade_database
+from src.storage.models import Analysis, Base, Document, ImpactAssessment
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+CURSOR = (datetime(2026, 1, 1, 12, 30), "analysis-1")
+
+# Copie figée des tables créées par create_all avant les migrations (SQLite)
+LEGACY_SCHEMA = [
+    "CREATE TABLE documents (id VARCHAR NOT NULL, title VARCHAR(500) NOT NULL, source_url VARCHAR(1000) NOT NULL, "
+    "regulation_type VARCHAR(50) NOT NULL, publication_date DATETIME, hash_sha256 VARCHAR(64) NOT NULL, "
+    "content TEXT, nc_codes JSON, document_metadata JSON, status VARCHAR(20) NOT NULL, "
+    "workflow_status VARCHAR(20) NOT NULL, analyzed_at DATETIME, validated_at DATETIME, validated_by VARCHAR(200), "
+    "first_seen DATETIME NOT NULL, last_checked DATETIME NOT NULL, created_at DATETIME NOT NULL, "
+    "PRIMARY KEY (id), UNIQUE (hash_sha256))",
+    "CREATE TABLE execution_logs (id VARCHAR NOT NULL, agent_type VARCHAR(20) NOT NULL, status VARCHAR(20) NOT NULL, "
+    "start_time DATETIME NOT NULL, end_time DATETIME, duration_seconds FLOAT, documents_processed INTEGER, "
+    "documents_new INTEGER, documents_modified INTEGER, errors JSON, log_metadata JSON, "
+    "created_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    "CREATE TABLE company_profiles (id VARCHAR NOT NULL, company_name VARCHAR(200) NOT NULL, nc_codes JSON NOT NULL, "
+    "keywords JSON NOT NULL, regulations JSON NOT NULL, contact_emails JSON NOT NULL, config JSON, active BOOLEAN, "
+    "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    "CREATE TABLE company_processes (id VARCHAR NOT NULL, company_name VARCHAR(200) NOT NULL, processes JSON, "
+    "transport_modes JSON, suppliers JSON, products JSON, import_export_flows JSON, notes TEXT, "
+    "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    "CREATE TABLE users (id VARCHAR NOT NULL, email VARCHAR(255) NOT NULL, password_hash VARCHAR(255) NOT NULL, "
+    "name VARCHAR(200) NOT NULL, role VARCHAR(50) NOT NULL, is_active BOOLEAN NOT NULL, "
+    "created_at DATETIME NOT NULL, last_login DATETIME, PRIMARY KEY (id))",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE TABLE analyses (id VARCHAR NOT NULL, document_id VARCHAR NOT NULL, is_relevant BOOLEAN NOT NULL, "
+    "confidence FLOAT NOT NULL, matched_keywords JSON, matched_nc_codes JSON, llm_reasoning TEXT, "
+    "validation_status VARCHAR(20) NOT NULL, validation_comment TEXT, validated_by VARCHAR(200), "
+    "validated_at DATETIME, regulation_type VARCHAR(50), created_at DATETIME NOT NULL, PRIMARY KEY (id), "
+    "FOREIGN KEY(document_id) REFERENCES documents (id))",
+    "CREATE TABLE impact_assessments (id VARCHAR NOT NULL, analysis_id VARCHAR NOT NULL, "
+    "risk_main VARCHAR(50) NOT NULL, impact_level VARCHAR(20) NOT NULL, risk_details TEXT, modality VARCHAR(50), "
+    "deadline VARCHAR(7), recommendation TEXT, llm_reasoning TEXT, created_at DATETIME NOT NULL, "
+    "PRIMARY KEY (id), FOREIGN KEY(analysis_id) REFERENCES analyses (id))",
+    "CREATE TABLE alerts (id VARCHAR NOT NULL, impact_assessment_id VARCHAR NOT NULL, alert_type VARCHAR(50) NOT NULL, "
+    "alert_data JSON NOT NULL, recipients JSON NOT NULL, sent_at DATETIME, status VARCHAR(20) NOT NULL, "
+    "error_message TEXT, created_at DATETIME NOT NULL, PRIMARY KEY (id), "
+    "FOREIGN KEY(impact_assessment_id) REFERENCES impact_assessments (id))",
+]
+
+
+def _keyset(query, entity):
+    """Page suivante d'une pagination par curseur (src/storage/pagination.py)"""
+    return query.filter(tuple_(entity.created_at, entity.id) < tuple_(*CURSOR)) \
+        .order_by(entity.created_at.desc(), entity.id.desc()).limit(11)
+
+
+# Requêtes des repositories et de l'API -> index attendu
+HOT_QUERIES = [
+    (lambda s: s.query(Document).filter(Document.source_url == "https://eur-lex.example/1.pdf"),
+     "idx_documents_source_url"),
+    (lambda s: s.query(Document).filter(Document.workflow_status == "raw").order_by(Document.created_at.desc()),
+     "idx_documents_workflow_created"),
+    (lambda s: s.query(Analysis).filter(Analysis.validation_status == "pending").order_by(Analysis.created_at.desc()),
+     "idx_analyses_validation_created"),
+    (lambda s: s.query(Analysis).filter(Analysis.document_id == "doc-1").order_by(Analysis.created_at.desc()),
+     "idx_analyses_document_created"),
+    (lambda s: s.query(Analysis).order_by(Analysis.created_at.desc()).limit(20),
+     "idx_analyses_created"),
+    (lambda s: s.query(ImpactAssessment).filter(ImpactAssessment.analysis_id == "analysis-1"),
+     "idx_impacts_analysis"),
+    (lambda s: s.query(ImpactAssessment).filter(ImpactAssessment.impact_level == "eleve")
+     .order_by(ImpactAssessment.created_at.desc()), "idx_impacts_level_created"),
+    (lambda s: s.query(ImpactAssessment).filter(ImpactAssessment.risk_main == "fiscal")
+     .order_by(ImpactAssessment.created_at.desc()), "idx_impacts_risk_created"),
+    # Pagination par curseur des listes de l'API
+    (lambda s: _keyset(s.query(Analysis).filter(Analysis.validation_status == "pending"), Analysis),
+     "idx_analyses_validation_created"),
+    (lambda s: _keyset(s.query(Analysis), Analysis), "idx_analyses_created"),
+    (lambda s: _keyset(s.query(ImpactAssessment).filter(ImpactAssessment.impact_level == "eleve"), ImpactAssessment),
+     "idx_impacts_level_created"),
+    (lambda s: _keyset(s.query(ImpactAssessment), ImpactAssessment), "idx_impacts_created"),
+]
+
+
+def _plan(session: Session, query) -> str:
+    sql = str(query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True}))
+    if session.get_bind().dialect.name == "postgresql":
+        # Tables de test minuscules : sans cela le planificateur préfère un parcours séquentiel
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        return "\n".join(row[0] for row in session.execute(text(f"EXPLAIN {sql}")))
+    return "\n".join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+@pytest.fixture(params=["sqlite", pytest.param("postgresql", marks=[
+    pytest.mark.database,
+    pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL non défini"),
+])])
+def migrated_engine(request, tmp_path):
+    if request.param == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    else:
+        engine = create_engine(POSTGRES_URL)
+        Base.metadata.drop_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    upgrade_database(engine)
+    yield engine
+    if request.param == "postgresql":
+        Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def test_hot_queries_use_indexes(migrated_engine):
+    with Session(migrated_engine) as session:
+        for build_query, index in HOT_QUERIES:
+            plan = _plan(session, build_query(session))
+            assert index in plan, f"{index} non utilisé :\n{plan}"
+            # Filtre + tri servis par le même index composite (pas de tri en mémoire)
+            assert "TEMP B-TREE" not in plan and "Sort" not in plan, plan
+
+
+def test_database_created_before_migrations_is_stamped_then_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        # Base créée par l'ancien init_db (create_all) : pas de version Alembic
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(text(
+            "INSERT INTO documents (id, title, source_url, regulation_type, hash_sha256, content, status, "
+            "workflow_status, first_seen, last_checked, created_at) VALUES ('d', 'Doc', 'https://x', 'CBAM', "
+            "'h', 'Texte', 'new', 'analyzed', :now, :now, :now)"
+        ), {"now": "2026-01-01 00:00:00"})
+        connection.execute(text(
+            "INSERT INTO analyses (id, document_id, is_relevant, confidence, validation_status, created_at) "
+            "VALUES ('a', 'd', 1, 0.9, 'pending', '2026-01-01 00:00:00')"
+        ))
+
+    upgrade_database(engine)
+    upgrade_database(engine)  # idempotent
+
+    inspector = inspect(engine)
+    assert {"jobs", "pipeline_runs", "run_locks", "stats_counters"} <= set(inspector.get_table_names())
+    columns = {column["name"] for column in inspector.get_columns("analyses")}
+    assert {"company_profile_id", "final_score", "criticality", "semantic_applicable"} <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("documents")}
+    assert {"idx_documents_source_url", "idx_documents_workflow_created"} <= indexes
+    with Session(engine) as session:
+        assert session.get(Analysis, "a").final_score is None
+        assert session.get(Document, "d").content == "Texte"
+    with engine.connect() as connection:
+        head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == head
+    engine.dispose()
+
+
+def test_models_match_migrations(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'check.db'}")
+    upgrade_database(engine)
+    with engine.connect() as connection:
+        # Échoue si src/storage/models.py a changé sans nouvelle migration
+        command.check(alembic_config(connection))
@@ -0,0 +1,71 @@
+"""Tests de la file de travaux (baux, nouvelles tentatives, lettres mortes)."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.storage.job_repository import JobRepository
+from src.storage.models import Base, Job
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_claim_order_dedupe_and_follow_ups():
+    session = _session()
+    repo = JobRepository(session)
+    low = repo.enqueue("analyse", {"document_id": "d-1"}, dedupe_key="analyse:d-1")
+    assert repo.enqueue("analyse", {"document_id": "d-1"}, dedupe_key="analyse:d-1").id == low.id
+    high = repo.enqueue("fetch", {"url": "u"}, priority=10)
+
+    assert repo.claim("w1").id == high.id
+    assert repo.claim("w2", job_types=["impact"]) is None
+    assert repo.claim("w2").id == low.id
+    assert repo.claim("w3") is None
+
+    # Le bail de w1 ne peut pas être terminé par un autre worker
+    assert not repo.complete(high.id, "w2")
+    assert repo.complete(high.id, "w1", {"ok": True}, [("extract", {"url": "u"}, "extract:u")])
+    assert session.get(Job, high.id, populate_existing=True).status == "done"
+    assert repo.claim("w1").job_type == "extract"
+
+
+def test_retries_with_backoff_then_dead_letter():
+    session = _session()
+    repo = JobRepository(session)
+    job = repo.enqueue("analyse", {"document_id": "d-1"}, max_attempts=2)
+
+    repo.claim("w1")
+    assert repo.fail(job.id, "w1", "LLM timeout") == "pending"
+    # Backoff : pas disponible tout de suite
+    assert repo.claim("w1") is None
+
+    session.query(Job).update({"available_at": datetime.utcnow() - timedelta(seconds=1)})
+    session.commit()
+    assert repo.claim("w2").attempts == 2
+    assert repo.fail(job.id, "w2", "LLM timeout") == "dead"
+    assert [j.id for j in repo.find_dead()] == [job.id]
+    assert repo.stats() == {"analyse": {"dead": 1}}
+
+    assert repo.requeue_dead() == 1
+    assert repo.claim("w3").attempts == 1
+
+
+def test_expired_lease_is_reclaimed_and_heartbeat_rejected():
+    session = _session()
+    repo = JobRepository(session)
+    job = repo.enqueue("fetch", {"url": "u"})
+
+    repo.claim("w1", lease_seconds=60)
+    assert repo.heartbeat(job.id, "w1")
+    session.query(Job).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    session.commit()
+
+    reclaimed = repo.claim("w2")
+    assert reclaimed.id == job.id and reclaimed.worker_id == "w2" and reclaimed.attempts == 2
+    assert not repo.heartbeat(job.id, "w1")
+    assert repo.fail(job.id, "w1", "late failure") is None
@@ -0,0 +1,89 @@
+"""Tests de la pagination par curseur et des totaux des listes de l'API."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.storage.migrations_runner import upgrade_database
+from src.storage.models import Analysis, Document
+from src.storage.pagination import (
+    CursorError, clear_count_cache, count_total, decode_cursor, encode_cursor, keyset_page
+)
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    upgrade_database(engine)
+    with Session(engine) as session:
+        session.add(Document(id="doc", title="CBAM", source_url="https://x", regulation_type="CBAM", hash_sha256="h"))
+        start = datetime(2026, 1, 1)
+        for i in range(23):
+            # Lots de 3 analyses à la même date : départage par id
+            session.add(Analysis(id=f"a-{i:02d}", document_id="doc", created_at=start + timedelta(hours=i // 3),
+                                 validation_status="approved" if i % 2 else "pending"))
+        session.commit()
+        yield session
+    clear_count_cache()
+
+
+def _list(session, status=None):
+    query = session.query(Analysis).join(Document)
+    return query.filter(Analysis.validation_status == status) if status else query
+
+
+def test_cursors_walk_all_rows_forward_and_back(session):
+    expected = [a.id for a in _list(session).order_by(Analysis.created_at.desc(), Analysis.id.desc())]
+
+    pages, cursor = [], None
+    while True:
+        page = keyset_page(_list(session), Analysis.created_at, Analysis.id, 5, cursor)
+        pages.append(page)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert [a.id for page in pages for a in page.items] == expected
+    assert [len(page.items) for page in pages] == [5, 5, 5, 5, 3]
+    assert pages[0].prev_cursor is None
+
+    # Retour en arrière depuis la dernière page
+    cursor, backwards = pages[-1].prev_cursor, []
+    while cursor is not None:
+        page = keyset_page(_list(session), Analysis.created_at, Analysis.id, 5, cursor)
+        backwards.insert(0, [a.id for a in page.items])
+        cursor = page.prev_cursor
+    assert backwards == [[a.id for a in page.items] for page in pages[:-1]]
+
+    # Filtre conservé d'une page à l'autre
+    first = keyset_page(_list(session, "pending"), Analysis.created_at, Analysis.id, 4)
+    second = keyset_page(_list(session, "pending"), Analysis.created_at, Analysis.id, 4, first.next_cursor)
+    assert {a.validation_status for a in first.items + second.items} == {"pending"}
+    assert [a.id for a in first.items + second.items] == [a for a in expected if int(a[2:]) % 2 == 0][:8]
+
+
+def test_cursor_is_opaque_and_validated():
+    cursor = encode_cursor(datetime(2026, 1, 1, 8, 30, 0, 125), "a-01")
+    assert "a-01" not in cursor
+    assert decode_cursor(cursor) == (datetime(2026, 1, 1, 8, 30, 0, 125), "a-01", "next")
+    for invalid in ("pas-un-curseur", encode_cursor(datetime(2026, 1, 1), "a")[:-4], ""):
+        with pytest.raises(CursorError):
+            decode_cursor(invalid)
+
+
+def test_count_modes(session):
+    assert count_total(_list(session), "exact") == 23
+    assert count_total(_list(session), "none") is None
+
+    assert count_total(_list(session, "pending"), "cached", cache_key="pending") == 12
+    session.add(Analysis(id="a-99", document_id="doc", validation_status="pending"))
+    session.commit()
+    # Total mis en cache jusqu'à expiration, puis recalculé
+    assert count_total(_list(session, "pending"), "cached", cache_key="pending") == 12
+    with patch("src.storage.pagination.settings.api_count_cache_seconds", 0):
+        assert count_total(_list(session, "pending"), "cached", cache_key="pending") == 13
+    clear_count_cache()
+    assert count_total(_list(session, "pending"), "exact") == 13
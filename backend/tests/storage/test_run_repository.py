@@ -0,0 +1,92 @@
+"""Tests du registre d'exécutions et du verrou inter-processus."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.orchestration.runs import RunRegistry
+from src.storage.models import Base, PipelineRun, RunLock
+from src.storage.run_repository import RunRepository
+
+
+def _session_factory(tmp_path):
+    # Fichier partagé : chaque registre a ses propres connexions (comme deux processus)
+    engine = create_engine(f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_single_run_per_type_across_owners(tmp_path):
+    Session = _session_factory(tmp_path)
+    api_1 = RunRegistry(Session, owner="api-1")
+    api_2 = RunRegistry(Session, owner="api-2")
+
+    run = api_1.start("agent1", {"keyword": "CBAM"})
+    assert run["state"] == "running"
+    assert api_2.start("agent1", {"keyword": "CBAM"}) is None
+    assert api_2.active("agent1")["id"] == run["id"]
+    # Verrou par type : l'Agent 2 reste libre
+    assert api_2.start("agent2") is not None
+
+    api_1.execute(run["id"], lambda progress: {"status": "success"})
+    assert api_2.active("agent1") is None
+    assert api_1.get(run["id"])["state"] == "succeeded"
+    assert api_2.start("agent1", {"keyword": "EUDR"}) is not None
+
+
+def test_concurrent_starts_get_one_lock(tmp_path):
+    Session = _session_factory(tmp_path)
+    barrier = threading.Barrier(4)
+    started = []
+
+    def trigger(i):
+        registry = RunRegistry(Session, owner=f"worker-{i}")
+        barrier.wait()
+        started.append(registry.start("agent1"))
+
+    threads = [threading.Thread(target=trigger, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len([run for run in started if run is not None]) == 1
+    session = Session()
+    assert session.query(RunLock).count() == 1
+
+
+def test_progress_heartbeat_failure_and_stale_lock(tmp_path):
+    Session = _session_factory(tmp_path)
+    registry = RunRegistry(Session, owner="scheduler", heartbeat_interval=0.02)
+    run = registry.start("agent1")
+    seen = {}
+
+    def pipeline(progress):
+        progress(stage="agent_1b", documents_total=2, documents_analyzed=1)
+        # Le heartbeat publie la progression pendant l'exécution
+        deadline = datetime.utcnow() + timedelta(seconds=2)
+        while not seen.get("progress") and datetime.utcnow() < deadline:
+            seen["progress"] = RunRegistry(Session).active("agent1")["progress"]
+        raise RuntimeError("LLM down")
+
+    with pytest.raises(RuntimeError):
+        registry.execute(run["id"], pipeline)
+    assert seen["progress"] == {"stage": "agent_1b", "documents_total": 2, "documents_analyzed": 1}
+    failed = registry.get(run["id"])
+    assert failed["state"] == "failed" and "LLM down" in failed["error"]
+
+    # Propriétaire arrêté sans libérer le verrou : repris après expiration
+    crashed = registry.start("agent1")
+    session = Session()
+    session.query(RunLock).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    session.commit()
+    assert RunRepository(session).find_active("agent1") is None
+
+    new_run = RunRegistry(Session, owner="api-1").start("agent1")
+    assert new_run is not None
+    assert session.get(PipelineRun, crashed["id"], populate_existing=True).state == "interrupted"
+    # L'ancien propriétaire ne peut plus prolonger le verrou
+    assert not RunRepository(session).heartbeat(crashed["id"], "scheduler")
@@ -0,0 +1,69 @@
+"""Tests de la recherche plein texte (index tenu à jour par upsert_document, classement, extraits)."""
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.storage.migrations_runner import upgrade_database
+from src.storage.models import Document
+from src.storage.repositories import DocumentRepository
+from src.storage.search import fts_query, search_matches, search_snippets
+
+FILLER = "Le déclarant autorisé transmet les informations sur les émissions intrinsèques. " * 50
+
+
+def _upsert(repo, doc_id, title, content, hash_sha256=None):
+    document, status = repo.upsert_document(
+        source_url=f"https://eur-lex.example/{doc_id}", hash_sha256=hash_sha256 or doc_id,
+        title=title, content=content
+    )
+    return document.id
+
+
+def _search(session, search):
+    matches = search_matches(session, search)
+    rows = session.execute(
+        select(Document.id).join(matches, matches.c.document_id == Document.id).order_by(matches.c.rank)
+    )
+    return [document_id for (document_id,) in rows]
+
+
+def test_search_ranks_title_and_body_matches_with_snippets(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    upgrade_database(engine)
+    with Session(engine) as session:
+        repo = DocumentRepository(session)
+        in_body = _upsert(repo, "body", "Règlement d'exécution 2023/1773",
+                          FILLER + "Les pneumatiques du code NC 4016.93 sont concernés. " + FILLER)
+        in_title = _upsert(repo, "title", "Joints en caoutchouc 4016.93", FILLER)
+        _upsert(repo, "other", "Règlement 2023/956", FILLER + "Codes 4016.10 et 7606, article 93.")
+        session.commit()
+
+        # Code NC : recherché tel quel, pas "4016" et "93" séparément
+        assert _search(session, "4016.93") == [in_title, in_body]
+        assert _search(session, "emissions INTRINSEQUES caoutchouc") == [in_title]
+        assert search_matches(session, '  " ') is None
+
+        snippets = search_snippets(session, "4016.93", [in_body])
+        assert "<mark>" in snippets[in_body] and "4016" in snippets[in_body]
+        assert len(snippets[in_body]) < 400
+
+        # Document modifié : réindexé
+        _upsert(repo, "body", "Règlement d'exécution 2023/1773", "Texte consolidé sans code", hash_sha256="v2")
+        session.commit()
+        assert _search(session, "4016.93") == [in_title]
+        assert _search(session, "consolidé") == [in_body]
+
+
+def test_migration_indexes_existing_documents(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    upgrade_database(engine, "0003")
+    with Session(engine) as session:
+        session.add(Document(id="doc-1", title="CBAM", source_url="https://x", regulation_type="CBAM",
+                             hash_sha256="h1", content="Importations d'aluminium 7601"))
+        session.commit()
+
+    upgrade_database(engine)
+
+    with Session(engine) as session:
+        assert _search(session, "aluminium") == ["doc-1"]
+    assert fts_query('code "4016.93" NC') == '"code" "4016.93" "NC"'
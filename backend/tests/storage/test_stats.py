@@ -0,0 +1,129 @@
+"""Tests des compteurs des statistiques des dashboards."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.agent_1b.models import KeywordAnalysisResult, NCCodeAnalysisResult, SemanticAnalysisResult
+from src.agent_1b.tools.relevance_scorer import create_document_analysis
+from src.storage.analysis_repository import AnalysisBatchWriter, AnalysisRepository
+from src.storage.migrations_runner import upgrade_database
+from src.storage.models import Analysis, Base, Document, ImpactAssessment, StatsCounter
+from src.storage.stats import (
+    ANALYSES_HIGH_PRIORITY, ANALYSES_STATUS, IMPACTS_DEADLINE, IMPACTS_LEVEL, aggregate_stats, read_stats,
+    rebuild_stats
+)
+
+
+def _snapshot(session):
+    return {(row.metric, row.bucket): row.count for row in session.query(StatsCounter) if row.count}
+
+
+def _analysis(document_id):
+    return create_document_analysis(
+        document_id=document_id,
+        company_profile_id="p-1",
+        document_title="CBAM",
+        regulation_type="CBAM",
+        keyword_result=KeywordAnalysisResult(
+            score=0.6, keywords_found=["rubber"], total_keywords_searched=2, keyword_density=0.5
+        ),
+        nc_code_result=NCCodeAnalysisResult(score=0.5, exact_matches=["4001.21"]),
+        semantic_result=SemanticAnalysisResult(
+            score=0.7,
+            is_applicable=True,
+            explanation="Explication de test suffisamment longue pour le modèle.",
+            regulation_summary="Résumé de test de la réglementation analysée, assez long pour le modèle.",
+            impact_explanation="Impact de test sur les produits importés par l'entreprise analysée.",
+            confidence_level=0.9,
+        ),
+    )
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            Document(id=f"d-{i}", title=f"Doc {i}", source_url=f"https://example.org/{i}",
+                     regulation_type="CBAM", hash_sha256=f"h{i}")
+            for i in range(4)
+        ])
+        session.commit()
+        yield session
+
+
+def test_counters_follow_pipeline_and_validation_writes(session):
+    # Pipeline : insertion par lots (hors ORM) et unité de travail ORM
+    with AnalysisBatchWriter(session, flush_size=2) as writer:
+        ids = [writer.add(_analysis(f"d-{i}")) for i in range(3)]
+    session.add(Analysis(id="a-orm", document_id="d-3", confidence=0.9))
+    session.commit()
+
+    assert read_stats(session, [ANALYSES_STATUS])[ANALYSES_STATUS] == {"pending": 4}
+    assert _snapshot(session) == aggregate_stats(session)
+
+    # Validation sur une analyse expirée par le commit précédent
+    AnalysisRepository(session).approve(ids[0])
+    AnalysisRepository(session).reject("a-orm")
+    stats = read_stats(session, [ANALYSES_STATUS, ANALYSES_HIGH_PRIORITY])
+    assert stats[ANALYSES_STATUS] == {"pending": 2, "approved": 1, "rejected": 1}
+    assert stats[ANALYSES_HIGH_PRIORITY] == {"rejected": 1}
+    assert _snapshot(session) == aggregate_stats(session)
+
+    # Agent 2 : création puis mise à jour d'un impact
+    session.add(ImpactAssessment(id="i-1", analysis_id=ids[0], risk_main="fiscal",
+                                 impact_level="eleve", deadline="06-2027"))
+    session.commit()
+    session.get(ImpactAssessment, "i-1").impact_level = "moyen"
+    session.commit()
+    assert read_stats(session, [IMPACTS_LEVEL, IMPACTS_DEADLINE]) == {
+        IMPACTS_LEVEL: {"moyen": 1}, IMPACTS_DEADLINE: {"06-2027|moyen": 1}
+    }
+
+    # Transaction annulée : compteurs inchangés
+    before = _snapshot(session)
+    session.get(Analysis, ids[1]).validation_status = "approved"
+    session.flush()
+    session.rollback()
+    assert _snapshot(session) == before
+
+    session.delete(session.get(ImpactAssessment, "i-1"))
+    session.commit()
+    assert _snapshot(session) == aggregate_stats(session)
+
+
+def test_migration_backfill_and_rebuild(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    upgrade_database(engine, "0005")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO documents (id, title, source_url, regulation_type, hash_sha256, status, "
+            "workflow_status, first_seen, last_checked, created_at) "
+            "VALUES ('d', 'Doc', 'https://x', 'CBAM', 'h', 'new', 'raw', :now, :now, :now)"
+        ), {"now": "2026-01-01 00:00:00"})
+        for i, (status, confidence) in enumerate([("pending", 0.9), ("pending", 0.2), ("approved", 0.95)]):
+            connection.execute(text(
+                "INSERT INTO analyses (id, document_id, is_relevant, confidence, validation_status, created_at) "
+                "VALUES (:id, 'd', 1, :confidence, :status, '2026-01-01 00:00:00')"
+            ), {"id": f"a-{i}", "confidence": confidence, "status": status})
+        connection.execute(text(
+            "INSERT INTO impact_assessments (id, analysis_id, risk_main, impact_level, deadline, created_at) "
+            "VALUES ('i-1', 'a-2', 'fiscal', 'eleve', '06-2027', '2026-01-01 00:00:00'), "
+            "('i-2', 'a-2', 'juridique', 'faible', NULL, '2026-01-01 00:00:00')"
+        ))
+
+    upgrade_database(engine)
+    with Session(engine) as session:
+        counts = aggregate_stats(session)
+        assert _snapshot(session) == counts
+        assert counts[(ANALYSES_HIGH_PRIORITY, "pending")] == 1
+
+        # Écart (écriture SQL directe) corrigé par rebuild_stats
+        session.execute(text("UPDATE stats_counters SET count = 7 WHERE metric = 'impacts_level'"))
+        drift = rebuild_stats(session)
+        session.commit()
+        assert drift == {(IMPACTS_LEVEL, "eleve"): (7, 1), (IMPACTS_LEVEL, "faible"): (7, 1)}
+        assert _snapshot(session) == counts
+    engine.dispose()
@@ -0,0 +1,54 @@
+"""Tests des mesures par étape (spans, compteurs, propagation asyncio/threads)."""
+
+import asyncio
+import time
+
+from src.utils.metrics import current_metrics, record, span, with_metrics
+
+
+def test_stages_accumulate_counters_and_nested_records():
+    @with_metrics
+    def run():
+        with span("download") as stage:
+            record(bytes=1000)
+            stage.add(items=1)
+        download = span("download")
+        record(bytes=500)
+        download.finish(items=1)
+
+        parse = span("extract")
+        sum(i * i for i in range(200_000))  # temps CPU
+        parse.finish(items=2)
+        return current_metrics().snapshot()
+
+    snapshot = run()
+    stages = snapshot["stages"]
+    assert stages["download"]["calls"] == 2
+    assert stages["download"]["bytes"] == 1500 and stages["download"]["items"] == 2
+    assert stages["extract"]["cpu_s"] > 0 and stages["extract"]["wall_s"] > 0
+    assert snapshot["total"]["wall_s"] >= stages["extract"]["wall_s"]
+    # Hors exécution mesurée : aucun collecteur, record() sans effet
+    assert current_metrics() is None
+    record(bytes=1)
+
+
+def test_nested_run_reuses_collector_across_asyncio_and_threads():
+    @with_metrics
+    async def collect():
+        with span("scrape"):
+            await asyncio.to_thread(record, items=3, input_tokens=10)
+        return current_metrics()
+
+    @with_metrics
+    def pipeline():
+        outer = current_metrics()
+        inner = asyncio.run(collect())
+        with span("analysis"):
+            time.sleep(0.01)
+        return outer, inner, outer.snapshot()
+
+    outer, inner, snapshot = pipeline()
+    assert inner is outer
+    assert snapshot["stages"]["scrape"]["items"] == 3
+    assert snapshot["stages"]["scrape"]["input_tokens"] == 10
+    assert snapshot["stages"]["analysis"]["wall_s"] >= 0.01
@@ -0,0 +1,77 @@
+"""Tests du modèle LLM hors ligne (déterminisme, schémas, agent ReAct)."""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.agent_1b.tools.semantic_analyzer import SemanticAnalyzer
+from src.storage.models import Analysis, Base, CompanyProcess, Document, ExecutionLog, ImpactAssessment
+from src.utils.offline_llm import OfflineChatModel
+
+CONTENT = (
+    "Article 1\nImporters of natural rubber of CN code 4001.21 shall submit a declaration.\n\n"
+    "Article 2\nThe reporting period starts on 1 January 2026."
+)
+PROFILE = {"company_id": "p-1", "company_name": "RubberCo", "keywords": ["rubber"], "nc_codes": ["4001.21"]}
+
+
+def _analyze(llm):
+    analyzer = SemanticAnalyzer(mode="single", llm=llm)
+    return analyzer.analyze(CONTENT, "CBAM rubber", "CBAM", PROFILE), analyzer
+
+
+def test_semantic_analysis_is_deterministic_and_schema_valid():
+    first, analyzer = _analyze(OfflineChatModel(seed=1))
+    second, _ = _analyze(OfflineChatModel(seed=1))
+
+    assert first == second
+    assert 0.0 <= first.score <= 1.0
+    assert len(first.impact_explanation) >= 50
+    usage = analyzer.last_usage
+    assert usage["calls"] == 1 and usage["input_tokens"] > 0 and usage["output_tokens"] > 0
+
+
+def test_format_instructions_path_returns_parsable_json(monkeypatch):
+    monkeypatch.setattr("src.config.settings.semantic_structured_output", False)
+
+    result, _ = _analyze(OfflineChatModel())
+
+    assert result.confidence_level > 0.0
+
+
+def test_simulated_errors_fall_back():
+    result, _ = _analyze(OfflineChatModel(error_rate=1.0))
+
+    assert result.confidence_level == 0.0
+    assert len(result.impact_explanation) >= 50
+
+
+def test_agent_2_runs_offline_and_saves_each_analysis(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr("src.agent_2.tools.get_session", Session)
+    monkeypatch.setattr("src.config.settings.llm_backend", "offline")
+
+    session = Session()
+    document = Document(title="CBAM", source_url="https://example.test/cbam", regulation_type="CBAM", hash_sha256="a" * 64)
+    session.add(document)
+    session.flush()
+    session.add_all([
+        Analysis(id="a-1", document_id=document.id, is_relevant=True, confidence=0.8, validation_status="approved"),
+        Analysis(id="a-2", document_id=document.id, is_relevant=True, confidence=0.6, validation_status="approved"),
+        CompanyProcess(company_name="RubberCo", processes=["import"]),
+    ])
+    session.commit()
+
+    from src.agent_2.agent import Agent2
+
+    Agent2().run()
+
+    impacts = Session().query(ImpactAssessment).all()
+    assert sorted(impact.analysis_id for impact in impacts) == ["a-1", "a-2"]
+
+    log = Session().query(ExecutionLog).filter(ExecutionLog.agent_type == "agent_2").one()
+    stage = log.log_metadata["metrics"]["stages"]["agent_2"]
+    assert log.status == "success" and log.duration_seconds > 0
+    assert stage["llm_calls"] > 0 and stage["input_tokens"] > 0